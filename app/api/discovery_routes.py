@@ -1,5 +1,5 @@
 from flask import Blueprint, jsonify, current_app, request
-from app.core.device_discovery import HeloDiscovery, StreamingState
+from app.core.device_discovery import HeloDiscovery, StreamingState, parse_scan_networks
 import asyncio
 from datetime import datetime
 from ..core.security.security_logger import SecurityEventLogger
@@ -9,11 +9,24 @@ discovery_bp = Blueprint('discovery', __name__)
 @discovery_bp.route('/scan', methods=['POST'])
 async def scan_network():
     """Endpoint to trigger network scan for Helo devices"""
+    # NETWORK_RANGE may be one CIDR or a list of them
+    requested = (request.get_json(silent=True) or {}).get(
+        'networks', current_app.config.get('NETWORK_RANGE', '192.168.1.0/24')
+    )
+    try:
+        network_range = parse_scan_networks(
+            requested, current_app.config.get('MAX_SCAN_ADDRESSES', 1024)
+        )
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
     try:
         discovery = HeloDiscovery(current_app.endpoint_registry)
-        network_range = current_app.config.get('NETWORK_RANGE', '192.168.1.0/24')
         
-        devices = await discovery.scan_network(network_range)
+        try:
+            devices = await discovery.scan_network(network_range)
+        finally:
+            await discovery.close()
         
         # Log scan event
         SecurityEventLogger(current_app).log_event(
@@ -116,4 +129,27 @@ def list_devices():
         return jsonify({
             'status': 'error',
             'message': str(e)
-        }), 500 
\ No newline at end of file
+        }), 500 
+
+
+@discovery_bp.route('/devices/stale', methods=['GET'])
+def list_stale_devices():
+    """List devices that went offline within the last ``seconds`` (default 300)"""
+    try:
+        discovery = current_app.device_discovery
+        seconds = request.args.get('seconds', 300, type=float)
+        stale = discovery.store.stale_since(seconds)
+        
+        return jsonify({
+            'status': 'success',
+            'devices': [
+                {
+                    'ip': ip,
+                    'last_seen': discovery.known_devices[ip].isoformat() if ip in discovery.known_devices else None
+                }
+                for ip in stale
+            ]
+        })
+    except Exception as e:
+        current_app.logger.error(f"Stale device query failed: {str(e)}")
+        return jsonify({'status': 'error', 'message': str(e)}), 500
@@ -1,60 +1,113 @@
-from .aja import (
-    AJADevice, AJAParameterManager, AJAParameter, AJAReplicatorCommands,
-    AJAMediaState, AJAHELOClient, AJAHELOEndpoints, AJARemediationService,
-    HeloDeviceParameters, HeloParameters, VideoSource, AudioSource,
-    MediaState, RecordingMediaType
-)
-
-from .auditing_log import log_audit, log_role_change, LoggingSystem
-
-from .cablecast import (
-    DateScraper, MeetingInfo, MeetingSource, CablecastScheduler,
-    ScheduledEvent, SchedulingAssistant, ScheduledAction, Show,
-    ScheduleItem, Format, Media, CablecastEndpoints, CablecastStreamStates,
-    CablecastVODStates, ChapteringSessionStates, CablecastErrorTypes,
-    DeviceTypes, DeviceStates, AssetLogMessageTypes, PublicSiteParameters,
-    create_google_calendar_event, AJACablecastIntegrator
-)
-
-from .config import (
-    Parameter, ParameterConfig, SocketServiceConfig, SSHKeyGenerator,
-    SSHKeyValidator, WebSocketConfig
-)
-
-from .connection import (
-    CablecastPooledClient, ConnectionThermalManager, ConnectionThermalMetrics,
-    HealthChecker, HeloPoolManager, HeloConnectionMetrics, PoolManager,
-    HeloWarmupManager, ConnectionWarmupMetrics
-)
-
-from .error_handling import (
-    handle_errors, ErrorLogger, APIError, EnhancedErrorMetrics,
-    EncoderError, HeloErrorType, AJAClientError, CentralErrorManager,
-    PerformanceMonitor, StreamErrorHandler, MediaStorageHandler,
-    ErrorResponse, SuccessResponse, AjaMetricCollector, Analyzer,
-    BaseMetrics, CorrelationAnalyzer, SystemAnalyzer,
-    BitrateControlMechanism, OptimizeBitrate
-)
-
-from .metrics import (
-    MetricsCollector, MetricsSystem, MetricsService, MetricsAnalyzer
-)
-
-from .models import LogEntry
-
-from .security import (
-    Role, Permission, nginx_conf, roles_required, permission_required,
-    get_user_roles_and_permissions, RoleManager, SecurityEventLogger,
-    SecurityManager, SSLConfig, configure_ssl
-)
-
-from .visualization import (
-    AdvancedErrorVisualizer, ErrorVisualizer, ReportExporter
-)
+from .lazy_loader import lazy_exports
+
+# Exported names are imported from their submodule on first access
+_EXPORTS = {
+    'AJADevice': '.aja',
+    'AJAParameterManager': '.aja',
+    'AJAReplicatorCommands': '.aja',
+    'AJAMediaState': '.aja',
+    'AJAHELOClient': '.aja',
+    'AJAHELOEndpoints': '.aja',
+    'AJARemediationService': '.aja',
+    'HeloDeviceParameters': '.aja',
+    'HeloParameters': '.aja',
+    'VideoSource': '.aja',
+    'AudioSource': '.aja',
+    'MediaState': '.aja',
+    'RecordingMediaType': '.aja',
+    'log_audit': '.auditing_log',
+    'log_role_change': '.auditing_log',
+    'LoggingSystem': '.auditing_log',
+    'DateScraper': '.cablecast',
+    'MeetingInfo': '.cablecast',
+    'MeetingSource': '.cablecast',
+    'CablecastScheduler': '.cablecast',
+    'ScheduledEvent': '.cablecast',
+    'SchedulingAssistant': '.cablecast',
+    'ScheduledAction': '.cablecast',
+    'Show': '.cablecast',
+    'ScheduleItem': '.cablecast',
+    'Format': '.cablecast',
+    'Media': '.cablecast',
+    'CablecastEndpoints': '.cablecast',
+    'CablecastStreamStates': '.cablecast',
+    'CablecastVODStates': '.cablecast',
+    'ChapteringSessionStates': '.cablecast',
+    'CablecastErrorTypes': '.cablecast',
+    'DeviceTypes': '.cablecast',
+    'DeviceStates': '.cablecast',
+    'AssetLogMessageTypes': '.cablecast',
+    'PublicSiteParameters': '.cablecast',
+    'create_google_calendar_event': '.cablecast',
+    'AJACablecastIntegrator': '.cablecast',
+    'EventPreflight': '.cablecast',
+    'PreflightResult': '.cablecast',
+    'CablecastResponseDecoder': '.cablecast',
+    'LazyModelList': '.cablecast',
+    'Parameter': '.config',
+    'ParameterConfig': '.config',
+    'SocketServiceConfig': '.config',
+    'SSHKeyGenerator': '.config',
+    'SSHKeyValidator': '.config',
+    'WebSocketConfig': '.config',
+    'CablecastPooledClient': '.connection',
+    'ConnectionThermalManager': '.connection',
+    'ConnectionThermalMetrics': '.connection',
+    'HealthChecker': '.connection',
+    'HeloPoolManager': '.connection',
+    'HeloConnectionMetrics': '.connection',
+    'PoolManager': '.connection',
+    'PeriodicJobScheduler': '.connection',
+    'HeloWarmupManager': '.connection',
+    'ConnectionWarmupMetrics': '.connection',
+    'handle_errors': '.error_handling',
+    'ErrorLogger': '.error_handling',
+    'APIError': '.error_handling',
+    'EnhancedErrorMetrics': '.error_handling',
+    'EncoderError': '.error_handling',
+    'HeloErrorType': '.error_handling',
+    'AJAClientError': '.error_handling',
+    'CentralErrorManager': '.error_handling',
+    'PerformanceMonitor': '.error_handling',
+    'StreamErrorHandler': '.error_handling',
+    'MediaStorageHandler': '.error_handling',
+    'ErrorResponse': '.error_handling',
+    'SuccessResponse': '.error_handling',
+    'AjaMetricCollector': '.error_handling',
+    'Analyzer': '.error_handling',
+    'BaseMetrics': '.error_handling',
+    'CorrelationAnalyzer': '.error_handling',
+    'SystemAnalyzer': '.error_handling',
+    'BitrateControlMechanism': '.error_handling',
+    'OptimizeBitrate': '.error_handling',
+    'MetricsCollector': '.metrics',
+    'MetricsSystem': '.metrics',
+    'MetricsService': '.metrics',
+    'MetricsAnalyzer': '.metrics',
+    'StreamingStabilityTracker': '.metrics',
+    'FleetAggregator': '.metrics',
+    'LogEntry': '.models',
+    'Role': '.security',
+    'Permission': '.security',
+    'nginx_conf': '.security',
+    'roles_required': '.security',
+    'permission_required': '.security',
+    'get_user_roles_and_permissions': '.security',
+    'RoleManager': '.security',
+    'SecurityEventLogger': '.security',
+    'SecurityManager': '.security',
+    'SSLConfig': '.security',
+    'configure_ssl': '.security',
+    'AdvancedErrorVisualizer': '.visualization',
+    'ErrorVisualizer': '.visualization',
+    'ReportExporter': '.visualization'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     # AJA
-    'AJADevice', 'AJAParameterManager', 'AJAParameter', 'AJAReplicatorCommands',
+    'AJADevice', 'AJAParameterManager', 'AJAReplicatorCommands',
     'AJAMediaState', 'AJAHELOClient', 'AJAHELOEndpoints', 'AJARemediationService',
     'HeloDeviceParameters', 'HeloParameters', 'VideoSource', 'AudioSource',
     'MediaState', 'RecordingMediaType',
@@ -69,6 +122,7 @@ __all__ = [
     'CablecastVODStates', 'ChapteringSessionStates', 'CablecastErrorTypes',
     'DeviceTypes', 'DeviceStates', 'AssetLogMessageTypes', 'PublicSiteParameters',
     'create_google_calendar_event', 'AJACablecastIntegrator',
+    'EventPreflight', 'PreflightResult', 'CablecastResponseDecoder', 'LazyModelList',
 
     # Config
     'Parameter', 'ParameterConfig', 'SocketServiceConfig', 'SSHKeyGenerator',
@@ -77,7 +131,7 @@ __all__ = [
     # Connection
     'CablecastPooledClient', 'ConnectionThermalManager', 'ConnectionThermalMetrics',
     'HealthChecker', 'HeloPoolManager', 'HeloConnectionMetrics', 'PoolManager',
-    'HeloWarmupManager', 'ConnectionWarmupMetrics',
+    'PeriodicJobScheduler', 'HeloWarmupManager', 'ConnectionWarmupMetrics',
 
     # Error Handling
     'handle_errors', 'ErrorLogger', 'APIError', 'EnhancedErrorMetrics',
@@ -89,6 +143,8 @@ __all__ = [
 
     # Metrics
     'MetricsCollector', 'MetricsSystem', 'MetricsService', 'MetricsAnalyzer',
+    'StreamingStabilityTracker',
+    'FleetAggregator',
 
     # Models
     'LogEntry',
@@ -1,40 +1,58 @@
-from .aja_device import AJADevice
-from .aja_helo_parameter_service import (
-    AJAParameterManager,
-    AJAParameter,
-    AJAReplicatorCommands,
-    AJAMediaState
-)
-from .client import AJAHELOClient, AJAHELOEndpoints
-from .aja_remediation_service import AJARemediationService
-from .machine_logic.helo_params import (
-    HeloDeviceParameters,
-    HeloParameters,
-    VideoSource,
-    AudioSource,
-    MediaState,
-    RecordingMediaType
-)
-from .machine_logic.helo_commands import (
-    recall_preset,
-    set_recording_name,
-    start_recording,
-    stop_recording,
-    start_streaming,
-    stop_streaming,
-    verify_streaming,
-    verify_recording
-)
-from .translate_mach_logi.integrated_params import IntegratedEncoderParameters
+from app.core.lazy_loader import lazy_exports
+
+# Exported names are imported from their submodule on first access
+_EXPORTS = {
+    'AJADevice': '.aja_device',
+    'ParameterSchema': '.parameter_schema',
+    'CompiledParameter': '.parameter_schema',
+    'load_parameter_schema': '.parameter_schema',
+    'AJAParameterManager': '.aja_helo_parameter_service',
+    'AJAReplicatorCommands': '.aja_helo_parameter_service',
+    'AJAMediaState': '.aja_helo_parameter_service',
+    'AJAHELOClient': '.client',
+    'AJAHELOEndpoints': '.client',
+    'HeloSessionRegistry': '.session_registry',
+    'HeloSessionMetrics': '.session_registry',
+    'get_session_registry': '.session_registry',
+    'DeviceStateCache': '.device_state_cache',
+    'DeviceStateCacheMetrics': '.device_state_cache',
+    'get_device_state_cache': '.device_state_cache',
+    'AJARemediationService': '.aja_remediation_service',
+    'HeloDeviceParameters': '.machine_logic.helo_params',
+    'HeloParameters': '.machine_logic.helo_params',
+    'VideoSource': '.machine_logic.helo_params',
+    'AudioSource': '.machine_logic.helo_params',
+    'MediaState': '.machine_logic.helo_params',
+    'RecordingMediaType': '.machine_logic.helo_params',
+    'recall_preset': '.machine_logic.helo_commands',
+    'set_recording_name': '.machine_logic.helo_commands',
+    'start_recording': '.machine_logic.helo_commands',
+    'stop_recording': '.machine_logic.helo_commands',
+    'start_streaming': '.machine_logic.helo_commands',
+    'stop_streaming': '.machine_logic.helo_commands',
+    'verify_streaming': '.machine_logic.helo_commands',
+    'verify_recording': '.machine_logic.helo_commands',
+    'IntegratedEncoderParameters': '.translate_mach_logi.integrated_params'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     'AJADevice',
     'AJAParameterManager',
-    'AJAParameter',
+    'ParameterSchema',
+    'CompiledParameter',
+    'load_parameter_schema',
     'AJAReplicatorCommands',
     'AJAMediaState',
     'AJAHELOClient',
     'AJAHELOEndpoints',
+    'HeloSessionRegistry',
+    'HeloSessionMetrics',
+    'get_session_registry',
+    'DeviceStateCache',
+    'DeviceStateCacheMetrics',
+    'get_device_state_cache',
     'AJARemediationService',
     'HeloDeviceParameters',
     'HeloParameters',
@@ -51,4 +69,4 @@ __all__ = [
     'verify_streaming',
     'verify_recording',
     'IntegratedEncoderParameters'
-]
\ No newline at end of file
+]
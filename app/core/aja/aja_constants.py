@@ -24,7 +24,12 @@ class AJAParameters:
 class AJAStreamParams:
     """AJA Stream Parameters"""
     STREAM_URL = "streamUrl"
+    STREAM_FORMAT = "streamFormat"
+    VIDEO_SOURCE = "videoSource"
+    AUDIO_SOURCE = "audioSource"
     BITRATE = "bitrate"
+    VIDEO_BITRATE = "videoBitrate"
+    KEYFRAME_INTERVAL = "keyframeInterval"
     RESOLUTION = "resolution"
     FRAME_RATE = "frameRate"
     AUDIO_CHANNELS = "audioChannels"
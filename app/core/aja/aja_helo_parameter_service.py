@@ -1,68 +1,38 @@
 import sys
 from enum import Enum
-from typing import Dict, Union, Optional, Any
-import csv
-from pathlib import Path
+from typing import Dict, Optional, Any, Mapping
 from app.core.aja.aja_constants import AJAParameters, AJAStreamParams
-
-# Avoid circular import by using a delayed import pattern
-class AJAParameterType(Enum):
-    STRING = "string"
-    INTEGER = "integer"
-    ENUM = "enum"
-    DATA = "data"
-
-class AJAParameter:
-    def __init__(self, name: str, description: str, param_type: AJAParameterType, 
-                 default_value: Union[str, int], enum_values: Optional[list] = None):
-        self.name = name
-        self.description = description
-        self.param_type = param_type
-        self.default_value = default_value
-        self.enum_values = enum_values.split(", ") if enum_values else None
+from app.core.aja.parameter_schema import ParameterSchema, load_parameter_schema
 
 class AJAParameterManager:
     """Manages AJA device parameters and validation"""
     
-    def __init__(self):
-        self.parameters: Dict[str, AJAParameter] = {}
-        self._load_parameters()
-        self.param_ranges = {
-            AJAStreamParams.VIDEO_BITRATE: (1_000_000, 20_000_000),  # 1-20 Mbps
-            AJAStreamParams.FRAME_RATE: (23.98, 60),
-            AJAStreamParams.KEYFRAME_INTERVAL: (1, 300)
-        }
-
-    def _load_parameters(self):
-        """Load parameters from CSV configuration"""
-        csv_path = Path(__file__).parent.parent / "Utils" / "Parameter_Configuration_Table.csv"
-        
-        with open(csv_path, 'r') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                param = AJAParameter(
-                    name=row['Param Name'],
-                    description=row['Description'],
-                    param_type=AJAParameterType(row['Param Type'].lower()),
-                    default_value=row['Default Value'],
-                    enum_values=row['Enum Values'] if row['Param Type'].lower() == 'enum' else None
-                )
-                self.parameters[param.name] = param
+    def __init__(self, schema: Optional[ParameterSchema] = None):
+        # The CSV is compiled once per process and shared by every manager
+        self.schema = schema or load_parameter_schema()
+        self.parameters = self.schema.parameters
+        self.param_ranges = self.schema.ranges
 
-    def get_parameter(self, name: str) -> Optional[AJAParameter]:
+    def get_parameter(self, name: str):
         """Get parameter configuration by name"""
         return self.parameters.get(name)
 
     def validate_value(self, param: str, value: Any) -> bool:
-        """Validate parameter value against defined ranges"""
-        # Import HeloParameters here to avoid circular import
-        from app.core.aja.machine_logic.helo_params import HeloParameters
-        
-        helo_params = HeloParameters().device_parameters  # Access current parameters
-        if param in self.param_ranges:
-            min_val, max_val = self.param_ranges[param]
-            return min_val <= float(value) <= max_val
-        return True
+        """Validate parameter value against its type, enum labels and defined ranges
+
+        Stricter than the original range-only check: a table parameter whose
+        value does not match its type, such as '4.5ms' for an integer, now
+        fails where it used to pass.
+        """
+        return self.schema.validate(param, value)
+
+    def validate_many(self, config: Mapping[str, Any]) -> Dict[str, str]:
+        """Validate a whole profile in one pass
+
+        Returns:
+            Parameter name to error reason for each invalid value; empty when valid
+        """
+        return self.schema.validate_many(config)
 
 class AJAReplicatorCommands:
     START_RECORDING = 1
@@ -4,7 +4,9 @@ import asyncio
 from datetime import datetime
 from app.core.aja.aja_helo_parameter_service import AJAParameterManager
 from app.core.aja.aja_constants import AJAStreamParams
-from app.core.aja.client import AJAHELOClient, AJAClientError
+from app.core.aja.session_registry import HeloSessionRegistry, get_session_registry
+from app.core.aja.device_state_cache import DeviceStateCache, get_device_state_cache
+from app.core.error_handling import AJAClientError
 from enum import Enum
 
 class AJAHELOEndpoints(Enum):
@@ -31,9 +33,17 @@ class AJAHELOEndpoints(Enum):
 class AJAHELOClient:
     """Enhanced AJA HELO REST API Client"""
     
-    def __init__(self, ip_address: str, port: int = 80, timeout: int = 30):
+    def __init__(self, ip_address: str, port: int = 80, timeout: int = 30,
+                 registry: Optional[HeloSessionRegistry] = None,
+                 encoder_id: Optional[str] = None,
+                 state_cache: Optional[DeviceStateCache] = None):
         self.base_url = f"http://{ip_address}:{port}/api/v1"
+        self.host = f"{ip_address}:{port}"
+        self.encoder_id = str(encoder_id) if encoder_id is not None else self.host
         self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.registry = registry or get_session_registry()
+        self.state_cache = state_cache or get_device_state_cache()
+        self.param_manager = AJAParameterManager()
         self.session = None
         self._last_error = None
         self._connection_retries = 3
@@ -67,9 +77,10 @@ class AJAHELOClient:
 
         while retries > 0:
             try:
-                if not self.session:
-                    self.session = aiohttp.ClientSession(timeout=self.timeout)
+                if not self.session or self.session.closed:
+                    self.session = await self.registry.get_session(self.host)
 
+                kwargs.setdefault('timeout', self.timeout)
                 async with self.session.request(method, url, **kwargs) as response:
                     if response.status >= 400:
                         await self._handle_api_error(response)
@@ -85,42 +96,61 @@ class AJAHELOClient:
                 self._last_error = str(e)
                 raise AJAClientError(f"Connection error: {str(e)}")
 
+    async def _get_status(self, endpoint: AJAHELOEndpoints, max_age: Optional[float] = None) -> Dict:
+        """Read a status endpoint through the shared device state cache"""
+        return await self.state_cache.get(
+            self.encoder_id,
+            endpoint.value,
+            lambda: self._make_request("GET", endpoint),
+            max_age=max_age
+        )
+
     # Enhanced streaming control methods
     async def start_stream(self, config: Optional[Dict] = None) -> Dict:
         """Start streaming with optional configuration"""
         if config:
             await self.configure_stream(config)
-        return await self._make_request("POST", AJAHELOEndpoints.STREAM_START)
+        response = await self._make_request("POST", AJAHELOEndpoints.STREAM_START)
+        self.state_cache.invalidate(self.encoder_id, AJAHELOEndpoints.STREAM_STATUS.value)
+        return response
 
     async def stop_stream(self) -> Dict:
         """Stop current stream"""
-        return await self._make_request("POST", AJAHELOEndpoints.STREAM_STOP)
+        response = await self._make_request("POST", AJAHELOEndpoints.STREAM_STOP)
+        self.state_cache.invalidate(self.encoder_id, AJAHELOEndpoints.STREAM_STATUS.value)
+        return response
 
     # Enhanced recording control methods
     async def start_recording(self, config: Optional[Dict] = None) -> Dict:
         """Start recording with optional configuration"""
         if config:
             await self.configure_recording(config)
-        return await self._make_request("POST", AJAHELOEndpoints.RECORD_START)
+        response = await self._make_request("POST", AJAHELOEndpoints.RECORD_START)
+        self.state_cache.invalidate(self.encoder_id, AJAHELOEndpoints.RECORD_STATUS.value)
+        return response
 
     async def stop_recording(self) -> Dict:
         """Stop current recording"""
-        return await self._make_request("POST", AJAHELOEndpoints.RECORD_STOP)
+        response = await self._make_request("POST", AJAHELOEndpoints.RECORD_STOP)
+        self.state_cache.invalidate(self.encoder_id, AJAHELOEndpoints.RECORD_STATUS.value)
+        return response
 
     # System control methods
     async def reboot_device(self) -> Dict:
         """Reboot the HELO device"""
-        return await self._make_request("POST", AJAHELOEndpoints.REBOOT)
+        response = await self._make_request("POST", AJAHELOEndpoints.REBOOT)
+        self.state_cache.invalidate(self.encoder_id)
+        return response
 
     # Enhanced status methods with error handling
     async def get_full_status(self) -> Dict:
         """Get comprehensive device status"""
         try:
             status_results = await asyncio.gather(
-                self._make_request("GET", AJAHELOEndpoints.SYSTEM_STATUS),
-                self._make_request("GET", AJAHELOEndpoints.STREAM_STATUS),
-                self._make_request("GET", AJAHELOEndpoints.RECORD_STATUS),
-                self._make_request("GET", AJAHELOEndpoints.NETWORK_STATUS),
+                self._get_status(AJAHELOEndpoints.SYSTEM_STATUS),
+                self._get_status(AJAHELOEndpoints.STREAM_STATUS),
+                self._get_status(AJAHELOEndpoints.RECORD_STATUS),
+                self._get_status(AJAHELOEndpoints.NETWORK_STATUS),
                 return_exceptions=True
             )
 
@@ -138,52 +168,60 @@ class AJAHELOClient:
     async def configure_stream(self, config: Dict) -> Dict:
         """Configure streaming parameters"""
         # Validate all parameters before sending
-        for param, value in config.items():
-            if not self.param_manager.validate_value(param, value):
-                raise AJAClientError(f"Invalid value for parameter: {param}")
+        errors = self.param_manager.validate_many(config)
+        if errors:
+            raise AJAClientError(f"Invalid value for parameter: {next(iter(errors))}")
 
         return await self._make_request("POST", AJAHELOEndpoints.STREAM_CONFIG, json=config)
 
+    async def get_system_status(self) -> Dict:
+        """Get system status"""
+        return await self._get_status(AJAHELOEndpoints.SYSTEM_STATUS)
+
+    async def get_stream_status(self) -> Dict:
+        """Get streaming status"""
+        return await self._get_status(AJAHELOEndpoints.STREAM_STATUS)
+
     async def get_network_stats(self) -> Dict:
         """Get network statistics"""
-        return await self._make_request("GET", AJAHELOEndpoints.NETWORK_STATUS)
+        return await self._get_status(AJAHELOEndpoints.NETWORK_STATUS)
 
     async def get_media_status(self) -> Dict:
         """Get media and storage status"""
-        return await self._make_request("GET", AJAHELOEndpoints.MEDIA_STATUS)
+        return await self._get_status(AJAHELOEndpoints.MEDIA_STATUS)
 
     async def configure_recording(self, config: Dict) -> Dict:
         """Configure recording parameters"""
         # Validate all parameters before sending
-        for param, value in config.items():
-            if not self.param_manager.validate_value(param, value):
-                raise AJAClientError(f"Invalid value for parameter: {param}")
+        errors = self.param_manager.validate_many(config)
+        if errors:
+            raise AJAClientError(f"Invalid value for parameter: {next(iter(errors))}")
 
         return await self._make_request("POST", AJAHELOEndpoints.RECORD_CONFIG, json=config)
 
     async def configure_network(self, config: Dict) -> Dict:
         """Configure network parameters"""
         # Validate all parameters before sending
-        for param, value in config.items():
-            if not self.param_manager.validate_value(param, value):
-                raise AJAClientError(f"Invalid value for parameter: {param}")
+        errors = self.param_manager.validate_many(config)
+        if errors:
+            raise AJAClientError(f"Invalid value for parameter: {next(iter(errors))}")
 
         return await self._make_request("POST", AJAHELOEndpoints.NETWORK_CONFIG, json=config)
 
     async def configure_system(self, config: Dict) -> Dict:
         """Configure system parameters"""
         # Validate all parameters before sending
-        for param, value in config.items():
-            if not self.param_manager.validate_value(param, value):
-                raise AJAClientError(f"Invalid value for parameter: {param}")
+        errors = self.param_manager.validate_many(config)
+        if errors:
+            raise AJAClientError(f"Invalid value for parameter: {next(iter(errors))}")
 
         return await self._make_request("POST", AJAHELOEndpoints.SYSTEM_CONFIG, json=config)
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        self.session = await self.registry.get_session(self.host)
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        # The session belongs to the shared registry; keep its connections alive
+        self.session = None
   
\ No newline at end of file
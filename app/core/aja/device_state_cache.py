@@ -0,0 +1,151 @@
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import logging
+import time
+from prometheus_client import Counter
+
+logger = logging.getLogger(__name__)
+
+# Seconds a status response stays fresh, per HELO endpoint
+DEFAULT_ENDPOINT_TTLS: Dict[str, float] = {
+    "/status/streaming": 2.0,
+    "/status/recording": 2.0,
+    "/status/system": 5.0,
+    "/status/network": 5.0,
+    "/status/media": 10.0,
+}
+
+class DeviceStateCacheMetrics:
+    """Hit/miss metrics for the device state cache"""
+    hits = Counter('helo_state_cache_hits_total', 'Status reads served from cache', ['endpoint'])
+    misses = Counter('helo_state_cache_misses_total', 'Status reads fetched from the device', ['endpoint'])
+    coalesced = Counter('helo_state_cache_coalesced_total',
+                        'Status reads that joined a fetch already in flight', ['endpoint'])
+
+class DeviceStateCache:
+    """Short-TTL cache of HELO status responses keyed by (encoder, endpoint).
+
+    Monitors, WebSocket broadcasters and REST routes all read through the
+    same instance. When several callers miss on the same key at once only
+    one of them fetches from the device; the rest await that result.
+    """
+
+    _instance: Optional['DeviceStateCache'] = None
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, default_ttl: float = 2.0):
+        """
+        Args:
+            ttls: Per-endpoint TTL overrides in seconds
+            default_ttl: TTL for endpoints without an explicit entry
+        """
+        self.ttls = {**DEFAULT_ENDPOINT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.metrics = DeviceStateCacheMetrics()
+        self._entries: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    @classmethod
+    def get_instance(cls) -> 'DeviceStateCache':
+        """Return the process-wide cache, creating it on first use"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def ttl_for(self, endpoint: str) -> float:
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def peek(self, encoder_id: str, endpoint: str, max_age: Optional[float] = None) -> Optional[Any]:
+        """Return the cached value if it is fresh enough, without fetching
+
+        Args:
+            encoder_id: Encoder the value belongs to
+            endpoint: HELO endpoint path, e.g. ``/status/streaming``
+            max_age: Override the endpoint TTL for this read
+        """
+        entry = self._entries.get((str(encoder_id), endpoint))
+        if entry is None:
+            return None
+        fetched_at, value = entry
+        if time.monotonic() - fetched_at > (self.ttl_for(endpoint) if max_age is None else max_age):
+            return None
+        return value
+
+    def put(self, encoder_id: str, endpoint: str, value: Any):
+        """Store a value obtained elsewhere, e.g. by the fleet poller"""
+        self._entries[(str(encoder_id), endpoint)] = (time.monotonic(), value)
+
+    def invalidate(self, encoder_id: str, endpoint: Optional[str] = None):
+        """Drop one endpoint, or every endpoint when none is given, for an encoder
+
+        A fetch already in flight is detached as well: the next read starts
+        a new fetch, and the detached one's result is not cached.
+        """
+        encoder_id = str(encoder_id)
+        if endpoint is not None:
+            self._entries.pop((encoder_id, endpoint), None)
+            self._inflight.pop((encoder_id, endpoint), None)
+            return
+        for key in [k for k in self._entries if k[0] == encoder_id]:
+            del self._entries[key]
+        for key in [k for k in self._inflight if k[0] == encoder_id]:
+            del self._inflight[key]
+
+    async def get(self, encoder_id: str, endpoint: str,
+                  fetch: Callable[[], Awaitable[Any]],
+                  max_age: Optional[float] = None) -> Any:
+        """Read through the cache, fetching at most once per key at a time
+
+        Args:
+            encoder_id: Encoder the value belongs to
+            endpoint: HELO endpoint path used for the TTL lookup and metrics
+            fetch: Coroutine factory that retrieves the value from the device
+            max_age: Override the endpoint TTL for this read
+
+        Returns:
+            The cached or freshly fetched value
+        """
+        value = self.peek(encoder_id, endpoint, max_age)
+        if value is not None:
+            self.metrics.hits.labels(endpoint).inc()
+            return value
+
+        key = (str(encoder_id), endpoint)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.metrics.coalesced.labels(endpoint).inc()
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The caller that owned the fetch gave up; issue our own below
+
+        self.metrics.misses.labels(endpoint).inc()
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await fetch()
+            # Not cached if the key was invalidated while the fetch was in flight
+            if self._inflight.get(key) is future:
+                self._entries[key] = (time.monotonic(), value)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def clear(self):
+        self._entries.clear()
+        self._inflight.clear()
+
+
+def get_device_state_cache() -> DeviceStateCache:
+    """Shortcut for DeviceStateCache.get_instance()"""
+    return DeviceStateCache.get_instance()
@@ -0,0 +1,187 @@
+import csv
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, Mapping, Optional, Tuple
+
+PARAMETER_TABLE_PATH = Path(__file__).parent.parent.parent / "Utils" / "Parameter_Configuration_Table.csv"
+
+class AJAParameterType(Enum):
+    STRING = "string"
+    INTEGER = "integer"
+    ENUM = "enum"
+    DATA = "data"
+
+def _coerce_integer(value: Any) -> int:
+    if isinstance(value, bool):
+        raise ValueError("boolean is not an integer")
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(f"{value} is not a whole number")
+        return int(value)
+    return int(str(value).strip())
+
+def _coerce_string(value: Any) -> str:
+    if not isinstance(value, (str, int, float)):
+        raise ValueError(f"{type(value).__name__} is not a string value")
+    return str(value)
+
+def _coerce_data(value: Any) -> Any:
+    return value
+
+_COERCERS: Dict[AJAParameterType, Callable[[Any], Any]] = {
+    AJAParameterType.STRING: _coerce_string,
+    AJAParameterType.INTEGER: _coerce_integer,
+    AJAParameterType.DATA: _coerce_data,
+}
+
+@dataclass(frozen=True)
+class CompiledParameter:
+    """A parameter row from the configuration table with its validator precomputed"""
+    name: str
+    description: str
+    param_type: AJAParameterType
+    default_value: str
+    enum_values: Optional[Tuple[str, ...]] = None
+    enum_set: FrozenSet[str] = field(default_factory=frozenset)
+    enum_codes: FrozenSet[int] = field(default_factory=frozenset)
+    value_range: Optional[Tuple[float, float]] = None
+
+    def coerce(self, value: Any) -> Any:
+        """Convert a value to the parameter's type, raising ValueError if impossible"""
+        if self.param_type is AJAParameterType.ENUM:
+            label = str(value).strip()
+            if label.lower() in self.enum_set:
+                return label
+            # Devices also accept the raw enum code: a label's position or the table's default code
+            code = _coerce_integer(value)
+            if self.enum_codes and code not in self.enum_codes:
+                raise ValueError(f"{value!r} is not one of {', '.join(self.enum_values or ())}")
+            return code
+        return _COERCERS[self.param_type](value)
+
+    def check(self, value: Any) -> Optional[str]:
+        """Return None when the value is valid, otherwise the reason it is not"""
+        try:
+            coerced = self.coerce(value)
+        except (TypeError, ValueError) as e:
+            return f"expected {self.param_type.value}: {str(e)}"
+        if self.value_range is not None and not isinstance(coerced, str):
+            min_val, max_val = self.value_range
+            if not min_val <= coerced <= max_val:
+                return f"{coerced} outside range {min_val}-{max_val}"
+        return None
+
+class ParameterSchema:
+    """Immutable, process-shared view of Parameter_Configuration_Table.csv.
+
+    Built once by ``load_parameter_schema`` and shared by every
+    AJAParameterManager, so constructing a manager no longer re-reads the
+    CSV and validation is a dictionary lookup plus a precompiled check.
+    """
+
+    def __init__(self, parameters: Mapping[str, CompiledParameter],
+                 ranges: Mapping[str, Tuple[float, float]]):
+        self.parameters: Mapping[str, CompiledParameter] = MappingProxyType(dict(parameters))
+        self.ranges: Mapping[str, Tuple[float, float]] = MappingProxyType(dict(ranges))
+
+    def __len__(self) -> int:
+        return len(self.parameters)
+
+    def get(self, name: str) -> Optional[CompiledParameter]:
+        return self.parameters.get(name)
+
+    def check(self, name: str, value: Any) -> Optional[str]:
+        """Validate one value; unknown parameters are accepted as before
+
+        Unlike the original range-only check, table parameters are also
+        checked against their type, so a non-numeric integer or an enum
+        value that is neither a label nor a declared code is rejected.
+        """
+        param = self.parameters.get(name)
+        if param is not None:
+            return param.check(value)
+        value_range = self.ranges.get(name)
+        if value_range is not None:
+            try:
+                numeric = float(value)
+            except (TypeError, ValueError):
+                return f"expected a number, got {value!r}"
+            if not value_range[0] <= numeric <= value_range[1]:
+                return f"{numeric} outside range {value_range[0]}-{value_range[1]}"
+        return None
+
+    def validate(self, name: str, value: Any) -> bool:
+        return self.check(name, value) is None
+
+    def validate_many(self, config: Mapping[str, Any]) -> Dict[str, str]:
+        """Validate a whole profile in one pass
+
+        Args:
+            config: Parameter name to value
+
+        Returns:
+            Parameter name to error reason for every invalid entry; empty when valid
+        """
+        parameters = self.parameters
+        ranges = self.ranges
+        errors = {}
+        for name, value in config.items():
+            param = parameters.get(name)
+            if param is not None:
+                reason = param.check(value)
+            elif name in ranges:
+                reason = self.check(name, value)
+            else:
+                continue
+            if reason is not None:
+                errors[name] = reason
+        return errors
+
+def compile_parameter_table(csv_path: Path,
+                            ranges: Optional[Mapping[str, Tuple[float, float]]] = None) -> ParameterSchema:
+    """Parse the configuration table into a ParameterSchema
+
+    Later rows override earlier rows with the same name, matching the
+    original loader.
+    """
+    ranges = dict(ranges or {})
+    parameters: Dict[str, CompiledParameter] = {}
+    with open(csv_path, 'r', newline='') as file:
+        for row in csv.DictReader(file):
+            param_type = AJAParameterType(row['Param Type'].strip().lower())
+            enum_values = None
+            enum_codes = frozenset()
+            if param_type is AJAParameterType.ENUM and row['Enum Values']:
+                enum_values = tuple(row['Enum Values'].split(", "))
+                enum_codes = frozenset(range(len(enum_values)))
+                try:
+                    enum_codes |= {_coerce_integer(row['Default Value'])}
+                except ValueError:
+                    pass
+            name = row['Param Name']
+            parameters[name] = CompiledParameter(
+                name=name,
+                description=row['Description'],
+                param_type=param_type,
+                default_value=row['Default Value'],
+                enum_values=enum_values,
+                enum_set=frozenset(v.strip().lower() for v in enum_values or ()),
+                enum_codes=enum_codes,
+                value_range=ranges.get(name)
+            )
+    return ParameterSchema(parameters, ranges)
+
+@lru_cache(maxsize=None)
+def load_parameter_schema(csv_path: Optional[str] = None) -> ParameterSchema:
+    """Return the compiled schema, parsing the CSV only on the first call per path"""
+    from app.core.aja.aja_constants import AJAStreamParams
+
+    ranges = {
+        AJAStreamParams.VIDEO_BITRATE: (1_000_000, 20_000_000),  # 1-20 Mbps
+        AJAStreamParams.FRAME_RATE: (23.98, 60),
+        AJAStreamParams.KEYFRAME_INTERVAL: (1, 300)
+    }
+    return compile_parameter_table(Path(csv_path) if csv_path else PARAMETER_TABLE_PATH, ranges)
@@ -0,0 +1,257 @@
+from typing import Dict, Optional
+import aiohttp
+import asyncio
+import logging
+import time
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+class HeloSessionMetrics:
+    """Connection reuse metrics for the shared HELO session registry"""
+    connections_created = Counter('helo_session_connections_created_total',
+                                  'New TCP connections opened to HELO devices', ['host'])
+    connections_reused = Counter('helo_session_connections_reused_total',
+                                 'Requests served over an existing keep-alive connection', ['host'])
+    open_sockets = Gauge('helo_session_open_sockets', 'Open sockets held by the HELO session registry')
+    sessions = Gauge('helo_session_active_sessions', 'HELO hosts with a live keep-alive session')
+
+class HeloSessionRegistry:
+    """Process-wide registry of keep-alive aiohttp sessions, one per HELO host.
+
+    Every AJAHELOClient borrows its session from here instead of building its
+    own, so repeated status reads reuse the same TCP connections. Sessions
+    that have not been used for ``idle_timeout`` seconds are closed by
+    ``evict_idle``, which runs in the background from the first
+    ``get_session`` call. Use is recorded on every request made through a
+    session, including by clients that keep the session they were given.
+    """
+
+    _instance: Optional['HeloSessionRegistry'] = None
+
+    def __init__(self,
+                 limit_per_host: int = 4,
+                 keepalive_timeout: float = 30.0,
+                 idle_timeout: float = 300.0):
+        """
+        Args:
+            limit_per_host: Maximum simultaneous connections to one HELO
+            keepalive_timeout: Seconds an unused socket stays open in the connector
+            idle_timeout: Seconds without requests before a host's session is closed
+        """
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.idle_timeout = idle_timeout
+        self.metrics = HeloSessionMetrics()
+
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._last_used: Dict[str, float] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._eviction_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._created: Dict[str, int] = {}
+        self._reused: Dict[str, int] = {}
+
+    @classmethod
+    def get_instance(cls) -> 'HeloSessionRegistry':
+        """Return the process-wide registry, creating it on first use"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def _trace_config(self, host: str) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_connection_create_end(session, ctx, params):
+            self._created[host] = self._created.get(host, 0) + 1
+            self.metrics.connections_created.labels(host).inc()
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self._reused[host] = self._reused.get(host, 0) + 1
+            self.metrics.connections_reused.labels(host).inc()
+
+        async def on_request_start(session, ctx, params):
+            self._last_used[host] = time.monotonic()
+            self._in_flight[host] = self._in_flight.get(host, 0) + 1
+
+        async def on_request_done(session, ctx, params):
+            self._last_used[host] = time.monotonic()
+            self._in_flight[host] = max(self._in_flight.get(host, 0) - 1, 0)
+
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_done)
+        trace_config.on_request_exception.append(on_request_done)
+        return trace_config
+
+    def _ensure_eviction(self):
+        if self._eviction_task is None or self._eviction_task.done():
+            self._eviction_task = asyncio.get_running_loop().create_task(self.run_eviction())
+
+    async def get_session(self, host: str) -> aiohttp.ClientSession:
+        """Get the shared session for a HELO host.
+
+        Args:
+            host: ``ip:port`` of the device
+
+        Returns:
+            A keep-alive session callers must not close themselves
+        """
+        self._last_used[host] = time.monotonic()
+        self._ensure_eviction()
+        session = self._sessions.get(host)
+        if session is not None and not session.closed:
+            return session
+
+        async with self._lock:
+            session = self._sessions.get(host)
+            if session is None or session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout
+                )
+                session = aiohttp.ClientSession(
+                    connector=connector,
+                    trace_configs=[self._trace_config(host)]
+                )
+                self._sessions[host] = session
+                self.metrics.sessions.set(len(self._sessions))
+                logger.debug(f"Opened keep-alive session for HELO {host}")
+            return session
+
+    async def prewarm(self, host: str, connections: int, path: str = "/api/v1/status/system") -> int:
+        """Open keep-alive sockets to a host ahead of use
+
+        Issues ``connections`` concurrent lightweight GETs so that many
+        distinct sockets are established, then leaves them idle in the
+        connector where the next requests through ``get_session(host)``
+        pick them up without a TCP handshake. Calling it again before
+        ``keepalive_timeout`` expires refreshes the same sockets.
+
+        Args:
+            host: ``ip:port`` of the device
+            connections: Sockets wanted, capped at limit_per_host
+            path: Cheap endpoint to request on each socket
+
+        Returns:
+            Idle sockets held for the host afterwards
+        """
+        session = await self.get_session(host)
+        connections = min(connections, self.limit_per_host)
+
+        async def touch():
+            async with session.get(f"http://{host}{path}") as response:
+                await response.read()
+
+        results = await asyncio.gather(*(touch() for _ in range(connections)), return_exceptions=True)
+        failures = [r for r in results if isinstance(r, Exception)]
+        if failures:
+            logger.debug(f"Prewarm of {host}: {len(failures)}/{connections} requests failed: {failures[0]}")
+        return self.idle_sockets(host)
+
+    def idle_sockets(self, host: str) -> int:
+        """Keep-alive sockets to a host that are open and not in use"""
+        session = self._sessions.get(host)
+        if session is None or session.closed or session.connector is None:
+            return 0
+        return sum(len(conns) for conns in getattr(session.connector, '_conns', {}).values())
+
+    async def reset_host(self, host: str):
+        """Drop every socket to a host; the next request reconnects"""
+        async with self._lock:
+            session = self._sessions.pop(host, None)
+            self._last_used.pop(host, None)
+            self.metrics.sessions.set(len(self._sessions))
+        if session is not None and not session.closed:
+            await session.close()
+
+    async def evict_idle(self) -> int:
+        """Close sessions that have been idle longer than idle_timeout
+
+        Sessions with a request in progress are never closed.
+
+        Returns:
+            Number of sessions closed
+        """
+        cutoff = time.monotonic() - self.idle_timeout
+        evicted = 0
+        async with self._lock:
+            idle = [h for h, used in self._last_used.items()
+                    if used < cutoff and not self._in_flight.get(h)]
+            for host in idle:
+                session = self._sessions.pop(host, None)
+                self._last_used.pop(host, None)
+                self._in_flight.pop(host, None)
+                if session is not None and not session.closed:
+                    await session.close()
+                    evicted += 1
+            self.metrics.sessions.set(len(self._sessions))
+        if evicted:
+            logger.debug(f"Evicted {evicted} idle HELO sessions")
+        self.metrics.open_sockets.set(self.open_sockets())
+        return evicted
+
+    async def run_eviction(self, interval: Optional[float] = None):
+        """Evict idle sessions periodically until cancelled"""
+        interval = interval or max(self.idle_timeout / 2, 1.0)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.evict_idle()
+            except Exception as e:
+                logger.error(f"HELO session eviction failed: {str(e)}")
+
+    def open_sockets(self) -> int:
+        """Count sockets currently held by all connectors, in use or idle"""
+        total = 0
+        for session in self._sessions.values():
+            connector = session.connector
+            if connector is None or connector.closed:
+                continue
+            # aiohttp keeps idle keep-alive sockets in _conns and busy ones in _acquired
+            total += len(getattr(connector, '_acquired', ()))
+            total += sum(len(conns) for conns in getattr(connector, '_conns', {}).values())
+        return total
+
+    def stats(self) -> Dict:
+        """Connection reuse counters for the whole registry"""
+        created = sum(self._created.values())
+        reused = sum(self._reused.values())
+        total = created + reused
+        open_sockets = self.open_sockets()
+        self.metrics.open_sockets.set(open_sockets)
+        return {
+            'sessions': len(self._sessions),
+            'connections_created': created,
+            'connections_reused': reused,
+            'reuse_ratio': reused / total if total else 0.0,
+            'open_sockets': open_sockets,
+            'hosts': {
+                host: {
+                    'created': self._created.get(host, 0),
+                    'reused': self._reused.get(host, 0)
+                }
+                for host in set(self._created) | set(self._reused)
+            }
+        }
+
+    async def close_all(self):
+        """Close every session, e.g. on application shutdown"""
+        if self._eviction_task is not None:
+            self._eviction_task.cancel()
+            self._eviction_task = None
+        async with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            self._last_used.clear()
+            self._in_flight.clear()
+        await asyncio.gather(*(s.close() for s in sessions if not s.closed),
+                             return_exceptions=True)
+        self.metrics.sessions.set(0)
+        self.metrics.open_sockets.set(0)
+
+
+def get_session_registry() -> HeloSessionRegistry:
+    """Shortcut for HeloSessionRegistry.get_instance()"""
+    return HeloSessionRegistry.get_instance()
@@ -1,8 +1,16 @@
-from .audit_logger import log_audit, log_role_change
-from .system import LoggingSystem
+from app.core.lazy_loader import lazy_exports
+
+# Exported names are imported from their submodule on first access
+_EXPORTS = {
+    'log_audit': '.audit_logger',
+    'log_role_change': '.audit_logger',
+    'LoggingSystem': '.system'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     'log_audit',
     'log_role_change',
     'LoggingSystem'
-]
\ No newline at end of file
+]
@@ -1,26 +1,36 @@
-from .scheduling import (
-    DateScraper,
-    MeetingInfo,
-    MeetingSource,
-    CablecastScheduler,
-    ScheduledEvent,
-    SchedulingAssistant,
-    ScheduledAction
-)
-from .machine_language.cablecast_schemas import Show, ScheduleItem, Format, Media
-from .machine_language.cablecast_constants import (
-    CablecastEndpoints,
-    CablecastStreamStates,
-    CablecastVODStates,
-    ChapteringSessionStates,
-    CablecastErrorTypes,
-    DeviceTypes,
-    DeviceStates,
-    AssetLogMessageTypes,
-    PublicSiteParameters
-)
-from .google_calendar import create_google_calendar_event
-from .aja_cablecast_integrate import AJACablecastIntegrator
+from app.core.lazy_loader import lazy_exports
+
+# Exported names are imported from their submodule on first access
+_EXPORTS = {
+    'DateScraper': '.scheduling',
+    'MeetingInfo': '.scheduling',
+    'MeetingSource': '.scheduling',
+    'CablecastScheduler': '.scheduling',
+    'ScheduledEvent': '.scheduling',
+    'SchedulingAssistant': '.scheduling',
+    'ScheduledAction': '.scheduling',
+    'Show': '.machine_language.cablecast_schemas',
+    'ScheduleItem': '.machine_language.cablecast_schemas',
+    'Format': '.machine_language.cablecast_schemas',
+    'Media': '.machine_language.cablecast_schemas',
+    'CablecastEndpoints': '.machine_language.cablecast_constants',
+    'CablecastStreamStates': '.machine_language.cablecast_constants',
+    'CablecastVODStates': '.machine_language.cablecast_constants',
+    'ChapteringSessionStates': '.machine_language.cablecast_constants',
+    'CablecastErrorTypes': '.machine_language.cablecast_constants',
+    'DeviceTypes': '.machine_language.cablecast_constants',
+    'DeviceStates': '.machine_language.cablecast_constants',
+    'AssetLogMessageTypes': '.machine_language.cablecast_constants',
+    'PublicSiteParameters': '.machine_language.cablecast_constants',
+    'CablecastResponseDecoder': '.machine_language.response_decoder',
+    'LazyModelList': '.machine_language.response_decoder',
+    'create_google_calendar_event': '.google_calendar',
+    'AJACablecastIntegrator': '.aja_cablecast_integrate',
+    'EventPreflight': '.event_preflight',
+    'PreflightResult': '.event_preflight'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     'DateScraper',
@@ -43,6 +53,10 @@ __all__ = [
     'DeviceStates',
     'AssetLogMessageTypes',
     'PublicSiteParameters',
+    'CablecastResponseDecoder',
+    'LazyModelList',
     'create_google_calendar_event',
-    'AJACablecastIntegrator'
+    'AJACablecastIntegrator',
+    'EventPreflight',
+    'PreflightResult'
 ]
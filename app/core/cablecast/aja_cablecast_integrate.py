@@ -1,8 +1,10 @@
+import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 from app.core import DateScraper, MeetingInfo, ScheduledEvent, ScheduledAction, SchedulingAssistant
-from app.core import HeloParameters, recall_preset, set_recording_name, start_recording, stop_recording
+from app.core import HeloParameters
+from app.core.cablecast.event_preflight import EventPreflight, PreflightResult
 from flask_caching import Cache
 
 
@@ -11,12 +13,14 @@ logger = logging.getLogger(__name__)
 class AJACablecastIntegrator:
     """Integrates AJA HELO encoders with Cablecast scheduling and city meeting sources"""
     
-    def __init__(self, cache: Cache):
+    def __init__(self, cache: Cache, preflight_minutes: int = 10, preflight: Optional[EventPreflight] = None):
         self.cache = cache
         self.date_scraper = DateScraper(cache)
         self.helo_params = HeloParameters()
         self.scheduling_assistant = SchedulingAssistant(self.helo_params)
         self.encoder_assignments: Dict[str, str] = {}  # Maps city names to encoder IDs
+        self.preflight = preflight or EventPreflight(lead_time=preflight_minutes * 60)
+        self._started: Set[str] = set()  # IDs of events currently recording
         
     def assign_encoder(self, city_name: str, encoder_id: str):
         """Assign an encoder to a specific city"""
@@ -25,16 +29,14 @@ class AJACablecastIntegrator:
     def sync_city_meetings(self, city_name: str) -> List[ScheduledEvent]:
         """Sync meetings from a city source to the scheduling system"""
         try:
-            # Get meetings from city website
-            meetings = self.date_scraper.fetch_meetings(city_name)
+            # Get every current meeting from the city website, not just changed ones: after a
+            # restart the assistant is empty while the scraper's cache still remembers what it
+            # emitted, and add_events dedupes by ID
+            meetings = self.date_scraper.fetch_meetings(city_name, changed_only=False)
             
             # Convert meetings to scheduled events
-            events = []
-            for meeting in meetings:
-                event = self._convert_meeting_to_event(meeting, city_name)
-                if event:
-                    self.scheduling_assistant.add_event(event)
-                    events.append(event)
+            converted = (self._convert_meeting_to_event(meeting, city_name) for meeting in meetings)
+            events = self.scheduling_assistant.add_events(e for e in converted if e)
                     
             logger.info(f"Synced {len(events)} events for {city_name}")
             return events
@@ -62,81 +64,87 @@ class AJACablecastIntegrator:
                 end_time=end_time,
                 action=ScheduledAction.RECORD_AND_STREAM,
                 title=meeting.title,
-                description=meeting.description
+                description=meeting.description,
+                encoder_id=self.encoder_assignments.get(city_name)
             )
             
         except Exception as e:
             logger.error(f"Failed to convert meeting to event: {str(e)}")
             return None
             
-    def prepare_encoder(self, encoder_id: str, event: ScheduledEvent):
-        """Prepare encoder for an upcoming recording"""
-        try:
-            device_url = f"http://{encoder_id}"  # Assuming IP-based URL
-            
-            # Set recording filename
-            meeting_date = event.start_time.strftime("%Y%m%d")
-            filename = f"{event.title}_{meeting_date}"
-            set_recording_name(device_url, filename)
-            
-            # Recall appropriate preset (assuming preset 1 for meetings)
-            recall_preset(device_url, 1)
-            
+    async def prepare_encoder(self, encoder_id: str, event: ScheduledEvent) -> PreflightResult:
+        """Prepare encoder for an upcoming recording
+
+        Warms its connections, prefetches its status, validates the profile
+        and pushes the preset and filename in one batch.
+        """
+        result = await self.preflight.prepare(encoder_id, event)
+        if result.ready:
             logger.info(f"Prepared encoder {encoder_id} for event: {event.title}")
-            
-        except Exception as e:
-            logger.error(f"Failed to prepare encoder {encoder_id}: {str(e)}")
-            
-    def start_scheduled_recording(self, encoder_id: str, event: ScheduledEvent):
+        return result
+
+    async def start_scheduled_recording(self, encoder_id: str, event: ScheduledEvent):
         """Start a scheduled recording on an encoder"""
         try:
-            device_url = f"http://{encoder_id}"
-            start_recording(device_url)
-            logger.info(f"Started recording for event: {event.title} on encoder {encoder_id}")
-            
+            elapsed = await self.preflight.start(encoder_id, event)
+            if elapsed is not None:
+                self._started.add(event.id)
+                logger.info(f"Started recording for event: {event.title} on encoder {encoder_id}")
+
         except Exception as e:
             logger.error(f"Failed to start recording on encoder {encoder_id}: {str(e)}")
-            
-    def stop_scheduled_recording(self, encoder_id: str, event: ScheduledEvent):
+
+    async def stop_scheduled_recording(self, encoder_id: str, event: ScheduledEvent):
         """Stop a scheduled recording on an encoder"""
         try:
-            device_url = f"http://{encoder_id}"
-            stop_recording(device_url)
+            await self.preflight.stop(encoder_id, event)
+            self._started.discard(event.id)
             logger.info(f"Stopped recording for event: {event.title} on encoder {encoder_id}")
-            
+
         except Exception as e:
             logger.error(f"Failed to stop recording on encoder {encoder_id}: {str(e)}")
-            
-    def monitor_upcoming_events(self):
-        """Monitor and handle upcoming scheduled events"""
+
+    def _encoder_for(self, event: ScheduledEvent) -> Optional[str]:
+        if event.encoder_id:
+            return event.encoder_id
+        # City name is the event ID prefix
+        city_name = event.id.split('_')[0]
+        encoder_id = self.encoder_assignments.get(city_name)
+        if not encoder_id:
+            logger.warning(f"No encoder assigned for {city_name}")
+        return encoder_id
+
+    async def monitor_upcoming_events(self):
+        """Monitor and handle upcoming scheduled events
+
+        Encoders are prepared ``preflight_minutes`` before their event so
+        the start itself is a single command over a warm connection.
+        """
         try:
-            # Get events in next hour
-            upcoming = self.scheduling_assistant.get_upcoming_events(hours=1)
-            
-            for event in upcoming:
-                # Extract city name from event ID
-                city_name = event.id.split('_')[0]
-                
-                # Get assigned encoder
-                encoder_id = self.encoder_assignments.get(city_name)
+            now = datetime.now()
+            lead = timedelta(seconds=self.preflight.lead_time)
+            active = self.scheduling_assistant.get_active_events(now, now + lead)
+            # Events that ended since the last pass still have to be stopped
+            active += [e for e in map(self.scheduling_assistant.get_event, self._started)
+                       if e is not None and e.end_time <= now]
+
+            await self.preflight.prepare_due(active, self._encoder_for, now)
+
+            # Encoders are started together so one slow device does not delay the rest
+            actions = []
+            for event in active:
+                encoder_id = self._encoder_for(event)
                 if not encoder_id:
-                    logger.warning(f"No encoder assigned for {city_name}")
                     continue
-                    
-                # Calculate time until event
-                time_until = event.start_time - datetime.now()
-                
-                # Prepare encoder 10 minutes before
-                if timedelta(minutes=0) <= time_until <= timedelta(minutes=10):
-                    self.prepare_encoder(encoder_id, event)
-                    
+
                 # Start recording at start time
-                if timedelta(minutes=0) <= time_until <= timedelta(minutes=1):
-                    self.start_scheduled_recording(encoder_id, event)
-                    
+                if event.id not in self._started and event.start_time <= now < event.end_time:
+                    actions.append(self.start_scheduled_recording(encoder_id, event))
+
                 # Stop recording at end time
-                if event.end_time <= datetime.now():
-                    self.stop_scheduled_recording(encoder_id, event)
-                    
+                elif event.id in self._started and event.end_time <= now:
+                    actions.append(self.stop_scheduled_recording(encoder_id, event))
+            await asyncio.gather(*actions)
+
         except Exception as e:
             logger.error(f"Error monitoring upcoming events: {str(e)}")
@@ -0,0 +1,300 @@
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from urllib.parse import quote
+from prometheus_client import Counter, Gauge, Histogram
+from app.core.aja.aja_constants import AJAParameters, ReplicatorCommands
+from app.core.aja.aja_helo_parameter_service import AJAParameterManager
+from app.core.aja.device_state_cache import DeviceStateCache, get_device_state_cache
+from app.core.aja.session_registry import HeloSessionRegistry, get_session_registry
+from app.core.cablecast.scheduling.scheduling_assistant import ScheduledAction, ScheduledEvent
+from app.core.rest_API_client import AJADevice
+
+logger = logging.getLogger(__name__)
+
+PRESET_RECALL_PARAM = "eParamID_RegisterRecall"
+FILENAME_PREFIX_PARAM = "eParamID_FilenamePrefix"
+# Cache key the prefetched replicator status is stored under
+STATUS_ENDPOINT = "/status/system"
+# A real HELO read, so warming the sockets also checks the device answers
+WARMUP_PATH = "/config?action=get&paramid=eParamID_ReplicatorRecordState"
+
+START_COMMANDS: Dict[ScheduledAction, Tuple[ReplicatorCommands, ...]] = {
+    ScheduledAction.RECORD: (ReplicatorCommands.START_RECORDING,),
+    ScheduledAction.STREAM: (ReplicatorCommands.START_STREAMING,),
+    ScheduledAction.RECORD_AND_STREAM: (ReplicatorCommands.START_RECORDING, ReplicatorCommands.START_STREAMING),
+}
+STOP_COMMANDS: Dict[ScheduledAction, Tuple[ReplicatorCommands, ...]] = {
+    ScheduledAction.RECORD: (ReplicatorCommands.STOP_RECORDING,),
+    ScheduledAction.STREAM: (ReplicatorCommands.STOP_STREAMING,),
+    ScheduledAction.RECORD_AND_STREAM: (ReplicatorCommands.STOP_STREAMING, ReplicatorCommands.STOP_RECORDING),
+}
+
+class EventPreflightMetrics:
+    """Metrics for schedule-driven encoder preparation"""
+    preflight_duration = Histogram('helo_preflight_duration_seconds', 'Time to prepare an encoder for an event')
+    preflight_results = Counter('helo_preflight_total', 'Pre-flight runs by outcome', ['result'])
+    ready_encoders = Gauge('helo_preflight_ready_encoders', 'Encoders prepared and waiting for their event')
+    start_to_first_frame = Histogram('helo_start_to_first_frame_seconds',
+                                     'Time from the start command until the encoder reports it is live',
+                                     ['action'],
+                                     buckets=(0.1, 0.25, 0.5, 0.75, 1, 1.5, 2.5, 5, 10, 30))
+    late_starts = Counter('helo_scheduled_start_late_total',
+                          'Scheduled starts that found the encoder not prepared', ['action'])
+
+@dataclass
+class PreflightResult:
+    event_id: str
+    encoder_id: str
+    ready: bool = False
+    errors: Dict[str, str] = field(default_factory=dict)
+    status: Optional[Dict[str, Any]] = None
+    prepared_at: Optional[float] = None
+    duration: float = 0.0
+
+class EventPreflight:
+    """Prepares encoders ahead of SchedulingAssistant events.
+
+    ``lead_time`` before an event starts, the encoder's keep-alive sockets
+    are opened (through the HeloWarmupManager when one is given), its
+    status is prefetched into the DeviceStateCache, the target profile is
+    validated locally and the preset recall, profile values and recording
+    filename are pushed as one ordered ``AJADevice.set_params`` batch. At
+    start time only the replicator command is left to send, over a socket
+    that is already open. The time from that command until the device
+    reports it is recording or streaming is recorded as
+    ``helo_start_to_first_frame_seconds``.
+    """
+
+    def __init__(self,
+                 lead_time: float = 600,
+                 preset: int = 1,
+                 profile: Optional[Mapping[str, Any]] = None,
+                 warmup_manager=None,
+                 registry: Optional[HeloSessionRegistry] = None,
+                 state_cache: Optional[DeviceStateCache] = None,
+                 param_manager: Optional[AJAParameterManager] = None,
+                 warm_connections: int = 2,
+                 first_frame_timeout: float = 10.0,
+                 poll_interval: float = 0.05,
+                 device_factory: Optional[Callable[[str], AJADevice]] = None):
+        """
+        Args:
+            lead_time: Seconds before an event start to prepare its encoder
+            preset: Register recalled on the encoder before the event
+            profile: eParamID_* values applied after the preset, validated before anything is sent
+            warmup_manager: Optional HeloWarmupManager that keeps the sockets warm until the event
+            registry: Session registry holding the sockets, defaults to the shared one
+            state_cache: Cache the prefetched status is stored in, defaults to the shared one
+            param_manager: Validator for the profile
+            warm_connections: Sockets opened when no warmup manager is given
+            first_frame_timeout: Seconds to wait for the device to report it is live after a start
+            poll_interval: Seconds between status reads while waiting for the first frame
+            device_factory: Builds the AJADevice for an encoder ID, defaults to ``http://{encoder_id}``
+        """
+        self.lead_time = lead_time
+        self.preset = preset
+        self.profile = dict(profile or {})
+        self.warmup_manager = warmup_manager
+        self.registry = registry or (warmup_manager.registry if warmup_manager else get_session_registry())
+        self.state_cache = state_cache or get_device_state_cache()
+        self.param_manager = param_manager or AJAParameterManager()
+        self.warm_connections = warm_connections
+        self.first_frame_timeout = first_frame_timeout
+        self.poll_interval = poll_interval
+        self.device_factory = device_factory or (lambda encoder_id: AJADevice(f"http://{encoder_id}", registry=self.registry))
+        self.metrics = EventPreflightMetrics()
+
+        self._devices: Dict[str, AJADevice] = {}
+        self._results: Dict[str, PreflightResult] = {}  # event_id -> latest pre-flight
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def device(self, encoder_id: str) -> AJADevice:
+        device = self._devices.get(encoder_id)
+        if device is None:
+            device = self._devices[encoder_id] = self.device_factory(encoder_id)
+        return device
+
+    @staticmethod
+    def recording_filename(event: ScheduledEvent) -> str:
+        """Filename prefix for an event, limited to characters the HELO accepts"""
+        name = re.sub(r'[^A-Za-z0-9_-]+', '_', event.title).strip('_')
+        return f"{name}_{event.start_time.strftime('%Y%m%d')}"
+
+    def build_writes(self, event: ScheduledEvent,
+                     profile: Optional[Mapping[str, Any]] = None) -> List[Tuple[str, Any]]:
+        """Ordered writes that leave the encoder configured for an event
+
+        The preset goes first since recalling it overwrites the current
+        configuration; profile values and the filename are applied on top.
+        """
+        writes: List[Tuple[str, Any]] = [(PRESET_RECALL_PARAM, self.preset)]
+        writes.extend((self.profile if profile is None else profile).items())
+        writes.append((FILENAME_PREFIX_PARAM, quote(self.recording_filename(event))))
+        return writes
+
+    def is_ready(self, event_id: str) -> bool:
+        result = self._results.get(event_id)
+        return result is not None and result.ready
+
+    def result(self, event_id: str) -> Optional[PreflightResult]:
+        return self._results.get(event_id)
+
+    def _set_ready(self, event_id: str, result: Optional[PreflightResult]):
+        if result is None:
+            self._results.pop(event_id, None)
+        else:
+            self._results[event_id] = result
+        self.metrics.ready_encoders.set(sum(1 for r in self._results.values() if r.ready))
+
+    async def _warm(self, encoder_id: str, device: AJADevice, event: ScheduledEvent) -> int:
+        if self.warmup_manager is not None:
+            await self.warmup_manager.start_warmup(encoder_id, host=device.host)
+            await self.warmup_manager.schedule_warmup(encoder_id, event.start_time)
+            return self.warmup_manager.warm_connection_count(encoder_id)
+        return await self.registry.prewarm(device.host, self.warm_connections, WARMUP_PATH)
+
+    async def _fetch_status(self, encoder_id: str, device: AJADevice, fresh: bool = False) -> Dict[str, Any]:
+        if fresh:
+            self.state_cache.invalidate(encoder_id, STATUS_ENDPOINT)
+        return await self.state_cache.get(encoder_id, STATUS_ENDPOINT, device.get_status_async)
+
+    async def prepare(self, encoder_id: str, event: ScheduledEvent,
+                      profile: Optional[Mapping[str, Any]] = None) -> PreflightResult:
+        """
+        Run the pre-flight for one event, joining a run already in progress.
+
+        Args:
+            encoder_id: Encoder assigned to the event
+            event: The upcoming event
+            profile: Overrides the default profile for this event
+
+        Returns:
+            PreflightResult with ``ready`` set when the encoder can be started with a single command
+        """
+        pending = self._inflight.get(event.id)
+        if pending is None:
+            pending = self._inflight[event.id] = asyncio.ensure_future(self._prepare(encoder_id, event, profile))
+            pending.add_done_callback(lambda _: self._inflight.pop(event.id, None))
+        return await asyncio.shield(pending)
+
+    async def _prepare(self, encoder_id: str, event: ScheduledEvent,
+                       profile: Optional[Mapping[str, Any]]) -> PreflightResult:
+        started = time.perf_counter()
+        result = PreflightResult(event.id, encoder_id)
+        device = self.device(encoder_id)
+        writes = self.build_writes(event, profile)
+
+        # Validate locally before touching the device
+        result.errors = self.param_manager.validate_many(dict(writes))
+        if not result.errors:
+            try:
+                warm, status = await asyncio.gather(self._warm(encoder_id, device, event),
+                                                    self._fetch_status(encoder_id, device, fresh=True))
+                result.status = status
+                if not status.get('online'):
+                    result.errors['status'] = 'encoder offline'
+                elif status.get('recording') or status.get('streaming'):
+                    result.errors['status'] = 'encoder is already live'
+                elif not warm:
+                    logger.warning(f"No warm connections to {encoder_id} for event {event.id}")
+            except Exception as e:
+                result.errors['status'] = str(e) or type(e).__name__
+
+        if not result.errors:
+            for write in await device.set_params(writes):
+                if not write['success']:
+                    result.errors[write['paramid']] = write['error']
+
+        result.ready = not result.errors
+        result.duration = time.perf_counter() - started
+        result.prepared_at = time.time() if result.ready else None
+        self.metrics.preflight_duration.observe(result.duration)
+        self.metrics.preflight_results.labels('ready' if result.ready else 'failed').inc()
+        self._set_ready(event.id, result)
+
+        if result.ready:
+            logger.info(f"Encoder {encoder_id} ready for event {event.id} ({event.title}) in {result.duration:.2f}s")
+        else:
+            logger.error(f"Pre-flight for event {event.id} on {encoder_id} failed: {result.errors}")
+        return result
+
+    async def prepare_due(self, events: Iterable[ScheduledEvent],
+                          resolve_encoder: Callable[[ScheduledEvent], Optional[str]],
+                          now: Optional[datetime] = None) -> List[PreflightResult]:
+        """
+        Prepare every event that is inside its lead time and not yet prepared.
+
+        Args:
+            events: Candidate events, e.g. ``SchedulingAssistant.get_upcoming_events()``
+            resolve_encoder: Maps an event to its encoder ID, or None to skip it
+            now: Current time, for testing
+
+        Returns:
+            Results of the pre-flights started by this call
+        """
+        now = now or datetime.now()
+        lead = timedelta(seconds=self.lead_time)
+        due = []
+        for event in events:
+            if not event.start_time - lead <= now < event.start_time or self.is_ready(event.id):
+                continue
+            encoder_id = resolve_encoder(event)
+            if encoder_id:
+                due.append(self.prepare(encoder_id, event))
+        return list(await asyncio.gather(*due)) if due else []
+
+    async def _send_commands(self, device: AJADevice, commands: Tuple[ReplicatorCommands, ...]) -> List[Dict[str, Any]]:
+        return await device.set_params([(AJAParameters.REPLICATOR_COMMAND, c.value) for c in commands])
+
+    async def start(self, encoder_id: str, event: ScheduledEvent) -> Optional[float]:
+        """
+        Start an event and wait for the encoder to go live.
+
+        An encoder that was not prepared is prepared first; that run is counted
+        in ``helo_scheduled_start_late_total``.
+
+        Returns:
+            Seconds from the start command until the device reported it is live,
+            or None if it failed to start within ``first_frame_timeout``
+        """
+        action = event.action.value
+        if not self.is_ready(event.id):
+            self.metrics.late_starts.labels(action).inc()
+            if not (await self.prepare(encoder_id, event)).ready:
+                return None
+
+        device = self.device(encoder_id)
+        sent = time.perf_counter()
+        results = await self._send_commands(device, START_COMMANDS[event.action])
+        self._set_ready(event.id, None)
+        if not all(r['success'] for r in results):
+            logger.error(f"Failed to start event {event.id} on {encoder_id}: {results}")
+            return None
+
+        want_recording = ReplicatorCommands.START_RECORDING in START_COMMANDS[event.action]
+        want_streaming = ReplicatorCommands.START_STREAMING in START_COMMANDS[event.action]
+        deadline = sent + self.first_frame_timeout
+        while True:
+            status = await self._fetch_status(encoder_id, device, fresh=True)
+            if ((not want_recording or status.get('recording')) and
+                    (not want_streaming or status.get('streaming'))):
+                elapsed = time.perf_counter() - sent
+                self.metrics.start_to_first_frame.labels(action).observe(elapsed)
+                logger.info(f"Event {event.id} live on {encoder_id} {elapsed * 1000:.0f} ms after start")
+                return elapsed
+            if time.perf_counter() >= deadline:
+                logger.error(f"Encoder {encoder_id} not live {self.first_frame_timeout}s after starting event {event.id}")
+                return None
+            await asyncio.sleep(self.poll_interval)
+
+    async def stop(self, encoder_id: str, event: ScheduledEvent) -> bool:
+        """Stop an event's recording/streaming; returns True if every command was accepted"""
+        results = await self._send_commands(self.device(encoder_id), STOP_COMMANDS[event.action])
+        self.state_cache.invalidate(encoder_id, STATUS_ENDPOINT)
+        self._set_ready(event.id, None)
+        return all(r['success'] for r in results)
@@ -1,15 +1,25 @@
-from .cablecast_schemas import Show, ScheduleItem, Format, Media
-from .cablecast_constants import (
-    CablecastEndpoints,
-    CablecastStreamStates,
-    CablecastVODStates,
-    ChapteringSessionStates,
-    CablecastErrorTypes,
-    DeviceTypes,
-    DeviceStates,
-    AssetLogMessageTypes,
-    PublicSiteParameters
-)
+from app.core.lazy_loader import lazy_exports
+
+# Exported names are imported from their submodule on first access
+_EXPORTS = {
+    'Show': '.cablecast_schemas',
+    'ScheduleItem': '.cablecast_schemas',
+    'Format': '.cablecast_schemas',
+    'Media': '.cablecast_schemas',
+    'CablecastEndpoints': '.cablecast_constants',
+    'CablecastStreamStates': '.cablecast_constants',
+    'CablecastVODStates': '.cablecast_constants',
+    'ChapteringSessionStates': '.cablecast_constants',
+    'CablecastErrorTypes': '.cablecast_constants',
+    'DeviceTypes': '.cablecast_constants',
+    'DeviceStates': '.cablecast_constants',
+    'AssetLogMessageTypes': '.cablecast_constants',
+    'PublicSiteParameters': '.cablecast_constants',
+    'CablecastResponseDecoder': '.response_decoder',
+    'LazyModelList': '.response_decoder'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     'Show',
@@ -24,5 +34,7 @@ __all__ = [
     'DeviceTypes',
     'DeviceStates',
     'AssetLogMessageTypes',
-    'PublicSiteParameters'
+    'PublicSiteParameters',
+    'CablecastResponseDecoder',
+    'LazyModelList'
 ]
@@ -225,7 +225,6 @@ class CablecastEndpoints(Enum):
     FILE_UPLOAD_UPLOAD = "/v1/fileuploads/{id}/upload"
     
     # Manual Event Endpoints
-    MANUAL_EVENTS = "/v1/manualevents"
     MANUAL_EVENT_BY_ID = "/v1/manualevents/{id}"
     MANUAL_EVENTS_BATCH = "/v1/manualevents/batch"
     MANUAL_EVENTS_FILTERED = "/v1/manualevents?start={start}&end={end}&channel={channel}"
@@ -380,7 +379,7 @@ class CablecastEndpoints(Enum):
     ID_TYPE = "idType"
     MANUAL_EVENT = "manualEvent"
     RUN_STATUS = "runStatus"
-    RECORD_EVENTS = "recordEvents"
+    RECORD_EVENT_IDS = "recordEvents"
     FILLER = "filler"
     SCHEDULE_RULE = "scheduleRule"
     
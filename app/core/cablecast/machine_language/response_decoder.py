@@ -0,0 +1,337 @@
+import codecs
+import json
+import logging
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import (Any, AsyncIterable, AsyncIterator, Callable, Dict, FrozenSet, Iterable, List, Optional,
+                    Tuple, Type, TypeVar, Union, get_args, get_origin)
+from prometheus_client import Counter
+from pydantic import BaseModel
+from .cablecast_constants import CablecastEndpoints
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar('ModelT', bound=BaseModel)
+
+# Endpoints whose payloads come straight from Cablecast's own serializers and
+# always match the schema, so they are decoded without pydantic validation
+TRUSTED_ENDPOINTS: FrozenSet[CablecastEndpoints] = frozenset({
+    CablecastEndpoints.SCHEDULE_ITEMS,
+    CablecastEndpoints.SCHEDULE_ITEMS_BATCH,
+    CablecastEndpoints.ASSET_LOGS,
+    CablecastEndpoints.VOD_TRANSACTIONS,
+    CablecastEndpoints.SHOWS,
+})
+
+_new = object.__new__
+_set = object.__setattr__
+_WHITESPACE = ' \t\n\r'
+
+class ResponseDecoderMetrics:
+    """Cablecast response decoding metrics"""
+    decoded = Counter('cablecast_decoded_models_total', 'Cablecast models decoded', ['path'])
+
+def _parse_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    return datetime.fromisoformat(value)
+
+def _converter(annotation: Any) -> Optional[Callable[[Any], Any]]:
+    """Converter turning a JSON value into the field's Python value, or None when it is used as is"""
+    if annotation is datetime:
+        return _parse_datetime
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return model_plan(annotation).build
+
+    origin, args = get_origin(annotation), get_args(annotation)
+    if origin is Union:
+        members = [arg for arg in args if arg is not type(None)]
+        inner = _converter(members[0]) if len(members) == 1 else None
+        if inner is None:
+            return None
+        return lambda value: None if value is None else inner(value)
+    if origin in (list, List) and args:
+        inner = _converter(args[0])
+        if inner is None:
+            return None
+        return lambda values: [inner(value) for value in values]
+    return None
+
+class ModelPlan:
+    """Field converters for one model, compiled once and reused for every item
+
+    ``build`` fills the instance ``__dict__`` directly, the same end state
+    as ``model_construct`` without its per-field bookkeeping, which in
+    pydantic 2 is slower than validating. When the payload has exactly the
+    model's fields, the payload dict itself becomes the ``__dict__``, so it
+    must not be reused by the caller.
+    """
+
+    def __init__(self, model: Type[BaseModel]):
+        self.model = model
+        self.fields: List[Tuple[str, str, bool]] = []
+        self.defaults: Dict[str, Any] = {}
+        self.converters: List[Tuple[str, Callable[[Any], Any]]] = []
+        for name, info in model.model_fields.items():
+            required = info.is_required()
+            if not required:
+                self.defaults[name] = info.get_default(call_default_factory=True)
+            self.fields.append((name, info.alias or name, required))
+            convert = _converter(info.annotation)
+            if convert is not None:
+                self.converters.append((name, convert))
+        # Payload keys when every field is present under its own name, the common case
+        self.keys = frozenset(key for _, key, _ in self.fields)
+        self.names = frozenset(name for name, _, _ in self.fields)
+        if self.keys != self.names:
+            self.keys = None
+
+    def _collect(self, data: Dict[str, Any]) -> Tuple[Dict[str, Any], set]:
+        values = {}
+        fields_set = set()
+        for name, key, required in self.fields:
+            if key in data:
+                values[name] = data[key]
+                fields_set.add(name)
+            elif required:
+                raise KeyError(key)
+            else:
+                values[name] = self.defaults[name]
+        return values, fields_set
+
+    def build(self, data: Dict[str, Any]) -> BaseModel:
+        """Construct the model from trusted data, raising KeyError/ValueError if it does not fit"""
+        if data.keys() == self.keys:
+            values, fields_set = data, set(self.names)
+        else:
+            values, fields_set = self._collect(data)
+        for name, convert in self.converters:
+            values[name] = convert(values[name])
+        instance = _new(self.model)
+        _set(instance, '__dict__', values)
+        _set(instance, '__pydantic_fields_set__', fields_set)
+        _set(instance, '__pydantic_extra__', None)
+        _set(instance, '__pydantic_private__', None)
+        return instance
+
+@lru_cache(maxsize=None)
+def model_plan(model: Type[BaseModel]) -> ModelPlan:
+    """Shared, lazily compiled ModelPlan for a schema model"""
+    return ModelPlan(model)
+
+class LazyModelList(Sequence):
+    """Sequence of models built from their raw dicts the first time each is accessed"""
+
+    def __init__(self, items: List[Dict[str, Any]], build: Callable[[Dict[str, Any]], BaseModel]):
+        self._items = items
+        self._build = build
+        self._models: List[Optional[BaseModel]] = [None] * len(items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        model = self._models[index]
+        if model is None:
+            model = self._models[index] = self._build(self._items[index])
+        return model
+
+    def raw(self, index: int) -> Dict[str, Any]:
+        """The item as received, for filtering without building the model; treat it as read-only"""
+        return self._items[index]
+
+    @property
+    def materialised(self) -> int:
+        return len(self._models) - self._models.count(None)
+
+class CablecastResponseDecoder:
+    """Turns Cablecast JSON payloads into schema models
+
+    Responses from trusted endpoints skip pydantic validation and are built
+    from a compiled ModelPlan; an item that does not fit the plan falls back
+    to ``model_validate`` so malformed data still raises ValidationError.
+    Everything else is validated as before. Decoded payloads are owned by
+    the returned models and must not be modified afterwards.
+    """
+
+    def __init__(self, trusted_endpoints: Iterable[CablecastEndpoints] = TRUSTED_ENDPOINTS,
+                 lazy_threshold: int = 500):
+        """
+        Args:
+            trusted_endpoints: Endpoints decoded without validation
+            lazy_threshold: Collections at least this long are returned as a LazyModelList
+        """
+        self.trusted_endpoints = frozenset(trusted_endpoints)
+        self.lazy_threshold = lazy_threshold
+        self.metrics = ResponseDecoderMetrics()
+
+    def is_trusted(self, endpoint: Optional[CablecastEndpoints]) -> bool:
+        return endpoint in self.trusted_endpoints
+
+    def _fast_build(self, model: Type[ModelT]) -> Callable[[Dict[str, Any]], ModelT]:
+        plan = model_plan(model)
+        fallback = self.metrics.decoded.labels('fallback')
+
+        def build(data: Dict[str, Any]) -> ModelT:
+            try:
+                return plan.build(data)
+            except (KeyError, TypeError, ValueError) as e:
+                fallback.inc()
+                logger.debug(f"Trusted decode of {model.__name__} fell back to validation: {str(e)}")
+                return model.model_validate(data)
+        return build
+
+    def decode(self, endpoint: Optional[CablecastEndpoints], model: Type[ModelT], data: Dict[str, Any]) -> ModelT:
+        """Decode a single object
+
+        Args:
+            endpoint: Endpoint the payload came from, deciding the trusted path
+            model: Schema model to decode into
+            data: JSON object
+
+        Returns:
+            Model instance
+        """
+        if self.is_trusted(endpoint):
+            self.metrics.decoded.labels('trusted').inc()
+            return self._fast_build(model)(data)
+        self.metrics.decoded.labels('validated').inc()
+        return model.model_validate(data)
+
+    def decode_items(self, endpoint: Optional[CablecastEndpoints], model: Type[ModelT],
+                     payload: Dict[str, Any], key: str, lazy: Optional[bool] = None) -> Sequence:
+        """Decode the list under ``key`` of a collection response
+
+        Args:
+            endpoint: Endpoint the payload came from
+            model: Schema model of each item
+            payload: Collection response, e.g. ``{"meta": ..., "scheduleItems": [...]}``
+            key: Name of the item list
+            lazy: Force or disable lazy materialisation; by default long trusted lists are lazy
+
+        Returns:
+            List of models, or a LazyModelList building each item on first access
+        """
+        items = payload.get(key) or []
+        if not self.is_trusted(endpoint):
+            self.metrics.decoded.labels('validated').inc(len(items))
+            return [model.model_validate(item) for item in items]
+
+        self.metrics.decoded.labels('trusted').inc(len(items))
+        build = self._fast_build(model)
+        if lazy is None:
+            lazy = len(items) >= self.lazy_threshold
+        if lazy:
+            return LazyModelList(items, build)
+        return [build(item) for item in items]
+
+    async def iter_items(self, endpoint: Optional[CablecastEndpoints], model: Type[ModelT],
+                         chunks: AsyncIterable[bytes], key: str) -> AsyncIterator[ModelT]:
+        """Decode a collection response while it is still being received
+
+        Args:
+            endpoint: Endpoint the payload came from
+            model: Schema model of each item
+            chunks: Response body chunks
+            key: Name of the item list in the top-level object
+
+        Yields:
+            One model per item, as soon as the item has arrived
+        """
+        trusted = self.is_trusted(endpoint)
+        build = self._fast_build(model) if trusted else model.model_validate
+        counter = self.metrics.decoded.labels('trusted' if trusted else 'validated')
+        async for item in iter_json_array(chunks, key):
+            counter.inc()
+            yield build(item)
+
+class _JsonStream:
+    """Incremental reader over a chunked JSON body using the C scanner for each value"""
+
+    def __init__(self, chunks: AsyncIterable[bytes]):
+        self._chunks = chunks.__aiter__()
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    async def _fill(self) -> None:
+        if self.eof:
+            raise json.JSONDecodeError("Unexpected end of response", self.buffer, len(self.buffer))
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self.eof = True
+            self.buffer = self.buffer[self.pos:] + self._text.decode(b'', final=True)
+        else:
+            self.buffer = self.buffer[self.pos:] + self._text.decode(chunk)
+        self.pos = 0
+
+    async def char(self) -> str:
+        """Next non-whitespace character, without consuming it"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            await self._fill()
+
+    async def expect(self, token: str) -> None:
+        if await self.char() != token:
+            raise json.JSONDecodeError(f"Expecting '{token}'", self.buffer, self.pos)
+        self.pos += 1
+
+    async def value(self) -> Any:
+        """Next complete JSON value"""
+        await self.char()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            await self._fill()
+
+async def iter_json_array(chunks: AsyncIterable[bytes], key: str) -> AsyncIterator[Dict[str, Any]]:
+    """Yield the items of the array under ``key`` in a top-level JSON object as they arrive
+
+    Other top-level members are decoded and discarded; only one item is
+    held in memory at a time.
+    """
+    stream = _JsonStream(chunks)
+    await stream.expect('{')
+    if await stream.char() == '}':
+        return
+    while True:
+        name = await stream.value()
+        await stream.expect(':')
+        if name == key:
+            await stream.expect('[')
+            if await stream.char() == ']':
+                return
+            while True:
+                yield await stream.value()
+                separator = await stream.char()
+                stream.pos += 1
+                if separator == ']':
+                    return
+                if separator != ',':
+                    raise json.JSONDecodeError("Expecting ',' delimiter", stream.buffer, stream.pos - 1)
+        await stream.value()
+        separator = await stream.char()
+        stream.pos += 1
+        if separator == '}':
+            return
+        if separator != ',':
+            raise json.JSONDecodeError("Expecting ',' delimiter", stream.buffer, stream.pos - 1)
@@ -1,6 +1,17 @@
-from .date_scraper import DateScraper, MeetingInfo, MeetingSource
-from .engine_cablecast import CablecastScheduler
-from .scheduling_assistant import ScheduledEvent, SchedulingAssistant, ScheduledAction
+from app.core.lazy_loader import lazy_exports
+
+# Exported names are imported from their submodule on first access
+_EXPORTS = {
+    'DateScraper': '.date_scraper',
+    'MeetingInfo': '.date_scraper',
+    'MeetingSource': '.date_scraper',
+    'CablecastScheduler': '.engine_cablecast',
+    'ScheduledEvent': '.scheduling_assistant',
+    'SchedulingAssistant': '.scheduling_assistant',
+    'ScheduledAction': '.scheduling_assistant'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     'DateScraper',
@@ -10,4 +21,4 @@ __all__ = [
     'ScheduledEvent',
     'SchedulingAssistant',
     'ScheduledAction'
-] 
\ No newline at end of file
+]
@@ -2,8 +2,13 @@ import feedparser
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import BinaryIO, Callable, List, Dict, Iterable, Iterator, Optional, Tuple, Union
+import hashlib
+import io
 import logging
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
 import pdfplumber
@@ -11,10 +16,9 @@ from dateutil.relativedelta import relativedelta
 import re
 from dateutil import parser as date_parser
 from flask_caching import Cache
+from prometheus_client import Counter, Histogram
 from app.core.cablecast.google_calendar import create_google_calendar_event
-from app.core.cablecast.aja_cablecast_integrate import create_cablecast_event
 from app.core.cablecast.scheduling.website_db.citysite import CitySiteDB
-from app.core.cablecast import DateScraper, MeetingInfo
 
 import icalendar
 
@@ -34,51 +38,269 @@ class MeetingInfo:
     source_url: str
     source_type: MeetingSource
 
+@dataclass(frozen=True)
+class FeedSource:
+    city: str
+    url: str
+    parser: str  # 'rss', 'calendar' (HTML), 'icalendar' or 'pdf'
+
+# Feeds fetched for each source name passed to DateScraper.fetch_meetings
+FEED_SOURCES: Dict[str, Tuple[FeedSource, ...]] = {
+    "rss": (
+        FeedSource("Mahtomedi", "https://www.ci.mahtomedi.mn.us/RSSFeed.aspx?ModID=65&CID=All-0", "rss"),
+        FeedSource("White Bear Township", "https://www.ci.white-bear-township.mn.us/common/modules/iCalendar/iCalendar.aspx?catID=14&feed=calendar", "icalendar"),
+    ),
+    "calendar": (
+        FeedSource("Lake Elmo", "https://www.lakeelmo.gov/calendar_app/index.html", "calendar"),
+        FeedSource("White Bear Lake", "https://www.whitebearlake.org/meetings", "calendar"),
+    ),
+    "icalendar": (
+        FeedSource("Lake Elmo", "https://cms8.revize.com/revize/plugins/calendar/editpages/export_events.jsp?webspaceId=lakeelmomn&CAL_ID=1&timezoneid=America/Chicago", "icalendar"),
+        FeedSource("White Bear Township", "https://www.ci.white-bear-township.mn.us/common/modules/iCalendar/iCalendar.aspx?catID=14&feed=calendar", "icalendar"),
+        FeedSource("Oakdale", "https://www.oakdalemn.gov/common/modules/iCalendar/iCalendar.aspx?catID=23&feed=calendar", "icalendar"),
+    ),
+}
+
+# Parsers handed the spooled body as a file instead of bytes
+STREAMED_PARSERS = frozenset({"pdf"})
+CHUNK_SIZE = 64 * 1024
+_MEETING_DATE_RE = re.compile(r'\b\w+ \d{1,2}, \d{4} \d{1,2}:\d{2} [APap][Mm]\b')
+# Label in front of a calendar field's value, matching the words _scrape_calendar looks for
+_CALENDAR_FIELD_LABEL_RE = re.compile(
+    r'^(Date|Time|Starts|Ends|Location|Venue|Address|Details|Description|Overview|Agenda)\s*:\s*', re.I)
+
+class DateScraperMetrics:
+    """City calendar ingestion metrics"""
+    feed_fetches = Counter('calendar_feed_fetches_total', 'Calendar feed fetches by outcome', ['result'])
+    feed_fetch_duration = Histogram('calendar_feed_fetch_duration_seconds', 'Time to fetch and parse one feed')
+    meetings_emitted = Counter('calendar_meetings_emitted_total', 'New or changed meetings passed downstream')
+    pdf_pages = Counter('calendar_pdf_pages_total', 'PDF pages read, extracted or from the page text cache', ['source'])
+
 class DateScraper:
-    def __init__(self, cache: Cache):
+    """Fetches city meeting calendars and emits meetings that are new or changed.
+
+    Every feed of a source is fetched concurrently with a timeout. Each
+    feed's ETag, Last-Modified, content hash and parsed meetings are kept
+    in the flask-caching backend, so a feed answering 304, or returning
+    the same bytes as last time, is not parsed again. Meetings already
+    emitted with the same details are not passed to the sinks again.
+    """
+
+    CACHE_PREFIX = "date_scraper"
+
+    def __init__(self, cache: Cache,
+                 sinks: Optional[Iterable[Callable[[MeetingInfo], None]]] = None,
+                 timeout: float = 10.0,
+                 max_workers: int = 8,
+                 cache_timeout: int = 7 * 24 * 3600,
+                 spool_memory_limit: int = 8 * 1024 * 1024,
+                 pdf_lookahead_days: int = 400):
+        """
+        Args:
+            cache: flask-caching backend holding feed validators, parsed meetings and emitted fingerprints
+            sinks: Called with every new or changed meeting, defaults to creating a Google Calendar event
+            timeout: Seconds allowed per feed request
+            max_workers: Feeds fetched at once
+            cache_timeout: Seconds cached feeds and fingerprints are kept
+            spool_memory_limit: Bytes of a download kept in memory before spilling to a temp file
+            pdf_lookahead_days: How far ahead PDF agendas are read before stopping
+        """
         self.city_db = CitySiteDB(cache)
         self.logger = logging.getLogger(__name__)
         self.cache = cache
+        self.sinks = list(sinks) if sinks is not None else [create_google_calendar_event]
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.cache_timeout = cache_timeout
+        self.spool_memory_limit = spool_memory_limit
+        self.pdf_lookahead_days = pdf_lookahead_days
+        self.metrics = DateScraperMetrics()
+        self.session = requests.Session()
+        self._parsers: Dict[str, Callable[..., List[MeetingInfo]]] = {
+            "rss": self._parse_rss,
+            "calendar": self._scrape_calendar,
+            "icalendar": self._parse_ical,
+            "pdf": self._scrape_pdf,
+        }
 
-    def fetch_meetings(self, source_name: str) -> List[MeetingInfo]:
-        """Fetch meetings from a specific source and create Google Calendar and Cablecast events."""
-        
-        # Determine the source type and fetch meetings accordingly
-        if source_name == "rss":    
-            #Mahtomedi
-            meetings = self._parse_rss("https://www.ci.mahtomedi.mn.us/RSSFeed.aspx?ModID=65&CID=All-0")  # Mahtomedi RSS feed
-            #White Bear Township    
-            meetings = self._parse_rss("https://www.ci.white-bear-township.mn.us/common/modules/iCalendar/iCalendar.aspx?catID=14&feed=calendar")  # White Bear Township  
-        elif source_name == "calendar":
-            #Lake Elmo
-            meetings = self._scrape_calendar("https://www.lakeelmo.gov/calendar_app/index.html")  
-            #White Bear Lake
-            meetings += self._scrape_calendar("https://www.whitebearlake.org/meetings")  
-        elif source_name == "icalendar":
-            #Lake Elmo
-            meetings = self._parse_ical("https://cms8.revize.com/revize/plugins/calendar/editpages/export_events.jsp?webspaceId=lakeelmomn&CAL_ID=1&timezoneid=America/Chicago")  # Mahtomedi
-            #White Bear Township    
-            meetings = self._parse_ical("https://www.ci.white-bear-township.mn.us/common/modules/iCalendar/iCalendar.aspx?catID=14&feed=calendar")  # White Bear Township  
-            #Oakdale
-            meetings += self._parse_ical("https://www.oakdalemn.gov/common/modules/iCalendar/iCalendar.aspx?catID=23&feed=calendar")  # Oakdale
-        elif source_name == "birchwood":
+    def fetch_meetings(self, source_name: str, changed_only: bool = True) -> List[MeetingInfo]:
+        """Fetch meetings from a source and pass new or changed ones to the sinks
+
+        Args:
+            source_name: Key of FEED_SOURCES, or "birchwood"
+            changed_only: Return only the meetings emitted by this call instead of every meeting
+
+        Returns:
+            Meetings emitted downstream, or all current meetings when ``changed_only`` is False
+        """
+        if source_name == "birchwood":
             meetings = self.fetch_birchwood_meetings()
+        elif source_name in FEED_SOURCES:
+            meetings = self.fetch_feeds(FEED_SOURCES[source_name])
         else:
             logger.warning(f"Unknown source name: {source_name}")
             return []
 
-        # Create Google Calendar events for each meeting
+        emitted = self._emit_changed(source_name, meetings)
+        return emitted if changed_only else meetings
+
+    def fetch_feeds(self, sources: Iterable[FeedSource]) -> List[MeetingInfo]:
+        """Fetch and parse feeds concurrently, merging and de-duplicating their meetings"""
+        sources = list(dict.fromkeys(sources))
+        if not sources:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(sources)),
+                                thread_name_prefix="calendar-feed") as executor:
+            results = list(executor.map(self._fetch_feed, sources))
+
+        meetings: Dict[Tuple[str, str], MeetingInfo] = {}
+        for feed_meetings in results:
+            for meeting in feed_meetings:
+                meetings.setdefault(self._meeting_key(meeting), meeting)
+        return list(meetings.values())
+
+    def _cache_key(self, kind: str, name: str) -> str:
+        return f"{self.CACHE_PREFIX}:{kind}:{hashlib.sha1(name.encode()).hexdigest()}"
+
+    def _spool(self, response: requests.Response) -> Tuple[BinaryIO, str]:
+        """Stream a response body into a spooled temp file, hashing it on the way
+
+        Bodies up to ``spool_memory_limit`` stay in memory, larger ones
+        (annual agenda packets) go to disk instead of one big bytes object.
+        """
+        spool = tempfile.SpooledTemporaryFile(max_size=self.spool_memory_limit)
+        digest = hashlib.sha256()
+        try:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                digest.update(chunk)
+                spool.write(chunk)
+        except BaseException:
+            spool.close()
+            raise
+        spool.seek(0)
+        return spool, digest.hexdigest()
+
+    def _fetch_feed(self, source: FeedSource) -> List[MeetingInfo]:
+        """Fetch one feed, re-parsing only when its content changed
+
+        A feed that fails is served from its last cached parse, if any.
+        """
+        started = time.perf_counter()
+        key = self._cache_key("feed", source.url)
+        entry = self.cache.get(key) or {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            with self.session.get(source.url, headers=headers, timeout=self.timeout, stream=True) as response:
+                if response.status_code == 304 and "meetings" in entry:
+                    self.metrics.feed_fetches.labels("not_modified").inc()
+                    return entry["meetings"]
+                response.raise_for_status()
+                spool, content_hash = self._spool(response)
+
+            with spool:
+                if content_hash == entry.get("hash") and "meetings" in entry:
+                    result = "unchanged"
+                    meetings = entry["meetings"]
+                else:
+                    result = "changed"
+                    if source.parser in STREAMED_PARSERS:
+                        # PDF packets are parsed straight from the spool, page by page
+                        meetings = self._parsers[source.parser](spool, source.url, content_hash)
+                    else:
+                        meetings = self._parsers[source.parser](spool.read(), source.url)
+
+            self.cache.set(key, {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "hash": content_hash,
+                "meetings": meetings,
+            }, timeout=self.cache_timeout)
+            self.metrics.feed_fetches.labels(result).inc()
+            return meetings
+        except Exception as e:
+            self.metrics.feed_fetches.labels("error").inc()
+            self.logger.error(f"Failed to fetch {source.city} calendar {source.url}: {str(e)}")
+            return entry.get("meetings", [])
+        finally:
+            self.metrics.feed_fetch_duration.observe(time.perf_counter() - started)
+
+    @staticmethod
+    def _meeting_key(meeting: MeetingInfo) -> Tuple[str, str]:
+        # The same meeting often appears in several feeds of one city
+        return (meeting.title.strip().lower(), meeting.date.isoformat())
+
+    @staticmethod
+    def _meeting_digest(meeting: MeetingInfo) -> str:
+        details = "\x1f".join(str(v) for v in (meeting.title, meeting.date.isoformat(), meeting.location,
+                                                meeting.meeting_type, meeting.description))
+        return hashlib.sha1(details.encode()).hexdigest()
+
+    @staticmethod
+    def _sink_name(index: int, sink: Callable[[MeetingInfo], None]) -> str:
+        return f"{index}:{getattr(sink, '__qualname__', type(sink).__name__)}"
+
+    def _emit_changed(self, source_name: str, meetings: List[MeetingInfo]) -> List[MeetingInfo]:
+        """Pass meetings not emitted before, or whose details changed, to the sinks
+
+        Delivery is recorded per (meeting, sink), so when a sink fails only
+        that sink is passed the meeting again on the next fetch; sinks that
+        already accepted it are not called twice.
+        """
+        key = self._cache_key("emitted", source_name)
+        emitted: Dict[str, str] = self.cache.get(key) or {}
+        sink_names = [self._sink_name(i, sink) for i, sink in enumerate(self.sinks)]
+        changed = []
+        failed = 0
+        updated = False
         for meeting in meetings:
-            create_google_calendar_event(meeting)  # Create Google Calendar event for each meeting
-            # Assuming you have a function to create Cablecast events
-            create_cablecast_event(meeting)  # Create Cablecast event for each meeting
+            fingerprint = "|".join(self._meeting_key(meeting))
+            digest = self._meeting_digest(meeting)
+            if emitted.get(fingerprint) == digest:
+                continue
+            pending = [(f"{fingerprint}|{name}", sink) for name, sink in zip(sink_names, self.sinks)
+                       if emitted.get(f"{fingerprint}|{name}") != digest]
+            delivered = self._publish(meeting, [sink for _, sink in pending])
+            for (sink_key, _), ok in zip(pending, delivered):
+                if ok:
+                    emitted[sink_key] = digest
+                    updated = True
+            if all(delivered):
+                # Every sink has this version; later fetches skip it with one lookup
+                emitted[fingerprint] = digest
+                updated = True
+                changed.append(meeting)
+            else:
+                failed += 1
 
-        return meetings
+        if updated:
+            self.cache.set(key, emitted, timeout=self.cache_timeout)
+        if changed:
+            self.metrics.meetings_emitted.inc(len(changed))
+        self.logger.info(f"{source_name}: {len(meetings)} meetings, {len(changed)} new or changed"
+                         + (f", {failed} to retry" if failed else ""))
+        return changed
 
-    def _parse_rss(self, url: str) -> List[MeetingInfo]:
+    def _publish(self, meeting: MeetingInfo, sinks: List[Callable[[MeetingInfo], None]]) -> List[bool]:
+        """Pass a meeting to each of ``sinks``, returning whether each one accepted it"""
+        delivered = []
+        for sink in sinks:
+            try:
+                sink(meeting)
+                delivered.append(True)
+            except Exception as e:
+                self.logger.error(f"Failed to publish meeting {meeting.title} on {meeting.date}: {str(e)}")
+                delivered.append(False)
+        return delivered
+
+    def _parse_rss(self, content: bytes, url: str) -> List[MeetingInfo]:
         """Parse meetings from RSS feed"""
         meetings = []
-        feed = feedparser.parse(url)
+        feed = feedparser.parse(content)
         
         for entry in feed.entries:
             try:
@@ -99,11 +321,10 @@ class DateScraper:
                 
         return meetings
 
-    def _scrape_calendar(self, url: str) -> List[MeetingInfo]:
+    def _scrape_calendar(self, content: bytes, url: str) -> List[MeetingInfo]:
         """Scrape meetings from calendar webpage"""
         meetings = []
-        response = requests.get(url)
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(content, 'html.parser')
         
         # Look for common calendar event containers
         events = soup.find_all(['div', 'article'], class_=lambda x: x and ('event' in x.lower() or 'calendar' in x.lower()))
@@ -117,13 +338,13 @@ class DateScraper:
                 desc = event.find(['div', 'p'], text=re.compile(r'Details|Description|Overview|Agenda'))
                 
                 if title and date_elem:
-                    date = self._parse_date(date_elem.text.strip())
+                    date = self._parse_date(self._field_text(date_elem))
                     meeting = MeetingInfo(
                         title=title.text.strip(),
                         date=date,
-                        location=location.text.strip() if location else None,
+                        location=self._field_text(location) if location else None,
                         meeting_type=self._extract_meeting_type(title.text.strip()),
-                        description=desc.text.strip() if desc else None,
+                        description=self._field_text(desc) if desc else None,
                         source_url=url,
                         source_type=MeetingSource.CALENDAR
                     )
@@ -134,6 +355,11 @@ class DateScraper:
                 
         return meetings
 
+    @staticmethod
+    def _field_text(element) -> str:
+        """Text of a calendar field without its leading label, such as "Location:"."""
+        return _CALENDAR_FIELD_LABEL_RE.sub("", element.text.strip(), count=1)
+
     def _extract_meeting_type(self, title: str) -> Optional[str]:
         """Extract meeting type from title"""
         common_types = ["Council", "Board", "Commission", "Committee"]
@@ -159,12 +385,12 @@ class DateScraper:
             if not source:
                 raise ValueError("Birchwood source not found in database")
                 
-            meetings = self._scrape_pdf(source.url)
+            meetings = self._fetch_feed(FeedSource("Birchwood", source.url, "pdf"))
 
             if not meetings:
                 # If no meetings were found in the PDF, generate based on regular schedule
                 # Meetings are held on 2nd Tuesday of each month at 6:45pm
-                start_date = datetime.now().replace(day=1, hour=18, minute=45)
+                start_date = datetime.now().replace(day=1, hour=18, minute=45, second=0, microsecond=0)
                 # Find second Tuesday by adding days until we hit a Tuesday (weekday 1)
                 while start_date.weekday() != 1:  # 1 = Tuesday
                     start_date += timedelta(days=1)
@@ -177,36 +403,100 @@ class DateScraper:
             self.logger.error(f"Failed to fetch Birchwood meetings: {str(e)}")
             return []
 
-    def _scrape_pdf(self, url: str) -> List[MeetingInfo]:
-        """Scrape meeting dates from a PDF document."""
+    def _pdf_page_texts(self, pdf_file: BinaryIO, content_hash: Optional[str]) -> Iterator[str]:
+        """Yield the text of each page in order, from the page cache when possible
+
+        Page text is cached by document hash and page number, so a re-run
+        over the same packet does not open the PDF at all.
+        """
+        page_count = self.cache.get(self._cache_key("pdf_pages", content_hash)) if content_hash else None
+        pdf = None
+        try:
+            index = 0
+            while page_count is None or index < page_count:
+                page_key = self._cache_key("pdf_page", f"{content_hash}:{index}") if content_hash else None
+                text = self.cache.get(page_key) if page_key else None
+                if text is None:
+                    if pdf is None:
+                        pdf = pdfplumber.open(pdf_file)
+                        page_count = len(pdf.pages)
+                        if content_hash:
+                            self.cache.set(self._cache_key("pdf_pages", content_hash), page_count,
+                                           timeout=self.cache_timeout)
+                        if index >= page_count:
+                            break
+                    page = pdf.pages[index]
+                    text = page.extract_text() or ""
+                    # Drop the page's parsed layout before moving on
+                    page.close()
+                    if page_key:
+                        self.cache.set(page_key, text, timeout=self.cache_timeout)
+                    self.metrics.pdf_pages.labels("extracted").inc()
+                else:
+                    self.metrics.pdf_pages.labels("cached").inc()
+                yield text
+                index += 1
+        finally:
+            if pdf is not None:
+                pdf.close()
+
+    def _scrape_pdf(self, content: Union[bytes, BinaryIO], url: str, content_hash: Optional[str] = None,
+                    since: Optional[datetime] = None, until: Optional[datetime] = None) -> List[MeetingInfo]:
+        """Scrape meeting dates from a PDF document.
+
+        Pages are read in order and reading stops at the first page that
+        lists a meeting after ``until``; agenda packets are chronological,
+        so the rest of the document is outside the range of interest.
+
+        Args:
+            content: PDF bytes or a seekable binary file
+            url: Source URL recorded on each meeting
+            content_hash: Document hash used to cache page text
+            since: Earliest meeting kept, defaults to the start of today
+            until: Latest meeting kept, defaults to ``pdf_lookahead_days`` from now
+        """
+        if isinstance(content, (bytes, bytearray)):
+            content_hash = content_hash or hashlib.sha256(content).hexdigest()
+            content = io.BytesIO(content)
+        now = datetime.now()
+        since = since or now.replace(hour=0, minute=0, second=0, microsecond=0)
+        until = until or now + timedelta(days=self.pdf_lookahead_days)
+
         meetings = []
-        response = requests.get(url)
-        with pdfplumber.open(response.content) as pdf:
-            for page in pdf.pages:
-                text = page.extract_text()
-                # Implement logic to parse dates from text
+        pages = self._pdf_page_texts(content, content_hash)
+        try:
+            for text in pages:
+                past_range = False
                 for line in text.split('\n'):
-                    if "meeting" in line.lower():
-                        # Extract date and time from the line
-                        date_str = self._extract_date_from_text(line)
-                        if date_str:
-                            date = date_parser.parse(date_str)
-                            meeting = MeetingInfo(
-                                title="Birchwood Meeting",
-                                date=date,
-                                location="Birchwood City Hall",
-                                meeting_type="Council",
-                                description="Monthly council meeting",
-                                source_url=url,
-                                source_type=MeetingSource.CALENDAR
-                            )
-                            meetings.append(meeting)
+                    if "meeting" not in line.lower():
+                        continue
+                    # Extract date and time from the line
+                    date_str = self._extract_date_from_text(line)
+                    if not date_str:
+                        continue
+                    date = date_parser.parse(date_str)
+                    if date > until:
+                        past_range = True
+                    elif date >= since:
+                        meetings.append(MeetingInfo(
+                            title="Birchwood Meeting",
+                            date=date,
+                            location="Birchwood City Hall",
+                            meeting_type="Council",
+                            description="Monthly council meeting",
+                            source_url=url,
+                            source_type=MeetingSource.CALENDAR
+                        ))
+                if past_range:
+                    break
+        finally:
+            pages.close()
         return meetings
 
     def _extract_date_from_text(self, text: str) -> str:
         """Extract date string from text."""
         # Use regex to match date patterns
-        match = re.search(r'\b\w+ \d{1,2}, \d{4} \d{1,2}:\d{2} [APap][Mm]\b', text)
+        match = _MEETING_DATE_RE.search(text)
         return match.group(0) if match else None
 
     def _generate_regular_meetings(self, start_date: datetime, months: int, source_url: str) -> List[MeetingInfo]:
@@ -226,11 +516,10 @@ class DateScraper:
             meetings.append(meeting)
         return meetings
 
-    def _parse_ical(self, url: str) -> List[MeetingInfo]:
+    def _parse_ical(self, content: bytes, url: str) -> List[MeetingInfo]:
         """Parse meetings from an iCalendar file."""
         meetings = []
-        response = requests.get(url)
-        cal = icalendar.Calendar.from_ical(response.content)
+        cal = icalendar.Calendar.from_ical(content)
 
         for component in cal.walk():
             if component.name == "VEVENT":
@@ -1,90 +1,291 @@
-from datetime import datetime, timedelta
-from typing import List, Optional
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from prometheus_client import Counter, Histogram
 from app.core.cablecast import Show, ScheduleItem, Format, Media
-from app.core.cablecast.machine_language.cablecast_constants import (
-    MEDIA_NAME, FORMAT_LOCATION, RUN_DATE_TIME, RUN_BUMP, RUN_LOCK,
-    BUG_TEXT, CRAWL_TEXT, CG_EXEMPT, RUN_STATUS
-)
+from app.core.cablecast.machine_language.cablecast_constants import CablecastEndpoints, CablecastParameters
+
+logger = logging.getLogger(__name__)
+
+# Request field names; they are members of CablecastEndpoints, not module constants
+MEDIA_NAME = CablecastEndpoints.MEDIA_NAME.value
+FORMAT_LOCATION = CablecastEndpoints.FORMAT_LOCATION.value
+RUN_DATE_TIME = CablecastEndpoints.RUN_DATE_TIME.value
+RUN_BUMP = CablecastEndpoints.RUN_BUMP.value
+RUN_LOCK = CablecastEndpoints.RUN_LOCK.value
+BUG_TEXT = CablecastEndpoints.BUG_TEXT.value
+CRAWL_TEXT = CablecastEndpoints.CRAWL_TEXT.value
+CG_EXEMPT = CablecastEndpoints.CG_EXEMPT.value
+RUN_STATUS = CablecastEndpoints.RUN_STATUS.value
+
+MeetingKey = Tuple[str, date]  # (show title, meeting day)
+
+class CablecastSchedulerMetrics:
+    """Bulk Cablecast scheduling metrics"""
+    meetings = Counter('cablecast_bulk_meetings_total', 'Meetings submitted for bulk scheduling', ['result'])
+    api_calls = Counter('cablecast_bulk_api_calls_total', 'Cablecast API calls made by bulk scheduling', ['call'])
+    batch_duration = Histogram('cablecast_bulk_schedule_duration_seconds', 'Time to schedule one batch of meetings')
+
+@dataclass
+class BulkScheduleResult:
+    """Outcome of CablecastScheduler.schedule_meetings"""
+    created: List[Tuple[Show, ScheduleItem]] = field(default_factory=list)
+    existing: List[Show] = field(default_factory=list)
+    failed: Dict[MeetingKey, str] = field(default_factory=dict)
 
 class CablecastScheduler:
     """Handles scheduling of city hall meetings in Cablecast"""
-    
-    def __init__(self, api_client, channel_id: int, storage_server_id: int):
+
+    def __init__(self, api_client, channel_id: int, storage_server_id: int,
+                 pooled_client=None, max_concurrency: int = 8, batch_size: int = 100,
+                 show_page_size: int = 500):
+        """
+        Args:
+            api_client: Synchronous client used by the single-meeting methods
+            channel_id: Channel meetings are scheduled on
+            storage_server_id: Storage server whose format and location new media use
+            pooled_client: CablecastPooledClient used by ``schedule_meetings``
+            max_concurrency: Media/show creations in flight at once
+            batch_size: Schedule items sent per SCHEDULE_ITEMS_BATCH request
+            show_page_size: Shows fetched per page when loading existing shows
+        """
         self.api_client = api_client
         self.channel_id = channel_id
         self.storage_server_id = storage_server_id
         self.default_duration = timedelta(hours=4) # 4 hour default duration
-        
+        self.pooled_client = pooled_client
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        self.show_page_size = show_page_size
+        self.metrics = CablecastSchedulerMetrics()
+
+        # Lookups that only depend on the storage server are made once
+        self._format: Optional[Format] = None
+        self._format_lock = asyncio.Lock()
+        self._shows: Optional[Dict[MeetingKey, Show]] = None
+        self._shows_lock = asyncio.Lock()
+        # Records left by a partly failed run, reused by the next one instead of duplicated
+        self._media: Dict[MeetingKey, Media] = {}  # Media whose show was not created
+        self._unscheduled: Dict[MeetingKey, Show] = {}  # Shows whose schedule item was not created
+
+    @staticmethod
+    def _show_title(meeting_type: str) -> str:
+        return f"{meeting_type} Meeting"
+
+    @staticmethod
+    def _cg_title(meeting_date: datetime, meeting_type: str) -> str:
+        return f"{meeting_type} Meeting - {meeting_date.strftime('%B %d, %Y')}"
+
+    def _media_params(self, meeting_date: datetime, meeting_type: str, server_format: Format) -> Dict:
+        return {
+            MEDIA_NAME: f"{meeting_type} Meeting {meeting_date.strftime('%Y-%m-%d')}",
+            "format": server_format.id,
+            "location": self.storage_server_id
+        }
+
+    def _show_params(self, meeting_date: datetime, meeting_type: str) -> Dict:
+        return {
+            "title": self._show_title(meeting_type),
+            "event_date": meeting_date.isoformat(),
+            "duration": int(self.default_duration.total_seconds()),
+            "custom_fields": {
+                "CG Title": self._cg_title(meeting_date, meeting_type)
+            }
+        }
+
+    def _schedule_params(self, show_id: int, start_time: datetime, bug_text: str) -> Dict:
+        return {
+            "channel": self.channel_id,
+            "show": show_id,
+            RUN_DATE_TIME: start_time.isoformat(),
+            RUN_BUMP: 0,
+            RUN_LOCK: True,
+            BUG_TEXT: bug_text,
+            CRAWL_TEXT: "",
+            CG_EXEMPT: False,
+            RUN_STATUS: 0 # Tentative status
+        }
+
     def create_meeting_show(self, meeting_date: datetime, meeting_type: str) -> Show:
         """Creates a new show record for a city meeting
-        
+
         Args:
             meeting_date: Date/time of the meeting
             meeting_type: Type of meeting (e.g. "City Council", "Planning Commission")
-            
+
         Returns:
             Show object for the created show
         """
         # Get format for the channel's storage server
         format_response = self.api_client.get(f"/v1/formats?{FORMAT_LOCATION}={self.storage_server_id}")
         server_format = Format(**format_response.formats[0])
-        
+
         # Create media record
-        media_params = {
-            MEDIA_NAME: f"{meeting_type} Meeting {meeting_date.strftime('%Y-%m-%d')}",
-            "format": server_format.id,
-            "location": self.storage_server_id
-        }
-        media_response = self.api_client.post("/v1/media", json=media_params)
+        media_response = self.api_client.post("/v1/media", json=self._media_params(meeting_date, meeting_type, server_format))
         media = Media(**media_response.media)
-        
+
         # Create show record
-        show_params = {
-            "title": f"{meeting_type} Meeting",
-            "event_date": meeting_date.isoformat(),
-            "duration": int(self.default_duration.total_seconds()),
-            "custom_fields": {
-                "CG Title": f"{meeting_type} Meeting - {meeting_date.strftime('%B %d, %Y')}"
-            }
-        }
-        show_response = self.api_client.post("/v1/shows", json=show_params)
+        show_response = self.api_client.post("/v1/shows", json=self._show_params(meeting_date, meeting_type))
         return Show(**show_response.show)
-        
+
     def schedule_meeting(self, show: Show, start_time: datetime) -> ScheduleItem:
         """Schedules a show into the channel schedule
-        
+
         Args:
             show: Show object to schedule
             start_time: Date/time to schedule the show
-            
+
         Returns:
             ScheduleItem for the scheduled show
         """
-        schedule_params = {
-            "channel": self.channel_id,
-            "show": show.id,
-            RUN_DATE_TIME: start_time.isoformat(),
-            RUN_BUMP: 0,
-            RUN_LOCK: True,
-            BUG_TEXT: show.custom_fields["CG Title"],
-            CRAWL_TEXT: "",
-            CG_EXEMPT: False,
-            RUN_STATUS: 0 # Tentative status
-        }
-        
+        schedule_params = self._schedule_params(show.id, start_time, show.customFields["CG Title"])
         schedule_response = self.api_client.post("/v1/scheduleItems", json=schedule_params)
         return ScheduleItem(**schedule_response.scheduleItem)
 
     def create_and_schedule_meeting(self, meeting_date: datetime, meeting_type: str) -> tuple[Show, ScheduleItem]:
         """Creates and schedules a meeting show
-        
+
         Args:
             meeting_date: Date/time of the meeting
             meeting_type: Type of meeting
-            
+
         Returns:
             Tuple of (Show, ScheduleItem) for the created and scheduled show
         """
         show = self.create_meeting_show(meeting_date, meeting_type)
         schedule_item = self.schedule_meeting(show, meeting_date)
         return show, schedule_item
+
+    async def _request(self, call: str, endpoint: CablecastEndpoints, method: str = "GET",
+                       params: Optional[Dict] = None, data=None) -> Dict:
+        self.metrics.api_calls.labels(call).inc()
+        return await self.pooled_client.request(endpoint, method=method, params=params, data=data)
+
+    async def get_server_format(self) -> Format:
+        """Format for the storage server, looked up once and cached"""
+        if self._format is None:
+            async with self._format_lock:
+                if self._format is None:
+                    response = await self._request("format", CablecastEndpoints.FORMATS,
+                                                   params={FORMAT_LOCATION: self.storage_server_id})
+                    self._format = Format(**response["formats"][0])
+        return self._format
+
+    async def get_existing_shows(self, refresh: bool = False) -> Dict[MeetingKey, Show]:
+        """Shows at the storage server's location keyed by (title, event day), loaded once"""
+        if self._shows is None or refresh:
+            async with self._shows_lock:
+                if self._shows is None or refresh:
+                    location = (await self.get_server_format()).location
+                    shows: Dict[MeetingKey, Show] = {}
+                    offset = 0
+                    while True:
+                        response = await self._request("list_shows", CablecastEndpoints.SHOWS, params={
+                            CablecastParameters.LOCATION: location,
+                            CablecastParameters.PAGE_SIZE: self.show_page_size,
+                            CablecastParameters.OFFSET: offset,
+                        })
+                        page = [Show(**show) for show in response.get("shows", [])]
+                        for show in page:
+                            shows[(show.title, show.eventDate.date())] = show
+                        if len(page) < self.show_page_size:
+                            break
+                        offset += len(page)
+                    self._shows = shows
+        return self._shows
+
+    async def _create_meeting(self, key: MeetingKey, meeting_date: datetime, meeting_type: str) -> Show:
+        """Create the media and then the show record for one meeting
+
+        Media created by an earlier attempt whose show failed is reused.
+        """
+        server_format = await self.get_server_format()
+        if key not in self._media:
+            media_response = await self._request("create_media", CablecastEndpoints.MEDIA, "POST",
+                                                 data=self._media_params(meeting_date, meeting_type, server_format))
+            self._media[key] = Media(**media_response["media"])
+        show_params = {**self._show_params(meeting_date, meeting_type), "location": server_format.location}
+        show_response = await self._request("create_show", CablecastEndpoints.SHOWS, "POST", data=show_params)
+        show = Show(**show_response["show"])
+        del self._media[key]
+        self._unscheduled[key] = show
+        return show
+
+    async def schedule_meetings(self, meetings: Iterable[Tuple[datetime, str]]) -> BulkScheduleResult:
+        """Create and schedule many meetings with as few API round trips as possible
+
+        The storage server format and the existing shows are fetched once
+        per scheduler. Meetings repeated in the input, or matching an
+        existing show by (title, day), are not created again. Meetings are
+        created concurrently, bounded by ``max_concurrency``, and the new
+        runs are sent through the SCHEDULE_ITEMS_BATCH endpoint in chunks
+        of ``batch_size``. A media record whose show failed, or a show whose
+        schedule item failed, is picked up by the next call rather than
+        created again.
+
+        Args:
+            meetings: (meeting date/time, meeting type) pairs
+
+        Returns:
+            BulkScheduleResult with created (show, schedule item) pairs, shows that
+            already existed, and the error for each meeting that failed
+        """
+        if self.pooled_client is None:
+            raise ValueError("schedule_meetings requires a pooled_client")
+
+        started = asyncio.get_running_loop().time()
+        result = BulkScheduleResult()
+        existing = await self.get_existing_shows()
+
+        pending: Dict[MeetingKey, Tuple[datetime, str]] = {}
+        seen_existing = set()
+        for meeting_date, meeting_type in meetings:
+            key = (self._show_title(meeting_type), meeting_date.date())
+            if key in existing:
+                if key not in seen_existing:
+                    seen_existing.add(key)
+                    result.existing.append(existing[key])
+            elif key not in pending:
+                pending[key] = (meeting_date, meeting_type)
+        self.metrics.meetings.labels("existing").inc(len(result.existing))
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def create(key: MeetingKey, meeting_date: datetime, meeting_type: str) -> Optional[Show]:
+            if key in self._unscheduled:
+                return self._unscheduled[key]
+            async with semaphore:
+                try:
+                    return await self._create_meeting(key, meeting_date, meeting_type)
+                except Exception as e:
+                    result.failed[key] = str(e)
+                    logger.error(f"Failed to create Cablecast show for {key[0]} on {key[1]}: {str(e)}")
+                    return None
+
+        shows = await asyncio.gather(*(create(key, *meeting) for key, meeting in pending.items()))
+        created = [(key, show) for key, show in zip(pending, shows) if show is not None]
+
+        for i in range(0, len(created), self.batch_size):
+            chunk = created[i:i + self.batch_size]
+            items = [self._schedule_params(show.id, pending[key][0], self._cg_title(*pending[key]))
+                     for key, show in chunk]
+            try:
+                response = await self._request("schedule_batch", CablecastEndpoints.SCHEDULE_ITEMS_BATCH,
+                                               "POST", data={"scheduleItems": items})
+                for (key, show), item in zip(chunk, response["scheduleItems"]):
+                    result.created.append((show, ScheduleItem(**item)))
+                    existing[key] = show
+                    del self._unscheduled[key]
+            except Exception as e:
+                for key, show in chunk:
+                    result.failed[key] = f"show {show.id} created but not scheduled: {str(e)}"
+                logger.error(f"Failed to schedule {len(chunk)} Cablecast shows: {str(e)}")
+
+        self.metrics.meetings.labels("created").inc(len(result.created))
+        self.metrics.meetings.labels("failed").inc(len(result.failed))
+        self.metrics.batch_duration.observe(asyncio.get_running_loop().time() - started)
+        logger.info(f"Scheduled {len(result.created)} meetings, {len(result.existing)} already existed, "
+                    f"{len(result.failed)} failed")
+        return result
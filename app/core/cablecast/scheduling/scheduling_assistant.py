@@ -1,12 +1,13 @@
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
-from typing import List, Optional
+from itertools import count
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import icalendar
 import requests
 from app.core.aja.aja_helo_parameter_service import AJAParameterManager, AJAReplicatorCommands
 from app.core.aja.machine_logic.helo_params import HeloParameters, MediaState
-from app.core.cablecast import ScheduledEvent, ScheduledAction
 
 class ScheduledAction(Enum):
     RECORD = "record"
@@ -22,54 +23,194 @@ class ScheduledEvent:
     title: str
     description: Optional[str] = None
     remote_id: Optional[str] = None  # For synced calendar events
+    encoder_id: Optional[str] = None  # Conflict domain; unassigned events share one
+
+# Smallest step past a datetime, makes the end of a window inclusive
+_EPSILON = timedelta(microseconds=1)
+
+class _ConflictDomain:
+    """Non-overlapping events on one encoder, sorted by start time.
+
+    Because accepted events never overlap, their end times are sorted too,
+    so a conflict check only has to look at the neighbours of the
+    insertion point.
+    """
+    __slots__ = ('starts', 'events')
+
+    def __init__(self):
+        self.starts: List[datetime] = []
+        self.events: List[ScheduledEvent] = []
+
+    def find_conflict(self, event: ScheduledEvent) -> Optional[ScheduledEvent]:
+        i = bisect_left(self.starts, event.start_time)
+        if i > 0 and self.events[i - 1].end_time > event.start_time:
+            return self.events[i - 1]
+        if i < len(self.events) and self.events[i].start_time < event.end_time:
+            return self.events[i]
+        return None
+
+    def insert(self, event: ScheduledEvent):
+        i = bisect_left(self.starts, event.start_time)
+        self.starts.insert(i, event.start_time)
+        self.events.insert(i, event)
+
+    def remove(self, event: ScheduledEvent):
+        i = bisect_left(self.starts, event.start_time)
+        while self.events[i] is not event:
+            i += 1
+        del self.starts[i]
+        del self.events[i]
+
+    def running_at(self, moment: datetime) -> Optional[ScheduledEvent]:
+        """The event that started before ``moment`` and is still running then, if any"""
+        i = bisect_left(self.starts, moment)
+        if i > 0 and self.events[i - 1].end_time > moment:
+            return self.events[i - 1]
+        return None
+
+class EventIndex:
+    """Sorted index of scheduled events with per-encoder conflict domains.
+
+    Events are kept in one list ordered by (start_time, insertion order)
+    for window queries, and in a non-overlapping list per encoder for
+    conflict checks. Lookups are binary searches; inserting in start
+    order, as ``add_many`` does, appends instead of shifting. Because an
+    encoder's events never overlap, at most one per encoder can already be
+    running when a window opens, so window queries stay logarithmic
+    however long the events are.
+    """
+
+    def __init__(self):
+        self._keys: List[Tuple[datetime, int]] = []
+        self._events: List[ScheduledEvent] = []
+        self._by_id: Dict[str, Tuple[Tuple[datetime, int], ScheduledEvent]] = {}
+        self._domains: Dict[Optional[str], _ConflictDomain] = {}
+        self._seq = count()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __iter__(self) -> Iterator[ScheduledEvent]:
+        return iter(list(self._events))
+
+    def __contains__(self, event_id: str) -> bool:
+        return event_id in self._by_id
+
+    def get(self, event_id: str) -> Optional[ScheduledEvent]:
+        entry = self._by_id.get(event_id)
+        return entry[1] if entry else None
+
+    def find_conflict(self, event: ScheduledEvent) -> Optional[ScheduledEvent]:
+        """Return an event on the same encoder that overlaps ``event``, if any"""
+        domain = self._domains.get(event.encoder_id)
+        return domain.find_conflict(event) if domain else None
+
+    def add(self, event: ScheduledEvent) -> bool:
+        """Insert an event unless its ID is taken or it conflicts on its encoder"""
+        if event.id in self._by_id or self.find_conflict(event) is not None:
+            return False
+
+        self._domains.setdefault(event.encoder_id, _ConflictDomain()).insert(event)
+        key = (event.start_time, next(self._seq))
+        i = bisect_right(self._keys, key)
+        self._keys.insert(i, key)
+        self._events.insert(i, event)
+        self._by_id[event.id] = (key, event)
+        return True
+
+    def add_many(self, events: Iterable[ScheduledEvent]) -> List[ScheduledEvent]:
+        """Insert events in start order; returns the ones accepted"""
+        return [event for event in sorted(events, key=lambda e: e.start_time) if self.add(event)]
+
+    def remove(self, event_id: str) -> Optional[ScheduledEvent]:
+        entry = self._by_id.pop(event_id, None)
+        if entry is None:
+            return None
+        key, event = entry
+        i = bisect_left(self._keys, key)
+        del self._keys[i]
+        del self._events[i]
+
+        domain = self._domains[event.encoder_id]
+        domain.remove(event)
+        if not domain.events:
+            del self._domains[event.encoder_id]
+        return event
+
+    def starting_between(self, start: datetime, end: datetime) -> List[ScheduledEvent]:
+        """Events whose start time falls in [start, end]"""
+        lo = bisect_left(self._keys, (start,))
+        hi = bisect_left(self._keys, (end + _EPSILON,))
+        return self._events[lo:hi]
+
+    def overlapping(self, start: datetime, end: datetime) -> List[ScheduledEvent]:
+        """Events running at any point in [start, end)"""
+        # Events that started earlier: at most one per encoder is still running
+        running = [event for event in (domain.running_at(start) for domain in self._domains.values()) if event]
+        running.sort(key=lambda event: self._by_id[event.id][0])
+        lo = bisect_left(self._keys, (start,))
+        hi = bisect_left(self._keys, (end,))
+        return running + [e for e in self._events[lo:hi] if e.end_time > start]
+
+    def for_encoder(self, encoder_id: Optional[str]) -> List[ScheduledEvent]:
+        domain = self._domains.get(encoder_id)
+        return list(domain.events) if domain else []
 
 class SchedulingAssistant:
     def __init__(self, helo_params: HeloParameters):
         self.helo_params = helo_params
-        self.events: List[ScheduledEvent] = []
+        self.index = EventIndex()
         self.param_manager = AJAParameterManager()
 
+    @property
+    def events(self) -> List[ScheduledEvent]:
+        """All events ordered by start time"""
+        return list(self.index)
+
     def add_event(self, event: ScheduledEvent) -> bool:
-        """Add new event after validating for conflicts"""
-        if self._check_conflicts(event):
-            return False
-            
-        self.events.append(event)
-        self.events.sort(key=lambda x: x.start_time)
-        return True
+        """Add new event after validating for conflicts on its encoder"""
+        return self.index.add(event)
+
+    def add_events(self, events: Iterable[ScheduledEvent]) -> List[ScheduledEvent]:
+        """Add a batch of events, e.g. a calendar import; returns the ones accepted"""
+        return self.index.add_many(events)
+
+    def get_event(self, event_id: str) -> Optional[ScheduledEvent]:
+        return self.index.get(event_id)
 
     def remove_event(self, event_id: str) -> bool:
         """Remove event by ID"""
-        initial_len = len(self.events)
-        self.events = [e for e in self.events if e.id != event_id]
-        return len(self.events) < initial_len
+        return self.index.remove(event_id) is not None
 
     def _check_conflicts(self, new_event: ScheduledEvent) -> bool:
-        """Check for scheduling conflicts"""
-        for event in self.events:
-            if (new_event.start_time < event.end_time and 
-                new_event.end_time > event.start_time):
-                return True
-        return False
-
-    def sync_calendar(self, calendar_url: str):
-        """Sync with external calendar"""
+        """Check for scheduling conflicts on the event's encoder"""
+        return self.index.find_conflict(new_event) is not None
+
+    def sync_calendar(self, calendar_url: str, encoder_id: Optional[str] = None):
+        """Sync with external calendar
+
+        Args:
+            calendar_url: iCal feed to import
+            encoder_id: Encoder the imported events are scheduled on
+        """
         try:
             response = requests.get(calendar_url)
             cal = icalendar.Calendar.from_ical(response.text)
-            
-            for component in cal.walk():
-                if component.name == "VEVENT":
-                    event = ScheduledEvent(
-                        id=str(component.get('uid')),
-                        start_time=component.get('dtstart').dt,
-                        end_time=component.get('dtend').dt,
-                        action=ScheduledAction.RECORD_AND_STREAM,  # Default action
-                        title=str(component.get('summary')),
-                        description=str(component.get('description')),
-                        remote_id=str(component.get('uid'))
-                    )
-                    self.add_event(event)
+
+            events = [
+                ScheduledEvent(
+                    id=str(component.get('uid')),
+                    start_time=component.get('dtstart').dt,
+                    end_time=component.get('dtend').dt,
+                    action=ScheduledAction.RECORD_AND_STREAM,  # Default action
+                    title=str(component.get('summary')),
+                    description=str(component.get('description')),
+                    remote_id=str(component.get('uid')),
+                    encoder_id=encoder_id
+                )
+                for component in cal.walk() if component.name == "VEVENT"
+            ]
+            self.add_events(events)
         except Exception as e:
             print(f"Calendar sync failed: {str(e)}")
 
@@ -88,7 +229,11 @@ class SchedulingAssistant:
         """Get list of upcoming events within specified hours"""
         now = datetime.now()
         future = now + timedelta(hours=hours)
-        return [e for e in self.events if now <= e.start_time <= future]
+        return self.index.starting_between(now, future)
+
+    def get_active_events(self, start: datetime, end: datetime) -> List[ScheduledEvent]:
+        """Get events running at any point between start and end"""
+        return self.index.overlapping(start, end)
 
     def check_storage_capacity(self) -> bool:
         """Check if storage capacity is sufficient for upcoming recordings"""
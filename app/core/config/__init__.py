@@ -1,8 +1,16 @@
-from .parameter_config import Parameter, ParameterConfig
-from .socketservice_config import Config as SocketServiceConfig
-from .ssh_generator import SSHKeyGenerator
-from .ssh_validator import SSHKeyValidator
-from .websocket_config import Config as WebSocketConfig
+from app.core.lazy_loader import lazy_exports
+
+# Exported names are imported from their submodule on first access
+_EXPORTS = {
+    'Parameter': '.parameter_config',
+    'ParameterConfig': '.parameter_config',
+    'SocketServiceConfig': '.socketservice_config:Config',
+    'SSHKeyGenerator': '.ssh_generator',
+    'SSHKeyValidator': '.ssh_validator',
+    'WebSocketConfig': '.websocket_config:Config'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     'Parameter',
@@ -1,9 +1,20 @@
-from .client import CablecastPooledClient
-from .connection_thermal_manager import ConnectionThermalManager, ConnectionThermalMetrics
-from .health_checker import HealthChecker
-from .helo_pool_manager import HeloPoolManager, HeloConnectionMetrics
-from .pool_manager import PoolManager
-from .prep_warmup_manager import HeloWarmupManager, ConnectionWarmupMetrics
+from app.core.lazy_loader import lazy_exports
+
+# Exported names are imported from their submodule on first access
+_EXPORTS = {
+    'CablecastPooledClient': '.client',
+    'ConnectionThermalManager': '.connection_thermal_manager',
+    'ConnectionThermalMetrics': '.connection_thermal_manager',
+    'HealthChecker': '.health_checker',
+    'HeloPoolManager': '.helo_pool_manager',
+    'HeloConnectionMetrics': '.helo_pool_manager',
+    'PoolManager': '.pool_manager',
+    'PeriodicJobScheduler': '.job_scheduler',
+    'HeloWarmupManager': '.prep_warmup_manager',
+    'ConnectionWarmupMetrics': '.prep_warmup_manager'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     'CablecastPooledClient',
@@ -13,6 +24,7 @@ __all__ = [
     'HeloPoolManager',
     'HeloConnectionMetrics',
     'PoolManager',
+    'PeriodicJobScheduler',
     'HeloWarmupManager',
     'ConnectionWarmupMetrics'
-]
\ No newline at end of file
+]
@@ -1,6 +1,8 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, Sequence, Type
 from .pool_manager import PoolManager
 from app.core import CablecastEndpoints, APIError, handle_errors, ErrorLogger
+from app.core.cablecast.machine_language.cablecast_constants import CablecastParameters
+from app.core.cablecast.machine_language.response_decoder import CablecastResponseDecoder, ModelT
 import json
 
 class CablecastPooledClient:
@@ -11,11 +13,15 @@ class CablecastPooledClient:
                  api_key: Optional[str] = None,
                  service_name: str = "cablecast",
                  pool_manager: Optional[PoolManager] = None,
-                 error_logger: Optional[ErrorLogger] = None):
+                 error_logger: Optional[ErrorLogger] = None,
+                 decoder: Optional[CablecastResponseDecoder] = None,
+                 stream_chunk_size: int = 64 * 1024):
         self.base_url = base_url
         self.service_name = service_name
         self.pool_manager = pool_manager or PoolManager()
         self.error_logger = error_logger
+        self.decoder = decoder or CablecastResponseDecoder()
+        self.stream_chunk_size = stream_chunk_size
         self.headers = {
             "Content-Type": "application/json",
             "Accept": "application/json"
@@ -44,10 +50,66 @@ class CablecastPooledClient:
                     response.raise_for_status()
                     return await response.json()
         except Exception as e:
-            if self.error_logger:
-                self.error_logger.log_error({
-                    'service': self.service_name,
-                    'endpoint': endpoint.value,
-                    'error': str(e)
-                }, 'api')
-            raise APIError(f"Request failed: {str(e)}", code=500) 
\ No newline at end of file
+            self._log_request_error(endpoint, e)
+            raise APIError(f"Request failed: {str(e)}", code=500)
+
+    def _log_request_error(self, endpoint: CablecastEndpoints, e: Exception) -> None:
+        if self.error_logger:
+            self.error_logger.log_error({
+                'service': self.service_name,
+                'endpoint': endpoint.value,
+                'error': str(e)
+            }, 'api')
+
+    async def request_model(self,
+                            endpoint: CablecastEndpoints,
+                            model: Type[ModelT],
+                            key: str,
+                            method: str = "GET",
+                            params: Optional[Dict] = None,
+                            data: Optional[Dict] = None) -> ModelT:
+        """Make a request and decode the object under ``key`` into ``model``"""
+        response = await self.request(endpoint, method=method, params=params, data=data)
+        return self.decoder.decode(endpoint, model, response[key])
+
+    async def request_items(self,
+                            endpoint: CablecastEndpoints,
+                            model: Type[ModelT],
+                            key: str,
+                            params: Optional[Dict] = None) -> Sequence[ModelT]:
+        """Make a collection request and decode its items, lazily for long trusted responses"""
+        response = await self.request(endpoint, params=params)
+        return self.decoder.decode_items(endpoint, model, response, key)
+
+    async def iter_items(self,
+                         endpoint: CablecastEndpoints,
+                         model: Type[ModelT],
+                         key: str,
+                         params: Optional[Dict] = None,
+                         page_size: int = 1000) -> AsyncIterator[ModelT]:
+        """Stream every item of a paginated collection
+
+        Pages are requested with ``offset``/``page_size`` until one comes
+        back short, and each page is decoded while it downloads, so the
+        whole response is never held in memory.
+        """
+        url = f"{self.base_url}{endpoint.value}"
+        offset = 0
+        while True:
+            page_params = {**(params or {}), CablecastParameters.PAGE_SIZE: page_size,
+                           CablecastParameters.OFFSET: offset}
+            count = 0
+            try:
+                async with self.pool_manager.connection(self.service_name, endpoint.value) as session:
+                    async with session.get(url, params=page_params, headers=self.headers) as response:
+                        response.raise_for_status()
+                        chunks = response.content.iter_chunked(self.stream_chunk_size)
+                        async for item in self.decoder.iter_items(endpoint, model, chunks, key):
+                            count += 1
+                            yield item
+            except Exception as e:
+                self._log_request_error(endpoint, e)
+                raise APIError(f"Request failed: {str(e)}", code=500)
+            if count < page_size:
+                return
+            offset += count
@@ -1,12 +1,14 @@
 from typing import Dict, Optional, List
 from datetime import datetime, timedelta
 import asyncio
+import logging
 from prometheus_client import Gauge, Counter, Histogram
 from app.core import EnhancedErrorMetrics
 from app.core.connection import HeloWarmupManager
 from app.core.aja import HeloDeviceParameters, VideoGeometry, HeloEncoder
 from app.core.database import db
 from app.core.error_handling import EncoderError
+from app.core.connection.job_scheduler import PeriodicJobScheduler
 
 class ConnectionThermalMetrics:
     """Metrics for connection thermal management"""
@@ -47,10 +49,15 @@ class ConnectionThermalManager:
     
     def __init__(self, 
                  warmup_manager: HeloWarmupManager,
-                 metrics: EnhancedErrorMetrics):
+                 metrics: EnhancedErrorMetrics,
+                 sample_interval: int = 15,
+                 scheduler: Optional[PeriodicJobScheduler] = None):
         self.warmup_manager = warmup_manager
         self.metrics = metrics
         self.thermal_metrics = ConnectionThermalMetrics()
+        self.logger = logging.getLogger(__name__)
+        self.sample_interval = sample_interval
+        self.scheduler = scheduler or warmup_manager.scheduler
         
         # Thermal thresholds
         self.thresholds = {
@@ -64,6 +71,28 @@ class ConnectionThermalManager:
         self._connection_stats: Dict[str, Dict] = {}
         self._cooling_tasks: Dict[str, asyncio.Task] = {}
 
+    async def start_sampling(self, encoder_id: str):
+        """
+        Sample connection temperatures for an encoder every ``sample_interval`` seconds.
+
+        Runs on the shared job wheel rather than a loop of its own.
+
+        Args:
+            encoder_id (str): The ID of the encoder to sample
+        """
+        if not self.scheduler.has_job('thermal', encoder_id):
+            self.scheduler.add_job('thermal', encoder_id, self.sample_interval, self._sample_encoder)
+
+    async def stop_sampling(self, encoder_id: str):
+        self.scheduler.remove_job('thermal', encoder_id)
+
+    async def _sample_encoder(self, encoder_id: str):
+        """Check the encoder's pooled connections and cool them if hot"""
+        # Warm sockets to one host are pooled together, so the host is the connection ID
+        connection_id = self.warmup_manager._hosts.get(encoder_id)
+        if connection_id and await self.check_temperature(encoder_id, connection_id):
+            await self.start_cooling(encoder_id, connection_id, 'high_temperature')
+
     async def check_temperature(self, encoder_id: str, connection_id: str) -> bool:
         """
         Check if a connection needs cooling based on its current temperature.
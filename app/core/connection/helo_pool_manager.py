@@ -6,6 +6,7 @@ import asyncio
 from prometheus_client import Counter, Gauge, Histogram
 from app.services.encoder_manager import EncoderManager
 from app.core.connection import PoolManager 
+from app.core.connection.job_scheduler import PeriodicJobScheduler
 from app.core.error_handling import HeloErrorType, HeloErrorHandler
 
 class HeloConnectionMetrics:
@@ -23,61 +24,64 @@ class HeloPoolManager:
                  pool_manager: PoolManager,
                  error_handler: HeloErrorHandler,
                  max_idle_time: int = 300,  # 5 minutes
-                 max_lifetime: int = 3600):  # 1 hour
+                 max_lifetime: int = 3600,  # 1 hour
+                 health_check_interval: int = 30,
+                 scheduler: Optional[PeriodicJobScheduler] = None):
         self.encoder_manager = encoder_manager
         self.pool_manager = pool_manager
         self.error_handler = error_handler
         self.max_idle_time = max_idle_time
         self.max_lifetime = max_lifetime
+        self.health_check_interval = health_check_interval
         self.metrics = HeloConnectionMetrics()
-        self._health_check_tasks: Dict[str, asyncio.Task] = {}
+        # Shared with the warmup and thermal managers so one wheel owns every periodic job
+        self._owns_scheduler = scheduler is None
+        self.scheduler = scheduler or PeriodicJobScheduler()
         self._connection_timestamps: Dict[str, datetime] = {}
 
     async def start_health_monitoring(self, encoder_id: str):
         """Start health monitoring for a HELO device"""
-        if encoder_id not in self._health_check_tasks:
-            self._health_check_tasks[encoder_id] = asyncio.create_task(
-                self._monitor_helo_health(encoder_id)
-            )
+        if not self.scheduler.has_job('health', encoder_id):
+            self.scheduler.add_job('health', encoder_id, self.health_check_interval, self._check_helo_health)
 
-    async def _monitor_helo_health(self, encoder_id: str):
-        """Monitor HELO device health with enhanced error handling"""
-        while True:
-            try:
-                client = await self.encoder_manager.get_client(encoder_id)
-                health_data = await client.get_health_metrics()
-                
-                # Check for warning conditions and handle errors
-                if health_data['cpu_usage'] > 80:
-                    await self.error_handler.handle_error(
-                        HeloErrorType.HIGH_RESOURCE_USAGE,
-                        encoder_id,
-                        {'cpu_usage': health_data['cpu_usage']}
-                    )
-                
-                if health_data['temperature'] > 75:
-                    await self.error_handler.handle_error(
-                        HeloErrorType.TEMPERATURE_WARNING,
-                        encoder_id,
-                        {'temperature': health_data['temperature']}
-                    )
-                    
-                # Check for encoding issues
-                if health_data.get('encoding_errors', 0) > 0:
-                    await self.error_handler.handle_error(
-                        HeloErrorType.ENCODING_ERROR,
-                        encoder_id,
-                        {'errors': health_data['encoding_errors']}
-                    )
-                    
-            except Exception as e:
+    async def stop_health_monitoring(self, encoder_id: str):
+        self.scheduler.remove_job('health', encoder_id)
+
+    async def _check_helo_health(self, encoder_id: str):
+        """Check HELO device health once with enhanced error handling"""
+        try:
+            client = await self.encoder_manager.get_client(encoder_id)
+            health_data = await client.get_health_metrics()
+            
+            # Check for warning conditions and handle errors
+            if health_data['cpu_usage'] > 80:
                 await self.error_handler.handle_error(
-                    HeloErrorType.CONNECTION_LOST,
+                    HeloErrorType.HIGH_RESOURCE_USAGE,
                     encoder_id,
-                    {'error': str(e)}
+                    {'cpu_usage': health_data['cpu_usage']}
                 )
             
-            await asyncio.sleep(self.health_check_interval)
+            if health_data['temperature'] > 75:
+                await self.error_handler.handle_error(
+                    HeloErrorType.TEMPERATURE_WARNING,
+                    encoder_id,
+                    {'temperature': health_data['temperature']}
+                )
+                
+            # Check for encoding issues
+            if health_data.get('encoding_errors', 0) > 0:
+                await self.error_handler.handle_error(
+                    HeloErrorType.ENCODING_ERROR,
+                    encoder_id,
+                    {'errors': health_data['encoding_errors']}
+                )
+                
+        except Exception as e:
+            await self.error_handler.handle_error(
+                HeloErrorType.CONNECTION_LOST,
+                encoder_id,
+                {'error': str(e)}
+            )
 
     @asynccontextmanager
     async def get_helo_connection(self, encoder_id: str):
@@ -108,7 +112,7 @@ class HeloPoolManager:
                 await self.pool_manager.pools[f"encoder_{encoder_id}"].close()
                 del self._connection_timestamps[encoder_id]
         
-        for task in self._health_check_tasks.values():
-            task.cancel()
-        await asyncio.gather(*self._health_check_tasks.values(), return_exceptions=True)
-        self._health_check_tasks.clear() 
\ No newline at end of file
+        if self._owns_scheduler:
+            await self.scheduler.stop()
+        else:
+            self.scheduler.remove_jobs('health') 
\ No newline at end of file
@@ -0,0 +1,161 @@
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import math
+import time
+import zlib
+from dataclasses import dataclass, field
+from prometheus_client import Counter, Gauge, Histogram
+
+logger = logging.getLogger(__name__)
+
+JobKey = Tuple[str, str]  # (job name, encoder_id)
+
+class JobSchedulerMetrics:
+    """Periodic per-encoder job metrics"""
+    job_lag = Histogram('helo_job_lag_seconds', 'Delay between a job falling due and starting', ['job'],
+                        buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30))
+    job_duration = Histogram('helo_job_duration_seconds', 'Periodic job run time', ['job'])
+    job_skipped = Counter('helo_job_skipped_total', 'Runs skipped because the previous run was still going', ['job'])
+    job_errors = Counter('helo_job_errors_total', 'Periodic job runs that raised', ['job'])
+    scheduled_jobs = Gauge('helo_scheduled_jobs', 'Jobs registered with the scheduler', ['job'])
+
+@dataclass
+class PeriodicJob:
+    name: str
+    encoder_id: str
+    interval: float
+    func: Callable[[str], Awaitable]
+    due: float = 0.0
+    rounds: int = 0
+    running: Optional[asyncio.Task] = field(default=None, repr=False)
+
+class PeriodicJobScheduler:
+    """Hashed timer wheel that runs every periodic per-encoder job.
+
+    Health checks, warmup and thermal sampling register here instead of each
+    spawning a sleep loop per encoder. The first run of a job is offset by a
+    stable hash of its key within its interval, so a fleet registered at
+    startup is spread out instead of firing together. A run that is still
+    in flight when the job falls due again is skipped, not stacked.
+    """
+
+    def __init__(self, tick: float = 0.5, wheel_size: int = 512):
+        """
+        Args:
+            tick: Wheel resolution in seconds
+            wheel_size: Number of slots; intervals longer than tick * wheel_size take extra rounds
+        """
+        self.tick = tick
+        self.wheel_size = wheel_size
+        self.metrics = JobSchedulerMetrics()
+        self._slots: List[List[PeriodicJob]] = [[] for _ in range(wheel_size)]
+        self._jobs: Dict[JobKey, PeriodicJob] = {}
+        self._cursor = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def _place(self, job: PeriodicJob, now: float):
+        ticks = max(1, math.ceil((job.due - now) / self.tick))
+        job.rounds = (ticks - 1) // self.wheel_size
+        self._slots[(self._cursor + ticks) % self.wheel_size].append(job)
+
+    def add_job(self, name: str, encoder_id: str, interval: float,
+                func: Callable[[str], Awaitable]) -> PeriodicJob:
+        """Register (or replace) a job called as ``await func(encoder_id)`` every ``interval`` seconds"""
+        self.remove_job(name, encoder_id)
+        job = PeriodicJob(name, encoder_id, interval, func)
+        # Deterministic spread across the interval
+        offset = zlib.crc32(f"{name}:{encoder_id}".encode()) / 2**32 * interval
+        now = time.monotonic()
+        job.due = now + offset
+        self._jobs[(name, encoder_id)] = job
+        self._place(job, now)
+        self.metrics.scheduled_jobs.labels(name).inc()
+        self.start()
+        return job
+
+    def remove_job(self, name: str, encoder_id: str):
+        job = self._jobs.pop((name, encoder_id), None)
+        if job is not None:
+            # Left in its slot; _advance drops jobs that are no longer registered
+            self.metrics.scheduled_jobs.labels(name).dec()
+
+    def remove_encoder(self, encoder_id: str):
+        for name, job_encoder in list(self._jobs):
+            if job_encoder == encoder_id:
+                self.remove_job(name, job_encoder)
+
+    def remove_jobs(self, name: str):
+        for job_name, encoder_id in list(self._jobs):
+            if job_name == name:
+                self.remove_job(job_name, encoder_id)
+
+    def has_job(self, name: str, encoder_id: str) -> bool:
+        return (name, encoder_id) in self._jobs
+
+    async def _run(self, job: PeriodicJob):
+        started = time.perf_counter()
+        try:
+            await job.func(job.encoder_id)
+        except Exception as e:
+            self.metrics.job_errors.labels(job.name).inc()
+            logger.error(f"{job.name} job failed for encoder {job.encoder_id}: {str(e)}")
+        finally:
+            self.metrics.job_duration.labels(job.name).observe(time.perf_counter() - started)
+
+    def _advance(self, now: float):
+        self._cursor = (self._cursor + 1) % self.wheel_size
+        slot = self._slots[self._cursor]
+        self._slots[self._cursor] = []
+        for job in slot:
+            if self._jobs.get((job.name, job.encoder_id)) is not job:
+                continue
+            if job.rounds:
+                job.rounds -= 1
+                self._slots[self._cursor].append(job)
+                continue
+
+            if job.running is not None and not job.running.done():
+                self.metrics.job_skipped.labels(job.name).inc()
+            else:
+                self.metrics.job_lag.labels(job.name).observe(max(0.0, now - job.due))
+                job.running = asyncio.create_task(self._run(job))
+
+            # Next due time stays on the job's own grid, so lag does not accumulate
+            job.due += job.interval * max(1, math.ceil((now - job.due) / job.interval + 1e-9))
+            self._place(job, now)
+
+    async def _loop(self):
+        next_tick = time.monotonic() + self.tick
+        while True:
+            await asyncio.sleep(max(0.0, next_tick - time.monotonic()))
+            now = time.monotonic()
+            # Catch up on every tick we slept through
+            while next_tick <= now:
+                self._advance(now)
+                next_tick += self.tick
+
+    def start(self):
+        """Start the wheel if it is not already turning; needs a running loop"""
+        if not self.running:
+            try:
+                self._task = asyncio.get_running_loop().create_task(self._loop())
+            except RuntimeError:
+                pass  # No loop yet; the next add_job or start() from async code starts it
+
+    async def stop(self):
+        """Stop the wheel and cancel any job runs still in flight"""
+        tasks = [job.running for job in self._jobs.values() if job.running is not None]
+        if self._task is not None:
+            tasks.append(self._task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
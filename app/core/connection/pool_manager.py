@@ -1,64 +1,241 @@
-from typing import Dict, Optional
+from typing import Deque, Dict, Optional, Tuple
 import aiohttp
+from collections import deque
 from contextlib import asynccontextmanager
 from app.core.error_handling import APIError, ErrorLogger
 import asyncio
-from prometheus_client import Gauge, Counter
+import time
+from prometheus_client import Gauge, Counter, Histogram
 import logging
 
+class PoolManagerMetrics:
+    """Connection pool metrics"""
+    active_connections = Gauge('active_connections', 'Number of active connections')
+    requests = Counter('requests_total', 'Total number of requests', ['service', 'endpoint'])
+    rate_limited = Counter('pool_rate_limited_total', 'Requests rejected by the token bucket',
+                           ['service', 'endpoint'])
+    in_flight = Gauge('pool_requests_in_flight', 'Requests currently holding a pool slot', ['service'])
+    concurrency_limit = Gauge('pool_concurrency_limit', 'Current adaptive concurrency limit', ['service'])
+    latency = Histogram('pool_request_latency_seconds', 'Time a request held its pool slot',
+                        ['service', 'endpoint'])
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate`` tokens per second"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        self._refill()
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+    def retry_after(self, tokens: float = 1.0) -> float:
+        """Seconds until ``tokens`` will be available"""
+        self._refill()
+        return max(0.0, (tokens - self.tokens) / self.rate) if self.rate else float('inf')
+
+class AdaptiveConcurrencyLimiter:
+    """Caps in-flight requests and tunes the cap from observed latency.
+
+    The lowest latency seen is taken as the unloaded baseline. While the
+    smoothed latency stays within ``tolerance`` times that baseline and the
+    limit is actually being used, the limit grows by about one per window of
+    completions (additive increase). Once latency climbs past it, or a
+    request fails, the limit is cut by ``backoff`` (multiplicative decrease).
+    Callers over the limit wait in FIFO order.
+    """
+
+    def __init__(self,
+                 initial_limit: int = 20,
+                 min_limit: int = 1,
+                 max_limit: int = 200,
+                 tolerance: float = 2.0,
+                 backoff: float = 0.9,
+                 smoothing: float = 0.2):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self.baseline: Optional[float] = None
+        self.smoothed: Optional[float] = None
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    def _wake(self):
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    async def acquire(self):
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we were cancelled
+                self.in_flight -= 1
+                self._wake()
+            raise
+
+    def release(self, latency: Optional[float] = None, success: bool = True):
+        saturated = self.in_flight >= int(self.limit)
+        self.in_flight -= 1
+        if latency is not None:
+            self._observe(latency, success, saturated)
+        elif not success:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+        self._wake()
+
+    def _observe(self, latency: float, success: bool, saturated: bool):
+        if self.baseline is None or latency < self.baseline:
+            self.baseline = latency
+        else:
+            # Drift up slowly so a lasting change in path latency is relearned
+            self.baseline += (latency - self.baseline) * 0.001
+        if self.smoothed is None:
+            self.smoothed = latency
+        else:
+            self.smoothed += (latency - self.smoothed) * self.smoothing
+
+        if not success or self.smoothed > self.baseline * self.tolerance:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+        elif saturated:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+
 class PoolManager:
-    """Connection Pool Manager with Adaptive Sizing and Rate Limiting"""
-    
-    def __init__(self, 
+    """Connection Pool Manager with Adaptive Sizing and Rate Limiting
+
+    The per-service lock only guards session creation; requests share the
+    session concurrently, bounded by an AdaptiveConcurrencyLimiter per
+    service and a TokenBucket per (service, endpoint).
+    """
+
+    def __init__(self,
                  error_logger: Optional[ErrorLogger] = None,
                  max_connections: int = 100,
                  min_connections: int = 10,
                  max_keepalive_time: int = 30,
-                 rate_limit: int = 100):
+                 rate_limit: float = 100,
+                 burst: Optional[float] = None,
+                 initial_concurrency: int = 20):
+        """
+        Args:
+            error_logger: Receives connection and rate limit errors
+            max_connections: Connector limit per service session
+            min_connections: Lower bound when the pool is resized
+            max_keepalive_time: DNS cache TTL for pooled connectors
+            rate_limit: Sustained requests per second allowed per (service, endpoint)
+            burst: Requests allowed back to back before the rate applies, defaults to rate_limit
+            initial_concurrency: Starting in-flight limit per service before it adapts
+        """
         self.pools: Dict[str, aiohttp.ClientSession] = {}
         self.error_logger = error_logger
         self.max_connections = max_connections
         self.min_connections = min_connections
         self.max_keepalive_time = max_keepalive_time
         self.rate_limit = rate_limit
+        self.burst = burst
+        self.initial_concurrency = initial_concurrency
         self._locks: Dict[str, asyncio.Lock] = {}
-        self.connection_gauge = Gauge('active_connections', 'Number of active connections')
-        self.request_counter = Counter('requests_total', 'Total number of requests', ['service', 'endpoint'])
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self.limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+        self.metrics = PoolManagerMetrics()
+        self.connection_gauge = self.metrics.active_connections
+        self.request_counter = self.metrics.requests
         self.logger = logging.getLogger(__name__)
 
+    def _log_error(self, details: Dict, level: str):
+        if self.error_logger:
+            self.error_logger.log_error(details, level)
+
+    async def _get_session(self, service: str) -> aiohttp.ClientSession:
+        session = self.pools.get(service)
+        if session is not None:
+            return session
+        lock = self._locks.setdefault(service, asyncio.Lock())
+        async with lock:
+            # Another request may have created it while we waited
+            if service not in self.pools:
+                self.pools[service] = await self._create_session()
+            return self.pools[service]
+
+    def _check_rate_limit(self, service: str, endpoint: str):
+        bucket = self._buckets.get((service, endpoint))
+        if bucket is None:
+            bucket = self._buckets[(service, endpoint)] = TokenBucket(self.rate_limit, self.burst)
+        if not bucket.try_acquire():
+            self.metrics.rate_limited.labels(service=service, endpoint=endpoint).inc()
+            raise APIError(
+                f"Rate limit exceeded for {service} at {endpoint}",
+                code=429,
+                details={'retry_after': bucket.retry_after()}
+            )
+
+    def _get_limiter(self, service: str) -> AdaptiveConcurrencyLimiter:
+        limiter = self.limiters.get(service)
+        if limiter is None:
+            limiter = self.limiters[service] = AdaptiveConcurrencyLimiter(
+                initial_limit=self.initial_concurrency,
+                max_limit=self.max_connections
+            )
+        return limiter
+
     @asynccontextmanager
     async def connection(self, service: str, endpoint: str):
         """Get a connection from the pool with error handling and rate limiting"""
-        if service not in self._locks:
-            self._locks[service] = asyncio.Lock()
-            
         try:
-            async with self._locks[service]:
-                if service not in self.pools:
-                    self.pools[service] = await self._create_session()
-                    
-                # Rate limiting logic
-                self.request_counter.labels(service=service, endpoint=endpoint).inc()
-                if self.request_counter.labels(service=service, endpoint=endpoint)._value.get() > self.rate_limit:
-                    raise APIError(f"Rate limit exceeded for {service} at {endpoint}", code=429)
-
-                try:
-                    yield self.pools[service]
-                except Exception as e:
-                    self.error_logger.log_error({
-                        'service': service,
-                        'endpoint': endpoint,
-                        'error': str(e)
-                    }, 'api')
-                    raise APIError(f"Connection error: {str(e)}", code=500)
+            session = await self._get_session(service)
+            self.request_counter.labels(service=service, endpoint=endpoint).inc()
+            self._check_rate_limit(service, endpoint)
         except Exception as e:
-            self.error_logger.log_error({
+            self._log_error({
                 'service': service,
                 'endpoint': endpoint,
                 'error': str(e)
             }, 'critical')
             raise
 
+        limiter = self._get_limiter(service)
+        await limiter.acquire()
+        self.metrics.in_flight.labels(service=service).inc()
+        started = time.perf_counter()
+        success = True
+        try:
+            yield session
+        except Exception as e:
+            success = False
+            self._log_error({
+                'service': service,
+                'endpoint': endpoint,
+                'error': str(e)
+            }, 'api')
+            raise APIError(f"Connection error: {str(e)}", code=500)
+        finally:
+            elapsed = time.perf_counter() - started
+            limiter.release(elapsed, success)
+            self.metrics.in_flight.labels(service=service).dec()
+            self.metrics.concurrency_limit.labels(service=service).set(limiter.limit)
+            self.metrics.latency.labels(service=service, endpoint=endpoint).observe(elapsed)
+
     async def _create_session(self) -> aiohttp.ClientSession:
         """Create a new session with configured limits"""
         self._adjust_pool_size()
@@ -85,8 +262,8 @@ class PoolManager:
             try:
                 await session.close()
             except Exception as e:
-                self.error_logger.log_error({
+                self._log_error({
                     'service': service,
                     'action': 'cleanup',
                     'error': str(e)
-                }, 'critical') 
\ No newline at end of file
+                }, 'critical')
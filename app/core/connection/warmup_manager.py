@@ -1,10 +1,14 @@
-from typing import Dict, Set, Optional, Callable, List
-import asyncio
+from typing import Dict, Optional, List
 import logging
+import time
 from datetime import datetime, timedelta
+import aiohttp
 from prometheus_client import Counter, Gauge, Histogram
 from app.core.connection import HeloPoolManager
 from app.core.error_handling import ErrorMetrics
+from app.core.connection.job_scheduler import PeriodicJobScheduler
+from app.core.aja.aja_client import AJAHELOClient
+from app.core.aja.session_registry import HeloSessionRegistry, get_session_registry
 
 class ConnectionWarmupMetrics:
     """Metrics for connection warmup monitoring"""
@@ -14,23 +18,42 @@ class ConnectionWarmupMetrics:
     warm_connections = Gauge('helo_warm_connections', 'Number of warm connections', ['encoder_id'])
 
 class HeloWarmupManager:
-    """Manages connection warmup for HELO devices"""
-    
-    def __init__(self, 
+    """Manages connection warmup for HELO devices
+
+    Warm connections are real keep-alive sockets held in the shared
+    HeloSessionRegistry. Any AJAHELOClient using that registry (which is
+    the default) sends its first command over an already open socket
+    instead of paying for a TCP handshake. The number of sockets kept per
+    encoder follows ``preemptive_warmup_schedule`` and events registered
+    with ``schedule_warmup``.
+    """
+
+    def __init__(self,
                  pool_manager: HeloPoolManager,
                  metrics: ErrorMetrics,
                  max_warm_connections: int = 3,
                  warmup_interval: int = 300,  # 5 minutes
-                 preemptive_warmup_schedule: Optional[Dict[str, List[int]]] = None):
+                 preemptive_warmup_schedule: Optional[Dict[str, List[int]]] = None,
+                 scheduler: Optional[PeriodicJobScheduler] = None,
+                 registry: Optional[HeloSessionRegistry] = None,
+                 min_warm_connections: int = 1,
+                 warmup_lead_time: int = 600,  # 10 minutes
+                 warmup_path: str = "/api/v1/status/system"):
         """
         Initialize the HeloWarmupManager.
 
         Args:
             pool_manager (HeloPoolManager): The pool manager to manage HELO connections.
             metrics (EnhancedErrorMetrics): Metrics for monitoring warmup performance.
-            max_warm_connections (int): Maximum number of warm connections to maintain.
+            max_warm_connections (int): Sockets held per encoder around scheduled events.
             warmup_interval (int): Interval in seconds for warmup checks.
-            preemptive_warmup_schedule (Optional[Dict[str, List[int]]]): Schedule for preemptive warmups.
+            preemptive_warmup_schedule (Optional[Dict[str, List[int]]]): Encoder ID to the hours of
+                the day (0-23) it is in use; sockets are scaled up ``warmup_lead_time`` before each.
+            scheduler (Optional[PeriodicJobScheduler]): Job wheel to run warmups on, defaults to the pool manager's.
+            registry (Optional[HeloSessionRegistry]): Registry holding the sockets, defaults to the shared one.
+            min_warm_connections (int): Sockets held per encoder outside scheduled events.
+            warmup_lead_time (int): Seconds before a scheduled event to start holding max_warm_connections.
+            warmup_path (str): Cheap endpoint requested on each socket to open and refresh it.
 
         Example:
             warmup_manager = HeloWarmupManager(pool_manager, metrics)
@@ -39,169 +62,187 @@ class HeloWarmupManager:
         self.metrics = metrics
         self.warmup_metrics = ConnectionWarmupMetrics()
         self.logger = logging.getLogger(__name__)
-        
+
         self.max_warm_connections = max_warm_connections
+        self.min_warm_connections = min_warm_connections
         self.warmup_interval = warmup_interval
+        self.warmup_lead_time = warmup_lead_time
+        self.warmup_path = warmup_path
         self.preemptive_warmup_schedule = preemptive_warmup_schedule or {}
-        
-        self._warm_connections: Dict[str, Set[str]] = {}
-        self._warmup_tasks: Dict[str, asyncio.Task] = {}
-        self._last_used: Dict[str, datetime] = {}
 
-    async def start_warmup(self, encoder_id: str):
+        self.scheduler = scheduler or pool_manager.scheduler
+        self.registry = registry or get_session_registry()
+        # Idle sockets close after keepalive_timeout, so refresh well inside it
+        self.refresh_interval = min(self.warmup_interval, self.registry.keepalive_timeout / 2)
+        self._hosts: Dict[str, str] = {}  # encoder_id -> ip:port
+        self._upcoming_events: Dict[str, List[datetime]] = {}
+
+    async def start_warmup(self, encoder_id: str, host: Optional[str] = None):
         """
         Start connection warmup for an encoder.
 
         Args:
             encoder_id (str): The ID of the encoder to warm up.
+            host (Optional[str]): ``ip:port`` of the encoder, looked up through the encoder manager if omitted.
 
         Example:
             await warmup_manager.start_warmup('encoder_1')
         """
-        if encoder_id not in self._warmup_tasks:
-            self._warmup_tasks[encoder_id] = asyncio.create_task(
-                self._warmup_loop(encoder_id)
-            )
-            self._warm_connections[encoder_id] = set()
+        if host is not None:
+            self._hosts[encoder_id] = host
+        if not self.scheduler.has_job('warmup', encoder_id):
+            self.scheduler.add_job('warmup', encoder_id, self.refresh_interval, self._maintain_warm_pool)
             self.logger.info(f"Started warmup for encoder {encoder_id}")
 
-    async def get_warm_connection(self, encoder_id: str) -> Optional[str]:
+    async def _get_host(self, encoder_id: str) -> str:
+        host = self._hosts.get(encoder_id)
+        if host is None:
+            client = await self.pool_manager.encoder_manager.get_client(encoder_id)
+            host = self._hosts[encoder_id] = client.host
+        return host
+
+    async def schedule_warmup(self, encoder_id: str, event_time: Optional[datetime] = None):
         """
-        Get a warm connection for an encoder.
+        Warm an encoder now, or ahead of an event.
 
         Args:
             encoder_id (str): The ID of the encoder.
-
-        Returns:
-            Optional[str]: The ID of a warm connection if available, otherwise None.
+            event_time (Optional[datetime]): Start of an upcoming event; sockets are scaled
+                up ``warmup_lead_time`` before it. Warms immediately when omitted.
 
         Example:
-            connection_id = await warmup_manager.get_warm_connection('encoder_1')
+            await warmup_manager.schedule_warmup('encoder_1', show.start_time)
         """
-        if encoder_id in self._warm_connections and self._warm_connections[encoder_id]:
-            connection_id = self._warm_connections[encoder_id].pop()
-            self._last_used[connection_id] = datetime.utcnow()
-            self.warmup_metrics.warm_connections.labels(encoder_id).dec()
-            return connection_id
-        return None
+        await self.start_warmup(encoder_id)
+        if event_time is None:
+            await self._maintain_warm_pool(encoder_id)
+            return
+
+        now = datetime.now()
+        lead = timedelta(seconds=self.warmup_lead_time)
+        events = [e for e in self._upcoming_events.get(encoder_id, []) if e + lead > now]
+        events.append(event_time)
+        self._upcoming_events[encoder_id] = sorted(events)
+        if event_time - lead <= now:
+            await self._maintain_warm_pool(encoder_id)
 
-    async def _warmup_loop(self, encoder_id: str):
+    def _target_connections(self, encoder_id: str, now: Optional[datetime] = None) -> int:
+        """Sockets to hold for an encoder right now"""
+        now = now or datetime.now()
+        lead = timedelta(seconds=self.warmup_lead_time)
+
+        for event_time in self._upcoming_events.get(encoder_id, []):
+            if event_time - lead <= now <= event_time + lead:
+                return self.max_warm_connections
+
+        for hour in self.preemptive_warmup_schedule.get(encoder_id, []):
+            start = now.replace(hour=hour % 24, minute=0, second=0, microsecond=0)
+            # Also consider tomorrow's slot when we are in the lead-up just before midnight
+            for slot in (start, start + timedelta(days=1)):
+                if slot - lead <= now < slot + timedelta(hours=1):
+                    return self.max_warm_connections
+
+        return self.min_warm_connections
+
+    async def get_warm_connection(self, encoder_id: str) -> Optional[aiohttp.ClientSession]:
         """
-        Maintain warm connections for an encoder.
+        Get the keep-alive session holding an encoder's warm sockets.
 
         Args:
             encoder_id (str): The ID of the encoder.
 
-        This method runs indefinitely to ensure the encoder has the required number of warm connections.
+        Returns:
+            Optional[aiohttp.ClientSession]: The shared session if it has idle warm sockets, otherwise None.
+            It belongs to the registry and must not be closed by the caller.
+
+        Example:
+            session = await warmup_manager.get_warm_connection('encoder_1')
         """
-        while True:
-            try:
-                await self._maintain_warm_pool(encoder_id)
-                await asyncio.sleep(self.warmup_interval)
-            except Exception as e:
-                self.logger.error(f"Error in warmup loop for {encoder_id}: {str(e)}")
-                await asyncio.sleep(self.warmup_interval * 2)  # Back off on error
+        host = self._hosts.get(encoder_id)
+        if host is None or not self.registry.idle_sockets(host):
+            return None
+        return await self.registry.get_session(host)
 
-    async def _maintain_warm_pool(self, encoder_id: str):
+    async def get_warm_client(self, encoder_id: str) -> AJAHELOClient:
         """
-        Maintain the pool of warm connections.
+        Get an AJAHELOClient whose requests go over the encoder's warm sockets.
 
         Args:
             encoder_id (str): The ID of the encoder.
 
-        Ensures the number of warm connections does not fall below the specified maximum.
+        Returns:
+            AJAHELOClient: Client bound to the registry holding the warm sockets.
+
+        Example:
+            client = await warmup_manager.get_warm_client('encoder_1')
+            await client.start_stream()
         """
-        current_count = len(self._warm_connections[encoder_id])
-        needed = self.max_warm_connections - current_count
-        
-        if needed > 0:
-            self.logger.debug(f"Warming up {needed} connections for {encoder_id}")
-            for _ in range(needed):
-                await self._warmup_connection(encoder_id)
+        encoder_manager = getattr(self.pool_manager, 'encoder_manager', None)
+        if encoder_manager is not None and encoder_id not in self._hosts:
+            client = await encoder_manager.get_client(encoder_id)
+            if client.registry is self.registry:
+                self._hosts[encoder_id] = client.host
+                return client
 
-    async def _warmup_connection(self, encoder_id: str):
+        ip_address, _, port = (await self._get_host(encoder_id)).partition(':')
+        return AJAHELOClient(ip_address, port=int(port or 80), registry=self.registry, encoder_id=encoder_id)
+
+    async def _maintain_warm_pool(self, encoder_id: str):
         """
-        Warm up a single connection.
+        Open or refresh the encoder's warm sockets.
 
         Args:
             encoder_id (str): The ID of the encoder.
 
-        This method attempts to establish and prepare a connection for use.
+        Runs on every refresh interval; touching the sockets keeps them inside the
+        connector's keep-alive window.
         """
+        host = await self._get_host(encoder_id)
+        target = self._target_connections(encoder_id)
+        if target <= 0:
+            self.warmup_metrics.warm_connections.labels(encoder_id).set(self.registry.idle_sockets(host))
+            return
+
         self.warmup_metrics.warmup_attempts.labels(encoder_id).inc()
-        start_time = datetime.utcnow()
-        
-        try:
-            # Get connection from pool
-            async with self.pool_manager.get_helo_connection(encoder_id) as connection:
-                # Perform warmup sequence
-                await self._execute_warmup_sequence(connection)
-                
-                # Add to warm pool
-                connection_id = id(connection)
-                self._warm_connections[encoder_id].add(connection_id)
-                self._last_used[connection_id] = datetime.utcnow()
-                
-                # Update metrics
-                duration = (datetime.utcnow() - start_time).total_seconds()
-                self.warmup_metrics.warmup_duration.observe(duration)
-                self.warmup_metrics.warmup_success.labels(encoder_id).inc()
-                self.warmup_metrics.warm_connections.labels(encoder_id).inc()
-                
-                self.logger.debug(f"Successfully warmed up connection for {encoder_id}")
-                
-        except Exception as e:
-            self.logger.error(f"Failed to warm up connection for {encoder_id}: {str(e)}")
-            raise
-
-    async def _execute_warmup_sequence(self, connection, custom_sequence: Optional[Callable] = None) -> bool:
-        """
-        Execute connection warmup sequence.
+        start_time = time.perf_counter()
+        warm = await self.registry.prewarm(host, target, self.warmup_path)
+        self.warmup_metrics.warmup_duration.observe(time.perf_counter() - start_time)
+        self.warmup_metrics.warm_connections.labels(encoder_id).set(warm)
 
-        Args:
-            connection: The connection object to warm up.
-            custom_sequence (Optional[Callable]): A custom sequence of steps for warming up.
+        if warm >= min(target, self.registry.limit_per_host):
+            self.warmup_metrics.warmup_success.labels(encoder_id).inc()
+            self.logger.debug(f"Holding {warm} warm connections for {encoder_id}")
+        else:
+            self.logger.warning(f"Only {warm}/{target} warm connections for {encoder_id} at {host}")
 
-        Returns:
-            bool: True if the warmup sequence was successful, False otherwise.
+    def warm_connection_count(self, encoder_id: str) -> int:
+        host = self._hosts.get(encoder_id)
+        return self.registry.idle_sockets(host) if host else 0
 
-        Example:
-            success = await warmup_manager._execute_warmup_sequence(connection, custom_sequence=my_custom_sequence)
-        """
-        try:
-            if custom_sequence:
-                await custom_sequence(connection)
-            else:
-                # Default warmup sequence
-                await connection.ping()
-                await connection.get_status()
-                await connection.prepare_configs()
-            
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"Warmup sequence failed: {str(e)}")
-            return False
+    async def force_reset_connection(self, encoder_id: str, connection_id: Optional[str] = None):
+        """
+        Close every socket to an encoder so the next request reconnects.
+
+        Args:
+            encoder_id (str): The ID of the encoder.
+            connection_id (Optional[str]): Kept for callers that track connections individually;
+                sockets to one host are reset together.
+        """
+        host = self._hosts.get(encoder_id)
+        if host is not None:
+            await self.registry.reset_host(host)
+        self.warmup_metrics.warm_connections.labels(encoder_id).set(0)
+        self.logger.info(f"Reset connections for encoder {encoder_id}")
 
     async def cleanup_stale_connections(self):
         """
-        Clean up stale warm connections.
+        Refresh the warm connection gauges.
 
-        This method removes connections that have not been used within a specified threshold.
+        Idle sockets past the keep-alive window are closed by the connector itself,
+        and encoders outside their schedule only hold ``min_warm_connections``.
         """
-        stale_threshold = datetime.utcnow() - timedelta(seconds=self.warmup_interval * 2)
-        
-        for encoder_id in list(self._warm_connections.keys()):
-            stale_connections = {
-                conn_id for conn_id in self._warm_connections[encoder_id]
-                if self._last_used.get(conn_id, datetime.min) < stale_threshold
-            }
-            
-            for conn_id in stale_connections:
-                self._warm_connections[encoder_id].remove(conn_id)
-                del self._last_used[conn_id]
-                self.warmup_metrics.warm_connections.labels(encoder_id).dec()
-                self.logger.info(f"Removed stale connection {conn_id} for encoder {encoder_id}")
+        for encoder_id, host in self._hosts.items():
+            self.warmup_metrics.warm_connections.labels(encoder_id).set(self.registry.idle_sockets(host))
 
     async def stop_warmup(self, encoder_id: str):
         """
@@ -213,8 +254,7 @@ class HeloWarmupManager:
         Example:
             await warmup_manager.stop_warmup('encoder_1')
         """
-        if encoder_id in self._warmup_tasks:
-            self._warmup_tasks[encoder_id].cancel()
-            del self._warmup_tasks[encoder_id]
-            del self._warm_connections[encoder_id]
-            self.logger.info(f"Stopped warmup for encoder {encoder_id}") 
\ No newline at end of file
+        if self.scheduler.has_job('warmup', encoder_id):
+            self.scheduler.remove_job('warmup', encoder_id)
+            self._upcoming_events.pop(encoder_id, None)
+            self.logger.info(f"Stopped warmup for encoder {encoder_id}")
@@ -1,37 +1,98 @@
-import json, time, logging, psycopg2, requests
+import json, time, asyncio, logging, aiohttp
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, Any
-from psycopg2.extras import DictCursor
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from psycopg2.extras import DictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
+from prometheus_client import Counter, Histogram
 from app.core.aja.aja_constants import AJAParameters, AJAStreamParams
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class DBConnection:
-    def __init__(self, dbname: str, user: str, password: str, host: str, port: str):
-        self.conn_params = {
-            "dbname": dbname,
-            "user": user,
-            "password": password,
-            "host": host,
-            "port": port
-        }
+class DBConnectionPool:
+    """Thread-safe psycopg2 connection pool shared by a poller for its lifetime"""
+
+    def __init__(self, dbname: str, user: str, password: str, host: str, port: str,
+                 min_connections: int = 1, max_connections: int = 4):
+        self._pool = ThreadedConnectionPool(
+            min_connections,
+            max_connections,
+            dbname=dbname,
+            user=user,
+            password=password,
+            host=host,
+            port=port
+        )
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; commit on success, roll back on error"""
+        conn = self._pool.getconn()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._pool.putconn(conn)
 
-    def __enter__(self):
-        self.conn = psycopg2.connect(**self.conn_params)
-        return self.conn
+    def close(self):
+        self._pool.closeall()
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.conn.close()
+class PollerMetrics:
+    """Polling cycle metrics"""
+    cycle_duration = Histogram('helo_poll_cycle_seconds', 'Duration of a full encoder polling sweep')
+    device_latency = Histogram('helo_poll_device_latency_seconds', 'Per-device status fetch latency',
+                               ['encoder_id'])
+    device_timeouts = Counter('helo_poll_device_timeouts_total', 'Encoders that missed their poll deadline',
+                              ['encoder_id'])
+    overruns = Counter('helo_poll_cycle_overruns_total', 'Polling sweeps that exceeded the poll interval')
 
 class EncoderPoller:
-    def __init__(self, db_config: Dict[str, str]):
+    def __init__(self, db_config: Dict[str, str],
+                 max_concurrency: int = 20,
+                 device_deadline: float = 10.0,
+                 poll_interval: int = 30,
+                 on_status: Optional[Callable[[Any, Dict[str, Any]], None]] = None):
+        """
+        Args:
+            db_config: psycopg2 connection parameters
+            max_concurrency: Maximum number of encoders polled at the same time
+            device_deadline: Seconds allowed for one encoder, covering both status requests
+            poll_interval: Seconds between the start of consecutive sweeps
+            on_status: Called with (encoder, status) for every polled encoder, e.g. to update fleet aggregates
+        """
         self.db_config = db_config
-        self.timeout = 5  # seconds
+        self.timeout = 5  # seconds, per request
+        self.max_concurrency = max_concurrency
+        self.device_deadline = device_deadline
+        self.poll_interval = poll_interval
+        self.on_status = on_status
+        self.metrics = PollerMetrics()
+        self._db_pool: Optional[DBConnectionPool] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def db_pool(self) -> DBConnectionPool:
+        if self._db_pool is None:
+            self._db_pool = DBConnectionPool(**self.db_config)
+        return self._db_pool
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=2)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
 
     def get_encoders(self) -> list:
         """Fetch all active encoders from database"""
-        with DBConnection(**self.db_config) as conn:
+        with self.db_pool.connection() as conn:
             with conn.cursor(cursor_factory=DictCursor) as cur:
                 cur.execute("""
                     SELECT id, name, ip_address, port 
@@ -40,18 +101,19 @@ class EncoderPoller:
                 """)
                 return cur.fetchall()
 
-    def fetch_encoder_status(self, ip: str, port: int) -> Dict[str, Any]:
+    async def _get_json(self, session: aiohttp.ClientSession, url: str) -> Dict[str, Any]:
+        async with session.get(url) as response:
+            return await response.json(content_type=None)
+
+    async def fetch_encoder_status(self, ip: str, port: int) -> Dict[str, Any]:
         """Fetch encoder status via AJA REST API"""
+        session = await self._get_session()
         try:
-            # Fetch streaming status
-            stream_url = f"http://{ip}:{port}/api/v1/status/streaming"
-            stream_resp = requests.get(stream_url, timeout=self.timeout)
-            stream_data = stream_resp.json()
-
-            # Fetch system status
-            system_url = f"http://{ip}:{port}/api/v1/status/system"
-            system_resp = requests.get(system_url, timeout=self.timeout)
-            system_data = system_resp.json()
+            # Streaming and system status are independent, fetch them together
+            stream_data, system_data = await asyncio.gather(
+                self._get_json(session, f"http://{ip}:{port}/api/v1/status/streaming"),
+                self._get_json(session, f"http://{ip}:{port}/api/v1/status/system")
+            )
 
             return {
                 "level": "INFO" if stream_data.get("streaming") else "WARNING",
@@ -62,60 +124,146 @@ class EncoderPoller:
                 },
                 "timestamp": datetime.now()
             }
-        except requests.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
             return {
                 "level": "ERROR",
-                "message": f"Connection error: {str(e)}",
-                "raw_json": {"error": str(e)},
+                "message": f"Connection error: {str(e) or type(e).__name__}",
+                "raw_json": {"error": str(e) or type(e).__name__},
                 "timestamp": datetime.now()
             }
 
-    def save_log(self, encoder_id: str, log_data: Dict[str, Any]):
-        """Save encoder log to database"""
-        with DBConnection(**self.db_config) as conn:
+    async def _poll_encoder(self, encoder) -> Tuple[Any, Dict[str, Any], float]:
+        """Poll one encoder under the concurrency limit and its deadline"""
+        async with self._semaphore:
+            start = time.perf_counter()
+            try:
+                status = await asyncio.wait_for(
+                    self.fetch_encoder_status(encoder['ip_address'], encoder['port']),
+                    timeout=self.device_deadline
+                )
+            except asyncio.TimeoutError:
+                self.metrics.device_timeouts.labels(str(encoder['id'])).inc()
+                status = {
+                    "level": "ERROR",
+                    "message": f"Poll deadline of {self.device_deadline}s exceeded",
+                    "raw_json": {"error": "deadline exceeded"},
+                    "timestamp": datetime.now()
+                }
+            latency = time.perf_counter() - start
+            self.metrics.device_latency.labels(str(encoder['id'])).observe(latency)
+            return encoder, status, latency
+
+    def save_cycle(self, results: List[Tuple[Any, Dict[str, Any], float]]):
+        """Write all logs and status updates from one sweep in a single transaction"""
+        if not results:
+            return
+
+        log_rows = [
+            (
+                encoder['id'],
+                status["level"],
+                status["message"],
+                json.dumps(status["raw_json"]),
+                status["timestamp"]
+            )
+            for encoder, status, _ in results
+        ]
+        status_rows = [
+            (encoder['id'], 'online' if status['level'] == 'INFO' else 'error')
+            for encoder, status, _ in results
+        ]
+
+        with self.db_pool.connection() as conn:
             with conn.cursor() as cur:
-                cur.execute("""
+                execute_values(cur, """
                     INSERT INTO encoder_logs 
                     (encoder_id, level, message, raw_json, created_at)
-                    VALUES (%s, %s, %s, %s, %s)
-                """, (
-                    encoder_id,
-                    log_data["level"],
-                    log_data["message"],
-                    json.dumps(log_data["raw_json"]),
-                    log_data["timestamp"]
-                ))
-                conn.commit()
-
-    def update_encoder_status(self, encoder_id: str, status: str):
-        """Update encoder status in database"""
-        with DBConnection(**self.db_config) as conn:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    UPDATE encoders 
-                    SET status = %s, last_seen = CURRENT_TIMESTAMP
-                    WHERE id = %s
-                """, (status, encoder_id))
-                conn.commit()
-
-    def poll(self):
-        """Main polling function"""
-        encoders = self.get_encoders()
-        for encoder in encoders:
-            try:
-                status = self.fetch_encoder_status(encoder['ip_address'], encoder['port'])
-                self.save_log(encoder['id'], status)
-                
-                # Update encoder status
-                new_status = 'online' if status['level'] == 'INFO' else 'error'
-                self.update_encoder_status(encoder['id'], new_status)
-                
-                logger.info(f"Polled encoder {encoder['name']}: {status['message']}")
-            except Exception as e:
-                logger.error(f"Error polling encoder {encoder['name']}: {str(e)}")
-
-def main():
-    db_config = {
+                    VALUES %s
+                """, log_rows)
+                execute_values(cur, """
+                    UPDATE encoders AS e
+                    SET status = v.status, last_seen = CURRENT_TIMESTAMP
+                    FROM (VALUES %s) AS v(id, status)
+                    WHERE e.id = v.id::integer
+                """, status_rows)
+
+    async def poll(self) -> Dict[str, Any]:
+        """Run one polling sweep over all active encoders
+
+        Returns:
+            Cycle report with total duration and per-device latency
+        """
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        cycle_start = time.perf_counter()
+        encoders = await loop.run_in_executor(None, self.get_encoders)
+
+        results = []
+        for outcome in await asyncio.gather(
+            *(self._poll_encoder(encoder) for encoder in encoders),
+            return_exceptions=True
+        ):
+            if isinstance(outcome, Exception):
+                logger.error(f"Error polling encoder: {str(outcome)}")
+                continue
+            encoder, status, latency = outcome
+            results.append(outcome)
+            logger.info(f"Polled encoder {encoder['name']} in {latency:.3f}s: {status['message']}")
+            if self.on_status is not None:
+                try:
+                    self.on_status(encoder, status)
+                except Exception as e:
+                    logger.error(f"Status callback failed for encoder {encoder['name']}: {str(e)}")
+
+        await loop.run_in_executor(None, self.save_cycle, results)
+
+        duration = time.perf_counter() - cycle_start
+        self.metrics.cycle_duration.observe(duration)
+        if duration > self.poll_interval:
+            self.metrics.overruns.inc()
+            logger.warning(
+                f"Polling sweep of {len(encoders)} encoders took {duration:.2f}s, "
+                f"longer than the {self.poll_interval}s interval"
+            )
+
+        return {
+            "encoders": len(encoders),
+            "cycle_duration": duration,
+            "fits_interval": duration <= self.poll_interval,
+            "device_latency": {
+                str(encoder['id']): latency for encoder, _, latency in results
+            }
+        }
+
+    async def run(self):
+        """Poll continuously, starting a sweep every poll_interval seconds"""
+        try:
+            while True:
+                started = time.monotonic()
+                try:
+                    await self.poll()
+                except Exception as e:
+                    logger.error(f"Polling error: {str(e)}")
+                    await asyncio.sleep(60)  # Wait longer on error
+                    continue
+                elapsed = time.monotonic() - started
+                await asyncio.sleep(max(0.0, self.poll_interval - elapsed))
+        finally:
+            await self.close()
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+        if self._db_pool is not None:
+            self._db_pool.close()
+            self._db_pool = None
+
+def main(db_config: Optional[Dict[str, str]] = None,
+         on_status: Optional[Callable[[Any, Dict[str, Any]], None]] = None):
+    """Poll until interrupted; realtime.init_websocket runs this in-process to feed fleet aggregates"""
+    db_config = db_config or {
         "dbname": "your_db_name",
         "user": "your_user",
         "password": "your_password",
@@ -123,18 +271,12 @@ def main():
         "port": "your_port"
     }
     
-    poller = EncoderPoller(db_config)
+    poller = EncoderPoller(db_config, on_status=on_status)
     
-    while True:
-        try:
-            poller.poll()
-            time.sleep(30)  # Poll every 30 seconds
-        except KeyboardInterrupt:
-            logger.info("Polling stopped by user")
-            break
-        except Exception as e:
-            logger.error(f"Polling error: {str(e)}")
-            time.sleep(60)  # Wait longer on error
+    try:
+        asyncio.run(poller.run())  # Poll every 30 seconds
+    except KeyboardInterrupt:
+        logger.info("Polling stopped by user")
 
 if __name__ == "__main__":
     main()
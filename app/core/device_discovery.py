@@ -1,6 +1,7 @@
-from typing import List, Dict, Optional
+from typing import AsyncIterator, Iterable, List, Dict, Mapping, Optional, Set, Union
 import ipaddress
 import asyncio
+import time
 import aiohttp
 import logging
 from datetime import datetime
@@ -9,6 +10,7 @@ from app.core.endpoint_registry import EndpointRegistry
 from dataclasses import dataclass
 from enum import Enum
 from app.core.security.rbac import roles_required
+from app.core.device_liveness import DeviceStateStore, LivenessScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -28,44 +30,148 @@ class EncoderStatus:
     retry_count: int
     config_version: str
 
+def parse_scan_networks(networks: Union[str, Iterable[str]], max_addresses: int = 1024) -> List[str]:
+    """Validate network ranges requested for a scan
+
+    Args:
+        networks: One CIDR or a list of them
+        max_addresses: Largest range accepted, in addresses; 1024 is a /22
+
+    Returns:
+        The ranges in canonical form
+
+    Raises:
+        ValueError: If a range is malformed or larger than ``max_addresses``
+    """
+    if isinstance(networks, str):
+        networks = [networks]
+    if not isinstance(networks, (list, tuple)) or not networks:
+        raise ValueError("networks must be a CIDR or a non-empty list of CIDRs")
+    parsed = []
+    for network in networks:
+        if not isinstance(network, str):
+            raise ValueError(f"Invalid network range: {network!r}")
+        try:
+            network = ipaddress.ip_network(network, strict=False)
+        except ValueError:
+            raise ValueError(f"Invalid network range: {network!r}")
+        if network.num_addresses > max_addresses:
+            raise ValueError(f"Network range {network} is larger than {max_addresses} addresses")
+        parsed.append(str(network))
+    return parsed
+
 class HeloDiscovery:
     """Scanner for discovering AJA Helo encoders on the network"""
     
-    def __init__(self, endpoint_registry: EndpointRegistry):
+    def __init__(self, endpoint_registry: EndpointRegistry,
+                 max_concurrency: int = 64,
+                 probes_per_second: float = 200.0,
+                 connect_timeout: float = 0.5,
+                 liveness_min_interval: float = 5.0,
+                 liveness_max_interval: float = 300.0):
+        """
+        Args:
+            endpoint_registry: Registry used for state change notifications
+            max_concurrency: Hosts probed at the same time during a scan
+            probes_per_second: Upper bound on new connection attempts per second
+            connect_timeout: Seconds to wait for the TCP pre-filter connect
+            liveness_min_interval: Probe interval for devices that just changed state
+            liveness_max_interval: Probe interval for devices that have been stable
+        """
         self.endpoint_registry = endpoint_registry
-        self.known_devices: Dict[str, datetime] = {}  # IP -> last_seen
-        self.encoder_states: Dict[str, EncoderStatus] = {}
+        self.store = DeviceStateStore()
         self.HELO_PORT = 80  # Default HTTP port for Helo devices
         self.SCAN_TIMEOUT = 2  # Seconds to wait for response
         self.MAX_RETRIES = 3
-        self.RETRY_DELAY = 5
-        
+        self.RETRY_DELAY = 5  # First retry delay, doubled on each failure
+        self.max_concurrency = max_concurrency
+        self.probe_interval = 1.0 / probes_per_second if probes_per_second else 0.0
+        self.connect_timeout = connect_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._next_probe_at = 0.0
+        self._retry_at: Dict[str, float] = {}  # IP -> monotonic time of next retry
+        self.liveness = LivenessScheduler(
+            self.store,
+            probe=self._port_open,
+            on_transition=self._on_liveness_change,
+            min_interval=liveness_min_interval,
+            max_interval=liveness_max_interval,
+            max_concurrency=max_concurrency
+        )
+
+    @property
+    def known_devices(self) -> Mapping[str, datetime]:
+        """IP -> last seen, read-only; updated through ``self.store``"""
+        return self.store.last_seen
+
+    @property
+    def encoder_states(self) -> Dict[str, EncoderStatus]:
+        return self.store.states
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """One session and connector shared by every probe"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency, force_close=True),
+                timeout=aiohttp.ClientTimeout(total=self.SCAN_TIMEOUT)
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _throttle(self) -> None:
+        """Space connection attempts so a scan cannot burst the network"""
+        if not self.probe_interval:
+            return
+        now = time.monotonic()
+        slot = max(now, self._next_probe_at)
+        self._next_probe_at = slot + self.probe_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _port_open(self, ip: str) -> bool:
+        """Cheap TCP connect check so dead addresses never reach the HTTP probe"""
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(ip, self.HELO_PORT),
+                timeout=self.connect_timeout
+            )
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
+
     async def probe_device(self, ip: str) -> Optional[Dict]:
         """Probe a single IP address for AJA Helo device"""
         url = f"http://{ip}/config"  # AJA Helo config endpoint
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url, 
-                    timeout=self.SCAN_TIMEOUT
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        # Verify it's a Helo device by checking specific headers/response
-                        if self._is_helo_device(data):
-                            device_info = {
-                                'ip': ip,
-                                'serial': data.get('serial_number'),
-                                'name': data.get('device_name', f'Helo-{ip}'),
-                                'firmware': data.get('firmware_version'),
-                                'last_seen': datetime.now()
-                            }
-                            # Check for configuration changes
-                            await self._detect_config_changes(ip, data)
-                            await self._update_device_state(ip, data)
-                            return device_info
-                            
+            session = self._get_session()
+            async with session.get(url) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    # Verify it's a Helo device by checking specific headers/response
+                    if self._is_helo_device(data):
+                        device_info = {
+                            'ip': ip,
+                            'serial': data.get('serial_number'),
+                            'name': data.get('device_name', f'Helo-{ip}'),
+                            'firmware': data.get('firmware_version'),
+                            'last_seen': datetime.now()
+                        }
+                        # Check for configuration changes
+                        await self._detect_config_changes(ip, data)
+                        await self._update_device_state(ip, data)
+                        self._retry_at.pop(ip, None)
+                        return device_info
+                        
         except Exception as e:
             logger.debug(f"Failed to probe {ip}: {str(e)}")
             await self._handle_connection_error(ip, str(e))
@@ -78,35 +184,106 @@ class HeloDiscovery:
         return all(key in response_data for key in required_keys) and \
                response_data.get('device_type') == 'AJA_HELO'
 
-    async def scan_network(self, network: str = "192.168.1.0/24") -> List[Dict]:
+    @staticmethod
+    def _hosts(networks: Iterable[str]) -> Iterable[str]:
+        """Host addresses across all CIDRs, each yielded once"""
+        seen: Set[str] = set()
+        for network in networks:
+            for ip in ipaddress.ip_network(network, strict=False).hosts():
+                ip = str(ip)
+                if ip not in seen:
+                    seen.add(ip)
+                    yield ip
+
+    async def _scan_host(self, ip: str) -> Optional[Dict]:
+        await self._throttle()
+        if not await self._port_open(ip):
+            return None
+        return await self.probe_device(ip)
+
+    async def iter_scan(self, networks: Union[str, Iterable[str]]) -> AsyncIterator[Dict]:
+        """
+        Scan one or more network ranges, yielding devices as they answer
+        
+        At most ``max_concurrency`` hosts are in flight. Each one gets a TCP
+        connect check before the HTTP probe. Failed devices are not retried
+        here; see ``retry_due``.
+        
+        Args:
+            networks: CIDR string or iterable of CIDR strings
+        """
+        if isinstance(networks, str):
+            networks = [networks]
+        hosts = iter(self._hosts(networks))
+        results: asyncio.Queue = asyncio.Queue()
+
+        async def worker():
+            try:
+                # Workers pull lazily, so a /16 never materialises as tasks
+                for ip in hosts:
+                    device = await self._scan_host(ip)
+                    if device is not None:
+                        await results.put(device)
+            finally:
+                await results.put(None)
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.max_concurrency)]
+        try:
+            running = len(workers)
+            while running:
+                device = await results.get()
+                if device is None:
+                    running -= 1
+                    continue
+                self._track(device)
+                yield device
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def scan_network(self, network: Union[str, List[str]] = "192.168.1.0/24") -> List[Dict]:
         """
         Scan network range for Helo devices
         
         Args:
-            network: Network range in CIDR notation
+            network: Network range in CIDR notation, or a list of ranges
         
         Returns:
             List of discovered Helo devices
         """
-        network = ipaddress.ip_network(network)
-        tasks = []
-        
-        # Create probe tasks for each IP in the network
-        for ip in network.hosts():
-            tasks.append(self.probe_device(str(ip)))
-        
-        # Run probes concurrently
-        results = await asyncio.gather(*tasks)
-        
-        # Filter out None results and update known devices
-        discovered_devices = [r for r in results if r is not None]
-        
-        for device in discovered_devices:
-            self.known_devices[device['ip']] = device['last_seen']
+        discovered_devices = []
+        async for device in self.iter_scan(network):
+            # Register as results arrive instead of after the whole sweep
             await self._register_device(device)
-        
+            discovered_devices.append(device)
         return discovered_devices
 
+    async def retry_due(self) -> List[Dict]:
+        """Re-probe devices whose backoff has expired"""
+        now = time.monotonic()
+        due = [ip for ip, retry_at in self._retry_at.items() if retry_at <= now]
+        if not due:
+            return []
+        for ip in due:
+            del self._retry_at[ip]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def retry(ip: str) -> Optional[Dict]:
+            async with semaphore:
+                await self._throttle()
+                return await self.probe_device(ip)
+
+        results = await asyncio.gather(*(retry(ip) for ip in due))
+        recovered = [device for device in results if device is not None]
+        for device in recovered:
+            self._track(device)
+        return recovered
+
+    def _track(self, device: Dict) -> None:
+        self.store.mark_online(device['ip'], device['last_seen'])
+        self.liveness.track(device['ip'], delay=self.liveness.min_interval)
+
     @roles_required('admin', 'editor')
     async def _register_device(self, device: Dict) -> None:
         """Register discovered device in the system"""
@@ -140,22 +317,38 @@ class HeloDiscovery:
         """
         Continuously monitor known devices
         
+        Each device is probed on its own schedule by ``self.liveness``,
+        between ``liveness_min_interval`` and ``interval`` seconds apart.
+        
         Args:
-            interval: Monitoring interval in seconds
+            interval: Longest probe interval for a stable device, in seconds
         """
+        self.liveness.max_interval = interval
+        for ip in self.store.ips():
+            self.liveness.track(ip)
+        await asyncio.gather(self.liveness.run(), self._run_retries())
+
+    async def _run_retries(self, poll: float = 1.0) -> None:
         while True:
-            for ip in list(self.known_devices.keys()):
-                result = await self.probe_device(ip)
-                if result:
-                    self.known_devices[ip] = datetime.now()
-                    # Reset retry count on successful connection
-                    if ip in self.encoder_states:
-                        self.encoder_states[ip].retry_count = 0
-                else:
-                    # Device not responding, mark as offline
-                    logger.warning(f"Device {ip} not responding")
-                    
-            await asyncio.sleep(interval) 
+            await self.retry_due()
+            await asyncio.sleep(poll)
+
+    async def _on_liveness_change(self, ip: str, online: bool) -> None:
+        """Refresh state when a device returns; flag it as soon as it drops"""
+        if online:
+            # Full /config probe only on recovery; steady-state checks are TCP connects
+            await self.probe_device(ip)
+        elif ip in self.encoder_states:
+            state = self.encoder_states[ip]
+            state.state = StreamingState.ERROR
+            state.last_error = 'unreachable'
+            logger.warning(f"Device {ip} not responding")
+        if hasattr(self.endpoint_registry, 'websocket'):
+            await self.endpoint_registry.websocket.emit('encoder_liveness', {
+                'ip': ip,
+                'online': online,
+                'last_seen': self.known_devices[ip].isoformat() if ip in self.known_devices else None
+            })
 
     async def _update_device_state(self, ip: str, data: Dict) -> None:
         """Update encoder state information"""
@@ -166,7 +359,7 @@ class HeloDiscovery:
             elif data.get('recording_active'):
                 state = StreamingState.RECORDING
                 
-            self.encoder_states[ip] = EncoderStatus(
+            self.store.states[ip] = EncoderStatus(
                 streaming=data.get('streaming_active', False),
                 recording=data.get('recording_active', False),
                 state=state,
@@ -190,10 +383,10 @@ class HeloDiscovery:
             
             if state.retry_count <= self.MAX_RETRIES:
                 state.state = StreamingState.RECONNECTING
-                await asyncio.sleep(self.RETRY_DELAY)
-                # Attempt reconnection
-                await self.probe_device(ip)
+                # Schedule reconnection with exponential backoff; retry_due picks it up
+                self._retry_at[ip] = time.monotonic() + self.RETRY_DELAY * 2 ** (state.retry_count - 1)
             else:
+                self._retry_at.pop(ip, None)
                 state.state = StreamingState.ERROR
                 await self._notify_state_change(ip)
                 logger.error(f"Device {ip} failed after {self.MAX_RETRIES} retries")
@@ -0,0 +1,213 @@
+import asyncio
+import heapq
+import logging
+import time
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class LivenessRecord:
+    """Probe bookkeeping for one device"""
+    ip: str
+    online: bool = True
+    interval: float = 0.0
+    next_probe: float = 0.0  # time.monotonic()
+    offline_since: Optional[float] = None  # time.time()
+    transitions: int = 0
+
+class DeviceStateStore:
+    """Known devices with indexes for liveness queries.
+
+    Holds what ``HeloDiscovery.known_devices`` and ``encoder_states`` used to
+    be, plus a set of online devices and a time-ordered index of when each
+    offline device went stale, so ``stale_since`` is a bisect rather than a
+    scan of the fleet.
+    """
+
+    def __init__(self):
+        self._last_seen: Dict[str, datetime] = {}
+        self.states: Dict[str, object] = {}  # IP -> EncoderStatus
+        self.records: Dict[str, LivenessRecord] = {}
+        self._online: Set[str] = set()
+        self._stale_index: List[Tuple[float, str]] = []  # (offline_since, ip), sorted
+
+    @property
+    def last_seen(self) -> Mapping[str, datetime]:
+        return MappingProxyType(self._last_seen)
+
+    def __contains__(self, ip: str) -> bool:
+        return ip in self.records
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def ips(self) -> List[str]:
+        return list(self.records)
+
+    def add(self, ip: str, last_seen: Optional[datetime] = None) -> LivenessRecord:
+        record = self.records.get(ip)
+        if record is None:
+            record = self.records[ip] = LivenessRecord(ip)
+            self._online.add(ip)
+        if last_seen is not None:
+            self.mark_online(ip, last_seen)
+        return record
+
+    def mark_online(self, ip: str, last_seen: Optional[datetime] = None) -> bool:
+        """Record a successful probe
+
+        Returns:
+            True if the device was offline before
+        """
+        record = self.records.get(ip) or self.add(ip)
+        self._last_seen[ip] = last_seen or datetime.now()
+        if record.online:
+            return False
+        self._stale_index.pop(bisect_left(self._stale_index, (record.offline_since, ip)))
+        record.online = True
+        record.offline_since = None
+        record.transitions += 1
+        self._online.add(ip)
+        return True
+
+    def mark_offline(self, ip: str, when: Optional[float] = None) -> bool:
+        """Record a failed probe
+
+        Returns:
+            True if the device was online before
+        """
+        record = self.records.get(ip) or self.add(ip)
+        if not record.online:
+            return False
+        record.online = False
+        record.offline_since = time.time() if when is None else when
+        record.transitions += 1
+        self._online.discard(ip)
+        insort(self._stale_index, (record.offline_since, ip))
+        return True
+
+    def online(self) -> Set[str]:
+        return set(self._online)
+
+    def stale_since(self, seconds: float) -> List[str]:
+        """Devices that went offline within the last ``seconds``, oldest first"""
+        start = bisect_left(self._stale_index, (time.time() - seconds, ''))
+        return [ip for _, ip in self._stale_index[start:]]
+
+    def remove(self, ip: str):
+        record = self.records.pop(ip, None)
+        if record is not None and not record.online:
+            self._stale_index.pop(bisect_left(self._stale_index, (record.offline_since, ip)))
+        self._online.discard(ip)
+        self._last_seen.pop(ip, None)
+        self.states.pop(ip, None)
+
+class LivenessScheduler:
+    """Probes each known device on its own adaptive interval.
+
+    A device that just changed state is probed again after
+    ``min_interval``; every unchanged result doubles its interval up to
+    ``max_interval``, so stable units cost little and flapping ones are
+    watched closely. Due probes run concurrently, at most
+    ``max_concurrency`` at a time, and ``on_transition`` is awaited as soon
+    as a device goes offline or comes back.
+    """
+
+    def __init__(self,
+                 store: DeviceStateStore,
+                 probe: Callable[[str], Awaitable[bool]],
+                 on_transition: Optional[Callable[[str, bool], Awaitable[None]]] = None,
+                 min_interval: float = 5.0,
+                 max_interval: float = 300.0,
+                 max_concurrency: int = 16):
+        """
+        Args:
+            store: Device store updated with every probe result
+            probe: Returns True when the device answers
+            on_transition: Called with (ip, online) when a device changes state
+            min_interval: Probe interval right after a state change
+            max_interval: Probe interval for a device that has been stable a while
+            max_concurrency: Probes allowed in flight at once
+        """
+        self.store = store
+        self.probe = probe
+        self.on_transition = on_transition
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._heap: List[Tuple[float, str]] = []
+        self._wakeup = asyncio.Event()
+        self._in_flight: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def track(self, ip: str, delay: float = 0.0):
+        """Start watching a device, or bring its next probe forward"""
+        record = self.store.add(ip)
+        if not record.interval:
+            record.interval = self.min_interval
+        next_probe = time.monotonic() + delay
+        if ip in self._in_flight or (record.next_probe and record.next_probe <= next_probe):
+            return  # Already due sooner
+        record.next_probe = next_probe
+        heapq.heappush(self._heap, (next_probe, ip))
+        self._wakeup.set()
+
+    async def _probe(self, ip: str):
+        async with self._semaphore:
+            try:
+                alive = await self.probe(ip)
+            except Exception as e:
+                logger.debug(f"Liveness probe for {ip} failed: {e}")
+                alive = False
+
+        record = self.store.records.get(ip)
+        self._in_flight.discard(ip)
+        if record is None:
+            return  # Forgotten while the probe was running
+
+        changed = self.store.mark_online(ip) if alive else self.store.mark_offline(ip)
+        if changed:
+            record.interval = self.min_interval
+        else:
+            record.interval = min(record.interval * 2, self.max_interval)
+        record.next_probe = time.monotonic() + record.interval
+        heapq.heappush(self._heap, (record.next_probe, ip))
+        self._wakeup.set()
+
+        if changed:
+            logger.info(f"Device {ip} is {'online' if alive else 'offline'}")
+            if self.on_transition is not None:
+                try:
+                    await self.on_transition(ip, alive)
+                except Exception as e:
+                    logger.error(f"Liveness transition handler failed for {ip}: {e}")
+
+    async def run(self):
+        try:
+            while True:
+                now = time.monotonic()
+                while self._heap and self._heap[0][0] <= now:
+                    due, ip = heapq.heappop(self._heap)
+                    record = self.store.records.get(ip)
+                    # Skip entries superseded by a later reschedule or a removed device
+                    if record is None or due != record.next_probe or ip in self._in_flight:
+                        continue
+                    self._in_flight.add(ip)
+                    task = asyncio.create_task(self._probe(ip))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+
+                self._wakeup.clear()
+                timeout = self._heap[0][0] - now if self._heap else None
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for task in self._tasks:
+                task.cancel()
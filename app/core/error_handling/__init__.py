@@ -1,24 +1,30 @@
-from .decorators import handle_errors
-from .central_error_manager import CentralErrorManager
-from .performance_monitoring import PerformanceMonitor
-from .stream_error_handler import StreamErrorHandler
-from .media_storage_handler import MediaStorageHandler
-from .responses import ErrorResponse, SuccessResponse
-from .analysis import (
-    AjaMetricCollector,
-    Analyzer,
-    BaseMetrics,
-    CorrelationAnalyzer,
-    SystemAnalyzer
-)
-from .bitrate import BitrateControlMechanism, OptimizeBitrate
-from .error_logging import ErrorLogger
-from .errors import (
-    APIError,
-    EncoderError,
-    HeloErrorType,
-    AJAClientError
-)
+from app.core.lazy_loader import lazy_exports
+
+# Exported names are imported from their submodule on first access
+_EXPORTS = {
+    'handle_errors': '.decorators',
+    'CentralErrorManager': '.central_error_manager',
+    'PerformanceMonitor': '.performance_monitoring',
+    'StreamErrorHandler': '.stream_error_handler',
+    'MediaStorageHandler': '.media_storage_handler',
+    'ErrorResponse': '.responses',
+    'SuccessResponse': '.responses',
+    'AjaMetricCollector': '.analysis',
+    'Analyzer': '.analysis',
+    'BaseMetrics': '.analysis',
+    'CorrelationAnalyzer': '.analysis',
+    'SystemAnalyzer': '.analysis',
+    'BitrateControlMechanism': '.bitrate',
+    'OptimizeBitrate': '.bitrate',
+    'ErrorLogger': '.error_logging',
+    'APIError': '.errors',
+    'EncoderError': '.errors',
+    'HeloErrorType': '.errors',
+    'AJAClientError': '.errors'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
 __all__ = [
     'handle_errors',
     'ErrorLogger',
@@ -40,4 +46,4 @@ __all__ = [
     'SystemAnalyzer',
     'BitrateControlMechanism',
     'OptimizeBitrate'
-] 
\ No newline at end of file
+]
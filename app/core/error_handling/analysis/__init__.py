@@ -1,8 +1,15 @@
-from .aja_metric_collector import AjaMetricCollector
-from .analyzer import Analyzer
-from .base_metrics import BaseMetrics
-from .correlation_analyzer import CorrelationAnalyzer
-from .system import SystemAnalyzer
+from app.core.lazy_loader import lazy_exports
+
+# Exported names are imported from their submodule on first access
+_EXPORTS = {
+    'AjaMetricCollector': '.aja_metric_collector',
+    'Analyzer': '.analyzer',
+    'BaseMetrics': '.base_metrics',
+    'CorrelationAnalyzer': '.correlation_analyzer',
+    'SystemAnalyzer': '.system'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     'AjaMetricCollector',
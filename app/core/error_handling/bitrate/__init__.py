@@ -1,7 +1,14 @@
-from .bitrate_control_mechanism import BitrateControlMechanism
-from .optimize_bitrate import OptimizeBitrate
+from app.core.lazy_loader import lazy_exports
+
+# Exported names are imported from their submodule on first access
+_EXPORTS = {
+    'BitrateControlMechanism': '.bitrate_control_mechanism',
+    'OptimizeBitrate': '.optimize_bitrate'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     'BitrateControlMechanism',
     'OptimizeBitrate'
-] 
\ No newline at end of file
+]
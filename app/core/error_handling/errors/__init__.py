@@ -1,6 +1,16 @@
-from .aja_exceptions import AJAClientError
-from .error_types import ErrorType
-from .exceptions import APIError, EncoderError, ValidationError, NotFoundError
+from app.core.lazy_loader import lazy_exports
+
+# Exported names are imported from their submodule on first access
+_EXPORTS = {
+    'AJAClientError': '.exceptions',
+    'ErrorType': '.error_types',
+    'APIError': '.exceptions',
+    'EncoderError': '.exceptions',
+    'ValidationError': '.exceptions',
+    'NotFoundError': '.exceptions'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     'AJAClientError',
@@ -9,4 +19,4 @@ __all__ = [
     'EncoderError',
     'ValidationError',
     'NotFoundError'
-]
\ No newline at end of file
+]
@@ -0,0 +1,36 @@
+import importlib
+import sys
+from typing import Callable, Dict, List, Tuple
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+    """Build module-level ``__getattr__``/``__dir__`` hooks (PEP 562) for a package.
+
+    Exported names are imported from their submodule on first access and
+    then cached in the package namespace, so ``import app.core`` no longer
+    pulls in every subpackage and its optional dependencies.
+
+    Args:
+        package: ``__name__`` of the package defining the hooks
+        exports: Public name to ``'.submodule'`` or ``'.submodule:attribute'``
+            when the attribute is re-exported under a different name
+
+    Example:
+        __getattr__, __dir__ = lazy_exports(__name__, {
+            'MetricsCollector': '.collector',
+            'SocketServiceConfig': '.socketservice_config:Config',
+        })
+    """
+    def __getattr__(name: str):
+        target = exports.get(name)
+        if target is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module_name, _, attribute = target.partition(':')
+        module = importlib.import_module(module_name, package)
+        value = getattr(module, attribute or name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,78 @@
+import threading
+from typing import Optional
+import numpy as np
+
+class PCMRingBuffer:
+    """Preallocated ring buffer of mono float32 PCM samples.
+
+    The ffmpeg reader writes into it from the event loop and the ASR worker
+    drains it from its thread. When the worker falls behind and the buffer
+    fills up, the oldest audio is overwritten so captions stay close to
+    real time; ``dropped_samples`` counts what was lost.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity: Maximum number of samples held before the oldest are dropped
+        """
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self._start = 0
+        self._size = 0
+        self._lock = threading.Lock()
+        self.dropped_samples = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def write(self, samples: np.ndarray) -> int:
+        """Append samples, overwriting the oldest ones on overflow
+
+        Returns:
+            Number of samples dropped to make room
+        """
+        n = len(samples)
+        if n == 0:
+            return 0
+        with self._lock:
+            if n >= self.capacity:
+                # Only the newest `capacity` samples can be kept
+                dropped = self._size + n - self.capacity
+                self._data[:] = samples[-self.capacity:]
+                self._start = 0
+                self._size = self.capacity
+                self.dropped_samples += dropped
+                return dropped
+
+            dropped = max(0, self._size + n - self.capacity)
+            if dropped:
+                self._start = (self._start + dropped) % self.capacity
+                self._size -= dropped
+                self.dropped_samples += dropped
+
+            end = (self._start + self._size) % self.capacity
+            first = min(n, self.capacity - end)
+            self._data[end:end + first] = samples[:first]
+            if first < n:
+                self._data[:n - first] = samples[first:]
+            self._size += n
+            return dropped
+
+    def read(self, max_samples: Optional[int] = None) -> np.ndarray:
+        """Remove and return up to max_samples of the oldest audio as a new array"""
+        with self._lock:
+            n = self._size if max_samples is None else min(max_samples, self._size)
+            out = np.empty(n, dtype=np.float32)
+            first = min(n, self.capacity - self._start)
+            out[:first] = self._data[self._start:self._start + first]
+            if first < n:
+                out[first:] = self._data[:n - first]
+            self._start = (self._start + n) % self.capacity
+            self._size -= n
+            return out
+
+    def clear(self):
+        with self._lock:
+            self._start = 0
+            self._size = 0
@@ -0,0 +1,160 @@
+import logging
+import math
+import os
+import time
+from pathlib import Path
+from typing import Optional, TextIO
+
+logger = logging.getLogger(__name__)
+
+def format_time_srt(seconds: float) -> str:
+    """Format seconds as an SRT timestamp (HH:MM:SS,mmm)"""
+    return _format_time(seconds, ',')
+
+def format_time_vtt(seconds: float) -> str:
+    """Format seconds as a WebVTT timestamp (HH:MM:SS.mmm)"""
+    return _format_time(seconds, '.')
+
+def _format_time(seconds: float, separator: str) -> str:
+    total_ms = int(round(max(seconds, 0.0) * 1000))
+    hours, remainder = divmod(total_ms, 3_600_000)
+    minutes, remainder = divmod(remainder, 60_000)
+    secs, milliseconds = divmod(remainder, 1000)
+    return f"{hours:02}:{minutes:02}:{secs:02}{separator}{milliseconds:03}"
+
+class CaptionSink:
+    """Writes captions to disk as ASR commits them.
+
+    Every cue is appended to a running SRT file and to the current WebVTT
+    segment. Segments cover ``segment_duration`` seconds of stream time and
+    are listed in an HLS event playlist as they close, so players can pick
+    up captions while the meeting is still live. Only open file handles and
+    counters are kept in memory, and files are fsynced in batches instead
+    of after every cue.
+    """
+
+    def __init__(self,
+                 output_dir: str,
+                 basename: str = "captions",
+                 segment_duration: float = 6.0,
+                 fsync_cues: int = 20,
+                 fsync_interval: float = 5.0):
+        """
+        Args:
+            output_dir: Directory for the SRT file, WebVTT segments and playlist
+            basename: Prefix of every file written
+            segment_duration: Seconds of stream time per WebVTT segment
+            fsync_cues: Cues written before the files are fsynced
+            fsync_interval: Longest time in seconds between fsyncs while cues arrive
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.basename = basename
+        self.segment_duration = segment_duration
+        self.fsync_cues = fsync_cues
+        self.fsync_interval = fsync_interval
+
+        self.srt_path = self.output_dir / f"{basename}.srt"
+        self.playlist_path = self.output_dir / f"{basename}.m3u8"
+        self._srt: TextIO = open(self.srt_path, 'w', encoding='utf-8')
+        self._playlist: TextIO = open(self.playlist_path, 'w', encoding='utf-8')
+        self._playlist.write(
+            "#EXTM3U\n"
+            "#EXT-X-VERSION:3\n"
+            f"#EXT-X-TARGETDURATION:{math.ceil(segment_duration)}\n"
+            "#EXT-X-MEDIA-SEQUENCE:0\n"
+            "#EXT-X-PLAYLIST-TYPE:EVENT\n"
+        )
+        self._playlist.flush()
+
+        self._segment: Optional[TextIO] = None
+        self._segment_index = -1
+        self.cue_count = 0
+        self._unsynced_cues = 0
+        self._last_fsync = time.monotonic()
+        self._closed = False
+
+    def _segment_path(self, index: int) -> Path:
+        return self.output_dir / f"{self.basename}_{index:05d}.vtt"
+
+    def _open_segment(self, index: int):
+        self._segment = open(self._segment_path(index), 'w', encoding='utf-8')
+        # Cue times are stream-relative, matching the playlist's zero start
+        self._segment.write("WEBVTT\nX-TIMESTAMP-MAP=MPEGTS:0,LOCAL:00:00:00.000\n\n")
+        self._segment_index = index
+
+    def _close_segment(self):
+        """Finish the current segment and publish it in the playlist"""
+        self._segment.flush()
+        os.fsync(self._segment.fileno())
+        self._segment.close()
+        self._segment = None
+        self._playlist.write(
+            f"#EXTINF:{self.segment_duration:.3f},\n"
+            f"{self._segment_path(self._segment_index).name}\n"
+        )
+        self._playlist.flush()
+
+    def _rotate_to(self, index: int):
+        """Advance to segment ``index``, emitting empty segments for silent gaps"""
+        while self._segment_index < index:
+            if self._segment is not None:
+                self._close_segment()
+            self._open_segment(self._segment_index + 1)
+
+    def _fsync(self):
+        for handle in (self._srt, self._segment, self._playlist):
+            if handle is not None:
+                handle.flush()
+                os.fsync(handle.fileno())
+        self._unsynced_cues = 0
+        self._last_fsync = time.monotonic()
+
+    def add_cue(self, start: float, end: float, text: str):
+        """Append one committed caption
+
+        Args:
+            start: Cue start in seconds of stream time
+            end: Cue end in seconds of stream time
+            text: Caption text
+        """
+        text = text.strip()
+        if self._closed or not text:
+            return
+        end = max(end, start)
+        self._rotate_to(max(int(start // self.segment_duration), self._segment_index))
+
+        self.cue_count += 1
+        self._srt.write(
+            f"{self.cue_count}\n{format_time_srt(start)} --> {format_time_srt(end)}\n{text}\n\n"
+        )
+        self._segment.write(f"{format_time_vtt(start)} --> {format_time_vtt(end)}\n{text}\n\n")
+        # Flush so live readers see the cue; fsync is batched
+        self._srt.flush()
+        self._segment.flush()
+
+        self._unsynced_cues += 1
+        if (self._unsynced_cues >= self.fsync_cues
+                or time.monotonic() - self._last_fsync >= self.fsync_interval):
+            self._fsync()
+
+    def close(self):
+        """Flush everything and mark the playlist complete"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self._segment is not None:
+                self._close_segment()
+            self._playlist.write("#EXT-X-ENDLIST\n")
+            self._fsync()
+        finally:
+            self._srt.close()
+            self._playlist.close()
+        logger.info(f"Captions closed after {self.cue_count} cues in {self.output_dir}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -1,16 +1,30 @@
 import asyncio
 import logging
-from typing import Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
 from dataclasses import dataclass
 import numpy as np
 import ffmpeg
 import argparse
+from prometheus_client import Counter, Gauge
 
-from app.core.live_transcription.whisper_streaming.whisper_online import asr_factory, OnlineASRProcessor, WhisperTimestampedASR, online_processor
+from app.core.live_transcription.whisper_streaming.whisper_online import asr_factory, OnlineASRProcessor, WhisperTimestampedASR
 from app.core.aja.client import AJAHELOClient, AJAClientError
+from app.core.live_transcription.audio_buffer import PCMRingBuffer
+from app.core.live_transcription.caption_sink import CaptionSink
+from app.core.live_transcription.transcription_pool import TranscriptionWorkerPool
 
 logger = logging.getLogger(__name__)
 
+class CaptioningMetrics:
+    """Live captioning throughput metrics"""
+    real_time_factor = Gauge('live_caption_real_time_factor',
+                             'ASR processing time divided by the audio duration processed', ['stream'])
+    buffered_audio = Gauge('live_caption_buffered_audio_seconds', 'Audio waiting for ASR', ['stream'])
+    dropped_audio = Counter('live_caption_dropped_audio_seconds_total',
+                            'Audio discarded because ASR fell behind real time', ['stream'])
+
 @dataclass
 class StreamConfig:
     """Configuration for stream processing.
@@ -26,6 +40,12 @@ class StreamConfig:
         language: Source language for transcription (default: "en")
         min_chunk_size: Minimum audio chunk size for processing
         chunk_size: Size of audio chunks for ffmpeg processing
+        sample_rate: PCM sample rate requested from ffmpeg
+        asr_window: Seconds of audio handed to each ASR inference call
+        max_merge_window: Upper bound in seconds when merging backlog into one call
+        buffer_seconds: Audio held while ASR is busy before the oldest is dropped
+        caption_dir: Directory for live SRT/WebVTT output, None disables it
+        caption_segment_duration: Seconds of stream time per WebVTT segment
     """
     ip_address: str
     stream_url: str
@@ -33,6 +53,12 @@ class StreamConfig:
     language: str = "en"
     min_chunk_size: float = 1.0
     chunk_size: int = 4096
+    sample_rate: int = 16000
+    asr_window: float = 1.0
+    max_merge_window: float = 5.0
+    buffer_seconds: float = 30.0
+    caption_dir: Optional[str] = None
+    caption_segment_duration: float = 6.0
 
 class LiveCaptioningService:
     """Service to handle live captioning of AJA device streams.
@@ -42,19 +68,31 @@ class LiveCaptioningService:
     - Automatic bypass on transcription failure
     """
     
-    def __init__(self, config: StreamConfig):
+    def __init__(self, config: StreamConfig, pool: Optional[TranscriptionWorkerPool] = None):
         """Initialize the captioning service.
         
         Args:
             config: StreamConfig object containing all necessary parameters
                    for both AJA device streaming and Whisper transcription
+            pool: Shared transcription pool; without one the service loads its own model
         """
         self.config = config
+        self.pool = pool
         self.asr = None
         self.online_processor = None
-        self._initialize_asr()
+        if pool is None:
+            self._initialize_asr()
         self._transcription_failed = False
 
+        # ffmpeg feeds the ring buffer from the event loop; ASR drains it on a worker thread
+        self.audio_buffer = PCMRingBuffer(int(config.buffer_seconds * config.sample_rate))
+        self._asr_executor: Optional[ThreadPoolExecutor] = None
+        self._audio_available: Optional[asyncio.Event] = None
+        self._reader_done = False
+        self.metrics = CaptioningMetrics()
+        self.real_time_factor = 0.0
+        self.captions: Optional[CaptionSink] = None
+
     def _initialize_asr(self):
         """Initialize the ASR processor with configuration"""
         args = argparse.Namespace(
@@ -65,14 +103,87 @@ class LiveCaptioningService:
         self.asr, self.online_processor = asr_factory(args)
         logger.info(f"ASR initialized with model {self.config.model}")
 
-    async def _process_audio_chunk(self, chunk: np.ndarray) -> Optional[str]:
-        """Process a single audio chunk and return transcription"""
+    def _transcribe_window(self, chunk: np.ndarray) -> Optional[Tuple[float, float, str]]:
+        """Run ASR on one window of audio; called on the ASR worker thread"""
         self.online_processor.insert_audio_chunk(chunk)
         result = self.online_processor.process_iter()
         if result[0] is not None:
-            return result[2]  # Return transcribed text
+            return result  # Committed (start, end, text)
         return None
 
+    async def _process_audio_chunk(self, chunk: np.ndarray) -> Optional[Tuple[float, float, str]]:
+        """Process a single audio chunk off the event loop and return transcription"""
+        if self.pool is not None:
+            return await self.pool.transcribe(self.config.ip_address, chunk)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._asr_executor, self._transcribe_window, chunk)
+
+    async def _read_audio(self, process: asyncio.subprocess.Process):
+        """Copy PCM from ffmpeg into the ring buffer without blocking the loop"""
+        sample_rate = self.config.sample_rate
+        leftover = b''
+        try:
+            while not self._transcription_failed:
+                in_bytes = await process.stdout.read(self.config.chunk_size)
+                if not in_bytes:
+                    returncode = await process.wait()
+                    if returncode:
+                        raise RuntimeError(f"ffmpeg exited with status {returncode}")
+                    break
+                in_bytes = leftover + in_bytes
+                usable = len(in_bytes) - len(in_bytes) % 2  # whole int16 samples only
+                leftover = in_bytes[usable:]
+
+                audio_chunk = np.frombuffer(in_bytes[:usable], np.int16).astype(np.float32) / 32768.0
+                dropped = self.audio_buffer.write(audio_chunk)
+                if dropped:
+                    self.metrics.dropped_audio.labels(self.config.ip_address).inc(dropped / sample_rate)
+                    logger.warning(f"ASR behind real time, dropped {dropped / sample_rate:.2f}s of audio")
+                self._audio_available.set()
+        finally:
+            self._reader_done = True
+            self._audio_available.set()
+
+    async def _transcribe_buffered_audio(self, aja_client: AJAHELOClient):
+        """Feed buffered audio to ASR in windows, merging backlog when behind"""
+        sample_rate = self.config.sample_rate
+        window = int(self.config.asr_window * sample_rate)
+        max_window = max(window, int(self.config.max_merge_window * sample_rate))
+
+        while not self._transcription_failed:
+            self._audio_available.clear()
+            buffered = len(self.audio_buffer)
+            self.metrics.buffered_audio.labels(self.config.ip_address).set(buffered / sample_rate)
+            if buffered < window and not self._reader_done:
+                await self._audio_available.wait()
+                continue
+            if buffered == 0:
+                # ffmpeg finished and everything has been transcribed
+                await self._finish_transcription(aja_client)
+                break
+
+            # Everything that piled up during the last inference goes into this call
+            audio_chunk = self.audio_buffer.read(max_window)
+            started = time.perf_counter()
+            transcription = await self._process_audio_chunk(audio_chunk)
+            elapsed = time.perf_counter() - started
+
+            self.real_time_factor = elapsed / (len(audio_chunk) / sample_rate)
+            self.metrics.real_time_factor.labels(self.config.ip_address).set(self.real_time_factor)
+
+            if transcription:
+                await self._handle_transcription(transcription, aja_client)
+
+    async def _finish_transcription(self, aja_client: AJAHELOClient):
+        """Flush the hypothesis ASR has not committed yet"""
+        if self.pool is not None:
+            transcription = await self.pool.finish(self.config.ip_address)
+        else:
+            loop = asyncio.get_running_loop()
+            transcription = await loop.run_in_executor(self._asr_executor, self.online_processor.finish)
+        if transcription and transcription[0] is not None:
+            await self._handle_transcription(transcription, aja_client)
+
     async def process_stream(self):
         """Main stream processing loop with minimal encoding overhead.
         On transcription failure, bypasses all audio processing
@@ -84,37 +195,61 @@ class LiveCaptioningService:
                 logger.info("Stream started successfully")
 
                 if not self._transcription_failed:
-                    # Only extract audio stream, ignore video
-                    process = (
+                    if self.pool is not None:
+                        # Admission control happens before ffmpeg is started
+                        stream = await self.pool.register_stream(self.config.ip_address, self.config.model)
+                        logger.info(f"Captioning {self.config.ip_address} on shared {stream.model} model")
+                    else:
+                        self._asr_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="asr")
+                    if self.config.caption_dir:
+                        self.captions = CaptionSink(
+                            self.config.caption_dir,
+                            basename=self.config.ip_address.replace('.', '_'),
+                            segment_duration=self.config.caption_segment_duration
+                        )
+
+                    # Only extract audio stream, ignore video; raw PCM so no WAV header lands in the samples
+                    ffmpeg_args = (
                         ffmpeg
                         .input(self.config.stream_url, f='m3u8')
                         .output('pipe:', 
-                               format='wav',
+                               format='s16le',
                                acodec='pcm_s16le',
                                ac=1,
-                               ar='16000',
-                               vn=True)  # Skip video processing
-                        .run_async(pipe_stdout=True)
+                               ar=str(self.config.sample_rate),
+                               vn=None)  # Skip video processing
+                        .compile()
+                    )
+                    process = await asyncio.create_subprocess_exec(
+                        *ffmpeg_args,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.DEVNULL
                     )
 
-                    while not self._transcription_failed:
-                        try:
-                            in_bytes = process.stdout.read(self.config.chunk_size)
-                            if not in_bytes:
-                                break
-                                
-                            audio_chunk = np.frombuffer(in_bytes, np.int16).astype(np.float32) / 32768.0
-                            transcription = await self._process_audio_chunk(audio_chunk)
-                            
-                            if transcription:
-                                await self._handle_transcription(transcription, aja_client)
-                                
-                        except Exception as e:
-                            logger.error(f"Transcription error (non-critical): {e}")
-                            self._transcription_failed = True
-                            # Stop audio processing
+                    self._audio_available = asyncio.Event()
+                    self._reader_done = False
+                    reader = asyncio.create_task(self._read_audio(process))
+                    try:
+                        await self._transcribe_buffered_audio(aja_client)
+                        if not self._transcription_failed:
+                            # Transcription only drains once the reader has stopped; raise whatever stopped it
+                            await reader
+                    except Exception as e:
+                        logger.error(f"Transcription error (non-critical): {e}")
+                        self._transcription_failed = True
+                    finally:
+                        # Stop audio processing
+                        reader.cancel()
+                        await asyncio.gather(reader, return_exceptions=True)
+                        if process.returncode is None:
                             process.kill()
-                            break
+                        await process.wait()
+                        if self.pool is not None:
+                            self.pool.unregister_stream(self.config.ip_address)
+                        else:
+                            self._asr_executor.shutdown(wait=False)
+                        if self.captions is not None:
+                            self.captions.close()
 
             except AJAClientError as e:
                 logger.error(f"AJA client error: {e}")
@@ -127,7 +262,7 @@ class LiveCaptioningService:
                     except Exception as e:
                         logger.error(f"Error stopping stream: {e}")
 
-    async def _handle_transcription(self, transcription: str, aja_client: AJAHELOClient):
+    async def _handle_transcription(self, transcription: Tuple[float, float, str], aja_client: AJAHELOClient):
         """Handle the transcription result and integrate with AJA device.
         
         This method bridges the Whisper transcription output with the AJA
@@ -140,11 +275,14 @@ class LiveCaptioningService:
         impact the main stream flow between input and output stream keys matrix. However, it will 
         
         Args:
-            transcription: Transcribed text from Whisper
+            transcription: Committed (start, end, text) segment from Whisper
             aja_client: AJA device client for stream management
         """
         try:
-            logger.info(f"New transcription: {transcription}")
+            start, end, text = transcription
+            logger.info(f"New transcription: {text}")
+            if self.captions is not None:
+                self.captions.add_cue(start, end, text)
             # Implement caption overlay logic here
             pass
         except Exception as e:
@@ -166,114 +304,9 @@ async def main():
 if __name__ == "__main__":
     asyncio.run(main())
 
-# At the end of this audio processing
-final_transcription = online_processor.finish()
-print(final_transcription)  # do something with the last output
-
-online_processor.init()  # refresh if you're going to re-use the object for the next audio
-
-def format_to_srt(transcription):
-    srt_content = []
-    for i, (start, end, text) in enumerate(transcription, start=1):
-        start_time = format_time_srt(start)
-        end_time = format_time_srt(end)
-        srt_content.append(f"{i}\n{start_time} --> {end_time}\n{text}\n")
-    return "\n".join(srt_content)
-
-def format_time_srt(seconds):
-    hours, remainder = divmod(seconds, 3600)
-    minutes, seconds = divmod(remainder, 60)
-    milliseconds = (seconds - int(seconds)) * 1000
-    return f"{int(hours):02}:{int(minutes):02}:{int(seconds):02},{int(milliseconds):03}"
-
-srt_content = format_to_srt(final_transcription)
-with open("subtitles.srt", "w") as srt_file:
-    srt_file.write(srt_content)
-    
-    #the code beneath here is rough. there is confusion around the input and output stream keys, names, and urls. 
-    #this will need to be cleaned up in the future.
-    #Need to make more cetrainty on how to properly interface with the database.
-    #Need to make more cetrainty on how to properly interface with the ffmpeg command relative to the inputs and outputs.
-        
-import subprocess
-
-def merge_subtitles_with_stream(src_stream_url, srt_file_path, output_stream_url):
-    """
-    Merges subtitles with the live stream using ffmpeg.
-    
-    :param src_stream_url: URL of the input live stream ---- This is essentially a place holder for the input stream key
-    :param srt_file_path: Path to the SRT file
-    :param output_stream_url: URL of the output stream with subtitles
-    """
-    command = [
-        'ffmpeg',
-        '-i', src_stream_url, #
-        '-vf', f"subtitles={srt_file_path}", 
-        '-c:a', 'copy',
-        '-m', 'm3u8',  # Assuming the output stream is in m3u8 format
-        output_stream_url
-    ]
-    
-    try:
-        subprocess.run(command, check=True)
-        print(f"Subtitles merged successfully into the stream at {output_stream_url}")
-    except subprocess.CalledProcessError as e:
-        print(f"Error occurred while merging subtitles: {e}")
-
-import psycopg2
-
-def get_stream_keys(stream_key_name):
-    """
-    Fetches the input and output stream keys from the database based on the stream key name.
-    
-    :param stream_key_name: The stream key name
-    :return: Tuple containing the input stream key and the output stream key
-    """
-    try:
-        # Connect to the PostgreSQL database
-        connection = psycopg2.connect(
-            dbname="your_db_name",
-            user="your_db_user",
-            password="your_db_password",
-            host="your_db_host",
-            port="your_db_port"
-        )
-        cursor = connection.cursor()
-        
-        # Query to fetch the stream keys based on the stream key name
-        query = """
-        SELECT input_stream_key, output_stream_key
-        FROM stream_keys
-        WHERE stream_key_name = %s
-        """
-        cursor.execute(query, (stream_key_name,))
-        result = cursor.fetchone()
-        
-        if result:
-            return result[0], result[1]
-        else:
-            raise ValueError(f"No stream keys found for stream key name: {stream_key_name}")
-    
-    except (Exception, psycopg2.DatabaseError) as error:
-        print(f"Error fetching stream keys: {error}")
-        raise
-    
-    finally:
-        if connection:
-            cursor.close()
-            connection.close()
-
-# Example usage
-stream_key_name = "example_stream_key_name"
-input_stream_key, output_stream_key = get_stream_keys(stream_key_name)
-
-merge_subtitles_with_stream(input_stream_key, srt_content, output_stream_key)
-
 #Written - 3/17/2025 
 #we need to make an error system that will check if the stream is working, and if it is not, the AJA device will be provided with the original connection.
 #this will be a table in the database that will have the stream url, the output stream url, and the error message.
 #the error message will be a description of the error that will be used to determine the action to take.
 #the failover action to take will be to provide the AJA device with the original connection.
 #the original connection will be the stream url that is provided by the user.
-
-# ffmpeg -i input_video.mp4 -vf "subtitles=subtitles.srt" -c:a copy output_video_with_subtitles.mp4
\ No newline at end of file
@@ -0,0 +1,306 @@
+import argparse
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+import numpy as np
+from prometheus_client import Counter, Gauge, Histogram
+from app.core.error_handling.errors.exceptions import EncoderError
+
+logger = logging.getLogger(__name__)
+
+# Smaller models are tried in this order when the requested one has no capacity left
+MODEL_SIZES = ["large-v3", "large-v2", "large", "medium", "small", "base", "tiny"]
+
+# Real-time factor assumed for a stream until its first window has been timed, so
+# streams admitted back to back are not counted as free; deliberately pessimistic
+EXPECTED_RTF = {
+    "large-v3": 0.5,
+    "large-v2": 0.5,
+    "large": 0.5,
+    "medium": 0.3,
+    "small": 0.15,
+    "base": 0.08,
+    "tiny": 0.05,
+}
+DEFAULT_RTF = 0.5
+
+class TranscriptionPoolMetrics:
+    """Shared transcription pool metrics"""
+    stream_latency = Histogram('transcription_stream_latency_seconds',
+                               'Time from audio window submission to ASR result', ['stream'])
+    queue_depth = Gauge('transcription_stream_queue_depth', 'Audio windows waiting for ASR', ['stream'])
+    stream_rtf = Gauge('transcription_stream_real_time_factor',
+                       'ASR processing time divided by audio duration', ['stream'])
+    model_load = Gauge('transcription_model_load',
+                       'Sum of per-stream real-time factors per loaded model', ['model'])
+    admissions = Counter('transcription_pool_admissions_total',
+                         'Stream admission decisions', ['result'])
+
+def _load_whisper_asr(model: str, language: str, min_chunk_size: float):
+    from app.core.live_transcription.whisper_streaming.whisper_online import asr_factory
+    args = argparse.Namespace(model=model, lan=language, min_chunk_size=min_chunk_size)
+    asr, _ = asr_factory(args)
+    return asr
+
+def _create_whisper_processor(asr):
+    from app.core.live_transcription.whisper_streaming.whisper_online import OnlineASRProcessor
+    return OnlineASRProcessor(asr)
+
+@dataclass
+class TranscriptionStream:
+    """Per-stream ASR state; the model itself is shared"""
+    stream_id: str
+    model: str
+    processor: Any
+    pending: Deque[Tuple[np.ndarray, float, asyncio.Future]] = field(default_factory=deque)
+    busy: bool = False
+    real_time_factor: float = 0.0
+
+class _ModelWorkers:
+    """One loaded model, its executor and the streams it serves"""
+
+    def __init__(self, model: str, asr: Any, workers: int):
+        self.model = model
+        self.asr = asr
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"asr-{model}")
+        self.workers = workers
+        self.streams: Dict[str, TranscriptionStream] = {}
+        self.ready: Deque[str] = deque()
+        self.wakeup: Optional[asyncio.Event] = None
+        self.tasks: List[asyncio.Task] = []
+
+    @property
+    def load(self) -> float:
+        return sum(stream.real_time_factor for stream in self.streams.values())
+
+class TranscriptionWorkerPool:
+    """Multiplexes live caption streams over one loaded Whisper model per size.
+
+    Each model size is loaded once and served by ``workers_per_model``
+    threads. Streams keep their own OnlineASRProcessor (audio buffer and
+    hypothesis state) but share the model weights. Work is scheduled
+    round-robin across streams so one busy meeting cannot starve another.
+    A new stream is admitted only while the summed real-time factor of the
+    streams on a model stays under ``max_load`` per worker; otherwise a
+    smaller model is used, or the stream is rejected. Until a stream's first
+    window has been timed it counts at its model's ``EXPECTED_RTF``.
+    """
+
+    _instance: Optional['TranscriptionWorkerPool'] = None
+
+    def __init__(self,
+                 language: str = "en",
+                 min_chunk_size: float = 1.0,
+                 workers_per_model: int = 1,
+                 max_load: float = 0.8,
+                 allow_downgrade: bool = True,
+                 sample_rate: int = 16000,
+                 asr_loader: Optional[Callable[[str, str, float], Any]] = None,
+                 processor_factory: Optional[Callable[[Any], Any]] = None):
+        """
+        Args:
+            language: Source language for every stream
+            min_chunk_size: Minimum audio chunk size passed to the ASR backend
+            workers_per_model: Concurrent inference threads per loaded model
+            max_load: Highest summed real-time factor allowed per worker
+            allow_downgrade: Fall back to a smaller model instead of rejecting
+            sample_rate: Sample rate of the PCM windows passed to transcribe()
+            asr_loader: Loads a model by size, defaults to whisper_online.asr_factory
+            processor_factory: Builds a per-stream processor around a loaded model
+        """
+        self.language = language
+        self.min_chunk_size = min_chunk_size
+        self.workers_per_model = workers_per_model
+        self.max_load = max_load
+        self.allow_downgrade = allow_downgrade
+        self.sample_rate = sample_rate
+        self._asr_loader = asr_loader or _load_whisper_asr
+        self._processor_factory = processor_factory or _create_whisper_processor
+        self.metrics = TranscriptionPoolMetrics()
+        self._models: Dict[str, _ModelWorkers] = {}
+        self._stream_models: Dict[str, str] = {}
+
+    @classmethod
+    def get_instance(cls) -> 'TranscriptionWorkerPool':
+        """Return the process-wide pool, creating it on first use"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def _has_capacity(self, model: str) -> bool:
+        workers = self._models.get(model)
+        if workers is None or not workers.streams:
+            return True
+        # Assume the new stream costs what the existing ones do on average
+        average_rtf = workers.load / len(workers.streams)
+        return workers.load + average_rtf <= self.max_load * workers.workers
+
+    def _choose_model(self, requested: str) -> Optional[str]:
+        if self._has_capacity(requested):
+            return requested
+        if not self.allow_downgrade or requested not in MODEL_SIZES:
+            return None
+        for model in MODEL_SIZES[MODEL_SIZES.index(requested) + 1:]:
+            if self._has_capacity(model):
+                return model
+        return None
+
+    async def _get_model(self, model: str) -> _ModelWorkers:
+        workers = self._models.get(model)
+        if workers is None:
+            loop = asyncio.get_running_loop()
+            logger.info(f"Loading ASR model {model} for the transcription pool")
+            asr = await loop.run_in_executor(
+                None, self._asr_loader, model, self.language, self.min_chunk_size
+            )
+            # Another stream may have loaded it while we waited
+            workers = self._models.get(model)
+            if workers is None:
+                workers = _ModelWorkers(model, asr, self.workers_per_model)
+                workers.wakeup = asyncio.Event()
+                workers.tasks = [
+                    asyncio.create_task(self._schedule(workers))
+                    for _ in range(self.workers_per_model)
+                ]
+                self._models[model] = workers
+        return workers
+
+    async def register_stream(self, stream_id: str, model: str = "large-v2") -> TranscriptionStream:
+        """Admit a stream, possibly on a smaller model than requested
+
+        Raises:
+            EncoderError: When no model size has capacity for another real-time stream
+        """
+        if stream_id in self._stream_models:
+            return self._models[self._stream_models[stream_id]].streams[stream_id]
+
+        chosen = self._choose_model(model)
+        if chosen is None:
+            self.metrics.admissions.labels('rejected').inc()
+            raise EncoderError(
+                f"Transcription capacity exhausted, cannot caption stream {stream_id} in real time",
+                encoder_id=stream_id,
+                error_type="transcription_capacity"
+            )
+        if chosen != model:
+            self.metrics.admissions.labels('downgraded').inc()
+            logger.warning(f"Stream {stream_id} downgraded from {model} to {chosen}, CPU cannot keep up")
+        else:
+            self.metrics.admissions.labels('accepted').inc()
+
+        workers = await self._get_model(chosen)
+        stream = TranscriptionStream(
+            stream_id, chosen, self._processor_factory(workers.asr),
+            real_time_factor=EXPECTED_RTF.get(chosen, DEFAULT_RTF)
+        )
+        workers.streams[stream_id] = stream
+        self._stream_models[stream_id] = chosen
+        return stream
+
+    def unregister_stream(self, stream_id: str):
+        """Remove a stream; its queued windows are cancelled"""
+        model = self._stream_models.pop(stream_id, None)
+        if model is None:
+            return
+        workers = self._models[model]
+        stream = workers.streams.pop(stream_id)
+        while stream.pending:
+            _, _, future = stream.pending.popleft()
+            future.cancel()
+        self.metrics.queue_depth.labels(stream_id).set(0)
+        self.metrics.model_load.labels(model).set(workers.load)
+
+    async def transcribe(self, stream_id: str, audio: np.ndarray) -> Optional[Tuple[float, float, str]]:
+        """Queue one window of mono float32 audio and wait for its committed segment"""
+        workers = self._models[self._stream_models[stream_id]]
+        stream = workers.streams[stream_id]
+        future = asyncio.get_running_loop().create_future()
+        stream.pending.append((audio, time.perf_counter(), future))
+        self.metrics.queue_depth.labels(stream_id).set(len(stream.pending))
+        if not stream.busy and stream_id not in workers.ready:
+            workers.ready.append(stream_id)
+            workers.wakeup.set()
+        return await future
+
+    @staticmethod
+    def _run_window(processor, audio: np.ndarray) -> Optional[Tuple[float, float, str]]:
+        processor.insert_audio_chunk(audio)
+        result = processor.process_iter()
+        if result[0] is not None:
+            return result
+        return None
+
+    async def finish(self, stream_id: str) -> Optional[Tuple[float, float, str]]:
+        """Flush a stream's uncommitted hypothesis once its last window has been transcribed"""
+        workers = self._models[self._stream_models[stream_id]]
+        stream = workers.streams[stream_id]
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(workers.executor, stream.processor.finish)
+
+    async def _schedule(self, workers: _ModelWorkers):
+        """Serve streams round-robin, one window per turn"""
+        loop = asyncio.get_running_loop()
+        while True:
+            if not workers.ready:
+                workers.wakeup.clear()
+                await workers.wakeup.wait()
+                continue
+
+            stream = workers.streams.get(workers.ready.popleft())
+            if stream is None or not stream.pending:
+                continue
+
+            stream.busy = True
+            audio, submitted, future = stream.pending.popleft()
+            self.metrics.queue_depth.labels(stream.stream_id).set(len(stream.pending))
+            started = time.perf_counter()
+            try:
+                text = await loop.run_in_executor(workers.executor, self._run_window, stream.processor, audio)
+                if not future.done():
+                    future.set_result(text)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                finished = time.perf_counter()
+                stream.busy = False
+                duration = len(audio) / self.sample_rate
+                if duration:
+                    stream.real_time_factor = (finished - started) / duration
+                self.metrics.stream_latency.labels(stream.stream_id).observe(finished - submitted)
+                self.metrics.stream_rtf.labels(stream.stream_id).set(stream.real_time_factor)
+                self.metrics.model_load.labels(workers.model).set(workers.load)
+                # Back of the line, so every other waiting stream gets a turn first
+                if stream.pending and stream.stream_id in workers.streams:
+                    workers.ready.append(stream.stream_id)
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-model streams, load and queue depths"""
+        return {
+            model: {
+                'streams': {
+                    stream_id: {
+                        'queue_depth': len(stream.pending),
+                        'real_time_factor': stream.real_time_factor
+                    }
+                    for stream_id, stream in workers.streams.items()
+                },
+                'load': workers.load,
+                'capacity': self.max_load * workers.workers
+            }
+            for model, workers in self._models.items()
+        }
+
+    async def shutdown(self):
+        for stream_id in list(self._stream_models):
+            self.unregister_stream(stream_id)
+        for workers in self._models.values():
+            for task in workers.tasks:
+                task.cancel()
+            await asyncio.gather(*workers.tasks, return_exceptions=True)
+            workers.executor.shutdown(wait=False)
+        self._models.clear()
@@ -1,11 +1,22 @@
-from .collector import MetricsCollector
-from .system import MetricsSystem
-from .metrics_service import MetricsService
-from .metrics_analyzer import MetricsAnalyzer
+from app.core.lazy_loader import lazy_exports
+
+# Exported names are imported from their submodule on first access
+_EXPORTS = {
+    'MetricsCollector': '.collector',
+    'MetricsSystem': '.system',
+    'MetricsService': '.metrics_service',
+    'MetricsAnalyzer': '.metrics_analyzer',
+    'StreamingStabilityTracker': '.stability_tracker',
+    'FleetAggregator': '.fleet_aggregator'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     'MetricsCollector',
     'MetricsSystem',
     'MetricsService',
-    'MetricsAnalyzer'
-] 
\ No newline at end of file
+    'MetricsAnalyzer',
+    'StreamingStabilityTracker',
+    'FleetAggregator'
+]
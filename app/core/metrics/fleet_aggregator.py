@@ -0,0 +1,233 @@
+import threading
+from typing import Dict, FrozenSet, Hashable, Iterable, Mapping, Optional, Set
+from prometheus_client import Counter
+
+FLEET = 'fleet'
+
+class FleetAggregatorMetrics:
+    """Fleet aggregate metrics"""
+    updates = Counter('fleet_aggregate_updates_total', 'Encoder metric values folded into fleet aggregates')
+    published = Counter('fleet_aggregate_publishes_total', 'Room aggregates published after a significant change')
+    suppressed = Counter('fleet_aggregate_suppressed_total', 'Changed room aggregates held back by their threshold')
+
+class RunningAggregate:
+    """Count, sum, min and max of one metric over a room's encoders
+
+    Adding a value and removing a value that is not the current minimum
+    or maximum are O(1). Removing an extreme marks min/max stale; they are
+    recomputed from the room's current values the next time they are read.
+    """
+    __slots__ = ('count', 'total', 'min', 'max', 'stale')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = self.max = None
+        self.stale = False
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if self.stale:
+            return
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def remove(self, value: float) -> None:
+        self.count -= 1
+        self.total -= value
+        if not self.count:
+            self.total, self.min, self.max, self.stale = 0.0, None, None, False
+        elif value == self.min or value == self.max:
+            self.stale = True
+
+    def recompute(self, values: Iterable[float]) -> None:
+        values = list(values)
+        # Also resets the running sum, so float error from add/remove never builds up
+        self.count, self.total = len(values), sum(values)
+        self.min, self.max = (min(values), max(values)) if values else (None, None)
+        self.stale = False
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.total / self.count if self.count else None
+        }
+
+class FleetAggregator:
+    """Fleet-wide and per-room encoder metric aggregates, kept up to date per event
+
+    Every encoder belongs to the ``fleet`` room and to any number of extra
+    rooms, such as its site or channel group. ``update`` folds one
+    encoder's changed values into the aggregates of each of its rooms, so
+    its cost depends on how many rooms the encoder is in, not on the size
+    of the fleet. ``publish`` returns only the rooms whose aggregates moved
+    by more than the metric's threshold since they were last published.
+
+    Safe to share between threads, e.g. a poller thread calling ``update``
+    while the broadcast task calls ``publish``.
+    """
+
+    def __init__(self, thresholds: Optional[Mapping[str, float]] = None, default_threshold: float = 0.0):
+        """
+        Args:
+            thresholds: Smallest change in a metric's sum, min or max worth publishing, by metric
+            default_threshold: Threshold for metrics not in ``thresholds``; 0 publishes any change
+        """
+        self.thresholds = dict(thresholds or {})
+        self.default_threshold = default_threshold
+        self._values: Dict[Hashable, Dict[str, float]] = {}
+        self._rooms: Dict[Hashable, FrozenSet[str]] = {}
+        self._members: Dict[str, Set[Hashable]] = {}
+        self._aggregates: Dict[str, Dict[str, RunningAggregate]] = {}
+        self._published: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self._dirty: Set[str] = set()
+        self._lock = threading.RLock()
+        self.metrics = FleetAggregatorMetrics()
+
+    def update(self, encoder_id: Hashable, values: Mapping[str, Optional[float]],
+               rooms: Optional[Iterable[str]] = None) -> None:
+        """Record new metric values reported for an encoder
+
+        Args:
+            encoder_id: Encoder the values belong to
+            values: Metric values; metrics not included keep their last value, None clears one
+            rooms: Rooms the encoder belongs to besides ``fleet``; None keeps its current rooms
+        """
+        with self._lock:
+            current = self._values.setdefault(encoder_id, {})
+            if rooms is not None or encoder_id not in self._rooms:
+                self._move(encoder_id, frozenset(rooms or ()) | {FLEET})
+            rooms = self._rooms[encoder_id]
+
+            changed = 0
+            for metric, value in values.items():
+                old = current.get(metric)
+                if value is not None:
+                    value = float(value)
+                if value == old:
+                    continue
+                for room in rooms:
+                    aggregate = self._aggregates[room].get(metric)
+                    if aggregate is None:
+                        aggregate = self._aggregates[room][metric] = RunningAggregate()
+                    if old is not None:
+                        aggregate.remove(old)
+                    if value is not None:
+                        aggregate.add(value)
+                if value is None:
+                    del current[metric]
+                else:
+                    current[metric] = value
+                changed += 1
+
+            if changed:
+                self._dirty.update(rooms)
+                self.metrics.updates.inc(changed)
+
+    def remove(self, encoder_id: Hashable) -> None:
+        """Drop an encoder, e.g. once it is deleted or disabled"""
+        with self._lock:
+            if encoder_id not in self._rooms:
+                return
+            self._move(encoder_id, frozenset())
+            del self._rooms[encoder_id]
+            self._values.pop(encoder_id, None)
+
+    def _move(self, encoder_id: Hashable, rooms: FrozenSet[str]) -> None:
+        previous = self._rooms.get(encoder_id, frozenset())
+        if rooms == previous:
+            return
+        values = self._values.get(encoder_id, {})
+        for room in previous - rooms:
+            self._members[room].discard(encoder_id)
+            for metric, value in values.items():
+                self._aggregates[room][metric].remove(value)
+            self._dirty.add(room)
+        for room in rooms - previous:
+            self._members.setdefault(room, set()).add(encoder_id)
+            aggregates = self._aggregates.setdefault(room, {})
+            for metric, value in values.items():
+                aggregates.setdefault(metric, RunningAggregate()).add(value)
+            self._dirty.add(room)
+        self._rooms[encoder_id] = rooms
+
+    def encoder_values(self) -> Dict[Hashable, Dict[str, float]]:
+        """Copy of the latest values of every encoder"""
+        with self._lock:
+            return {encoder_id: dict(values) for encoder_id, values in self._values.items()}
+
+    def rooms(self) -> Set[str]:
+        with self._lock:
+            return set(self._members)
+
+    def aggregates(self, room: str = FLEET) -> Dict[str, Dict[str, float]]:
+        """Current count, sum, min, max and mean of every metric reported in the room"""
+        with self._lock:
+            result = {}
+            for metric, aggregate in self._aggregates.get(room, {}).items():
+                if aggregate.stale:
+                    aggregate.recompute(
+                        self._values[encoder_id][metric] for encoder_id in self._members[room]
+                        if metric in self._values[encoder_id]
+                    )
+                if aggregate.count:
+                    result[metric] = aggregate.summary()
+            return result
+
+    def _threshold(self, metric: str) -> float:
+        return self.thresholds.get(metric, self.default_threshold)
+
+    def _significant(self, last: Dict[str, Dict[str, float]], current: Dict[str, Dict[str, float]]) -> bool:
+        if last.keys() != current.keys():
+            return True
+        for metric, summary in current.items():
+            previous = last[metric]
+            if summary['count'] != previous['count']:
+                return True
+            threshold = self._threshold(metric)
+            if any(abs(summary[key] - previous[key]) > threshold for key in ('sum', 'min', 'max')):
+                return True
+        return False
+
+    def publish(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Aggregates of every room that changed significantly since it was last published
+
+        A change below the threshold is held back rather than forgotten: it
+        is measured against the last published aggregates, so small changes
+        that add up are published once together they cross the threshold.
+
+        Returns:
+            Room to its aggregates; a room whose last encoder left maps to an empty dict once
+        """
+        with self._lock:
+            changed = {}
+            for room in self._dirty:
+                current = self.aggregates(room)
+                last = self._published.get(room)
+                if last is not None and not self._significant(last, current):
+                    self.metrics.suppressed.inc()
+                    continue
+                if last is None and not current:
+                    self._forget_room(room)
+                    continue
+                changed[room] = current
+                if current:
+                    self._published[room] = current
+                else:
+                    self._forget_room(room)
+            self._dirty.clear()
+            if changed:
+                self.metrics.published.inc(len(changed))
+            return changed
+
+    def _forget_room(self, room: str) -> None:
+        self._published.pop(room, None)
+        if not self._members.get(room):
+            self._members.pop(room, None)
+            self._aggregates.pop(room, None)
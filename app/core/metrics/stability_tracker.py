@@ -0,0 +1,186 @@
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, Mapping, Optional, Tuple
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+class StabilityTrackerMetrics:
+    """Background streaming-stability analysis metrics"""
+    samples = Counter('stream_stability_samples_total', 'Streaming samples folded into rolling stability stats')
+    pending = Gauge('stream_stability_pending_samples', 'Streaming samples waiting for the stability worker')
+    dropped = Counter('stream_stability_dropped_samples_total',
+                      'Streaming samples discarded because the stability worker fell behind')
+
+class RollingStats:
+    """Mean and population variance of the last ``size`` values, updated in O(1) per value
+
+    Uses Welford's update for added values and its inverse for values
+    leaving the window, which stays accurate for bitrates in the millions
+    where sum-of-squares would cancel.
+    """
+
+    def __init__(self, size: int):
+        self.values: Deque[float] = deque()
+        self.size = size
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float) -> None:
+        self.values.append(value)
+        delta = value - self.mean
+        self.mean += delta / len(self.values)
+        self._m2 += delta * (value - self.mean)
+        if len(self.values) > self.size:
+            self._remove(self.values.popleft())
+
+    def _remove(self, value: float) -> None:
+        count = len(self.values)
+        delta = value - self.mean
+        self.mean -= delta / count
+        self._m2 = max(self._m2 - delta * (value - self.mean), 0.0)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / len(self.values) if self.values else 0.0
+
+    def stability(self) -> float:
+        """Same score as MetricsAnalyzer._calculate_stability: 1 / (1 + variance / mean²)
+
+        Always finite, since results are sent to browsers as JSON: a window
+        of zeros (an idle encoder) is perfectly stable, so it scores 1.0
+        where the analyzer's formula gives NaN.
+        """
+        if not self.values:
+            return 1.0
+        if self.mean == 0:
+            return 0.0 if self.variance else 1.0
+        return 1.0 / (1.0 + self.variance / self.mean ** 2)
+
+class RollingSum:
+    """Sum of the last ``size`` values"""
+
+    def __init__(self, size: int):
+        self.values: Deque[float] = deque(maxlen=size)
+        self.total = 0
+
+    def add(self, value: float) -> None:
+        if len(self.values) == self.values.maxlen:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+
+class EncoderStability:
+    """Rolling streaming statistics for one encoder"""
+
+    def __init__(self, window: int):
+        self.bitrate = RollingStats(window)
+        self.fps = RollingStats(window)
+        self.dropped_frames = RollingSum(window)
+        self.total_frames = RollingSum(window)
+
+    def add(self, streaming_data: Mapping[str, Any]) -> None:
+        # Read every field first so a malformed sample leaves the window untouched
+        bitrate, fps = float(streaming_data['bitrate']), float(streaming_data['fps'])
+        dropped, total = streaming_data.get('dropped_frames', 0), streaming_data.get('total_frames', 0)
+        if not isinstance(dropped, (int, float)) or not isinstance(total, (int, float)):
+            raise TypeError(f"frame counts must be numbers, got {dropped!r} and {total!r}")
+        self.bitrate.add(bitrate)
+        self.fps.add(fps)
+        self.dropped_frames.add(dropped)
+        self.total_frames.add(total)
+
+    def result(self) -> Dict[str, float]:
+        """The analyze_streaming_stability result for the samples in the window"""
+        bitrate_stability = self.bitrate.stability()
+        scores = [bitrate_stability * 100]
+        if self.total_frames.total > 0:
+            scores.append(100 * (1 - self.dropped_frames.total / self.total_frames.total))
+        return {
+            'bitrate_stability': bitrate_stability,
+            'fps_stability': self.fps.stability(),
+            'dropped_frames_total': self.dropped_frames.total,
+            'quality_score': sum(scores) / len(scores),
+            'samples': len(self.bitrate.values)
+        }
+
+class StreamingStabilityTracker:
+    """Streaming-stability analysis kept up to date off the broadcast path
+
+    Broadcasts ``submit`` their sample and read ``latest``, both O(1). A
+    background task drains submitted samples into per-encoder rolling
+    statistics and publishes a fresh result dict per encoder, so the cost
+    of a broadcast no longer depends on how much history there is.
+    """
+
+    def __init__(self, window: int = 300, interval: float = 0.25, max_pending: int = 10000):
+        """
+        Args:
+            window: Samples per encoder the statistics cover
+            interval: Seconds the background task waits when there is nothing to process
+            max_pending: Samples queued before the oldest are dropped, should the worker stall
+        """
+        self.window = window
+        self.interval = interval
+        self._pending: Deque[Tuple[Hashable, Mapping[str, Any]]] = deque(maxlen=max_pending)
+        self._encoders: Dict[Hashable, EncoderStability] = {}
+        self._results: Dict[Hashable, Dict[str, float]] = {}
+        self._running = False
+        self.metrics = StabilityTrackerMetrics()
+
+    def submit(self, encoder_id: Hashable, streaming_data: Mapping[str, Any]) -> None:
+        """Queue a sample with at least ``bitrate`` and ``fps`` for the background task"""
+        if len(self._pending) == self._pending.maxlen:
+            self.metrics.dropped.inc()
+        self._pending.append((encoder_id, streaming_data))
+
+    def latest(self, encoder_id: Hashable) -> Optional[Dict[str, float]]:
+        """Most recent precomputed analysis for the encoder, or None before its first sample"""
+        return self._results.get(encoder_id)
+
+    def process_pending(self, limit: Optional[int] = None) -> int:
+        """Fold queued samples into the rolling statistics
+
+        Args:
+            limit: Most samples to process in this call
+
+        Returns:
+            Number of samples processed
+        """
+        processed = 0
+        touched = set()
+        while self._pending and (limit is None or processed < limit):
+            encoder_id, streaming_data = self._pending.popleft()
+            stats = self._encoders.get(encoder_id)
+            if stats is None:
+                stats = self._encoders[encoder_id] = EncoderStability(self.window)
+            try:
+                stats.add(streaming_data)
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Skipping malformed streaming sample for encoder {encoder_id}: {str(e)}")
+                continue
+            touched.add(encoder_id)
+            processed += 1
+
+        # Results are replaced, never mutated, so readers always see a complete dict
+        for encoder_id in touched:
+            self._results[encoder_id] = self._encoders[encoder_id].result()
+        if processed:
+            self.metrics.samples.inc(processed)
+        self.metrics.pending.set(len(self._pending))
+        return processed
+
+    def forget(self, encoder_id: Hashable) -> None:
+        self._encoders.pop(encoder_id, None)
+        self._results.pop(encoder_id, None)
+
+    def run(self, sleep: Callable[[float], Any] = time.sleep) -> None:
+        """Background loop for ``socketio.start_background_task``; pass ``socketio.sleep`` under eventlet"""
+        self._running = True
+        while self._running:
+            # Yield between batches so a backlog does not starve the Socket.IO handlers
+            sleep(0 if self.process_pending(limit=1000) else self.interval)
+
+    def stop(self) -> None:
+        self._running = False
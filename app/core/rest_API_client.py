@@ -1,6 +1,19 @@
 import requests
-from typing import Dict, Any
+import aiohttp
+import asyncio
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
 import logging
+from app.core.aja.session_registry import HeloSessionRegistry, get_session_registry
+
+# In-flight reads shared by every AJADevice in the process, keyed by (base_url, paramid)
+_inflight_reads: Dict[Tuple[str, str], asyncio.Future] = {}
+
+STATUS_PARAMS = (
+    "eParamID_ReplicatorStreamState",
+    "eParamID_ReplicatorRecordState",
+    "eParamID_VideoInSelect"
+)
 
 class AJADevice:
     """
@@ -22,10 +35,22 @@ class AJADevice:
         
         # Start streaming
         await device.set_param("eParamID_ReplicatorStreamState", 1)
+
+        # Read several parameters in one batch
+        values = await device.get_params(["eParamID_VideoInSelect", "eParamID_AudioInSelect"])
+
+        # Apply an ordered list of writes
+        results = await device.set_params([("eParamID_StreamingProfileSel", 2),
+                                           ("eParamID_ReplicatorCommand", 3)])
         ```
     """
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, timeout: int = 5,
+                 registry: Optional[HeloSessionRegistry] = None):
         self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.registry = registry or get_session_registry()
+        parsed = urlparse(self.base_url)
+        self.host = f"{parsed.hostname}:{parsed.port or 80}"
         self.logger = logging.getLogger(__name__)
         
     def get_param(self, paramid: str) -> Dict[str, Any]:
@@ -42,6 +67,136 @@ class AJADevice:
         response.raise_for_status()
         return response.json()
 
+    async def _request_param(self, query: str) -> Dict[str, Any]:
+        session = await self.registry.get_session(self.host)
+        url = f"{self.base_url}/config?{query}"
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def get_param_async(self, paramid: str) -> Dict[str, Any]:
+        """Get a parameter value, joining an identical read already in flight
+
+        Concurrent callers asking the same device for the same parameter
+        share one HTTP request and receive the same response.
+        """
+        key = (self.base_url, paramid)
+        pending = _inflight_reads.get(key)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The caller that owned the read gave up; issue our own below
+
+        future = asyncio.get_running_loop().create_future()
+        _inflight_reads[key] = future
+        try:
+            result = await self._request_param(f"action=get&paramid={paramid}")
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a read nobody joined does not log "exception never retrieved"
+            future.exception()
+            raise
+        finally:
+            if _inflight_reads.get(key) is future:
+                del _inflight_reads[key]
+
+    async def get_params(self, paramids: Sequence[str],
+                         deadline: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Fetch several parameters concurrently over the pooled connection
+
+        Args:
+            paramids: eParamID_* names to read
+            deadline: Seconds allowed for the whole batch, defaults to the request timeout
+
+        Returns:
+            Mapping of param ID to the device response, or to ``{"error": ...}``
+            for reads that failed or missed the deadline
+        """
+        unique_ids = list(dict.fromkeys(paramids))
+        tasks = {
+            paramid: asyncio.ensure_future(self.get_param_async(paramid))
+            for paramid in unique_ids
+        }
+        if not tasks:
+            return {}
+
+        done, pending = await asyncio.wait(tasks.values(), timeout=deadline or self.timeout)
+        for task in pending:
+            task.cancel()
+
+        results = {}
+        for paramid, task in tasks.items():
+            if task in pending or task.cancelled():
+                results[paramid] = {"error": "deadline exceeded"}
+            elif task.exception() is not None:
+                results[paramid] = {"error": str(task.exception())}
+            else:
+                results[paramid] = task.result()
+        return results
+
+    async def set_param_async(self, paramid: str, value: Any) -> Dict[str, Any]:
+        """Set parameter value on AJA device"""
+        return await self._request_param(f"action=set&paramid={paramid}&value={value}")
+
+    async def set_params(self, writes: Sequence[Tuple[str, Any]],
+                         stop_on_error: bool = True) -> List[Dict[str, Any]]:
+        """Apply an ordered list of writes back to back over one keep-alive connection
+
+        Writes are sent in order because later parameters (e.g. a replicator
+        command) usually depend on earlier ones.
+
+        Args:
+            writes: (paramid, value) pairs in the order they must be applied
+            stop_on_error: Skip the remaining writes after the first failure
+
+        Returns:
+            One result per write with ``paramid``, ``value``, ``success`` and
+            either ``response`` or ``error``
+        """
+        results = []
+        failed = False
+        for paramid, value in writes:
+            if failed and stop_on_error:
+                results.append({"paramid": paramid, "value": value,
+                                "success": False, "error": "skipped after earlier failure"})
+                continue
+            try:
+                response = await self.set_param_async(paramid, value)
+                results.append({"paramid": paramid, "value": value,
+                                "success": True, "response": response})
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                failed = True
+                self.logger.error(f"Failed to set {paramid}={value}: {str(e)}")
+                results.append({"paramid": paramid, "value": value,
+                                "success": False, "error": str(e) or type(e).__name__})
+        return results
+
+    async def get_status_async(self) -> Dict[str, Any]:
+        """Get comprehensive device status with one batched read"""
+        values = await self.get_params(STATUS_PARAMS)
+        if any("error" in value for value in values.values()):
+            self.logger.error(f"Error getting device status: {values}")
+            return {
+                "streaming": False,
+                "recording": False,
+                "video_input": None,
+                "online": False
+            }
+        return {
+            "streaming": values["eParamID_ReplicatorStreamState"]["value"] == 2,
+            "recording": values["eParamID_ReplicatorRecordState"]["value"] == 2,
+            "video_input": values["eParamID_VideoInSelect"]["value"],
+            "online": True
+        }
+
     def get_status(self) -> Dict[str, Any]:
         """Get comprehensive device status"""
         try:
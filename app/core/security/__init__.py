@@ -1,10 +1,5 @@
 # config/__init__.py
-from .models import Role, Permission
-from .rbac import roles_required, permission_required, get_user_roles_and_permissions
-from .role_manager import RoleManager
-from .security_logger import SecurityEventLogger
-from .security_manager import SecurityManager
-from .ssl_config import SSLConfig, configure_ssl
+from app.core.lazy_loader import lazy_exports
 
 def read_nginx_conf():
     """Read the nginx.conf file and return its content."""
@@ -17,6 +12,22 @@ def read_nginx_conf():
     except Exception as e:
         raise Exception(f"Error reading nginx.conf: {str(e)}")
 
+# Exported names are imported from their submodule on first access
+_EXPORTS = {
+    'Role': '.models',
+    'Permission': '.models',
+    'roles_required': '.rbac',
+    'permission_required': '.rbac',
+    'get_user_roles_and_permissions': '.rbac',
+    'RoleManager': '.role_manager',
+    'SecurityEventLogger': '.security_logger',
+    'SecurityManager': '.security_manager',
+    'SSLConfig': '.ssl_config',
+    'configure_ssl': '.ssl_config'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
 __all__ = [
     'Role',
     'Permission',
@@ -29,4 +40,4 @@ __all__ = [
     'SSLConfig',
     'configure_ssl',
     'read_nginx_conf'
-]
\ No newline at end of file
+]
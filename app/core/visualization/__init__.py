@@ -1,9 +1,16 @@
-from .advanced_visualizer import AdvancedErrorVisualizer
-from .error_visualizer import ErrorVisualizer
-from .export_manager import ReportExporter
+from app.core.lazy_loader import lazy_exports
+
+# Exported names are imported from their submodule on first access
+_EXPORTS = {
+    'AdvancedErrorVisualizer': '.advanced_visualizer',
+    'ErrorVisualizer': '.error_visualizer',
+    'ReportExporter': '.export_manager'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     'AdvancedErrorVisualizer',
     'ErrorVisualizer',
     'ReportExporter'
-] 
\ No newline at end of file
+]
@@ -69,7 +69,7 @@ class EncoderManager(BaseMetricsService):
     async def get_client(self, encoder_id: str) -> AJAHELOClient:
         if encoder_id not in self.clients:
             encoder = await self.get_encoder(encoder_id)
-            self.clients[encoder_id] = AJAHELOClient(encoder.ip_address)
+            self.clients[encoder_id] = AJAHELOClient(encoder.ip_address, encoder_id=encoder_id)
         return self.clients[encoder_id]
 
     @handle_errors()
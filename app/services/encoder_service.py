@@ -1,4 +1,5 @@
 from typing import Dict, List, Optional
+import asyncio
 from app.core.base_service import BaseService
 from app.core.error_handling.errors.exceptions import EncoderError
 from app.core.database.models.encoder import HeloEncoder, EncoderMetrics
@@ -15,7 +16,6 @@ from app.core.error_handling.performance_monitoring import PerformanceMonitor
 from app.core.error_handling.helo_error_tracking import ErrorTracking
 from app.core.error_handling.handlers import ErrorHandler
 from app.core.monitoring.system_monitor import MonitoringSystem
-from app.core.live_transcription.handler_whisper_online import LiveCaptioningService
 from app.core.aja.client import AJAHELOClient
 
 
@@ -245,13 +245,14 @@ class EncoderService(BaseService):
 
     async def update_encoder_settings(self, encoder_id: str, settings: Dict) -> Dict:
         """Update encoder settings with validation"""
-        for param_name, value in settings.items():
-            if not self.param_manager.validate_value(param_name, value):
-                raise EncoderError(
-                    f"Invalid value for parameter: {param_name}",
-                    encoder_id=encoder_id,
-                    error_type="invalid_parameter"
-                )
+        errors = self.param_manager.validate_many(settings)
+        if errors:
+            param_name = next(iter(errors))
+            raise EncoderError(
+                f"Invalid value for parameter: {param_name} ({errors[param_name]})",
+                encoder_id=encoder_id,
+                error_type="invalid_parameter"
+            )
 
         # Reference existing parameters from CSV
         if 'Video Bit Rate' in settings:
@@ -266,7 +267,7 @@ class EncoderService(BaseService):
         """Get or create AJA HELO client for encoder"""
         if encoder_id not in self._clients:
             encoder = await self.get_encoder(encoder_id)
-            self._clients[encoder_id] = AJAHELOClient(encoder.ip_address)
+            self._clients[encoder_id] = AJAHELOClient(encoder.ip_address, encoder_id=encoder_id)
         return self._clients[encoder_id]
 
     async def start_stream(self, encoder_id: str, config: Dict) -> Dict:
@@ -286,13 +287,20 @@ class EncoderService(BaseService):
 
     async def get_encoder_status(self, encoder_id: str) -> Dict:
         """Get comprehensive encoder status"""
-        async with await self.get_client(encoder_id) as client:
-            return {
-                'system': await client.get_system_status(),
-                'stream': await client.get_stream_status(),
-                'network': await client.get_network_stats(),
-                'media': await client.get_media_status()
-            }
+        # Cached client borrows a keep-alive session from the shared registry
+        client = await self.get_client(encoder_id)
+        system, stream, network, media = await asyncio.gather(
+            client.get_system_status(),
+            client.get_stream_status(),
+            client.get_network_stats(),
+            client.get_media_status()
+        )
+        return {
+            'system': system,
+            'stream': stream,
+            'network': network,
+            'media': media
+        }
 
     async def monitor_encoder(self, encoder_id: str):
         # Use the new monitoring system
@@ -302,7 +310,12 @@ class EncoderService(BaseService):
     async def start_transcription(self, encoder_id: str) -> Dict:
         """Start transcription for an encoder"""
         encoder = await self._get_encoder_or_error(encoder_id)
-        
+
+        # Admit the stream up front so a full pool is reported to the caller
+        from app.core.live_transcription.transcription_pool import TranscriptionWorkerPool
+        pool = TranscriptionWorkerPool.get_instance()
+        await pool.register_stream(encoder.ip_address)
+
         try:
             # Use existing LiveCaptioningService directly
             await self.monitoring_system.start_background_task(
@@ -314,23 +327,31 @@ class EncoderService(BaseService):
             await self._update_transcription_status(encoder, True)
             return {"status": "started", "encoder_id": encoder_id}
         except Exception as e:
+            # Give the admitted slot back, or every failed start shrinks the pool for good
+            pool.unregister_stream(encoder.ip_address)
             raise EncoderError(f"Failed to start transcription: {str(e)}", 
                               encoder_id=encoder_id, 
                               error_type="transcription_start")
 
     async def _run_transcription(self, encoder):
-        """Use existing LiveCaptioningService implementation"""
+        """Use existing LiveCaptioningService implementation on the shared model pool"""
         from app.core.live_transcription.handler_whisper_online import (
             LiveCaptioningService, StreamConfig
         )
+        from app.core.live_transcription.transcription_pool import TranscriptionWorkerPool
         
         service = LiveCaptioningService(
             config=StreamConfig(
                 ip_address=encoder.ip_address,
                 stream_url=encoder.stream_url
-            )
+            ),
+            pool=TranscriptionWorkerPool.get_instance()
         )
-        return await service.process_stream()
+        try:
+            return await service.process_stream()
+        finally:
+            # Frees the admission slot even if the stream never started
+            service.pool.unregister_stream(encoder.ip_address)
 
     async def stop_transcription(self, encoder_id: str) -> Dict:
         """Stop transcription for an encoder"""
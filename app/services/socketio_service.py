@@ -14,11 +14,13 @@ from app.core.database.models.log_entry import LogEntry
 from WatchTower.app.core.auth.auth import require_api_key, roles_required
 from app.core.error_handling.decorators import handle_errors
 from app.core.metrics.metrics_analyzer import MetricsAnalyzer
+from app.core.metrics.stability_tracker import StreamingStabilityTracker
 from app.services.websocket.websocket_security import WebSocketSecurity
 from app.services.websocket.websocket_rate_limiter import WebSocketRateLimiter
 from app.services.websocket.websocket_auth import Authenticator
 from app.services.encoder_backup_fail_over import LoadBalancer
 from app.services.performance_monitor import PerformanceMonitor
+from app.services.websocket.state_sync import EncoderStateSync
 
 
 class EnhancedSocketIOService:
@@ -26,19 +28,25 @@ class EnhancedSocketIOService:
         self.socketio = SocketIO()
         self.connected_clients = {}
         self.metrics_analyzer = MetricsAnalyzer()
+        self.stability = StreamingStabilityTracker()
         self.security = WebSocketSecurity()
         self.performance_monitor = PerformanceMonitor()
         self.load_balancer = LoadBalancer()
         self.rate_limiter = WebSocketRateLimiter()
         self.authenticator = Authenticator()
+        self.state_sync = EncoderStateSync(self.socketio)
         
         if app:
             self.init_app(app)
     
     def init_app(self, app):
         self.socketio.init_app(app)
+        if getattr(app, 'redis_client', None) is not None:
+            # Share message limits between Socket.IO worker processes
+            self.rate_limiter = WebSocketRateLimiter(redis_client=app.redis_client)
         self.authenticator.init_app(app)
         self.setup_event_handlers()
+        self.socketio.start_background_task(self.stability.run, self.socketio.sleep)
     
     def setup_event_handlers(self):
         @self.socketio.on('connect')
@@ -67,10 +75,17 @@ class EnhancedSocketIOService:
             encoder_id = data.get('encoder_id')
             self._handle_subscription(client_id, encoder_id)
         
+        @self.socketio.on('resync_encoder')
+        def handle_resync(data):
+            # The client saw a gap in an encoder's delta sequence numbers
+            self.state_sync.handle_resync(request.sid, data)
+        
         @self.socketio.on('disconnect')
         def handle_disconnect():
             client_id = request.sid
             self.connected_clients.pop(client_id, None)
+            self.state_sync.remove_client(client_id)
+            self.rate_limiter.remove_client(client_id)
         
         @self.socketio.on('performance_metrics')
         @self.security.secure_websocket
@@ -93,7 +108,7 @@ class EnhancedSocketIOService:
                     # Update client assignment
                     if client_id in self.connected_clients:
                         self.connected_clients[client_id]['assigned_encoder'] = new_encoder
-                        self.connected_clients[client_id]['subscriptions'].add(new_encoder)
+                        self._handle_subscription(client_id, new_encoder)
                 except Exception as e:
                     current_app.logger.error(
                         f"Failed to reassign client {client_id}: {str(e)}"
@@ -104,19 +119,24 @@ class EnhancedSocketIOService:
             target=lambda: self.socketio.sleep(30) or check_load_balance()
         )
     
+    def _handle_subscription(self, client_id: str, encoder_id: int):
+        """Subscribe a client to an encoder and send it the encoder's current snapshot"""
+        client = self.connected_clients.setdefault(client_id, {})
+        self.state_sync.subscribe(client_id, encoder_id)
+        client['subscriptions'] = self.state_sync.index.subscriptions(client_id)
+    
     def broadcast_encoder_update(self, encoder_id: int, data: dict):
         """Broadcast updates to subscribed clients"""
         try:
-            # Add analysis to the data
-            data['analysis'] = self.metrics_analyzer.analyze_streaming_stability(data)
+            # Analysis is computed in the background; attach the latest result
+            self.stability.submit(encoder_id, data.get('streaming_data', data))
+            data['analysis'] = self.stability.latest(encoder_id)
             
-            # Broadcast to subscribed clients only
-            for client_id, subscriptions in self.connected_clients.items():
-                if encoder_id in subscriptions['subscriptions']:
-                    try:
-                        self.socketio.emit('encoder_update', data, room=client_id)
-                    except Exception as e:
-                        raise EncoderError(f"Failed to send update", encoder_id=str(encoder_id))
+            # One delta of the changed fields to the encoder's room
+            try:
+                self.state_sync.update(encoder_id, data)
+            except Exception as e:
+                raise EncoderError(f"Failed to send update", encoder_id=str(encoder_id))
         except Exception as e:
             raise APIError(f"Broadcast failed: {str(e)}", code=500)
     
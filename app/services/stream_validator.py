@@ -121,9 +121,8 @@ class StreamConfigValidator:
         errors = []
         
         # Validate each parameter against AJA specifications
-        for param_name, value in config.items():
-            if not self.param_manager.validate_value(param_name, value):
-                errors.append(f"Invalid value for {param_name}: {value}")
+        for param_name in self.param_manager.validate_many(config):
+            errors.append(f"Invalid value for {param_name}: {config[param_name]}")
 
         # Check required parameters
         required_params = [
@@ -0,0 +1,203 @@
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from prometheus_client import Counter, Gauge, Histogram
+from app.services.websocket.subscription_fanout import SubscriptionIndex, encoder_room
+
+logger = logging.getLogger(__name__)
+
+Path = Tuple[str, ...]
+
+class StateSyncMetrics:
+    """Encoder state sync metrics"""
+    messages = Counter('websocket_state_sync_messages_total', 'Encoder state messages sent', ['kind'])
+    bytes_sent = Counter('websocket_state_sync_bytes_total', 'Encoder state bytes delivered to clients', ['kind'])
+    client_bytes_per_minute = Histogram('websocket_client_bytes_per_minute',
+                                        'Encoder state bytes sent to each client per minute',
+                                        buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576))
+    mean_client_bytes_per_minute = Gauge('websocket_client_bytes_per_minute_mean',
+                                         'Mean encoder state bytes sent per client over the last minute')
+
+def flatten_state(state: Dict[str, Any], prefix: Path = ()) -> Dict[Path, Any]:
+    """Leaf values of a nested status dict keyed by their key path; empty dicts and lists are leaves"""
+    flat = {}
+    for key, value in state.items():
+        path = prefix + (key,)
+        if isinstance(value, dict) and value:
+            flat.update(flatten_state(value, path))
+        else:
+            flat[path] = value
+    return flat
+
+def diff_states(old: Dict[Path, Any], new: Dict[Path, Any]) -> Tuple[List[list], List[list]]:
+    """Changes turning flattened ``old`` into ``new`` as ([path, value] pairs to set, paths to unset)"""
+    changed = [[list(path), value] for path, value in new.items() if path not in old or old[path] != value]
+    removed = [list(path) for path in old if path not in new]
+    return changed, removed
+
+def apply_delta(state: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply an ``encoder_delta`` message to a client's copy of the state, in place
+
+    Reference implementation of what dashboards do with a delta: unset
+    paths first, pruning dicts they leave empty, then set the new values.
+    """
+    for path in delta.get('unset', ()):
+        parents = []
+        node = state
+        for key in path[:-1]:
+            parents.append((node, key))
+            node = node.get(key)
+            if not isinstance(node, dict):
+                break
+        else:
+            node.pop(path[-1], None)
+            for parent, key in reversed(parents):
+                if parent[key]:
+                    break
+                del parent[key]
+    for path, value in delta.get('set', ()):
+        node = state
+        for key in path[:-1]:
+            if not isinstance(node.get(key), dict):
+                node[key] = {}
+            node = node[key]
+        node[path[-1]] = value
+    return state
+
+class _EncoderState:
+    __slots__ = ('seq', 'state', 'flat')
+
+    def __init__(self):
+        self.seq = 0
+        self.state: Dict[str, Any] = {}
+        self.flat: Dict[Path, Any] = {}
+
+class EncoderStateSync:
+    """Versioned encoder state sync over Socket.IO
+
+    Subscribing sends the client an ``encoder_snapshot`` of the encoder's
+    current state. Each later change is sent once to the encoder's room as
+    an ``encoder_delta`` holding only the changed paths and the encoder's
+    next sequence number. A client that sees a sequence gap emits
+    ``resync_encoder`` and is sent a fresh snapshot. A delta that would be
+    larger than the state itself is sent as a snapshot instead.
+    """
+
+    def __init__(self, socketio, index: Optional[SubscriptionIndex] = None, namespace: str = '/',
+                 window: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            socketio: Flask-SocketIO instance used to emit and manage rooms
+            index: Subscription index, shared with BatchFanout where both are used
+            namespace: Socket.IO namespace clients connect on
+            window: Seconds over which bytes per client are measured
+            clock: Time source, replaceable in tests
+        """
+        self.socketio = socketio
+        self.index = index or SubscriptionIndex()
+        self.namespace = namespace
+        self.window = window
+        self.clock = clock
+        self.encoders: Dict[Hashable, _EncoderState] = {}
+        self.metrics = StateSyncMetrics()
+
+        # Bytes sent this window to each encoder room and directly to each client
+        self._window_start = clock()
+        self._room_bytes: Dict[Hashable, int] = {}
+        self._client_bytes: Dict[str, int] = {}
+        self.last_bytes_per_client: Dict[str, float] = {}
+
+    def _emit(self, kind: str, message: Dict[str, Any], encoder_id: Hashable,
+              client_id: Optional[str] = None, size: Optional[int] = None) -> None:
+        event = 'encoder_delta' if kind == 'delta' else 'encoder_snapshot'
+        if size is None:
+            size = len(json.dumps(message, separators=(',', ':'), default=str))
+        if client_id is None:
+            self.socketio.emit(event, message, room=encoder_room(encoder_id), namespace=self.namespace)
+            self._room_bytes[encoder_id] = self._room_bytes.get(encoder_id, 0) + size
+            recipients = self.index.subscriber_count(encoder_id)
+        else:
+            self.socketio.emit(event, message, room=client_id, namespace=self.namespace)
+            self._client_bytes[client_id] = self._client_bytes.get(client_id, 0) + size
+            recipients = 1
+        self.metrics.messages.labels(kind).inc()
+        self.metrics.bytes_sent.labels(kind).inc(size * recipients)
+
+    def snapshot(self, encoder_id: Hashable) -> Dict[str, Any]:
+        entry = self.encoders.get(encoder_id) or _EncoderState()
+        return {'encoder_id': encoder_id, 'seq': entry.seq, 'state': entry.state}
+
+    def update(self, encoder_id: Hashable, state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Record an encoder's new state and send subscribers what changed
+
+        Args:
+            encoder_id: Encoder the state belongs to
+            state: Full, JSON-serialisable status dict; it is kept, so pass a copy if it will be mutated
+
+        Returns:
+            The message sent, or None when nothing changed
+        """
+        self.rollover()
+        entry = self.encoders.setdefault(encoder_id, _EncoderState())
+        flat = flatten_state(state)
+        changed, removed = diff_states(entry.flat, flat)
+        if not changed and not removed and entry.seq:
+            return None
+
+        entry.seq += 1
+        entry.state, entry.flat = state, flat
+        if not self.index.subscriber_count(encoder_id):
+            return None
+
+        delta = {'encoder_id': encoder_id, 'seq': entry.seq, 'set': changed, 'unset': removed}
+        delta_size = len(json.dumps(delta, separators=(',', ':'), default=str))
+        # Only a delta touching most of the state can outgrow a snapshot
+        if 2 * (len(changed) + len(removed)) >= len(flat):
+            snapshot = self.snapshot(encoder_id)
+            snapshot_size = len(json.dumps(snapshot, separators=(',', ':'), default=str))
+            if delta_size >= snapshot_size:
+                self._emit('snapshot', snapshot, encoder_id, size=snapshot_size)
+                return snapshot
+        self._emit('delta', delta, encoder_id, size=delta_size)
+        return delta
+
+    def send_snapshot(self, client_id: str, encoder_id: Hashable, kind: str = 'snapshot') -> None:
+        self._emit(kind, self.snapshot(encoder_id), encoder_id, client_id=client_id)
+
+    def subscribe(self, client_id: str, encoder_id: Hashable) -> None:
+        """Join the client to the encoder's room and send it the current snapshot"""
+        if self.index.subscribe(client_id, encoder_id):
+            self.socketio.server.enter_room(client_id, encoder_room(encoder_id), namespace=self.namespace)
+        self.send_snapshot(client_id, encoder_id)
+
+    def handle_resync(self, client_id: str, data: Dict[str, Any]) -> None:
+        """Answer a client's ``resync_encoder`` after it detected a sequence gap"""
+        encoder_id = data.get('encoder_id')
+        if encoder_id not in self.index.subscriptions(client_id):
+            return
+        logger.debug(f"Client {client_id} resyncing encoder {encoder_id} from seq {data.get('seq')}")
+        self.send_snapshot(client_id, encoder_id, kind='resync')
+
+    def remove_client(self, client_id: str) -> None:
+        self.index.remove_client(client_id)
+        self._client_bytes.pop(client_id, None)
+
+    def rollover(self, force: bool = False) -> None:
+        """Close the measurement window once it has elapsed and export bytes per client per minute"""
+        now = self.clock()
+        elapsed = now - self._window_start
+        if elapsed < self.window and not force:
+            return
+        per_minute = 60.0 / elapsed if elapsed > 0 else 0.0
+        rates = {}
+        for client_id, subscriptions in self.index.clients():
+            sent = self._client_bytes.get(client_id, 0)
+            sent += sum(self._room_bytes.get(encoder_id, 0) for encoder_id in subscriptions)
+            rates[client_id] = sent * per_minute
+            self.metrics.client_bytes_per_minute.observe(rates[client_id])
+        self.metrics.mean_client_bytes_per_minute.set(sum(rates.values()) / len(rates) if rates else 0)
+        self.last_bytes_per_client = rates
+        self._window_start = now
+        self._room_bytes.clear()
+        self._client_bytes.clear()
@@ -0,0 +1,166 @@
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Hashable, ItemsView, List, Optional, Set
+from prometheus_client import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+EMPTY: frozenset = frozenset()
+
+class FanoutMetrics:
+    """Encoder update fan-out metrics"""
+    flush_duration = Histogram('websocket_fanout_flush_seconds', 'Time to send one flush of queued encoder updates')
+    deliveries = Counter('websocket_fanout_deliveries_total', 'Encoder update batches delivered to subscribed clients')
+    emits = Counter('websocket_fanout_emits_total', 'Room emits made by batch flushes')
+    dropped = Counter('websocket_fanout_dropped_updates_total', 'Queued updates for encoders nobody is subscribed to')
+
+def encoder_room(encoder_id: Hashable) -> str:
+    """Socket.IO room holding the clients subscribed to an encoder"""
+    return f"encoder:{encoder_id}"
+
+class SubscriptionIndex:
+    """Encoder to subscribed clients, and client to subscribed encoders
+
+    Both directions are kept so that a flush only touches encoders with
+    subscribers and a disconnect only touches the client's own encoders.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[Hashable, Set[str]] = {}
+        self._subscriptions: Dict[str, Set[Hashable]] = {}
+
+    def subscribe(self, client_id: str, encoder_id: Hashable) -> bool:
+        """Returns True if the client was not already subscribed"""
+        subscriptions = self._subscriptions.setdefault(client_id, set())
+        if encoder_id in subscriptions:
+            return False
+        subscriptions.add(encoder_id)
+        self._subscribers.setdefault(encoder_id, set()).add(client_id)
+        return True
+
+    def unsubscribe(self, client_id: str, encoder_id: Hashable) -> bool:
+        """Returns True if the client was subscribed"""
+        subscriptions = self._subscriptions.get(client_id)
+        if not subscriptions or encoder_id not in subscriptions:
+            return False
+        subscriptions.discard(encoder_id)
+        if not subscriptions:
+            del self._subscriptions[client_id]
+        self._discard_subscriber(encoder_id, client_id)
+        return True
+
+    def remove_client(self, client_id: str) -> Set[Hashable]:
+        """Drop all of a client's subscriptions, returning the encoders it was subscribed to"""
+        subscriptions = self._subscriptions.pop(client_id, set())
+        for encoder_id in subscriptions:
+            self._discard_subscriber(encoder_id, client_id)
+        return subscriptions
+
+    def _discard_subscriber(self, encoder_id: Hashable, client_id: str) -> None:
+        subscribers = self._subscribers.get(encoder_id)
+        if subscribers is not None:
+            subscribers.discard(client_id)
+            if not subscribers:
+                del self._subscribers[encoder_id]
+
+    def subscribers(self, encoder_id: Hashable) -> Set[str]:
+        """Clients subscribed to an encoder; the returned set must not be modified"""
+        return self._subscribers.get(encoder_id, EMPTY)
+
+    def subscriptions(self, client_id: str) -> Set[Hashable]:
+        """Encoders a client is subscribed to; the returned set must not be modified"""
+        return self._subscriptions.get(client_id, EMPTY)
+
+    def subscriber_count(self, encoder_id: Hashable) -> int:
+        return len(self._subscribers.get(encoder_id, EMPTY))
+
+    def clients(self) -> ItemsView[str, Set[Hashable]]:
+        """(client, subscribed encoders) for every client with a subscription"""
+        return self._subscriptions.items()
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+class BatchFanout:
+    """Queues encoder updates and sends each encoder's batch once to its room
+
+    A flush costs one emit per encoder with both pending updates and
+    subscribers. Socket.IO encodes a room emit once and writes the same
+    packet to every participant, so the payload is serialised once per
+    encoder rather than once per client.
+    """
+
+    def __init__(self, socketio, index: Optional[SubscriptionIndex] = None, event: str = 'encoder_batch_update',
+                 namespace: str = '/'):
+        """
+        Args:
+            socketio: Flask-SocketIO instance used to emit and manage rooms
+            index: Subscription index shared with the subscribe handlers
+            event: Event name of the batch message
+            namespace: Socket.IO namespace clients connect on
+        """
+        self.socketio = socketio
+        self.index = index or SubscriptionIndex()
+        self.event = event
+        self.namespace = namespace
+        self.queue: Dict[Hashable, List[Dict[str, Any]]] = defaultdict(list)
+        self.metrics = FanoutMetrics()
+
+    def subscribe(self, client_id: str, encoder_id: Hashable) -> bool:
+        """Index the subscription and add the client to the encoder's room"""
+        if not self.index.subscribe(client_id, encoder_id):
+            return False
+        self.socketio.server.enter_room(client_id, encoder_room(encoder_id), namespace=self.namespace)
+        return True
+
+    def unsubscribe(self, client_id: str, encoder_id: Hashable) -> bool:
+        if not self.index.unsubscribe(client_id, encoder_id):
+            return False
+        self.socketio.server.leave_room(client_id, encoder_room(encoder_id), namespace=self.namespace)
+        return True
+
+    def remove_client(self, client_id: str) -> None:
+        """Forget a disconnected client; Socket.IO drops its rooms on disconnect"""
+        self.index.remove_client(client_id)
+
+    def enqueue(self, encoder_id: Hashable, update_type: str, data: dict) -> None:
+        self.queue[encoder_id].append({
+            'type': update_type,
+            'data': data,
+            'timestamp': datetime.utcnow().isoformat()
+        })
+
+    def flush(self) -> int:
+        """Send every queued batch to its encoder's room
+
+        Returns:
+            Number of client deliveries made
+        """
+        if not self.queue:
+            return 0
+        started = time.perf_counter()
+        pending, self.queue = self.queue, defaultdict(list)
+
+        deliveries = emits = dropped = 0
+        for encoder_id, batch in pending.items():
+            subscribers = self.index.subscriber_count(encoder_id)
+            if not subscribers:
+                dropped += len(batch)
+                continue
+            try:
+                self.socketio.emit(self.event, {'encoder_id': encoder_id, 'updates': batch},
+                                   room=encoder_room(encoder_id), namespace=self.namespace)
+            except Exception as e:
+                logger.error(f"Failed to send batch for encoder {encoder_id}: {str(e)}")
+                continue
+            emits += 1
+            deliveries += subscribers
+
+        self.metrics.emits.inc(emits)
+        self.metrics.deliveries.inc(deliveries)
+        if dropped:
+            self.metrics.dropped.inc(dropped)
+        self.metrics.flush_duration.observe(time.perf_counter() - started)
+        return deliveries
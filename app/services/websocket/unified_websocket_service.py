@@ -3,14 +3,16 @@ from datetime import datetime
 import asyncio
 import logging
 from typing import Dict, Any, Set
-from collections import defaultdict
 from app.core.auditing_log import setup_logging
 from app.services.websocket.websocket_auth import WebSocketAuthenticator
 from app.core.config.websocket_config import Config
-from WatchTower.app.core.auth.auth import require_api_key, roles_required
+from app.core.auth.auth import require_api_key
+from app.core.security.rbac import roles_required
 from app.core.error_handling.decorators import handle_errors
 from app.services.websocket.websocket_security import WebSocketSecurity
 from app.services.websocket.websocket_rate_limiter import WebSocketRateLimiter
+from app.services.websocket.subscription_fanout import BatchFanout
+from app.services.websocket.state_sync import EncoderStateSync
 from app.services.encoder_manager import EncoderManager
 from app.services.encoder_service import EncoderService
 
@@ -22,12 +24,13 @@ class UnifiedWebSocketService:
         self.app = app
         self.connected_clients: Dict[str, Dict] = {}
         self.encoder_states: Dict[int, Dict] = {}
-        self.batch_queue: Dict[str, list] = defaultdict(list)
+        self.fanout = BatchFanout(socketio)
+        self.state_sync = EncoderStateSync(socketio, self.fanout.index)
         self.batch_interval = 0.5  # seconds
         self.logger = setup_logging(__name__)
         self.authenticator = WebSocketAuthenticator(socketio)
         self.security = WebSocketSecurity()
-        self.rate_limiter = WebSocketRateLimiter()
+        self.rate_limiter = WebSocketRateLimiter(redis_client=getattr(app, 'redis_client', None))
         self.encoder_manager = EncoderManager(app.db)  # Assuming app has a db attribute
         self.encoder_service = EncoderService()
         
@@ -45,6 +48,13 @@ class UnifiedWebSocketService:
         def handle_connect():
             token = request.args.get('token')
             self.on_connect(token)
+
+        @self.socketio.on('disconnect')
+        def handle_disconnect():
+            client_id = request.sid
+            self.connected_clients.pop(client_id, None)
+            self.state_sync.remove_client(client_id)
+            self.rate_limiter.remove_client(client_id)
             
         @self.socketio.on('subscribe_encoder')
         @self.security.secure_websocket
@@ -59,6 +69,11 @@ class UnifiedWebSocketService:
                 logger.error(f"Subscription error: {str(e)}")
                 emit('error', {'message': str(e)})
 
+        @self.socketio.on('resync_encoder')
+        def handle_resync(data):
+            # The client saw a gap in an encoder's delta sequence numbers
+            self.state_sync.handle_resync(request.sid, data)
+
     @handle_errors()
     async def _validate_connection(self, client_id: str) -> bool:
         """Validate new connection with rate limiting and security checks"""
@@ -75,37 +90,14 @@ class UnifiedWebSocketService:
     @handle_errors()
     async def broadcast_update(self, encoder_id: int, update_type: str, data: dict):
         """Queue update for batch processing"""
-        self.batch_queue[encoder_id].append({
-            'type': update_type,
-            'data': data,
-            'timestamp': datetime.utcnow().isoformat()
-        })
+        self.fanout.enqueue(encoder_id, update_type, data)
         
     @handle_errors()
     async def _process_batch_queue(self):
         """Process batched updates"""
         while True:
-            for encoder_id, updates in self.batch_queue.items():
-                if updates:
-                    batch = updates.copy()
-                    self.batch_queue[encoder_id] = []
-                    
-                    # Send to subscribed clients
-                    for client_id, client in self.connected_clients.items():
-                        if encoder_id in client['subscriptions']:
-                            try:
-                                self.socketio.emit(
-                                    'encoder_batch_update',
-                                    {
-                                        'encoder_id': encoder_id,
-                                        'updates': batch
-                                    },
-                                    room=client_id
-                                )
-                            except Exception as e:
-                                logger.error(f"Failed to send batch: {str(e)}")
-                                await self._handle_client_error(client_id)
-                                
+            # One emit per encoder room, only for encoders with subscribers
+            self.fanout.flush()
             await asyncio.sleep(self.batch_interval)
 
     @handle_errors()
@@ -130,14 +122,18 @@ class UnifiedWebSocketService:
     async def _handle_subscription(self, client_id: str, encoder_id: str):
         """Handle client subscription to encoder updates"""
         if client_id not in self.connected_clients:
-            self.connected_clients[client_id] = {'subscriptions': set()}
+            self.connected_clients[client_id] = {}
         
-        self.connected_clients[client_id]['subscriptions'].add(encoder_id)
+        # Joins the encoder's room and sends the current snapshot; changes follow as deltas
+        self.state_sync.subscribe(client_id, encoder_id)
+        self.connected_clients[client_id]['subscriptions'] = self.fanout.index.subscriptions(client_id)
         self.logger.info(f"Client {client_id} subscribed to encoder {encoder_id}")
 
     async def _handle_client_error(self, client_id: str):
         """Handle errors related to a specific client"""
         self.logger.error(f"Handling error for client {client_id}")
+        self.state_sync.remove_client(client_id)
+        self.rate_limiter.remove_client(client_id)
         if client_id in self.connected_clients:
             disconnect(client_id)
             del self.connected_clients[client_id]
@@ -174,13 +170,15 @@ class UnifiedWebSocketService:
             for encoder_id in self.encoder_states.keys():
                 try:
                     # Retrieve the current state of the encoder
-                    encoder = await self.encoder_service._op_get_encoder(encoder_id)
-                    new_state = await self.encoder_manager.get_encoder_status(encoder_id)
+                    # Reads through the shared device state cache, so this loop does not
+                    # add device load on top of the other monitors polling the same HELO
+                    new_state = await self.encoder_service.get_encoder_status(encoder_id)
                     
                     # Check if the state has changed
                     if new_state != self.encoder_states[encoder_id]:
                         self.encoder_states[encoder_id] = new_state
-                        await self.broadcast_update(encoder_id, 'state_change', new_state)
+                        # Subscribers get only the changed fields, tagged with a sequence number
+                        self.state_sync.update(encoder_id, new_state)
                 except Exception as e:
                     self.logger.error(f"Error monitoring encoder {encoder_id}: {str(e)}")
             
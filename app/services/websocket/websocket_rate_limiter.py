@@ -1,30 +1,191 @@
-from datetime import datetime, timedelta
-from collections import defaultdict
-import asyncio
-from app.core.error_handling.decorators import handle_errors
+import logging
+import time
+from typing import Callable, Dict, Hashable, Optional, Tuple
+from prometheus_client import Counter
 
+logger = logging.getLogger(__name__)
+
+# Slack for float error when a request lands exactly on the burst limit
+_EPSILON = 1e-6
+
+class RateLimiterMetrics:
+    """WebSocket rate limiting metrics"""
+    checks = Counter('websocket_rate_limit_checks_total', 'WebSocket rate limit checks', ['result'])
+    errors = Counter('websocket_rate_limit_errors_total', 'Rate limit checks that failed open on a backend error')
+
+class GCRALimiter:
+    """Generic cell rate algorithm limiter keeping one timestamp per key
+
+    Each key stores its theoretical arrival time (TAT): when its bucket
+    would be empty again if requests arrived at exactly the allowed rate.
+    A request is allowed while the TAT it would push forward stays within
+    ``burst`` emission intervals of now, so a check is O(1) in time and
+    memory however many requests the key makes.
+    """
+
+    def __init__(self, rate: int, period: float, burst: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            rate: Requests allowed per period
+            period: Length of the period in seconds
+            burst: Requests allowed at once from an idle key; defaults to ``rate``
+            clock: Time source in seconds, replaceable in tests
+        """
+        self.interval = period / rate
+        self.burst = burst or rate
+        self.tolerance = self.interval * self.burst
+        self.clock = clock
+        self._tat: Dict[Hashable, float] = {}
+        self._next_prune = 1024
+
+    def check(self, key: Hashable, cost: int = 1) -> Tuple[bool, float]:
+        """Consume ``cost`` requests for ``key`` if allowed
+
+        Returns:
+            (allowed, seconds until the request would be allowed; 0 when it was)
+        """
+        now = self.clock()
+        tat = self._tat.get(key, now)
+        if tat < now:
+            tat = now
+        new_tat = tat + self.interval * cost
+        excess = new_tat - now - self.tolerance
+        if excess > _EPSILON:
+            return False, excess
+
+        self._tat[key] = new_tat
+        if len(self._tat) >= self._next_prune:
+            self.prune()
+        return True, 0.0
+
+    def allow(self, key: Hashable, cost: int = 1) -> bool:
+        return self.check(key, cost)[0]
+
+    def reset(self, key: Hashable) -> None:
+        self._tat.pop(key, None)
+
+    def prune(self) -> int:
+        """Forget keys idle long enough to have a full burst again; they behave as new keys
+
+        Runs automatically each time the number of keys doubles, so idle
+        clients cost nothing once they have recovered.
+
+        Returns:
+            Number of keys removed
+        """
+        now = self.clock()
+        idle = [key for key, tat in self._tat.items() if tat <= now]
+        for key in idle:
+            del self._tat[key]
+        self._next_prune = max(1024, 2 * len(self._tat))
+        return len(idle)
+
+    def __len__(self) -> int:
+        return len(self._tat)
+
+# KEYS[1]: limiter key. ARGV: emission interval, burst tolerance (both microseconds), cost.
+# Uses the Redis server clock so every worker process sees the same time (Redis 5+ replicates
+# the SET rather than the script, which makes calling TIME before a write safe).
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000000 + tonumber(time[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval * cost
+local excess = new_tat - now - tolerance
+if excess > 0 then
+    return {0, excess}
+end
+redis.call('SET', KEYS[1], string.format('%d', new_tat), 'PX', math.max(1, math.ceil((new_tat - now) / 1000)))
+return {1, 0}
+"""
+
+class RedisGCRALimiter:
+    """GCRA limiter storing each key's TAT in Redis, shared by all worker processes
+
+    The whole check runs as one Lua script, so concurrent checks for the
+    same key from different Socket.IO workers cannot both take the last
+    request. Keys expire once their bucket is full again.
+    """
+
+    def __init__(self, redis_client, rate: int, period: float, burst: Optional[int] = None,
+                 prefix: str = 'ws_rate:'):
+        """
+        Args:
+            redis_client: redis.Redis client
+            rate: Requests allowed per period
+            period: Length of the period in seconds
+            burst: Requests allowed at once from an idle key; defaults to ``rate``
+            prefix: Prefix of the Redis keys holding each key's TAT
+        """
+        self.redis = redis_client
+        self.interval = round(period / rate * 1_000_000)
+        self.burst = burst or rate
+        self.tolerance = self.interval * self.burst
+        self.prefix = prefix
+        self._script = redis_client.register_script(GCRA_SCRIPT)
+
+    def check(self, key: Hashable, cost: int = 1) -> Tuple[bool, float]:
+        """Consume ``cost`` requests for ``key`` if allowed
+
+        Returns:
+            (allowed, seconds until the request would be allowed; 0 when it was)
+        """
+        allowed, excess = self._script(keys=[f"{self.prefix}{key}"],
+                                       args=[self.interval, self.tolerance, cost])
+        return bool(allowed), int(excess) / 1_000_000
+
+    def allow(self, key: Hashable, cost: int = 1) -> bool:
+        return self.check(key, cost)[0]
+
+    def reset(self, key: Hashable) -> None:
+        self.redis.delete(f"{self.prefix}{key}")
 
 class WebSocketRateLimiter:
-    def __init__(self, rate_limit=100, time_window=60):
-        self.rate_limit = rate_limit  # messages per time window
-        self.time_window = time_window  # seconds
-        self.client_messages = defaultdict(list)
+    """Per-client WebSocket message limit
+
+    Uses Redis when a client is given, so the limit holds across Socket.IO
+    worker processes, and an in-process limiter otherwise.
+    """
+
+    def __init__(self, rate_limit=100, time_window=60, burst=None, redis_client=None):
+        """
+        Args:
+            rate_limit: Messages allowed per time window
+            time_window: Seconds
+            burst: Messages a client may send at once; defaults to ``rate_limit``
+            redis_client: redis.Redis client shared by all workers, or None for a per-process limit
+        """
+        self.rate_limit = rate_limit
+        self.time_window = time_window
+        if redis_client is not None:
+            self.limiter = RedisGCRALimiter(redis_client, rate_limit, time_window, burst)
+        else:
+            self.limiter = GCRALimiter(rate_limit, time_window, burst)
+        self.metrics = RateLimiterMetrics()
+        self._allowed = self.metrics.checks.labels('allowed')
+        self._limited = self.metrics.checks.labels('limited')
 
-    @handle_errors()
     def check_rate_limit(self, client_id: str) -> bool:
-        now = datetime.now()
-        window_start = now - timedelta(seconds=self.time_window)
-        
-        # Clean old messages
-        self.client_messages[client_id] = [
-            timestamp for timestamp in self.client_messages[client_id]
-            if timestamp > window_start
-        ]
-        
-        # Check rate limit
-        if len(self.client_messages[client_id]) >= self.rate_limit:
-            return False
-            
-        # Add new message timestamp
-        self.client_messages[client_id].append(now)
-        return True 
\ No newline at end of file
+        try:
+            allowed = self.limiter.allow(client_id)
+        except Exception as e:
+            # Fail open: an unreachable Redis should not disconnect every client
+            logger.error(f"Rate limit check failed for client {client_id}: {str(e)}")
+            self.metrics.errors.inc()
+            return True
+        (self._allowed if allowed else self._limited).inc()
+        return allowed
+
+    def remove_client(self, client_id: str) -> None:
+        """Forget a disconnected client"""
+        try:
+            self.limiter.reset(client_id)
+        except Exception as e:
+            logger.error(f"Failed to reset rate limit for client {client_id}: {str(e)}")
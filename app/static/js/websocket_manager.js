@@ -1,5 +1,50 @@
 import { UnifiedWebSocketService } from '../services/unified_websocket_service';
 
+function isPlainObject(value) {
+    return value !== null && typeof value === 'object' && !Array.isArray(value);
+}
+
+// Apply an encoder_delta message to our copy of the encoder state, in place.
+// Mirrors apply_delta in app/services/websocket/state_sync.py: unset paths first,
+// pruning objects they leave empty, then set the new values.
+function applyEncoderDelta(state, delta) {
+    for (const path of delta.unset || []) {
+        const parents = [];
+        let node = state;
+        let found = true;
+        for (const key of path.slice(0, -1)) {
+            parents.push([node, key]);
+            node = node[key];
+            if (!isPlainObject(node)) {
+                found = false;
+                break;
+            }
+        }
+        if (!found) {
+            continue;
+        }
+        delete node[path[path.length - 1]];
+        for (let i = parents.length - 1; i >= 0; i--) {
+            const [parent, key] = parents[i];
+            if (Object.keys(parent[key]).length > 0) {
+                break;
+            }
+            delete parent[key];
+        }
+    }
+    for (const [path, value] of delta.set || []) {
+        let node = state;
+        for (const key of path.slice(0, -1)) {
+            if (!isPlainObject(node[key])) {
+                node[key] = {};
+            }
+            node = node[key];
+        }
+        node[path[path.length - 1]] = value;
+    }
+    return state;
+}
+
 class EnhancedWebSocketManager {
     constructor(authToken, options = {}) {
         this.authToken = authToken;
@@ -13,6 +58,9 @@ class EnhancedWebSocketManager {
         };
         
         this.subscribedEncoders = new Set();
+        this.encoderStates = new Map();  // encoderId -> { seq, state }
+        this.pendingResyncs = new Map();  // encoderId -> time the resync was requested
+        this.resyncTimeout = 5000;
         this.messageQueue = [];
         this.connectionState = 'disconnected';
         this.retryCount = 0;
@@ -44,6 +92,9 @@ class EnhancedWebSocketManager {
         this.socket.on('disconnect', (reason) => {
             console.log('Disconnected:', reason);
             this.connectionState = 'disconnected';
+            // Subscribing again on reconnect sends fresh snapshots
+            this.encoderStates.clear();
+            this.pendingResyncs.clear();
             this.handleDisconnect(reason);
         });
         
@@ -70,6 +121,15 @@ class EnhancedWebSocketManager {
             this.handleEncoderUpdate(data);
         });
         
+        // Versioned encoder state: a snapshot on subscribe, then deltas of changed fields
+        this.socket.on('encoder_snapshot', (message) => {
+            this.handleEncoderSnapshot(message);
+        });
+        
+        this.socket.on('encoder_delta', (message) => {
+            this.handleEncoderDelta(message);
+        });
+        
         this.socket.on('encoder_state_change', (data) => {
             this.handleStateChange(data);
         });
@@ -163,6 +223,43 @@ class EnhancedWebSocketManager {
         }
     }
     
+    handleEncoderSnapshot(message) {
+        const encoderId = message.encoder_id;
+        const current = this.encoderStates.get(encoderId);
+        // A resync reply can arrive after deltas we already applied
+        if (current && message.seq < current.seq) {
+            return;
+        }
+        this.pendingResyncs.delete(encoderId);
+        this.encoderStates.set(encoderId, { seq: message.seq, state: message.state });
+        this.handleEncoderUpdate(message.state);
+    }
+    
+    handleEncoderDelta(message) {
+        const encoderId = message.encoder_id;
+        const current = this.encoderStates.get(encoderId);
+        if (current && message.seq <= current.seq) {
+            return;  // Already applied
+        }
+        if (!current || message.seq !== current.seq + 1) {
+            // Missed a delta: our copy is stale until a fresh snapshot arrives
+            this.requestResync(encoderId, current ? current.seq : null);
+            return;
+        }
+        applyEncoderDelta(current.state, message);
+        current.seq = message.seq;
+        this.handleEncoderUpdate(current.state);
+    }
+    
+    requestResync(encoderId, seq) {
+        const requested = this.pendingResyncs.get(encoderId);
+        if (requested !== undefined && Date.now() - requested < this.resyncTimeout) {
+            return;
+        }
+        this.pendingResyncs.set(encoderId, Date.now());
+        this.socket.emit('resync_encoder', { encoder_id: encoderId, seq });
+    }
+    
     // Utility methods
     async emitWithAck(event, data, timeout = 5000) {
         return new Promise((resolve, reject) => {
@@ -187,6 +284,8 @@ class EnhancedWebSocketManager {
     destroy() {
         this.socket.disconnect();
         this.subscribedEncoders.clear();
+        this.encoderStates.clear();
+        this.pendingResyncs.clear();
         this.messageQueue = [];
     }
 }
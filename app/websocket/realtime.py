@@ -1,22 +1,128 @@
 from flask import current_app
-from flask_socketio import SocketIO, emit
+from flask_socketio import SocketIO, emit, join_room, leave_room
 from datetime import datetime
 import json
+from app.core.aja.aja_constants import AJAStreamParams
+from app.core.metrics.fleet_aggregator import FLEET, FleetAggregator
+
+def encoder_metrics(encoder) -> dict:
+    """Aggregated per-encoder values, from an encoder as returned by update_encoder_metrics"""
+    return {
+        'streaming': 1 if encoder.streaming_state else 0,
+        'bandwidth': encoder.bandwidth_usage,
+        'storage_total': encoder.storage_total,
+        'storage_used': encoder.storage_used,
+        'storage_health': encoder.storage_health
+    }
+
+def poll_status_metrics(status: dict) -> dict:
+    """Aggregated per-encoder values from an EncoderPoller status
+
+    Values the device did not report, e.g. when it could not be reached,
+    are None so the aggregator drops them rather than keeping stale ones.
+    """
+    raw = status.get('raw_json', {})
+    stream = raw.get('stream', {})
+    storage = raw.get('system', {}).get('storage', {})
+    return {
+        'online': 1 if status.get('level') == 'INFO' else 0,
+        'streaming': 1 if stream.get('streaming') else 0,
+        'bandwidth': stream.get(AJAStreamParams.BITRATE),
+        'storage_total': storage.get('total'),
+        'storage_used': storage.get('used'),
+        'storage_health': storage.get('health')
+    }
+
+def encoder_rooms(encoder, room_keys) -> list:
+    """Aggregate rooms such as ``site:Chambers`` for each of ``room_keys`` the encoder has a value for"""
+    return [
+        f"{key}:{getattr(encoder, key)}" for key in room_keys
+        if getattr(encoder, key, None) is not None
+    ]
+
+def metrics_update_payload(aggregator, timestamp: str) -> dict:
+    """The ``metrics_update`` message dashboards render, built from the aggregator's current values"""
+    fleet = aggregator.aggregates(FLEET)
+    values = aggregator.encoder_values()
+
+    def total(metric):
+        return fleet.get(metric, {}).get('sum', 0)
+
+    return {
+        'streaming': {
+            'timestamp': timestamp,
+            'active_streams': int(total('streaming')),
+            'encoders': [
+                {
+                    'name': name,
+                    'streaming': bool(v.get('streaming')),
+                    'bandwidth': v.get('bandwidth')
+                } for name, v in values.items()
+            ]
+        },
+        'bandwidth': {
+            'total': total('bandwidth'),
+            'per_encoder': {
+                name: v.get('bandwidth') for name, v in values.items()
+            }
+        },
+        'storage': {
+            'total_space': total('storage_total'),
+            'used_space': total('storage_used'),
+            'health_status': {
+                name: v.get('storage_health') for name, v in values.items()
+            }
+        }
+    }
 
 def init_websocket(app):
     socketio = SocketIO(app)
-    
+    aggregator = FleetAggregator(thresholds=app.config.get('FLEET_METRIC_THRESHOLDS'))
+    room_keys = app.config.get('FLEET_ROOM_KEYS', ('site', 'channel_group'))
+    app.extensions['fleet_aggregator'] = aggregator
+
+    def record_encoder(encoder):
+        aggregator.update(encoder.name, encoder_metrics(encoder), rooms=encoder_rooms(encoder, room_keys))
+
+    def record_poll_status(encoder, status):
+        """EncoderPoller on_status callback"""
+        aggregator.update(encoder['name'], poll_status_metrics(status))
+
+    app.record_poll_status = record_poll_status
+
+    # Poll in-process so every sweep feeds the aggregator
+    if app.config.get('HELO_POLLER_DB'):
+        from app.core.database.helo_polling import main as run_poller
+        socketio.start_background_task(run_poller, app.config['HELO_POLLER_DB'], record_poll_status)
+
     @socketio.on('connect')
     def handle_connect():
         emit('connection_status', {'status': 'connected'})
-    
+        emit('fleet_metrics', {'room': FLEET, 'metrics': aggregator.aggregates(FLEET)})
+
     @socketio.on('request_metrics')
     def handle_metrics_request():
         metrics = get_current_metrics()
         emit('metrics_update', metrics)
-    
+
+    @socketio.on('join_fleet_room')
+    def handle_join_fleet_room(data):
+        room = data.get('room')
+        if room not in aggregator.rooms() or room == FLEET:
+            return
+        join_room(room)
+        emit('fleet_metrics', {'room': room, 'metrics': aggregator.aggregates(room)})
+
+    @socketio.on('leave_fleet_room')
+    def handle_leave_fleet_room(data):
+        if data.get('room') != FLEET:
+            leave_room(data.get('room'))
+
     def get_current_metrics():
         encoders = current_app.update_encoder_metrics()
+        # A full fetch is also an update for every encoder in it
+        for e in encoders:
+            record_encoder(e)
         return {
             'streaming': {
                 'timestamp': datetime.now().isoformat(),
@@ -43,14 +149,22 @@ def init_websocket(app):
                 }
             }
         }
-    
-    # Broadcast metrics every 5 seconds
+
+    # Publish aggregates that changed significantly; the fleet room goes to every client
     def broadcast_metrics():
+        interval = app.config.get('FLEET_PUBLISH_INTERVAL', 5)
         while True:
-            metrics = get_current_metrics()
-            socketio.emit('metrics_update', metrics)
-            socketio.sleep(5)
-    
+            timestamp = datetime.now().isoformat()
+            for room, metrics in aggregator.publish().items():
+                payload = {'room': room, 'timestamp': timestamp, 'metrics': metrics}
+                if room == FLEET:
+                    socketio.emit('fleet_metrics', payload)
+                    # Dashboards still render metrics_update; send it only when the fleet changed
+                    socketio.emit('metrics_update', metrics_update_payload(aggregator, timestamp))
+                else:
+                    socketio.emit('fleet_metrics', payload, room=room)
+            socketio.sleep(interval)
+
     socketio.start_background_task(broadcast_metrics)
-    
-    return socketio 
\ No newline at end of file
+
+    return socketio
@@ -0,0 +1,16 @@
+import pytest
+
+def pytest_addoption(parser):
+    parser.addoption('--run-benchmarks', action='store_true', default=False,
+                     help='run tests marked benchmark, which assert on wall-clock timings')
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'benchmark: timing comparison, skipped unless --run-benchmarks is given')
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--run-benchmarks'):
+        return
+    skip = pytest.mark.skip(reason='benchmark; run with --run-benchmarks')
+    for item in items:
+        if 'benchmark' in item.keywords:
+            item.add_marker(skip)
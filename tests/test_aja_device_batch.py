@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from app.core.aja.session_registry import HeloSessionRegistry
+from app.core.rest_API_client import AJADevice
+
+@pytest_asyncio.fixture
+async def config_server(aiohttp_server):
+    calls = []
+    params = {}
+
+    async def config(request):
+        action = request.query['action']
+        paramid = request.query['paramid']
+        calls.append((action, paramid))
+        if paramid == 'eParamID_Slow':
+            await asyncio.sleep(1)
+        if paramid == 'eParamID_Broken':
+            raise web.HTTPInternalServerError()
+        if action == 'set':
+            params[paramid] = request.query['value']
+        await asyncio.sleep(0.01)
+        return web.json_response({'paramid': paramid, 'value': params.get(paramid, 2)})
+
+    app = web.Application()
+    app.router.add_get('/config', config)
+    server = await aiohttp_server(app)
+    server.calls = calls
+    return server
+
+@pytest_asyncio.fixture
+async def device(config_server):
+    registry = HeloSessionRegistry()
+    yield AJADevice(f"http://{config_server.host}:{config_server.port}", registry=registry)
+    await registry.close_all()
+
+@pytest.mark.asyncio
+async def test_get_params_batches_and_reports_deadline(device):
+    values = await device.get_params(
+        ['eParamID_ReplicatorStreamState', 'eParamID_Slow', 'eParamID_Broken'],
+        deadline=0.5
+    )
+
+    assert values['eParamID_ReplicatorStreamState']['value'] == 2
+    assert values['eParamID_Slow'] == {'error': 'deadline exceeded'}
+    assert 'error' in values['eParamID_Broken']
+
+@pytest.mark.asyncio
+async def test_identical_reads_are_coalesced(device, config_server):
+    other = AJADevice(device.base_url, registry=device.registry)
+
+    await asyncio.gather(
+        device.get_params(['eParamID_VideoInSelect']),
+        other.get_params(['eParamID_VideoInSelect']),
+        device.get_param_async('eParamID_VideoInSelect')
+    )
+
+    assert config_server.calls.count(('get', 'eParamID_VideoInSelect')) == 1
+
+@pytest.mark.asyncio
+async def test_set_params_applies_in_order(device, config_server):
+    results = await device.set_params([
+        ('eParamID_StreamingProfileSel', 2),
+        ('eParamID_Broken', 1),
+        ('eParamID_ReplicatorCommand', 3)
+    ])
+
+    assert [r['success'] for r in results] == [True, False, False]
+    assert results[2]['error'] == 'skipped after earlier failure'
+    assert [c[1] for c in config_server.calls] == ['eParamID_StreamingProfileSel', 'eParamID_Broken']
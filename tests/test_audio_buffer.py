@@ -0,0 +1,23 @@
+import numpy as np
+from app.core.live_transcription.audio_buffer import PCMRingBuffer
+
+def test_read_returns_samples_in_order_across_wraparound():
+    buffer = PCMRingBuffer(capacity=8)
+    buffer.write(np.arange(6, dtype=np.float32))
+    assert list(buffer.read(4)) == [0, 1, 2, 3]
+
+    buffer.write(np.arange(6, 11, dtype=np.float32))
+    assert len(buffer) == 7
+    assert list(buffer.read()) == [4, 5, 6, 7, 8, 9, 10]
+    assert buffer.dropped_samples == 0
+
+def test_overflow_drops_oldest_audio():
+    buffer = PCMRingBuffer(capacity=4)
+    buffer.write(np.arange(3, dtype=np.float32))
+
+    assert buffer.write(np.arange(3, 6, dtype=np.float32)) == 2
+    assert list(buffer.read()) == [2, 3, 4, 5]
+
+    assert buffer.write(np.arange(10, dtype=np.float32)) == 6
+    assert list(buffer.read()) == [6, 7, 8, 9]
+    assert buffer.dropped_samples == 8
@@ -0,0 +1,154 @@
+import json
+import time
+from datetime import datetime, timedelta
+import pytest
+from aiohttp import web
+from pydantic import ValidationError
+from app.core.cablecast.machine_language.cablecast_constants import CablecastEndpoints
+from app.core.cablecast.machine_language.cablecast_schemas import (
+    ChannelBrandingResponse, ScheduleItem, ScheduleItemsResource, Show)
+from app.core.cablecast.machine_language.response_decoder import (
+    CablecastResponseDecoder, LazyModelList, iter_json_array)
+from app.core.connection.client import CablecastPooledClient
+from app.core.connection.pool_manager import PoolManager
+
+def schedule_item(item_id, start=datetime(2025, 1, 6, 6, 0)):
+    return {"id": item_id, "channel": 1 + item_id % 3, "show": 5000 + item_id % 400,
+            "runDateTime": (start + timedelta(minutes=30 * item_id)).isoformat() + "Z",
+            "runBump": 0, "runLock": item_id % 2 == 0, "runType": 0, "bugText": f"Meeting – {item_id}",
+            "crawlText": "", "crawlLength": 0, "cgExempt": False, "idType": 0, "manualEvent": 0,
+            "runStatus": 1, "deleted": False, "recordEvents": [item_id], "filler": False, "scheduleRule": 0,
+            "liveCaptions": False, "encoder": 0, "captionProvider": "", "captionVocabulary": 0,
+            "liveTranslations": False, "sourceLanguage": "en", "translationLanguage": "", "hasFiles": True,
+            "hasValidFile": True, "hasInvalidFile": False, "hasProcessingFile": False}
+
+def recorded_schedule(count):
+    """A schedule window response as returned by /v1/scheduleitems"""
+    return {"meta": {"count": count, "offset": 0}, "scheduleItems": [schedule_item(i) for i in range(count)]}
+
+async def chunked(data, size):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+@pytest.fixture
+def decoder():
+    return CablecastResponseDecoder()
+
+def test_trusted_decode_matches_validation(decoder):
+    payload = recorded_schedule(20)
+    fast = decoder.decode_items(CablecastEndpoints.SCHEDULE_ITEMS, ScheduleItem, payload, "scheduleItems")
+    validated = ScheduleItemsResource.model_validate(payload).scheduleItems
+
+    assert [item.model_dump() for item in fast] == [item.model_dump() for item in validated]
+    assert fast[0].runDateTime.tzinfo is not None
+
+    show = {"id": 1, "title": "City Council", "location": 22, "project": None, "producer": None, "category": 4,
+            "comments": None, "customFields": {"CG Title": "x"}, "lastModified": "2025-01-01T00:00:00",
+            "eventDate": "2025-01-07T18:30:00", "duration": 7200}
+    assert decoder.decode(CablecastEndpoints.SHOWS, Show, show) == Show.model_validate(show)
+
+def test_nested_models_are_built_on_the_fast_path(decoder):
+    branding = {"channelBranding": [{
+        "channelID": 1, "bugText": "Live", "deviceAddress": "10.0.0.4", "deviceID": 3, "bugState": True,
+        "squeezedBackState": False, "crawlText": "", "crawlSpeed": 1.5, "cmsid": 9,
+        "expiresTime": "2025-01-07T20:00:00", "startTime": "2025-01-07T18:00:00",
+        "assets": {"bugUrl": "a", "bugTextUrl": "b", "crawlBGUrl": "c", "crawlFGUrl": "d", "crawlTextUrl": "e"},
+        "channelModified": "2025-01-07T17:00:00"}]}
+    decoder.trusted_endpoints |= {CablecastEndpoints.CHANNEL_BRANDING}
+
+    fast = decoder.decode(CablecastEndpoints.CHANNEL_BRANDING, ChannelBrandingResponse, branding)
+
+    assert fast.model_dump() == ChannelBrandingResponse.model_validate(branding).model_dump()
+    assert fast.channelBranding[0].assets.bugUrl == "a"
+
+def test_items_that_do_not_fit_fall_back_to_validation(decoder):
+    before = decoder.metrics.decoded.labels('fallback')._value.get()
+    coerced = dict(schedule_item(1), runDateTime=1736272800)
+    assert decoder.decode(CablecastEndpoints.SCHEDULE_ITEMS, ScheduleItem, coerced).runDateTime.year == 2025
+
+    broken = schedule_item(2)
+    del broken["channel"]
+    with pytest.raises(ValidationError):
+        decoder.decode(CablecastEndpoints.SCHEDULE_ITEMS, ScheduleItem, broken)
+    with pytest.raises(ValidationError):
+        decoder.decode(CablecastEndpoints.SCHEDULE_ITEMS, ScheduleItem, dict(schedule_item(3), runDateTime="soon"))
+    assert decoder.metrics.decoded.labels('fallback')._value.get() - before == 2
+
+def test_untrusted_endpoints_are_validated(decoder):
+    with pytest.raises(ValidationError):
+        decoder.decode(CablecastEndpoints.SCHEDULE_ITEM_BY_ID, ScheduleItem, dict(schedule_item(1), show="many"))
+
+def test_large_collections_materialise_on_access(decoder):
+    items = decoder.decode_items(CablecastEndpoints.SCHEDULE_ITEMS, ScheduleItem,
+                                 recorded_schedule(5000), "scheduleItems")
+
+    assert isinstance(items, LazyModelList) and len(items) == 5000
+    assert items.materialised == 0
+    assert items[4321].id == 4321 and items[4321] is items[4321]
+    assert [item.id for item in items[10:13]] == [10, 11, 12]
+    assert items.materialised == 4
+
+@pytest.mark.asyncio
+async def test_streamed_items_match_json_loads():
+    payload = recorded_schedule(50)
+    payload = {"meta": payload["meta"], "note": {"scheduleItems": [1]}, "scheduleItems": payload["scheduleItems"],
+               "trailer": 12345}
+    body = json.dumps(payload, ensure_ascii=False, indent=1).encode()
+
+    # Seven-byte chunks split numbers, strings and multi-byte characters
+    streamed = [item async for item in iter_json_array(chunked(body, 7), "scheduleItems")]
+
+    assert streamed == payload["scheduleItems"]
+    assert [item async for item in iter_json_array(chunked(b'{"scheduleItems": []}', 4), "scheduleItems")] == []
+    with pytest.raises(json.JSONDecodeError):
+        [item async for item in iter_json_array(chunked(body[:-40], 64), "scheduleItems")]
+
+@pytest.mark.asyncio
+async def test_client_streams_every_page(aiohttp_server):
+    schedule = recorded_schedule(250)["scheduleItems"]
+    pages = []
+
+    async def schedule_items(request):
+        offset, size = int(request.query["offset"]), int(request.query["page_size"])
+        pages.append(offset)
+        return web.json_response({"meta": {"count": len(schedule)}, "scheduleItems": schedule[offset:offset + size]})
+
+    app = web.Application()
+    app.router.add_get(CablecastEndpoints.SCHEDULE_ITEMS.value, schedule_items)
+    server = await aiohttp_server(app)
+    pool = PoolManager()
+    client = CablecastPooledClient(f"http://{server.host}:{server.port}", pool_manager=pool, stream_chunk_size=1024)
+
+    items = [item async for item in client.iter_items(CablecastEndpoints.SCHEDULE_ITEMS, ScheduleItem,
+                                                      "scheduleItems", page_size=100)]
+
+    assert [item.id for item in items] == list(range(250))
+    assert pages == [0, 100, 200]
+    await pool.cleanup()
+
+@pytest.mark.benchmark
+def test_decode_benchmark_10k_schedule_items(decoder):
+    body = json.dumps(recorded_schedule(10_000)).encode()
+
+    def best_of(decode, runs=7):
+        best = None
+        for _ in range(runs):
+            payload = json.loads(body)
+            start = time.perf_counter()
+            result = decode(payload)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    validated, baseline = best_of(lambda p: ScheduleItemsResource.model_validate(p).scheduleItems)
+    trusted, fast = best_of(lambda p: decoder.decode_items(CablecastEndpoints.SCHEDULE_ITEMS, ScheduleItem,
+                                                           p, "scheduleItems", lazy=False))
+    # A schedule grid page only looks at the first 50 runs of the window
+    lazy, _ = best_of(lambda p: decoder.decode_items(CablecastEndpoints.SCHEDULE_ITEMS, ScheduleItem,
+                                                     p, "scheduleItems")[:50])
+
+    print(f"\n10,000 schedule items: validated {validated * 1000:.1f} ms, trusted {trusted * 1000:.1f} ms, "
+          f"lazy first page {lazy * 1000:.2f} ms")
+    assert fast[9999].model_dump() == baseline[9999].model_dump()
+    assert trusted < validated
+    assert lazy < trusted / 20
@@ -0,0 +1,181 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+import pytest
+from app.core.cablecast.machine_language.cablecast_constants import CablecastEndpoints
+from app.core.cablecast.scheduling.engine_cablecast import CablecastScheduler
+
+# Simulated Cablecast API round trip
+API_LATENCY = 0.02
+LOCATION = 22
+
+def show_record(show_id, title, event_date):
+    return {"id": show_id, "title": title, "location": LOCATION, "project": None, "producer": None,
+            "category": None, "comments": None, "customFields": {}, "lastModified": event_date,
+            "eventDate": event_date, "duration": 14400}
+
+def schedule_item_record(item_id, item):
+    return {"id": item_id, "channel": item["channel"], "show": item["show"], "runDateTime": item["runDateTime"],
+            "runBump": 0, "runLock": True, "runType": 0, "bugText": item["bugText"], "crawlText": "",
+            "crawlLength": 0, "cgExempt": False, "idType": 0, "manualEvent": 0, "runStatus": 0,
+            "deleted": False, "recordEvents": [], "filler": False, "scheduleRule": 0, "liveCaptions": False,
+            "encoder": 0, "captionProvider": "", "captionVocabulary": 0, "liveTranslations": False,
+            "sourceLanguage": "", "translationLanguage": "", "hasFiles": False, "hasValidFile": False,
+            "hasInvalidFile": False, "hasProcessingFile": False}
+
+class FakeCablecast:
+    """Stands in for CablecastPooledClient, counting calls and peak concurrency"""
+    def __init__(self, existing=()):
+        self.shows = [show_record(i + 1, title, event_date) for i, (title, event_date) in enumerate(existing)]
+        self.calls = []
+        self.in_flight = self.peak = 0
+        self.next_id = 1000
+        self.failures = {}  # (endpoint, method) to the number of calls that fail
+
+    async def request(self, endpoint, method="GET", params=None, data=None):
+        self.calls.append((endpoint, method))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(API_LATENCY)
+        finally:
+            self.in_flight -= 1
+        self.next_id += 1
+        if self.failures.get((endpoint, method)):
+            self.failures[(endpoint, method)] -= 1
+            raise ConnectionError(f"{endpoint.name} unavailable")
+
+        if endpoint is CablecastEndpoints.FORMATS:
+            return {"formats": [{"id": 7, "primitiveFormat": 1, "name": "MPEG-2", "location": LOCATION}]}
+        if endpoint is CablecastEndpoints.SHOWS and method == "GET":
+            offset, size = params["offset"], params["page_size"]
+            return {"shows": self.shows[offset:offset + size]}
+        if endpoint is CablecastEndpoints.SHOWS:
+            return {"show": show_record(self.next_id, data["title"], data["event_date"])}
+        if endpoint is CablecastEndpoints.MEDIA:
+            now = datetime.now().isoformat()
+            return {"media": {"id": self.next_id, "creationDate": now, "dispositionDate": now, "disposition": 0,
+                              "format": data["format"], "location": data["location"], "mediaName": data["media_name"],
+                              "preAssignedDevice": 0, "preAssignedDeviceSlot": 0, "overrideAspectRatio": 0,
+                              "networkStream": 0}}
+        if endpoint is CablecastEndpoints.SCHEDULE_ITEMS_BATCH:
+            return {"scheduleItems": [schedule_item_record(self.next_id + i, item)
+                                      for i, item in enumerate(data["scheduleItems"])]}
+        raise AssertionError(f"unexpected call {endpoint} {method}")
+
+def season(count, start=datetime(2025, 1, 7, 18, 30)):
+    return [(start + timedelta(weeks=i), "City Council") for i in range(count)]
+
+@pytest.mark.asyncio
+async def test_bulk_schedule_caches_lookups_and_batches_schedule_items():
+    client = FakeCablecast()
+    scheduler = CablecastScheduler(None, channel_id=1, storage_server_id=3, pooled_client=client, batch_size=20)
+
+    result = await scheduler.schedule_meetings(season(52))
+
+    assert len(result.created) == 52 and not result.failed
+    calls = [endpoint for endpoint, _ in client.calls]
+    assert calls.count(CablecastEndpoints.FORMATS) == 1
+    assert calls.count(CablecastEndpoints.MEDIA) == 52
+    assert calls.count(CablecastEndpoints.SCHEDULE_ITEMS_BATCH) == 3
+    show, item = result.created[0]
+    assert item.show == show.id and item.bugText == "City Council Meeting - January 07, 2025"
+
+@pytest.mark.asyncio
+async def test_existing_and_repeated_meetings_are_not_recreated():
+    client = FakeCablecast(existing=[("City Council Meeting", "2025-01-07T18:30:00")])
+    scheduler = CablecastScheduler(None, channel_id=1, storage_server_id=3, pooled_client=client)
+
+    meetings = season(3) + season(3)
+    result = await scheduler.schedule_meetings(meetings)
+    assert [s.id for s in result.existing] == [1]
+    assert len(result.created) == 2
+
+    # A second sync finds everything already created, without listing shows again
+    again = await scheduler.schedule_meetings(meetings)
+    assert again.created == [] and len(again.existing) == 3
+    assert [e for e, m in client.calls if m == "GET"].count(CablecastEndpoints.SHOWS) == 1
+
+@pytest.mark.asyncio
+async def test_creations_run_concurrently_within_the_limit():
+    client = FakeCablecast()
+    scheduler = CablecastScheduler(None, channel_id=1, storage_server_id=3, pooled_client=client, max_concurrency=8)
+
+    result = await scheduler.schedule_meetings(season(20))
+    assert len(result.created) == 20
+    assert 1 < client.peak <= 16
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_bulk_schedule_is_faster_than_one_meeting_at_a_time():
+    meetings = season(20)
+
+    sequential_client = FakeCablecast()
+    start = time.perf_counter()
+    # The old flow: format lookup, media, show and schedule item one after another per meeting
+    for meeting_date, meeting_type in meetings:
+        for endpoint in (CablecastEndpoints.FORMATS, CablecastEndpoints.MEDIA, CablecastEndpoints.SHOWS):
+            await sequential_client.request(endpoint, "GET" if endpoint is CablecastEndpoints.FORMATS else "POST",
+                                            data={"title": meeting_type, "event_date": meeting_date.isoformat(),
+                                                  "format": 7, "location": 3, "media_name": meeting_type})
+        await asyncio.sleep(API_LATENCY)
+    sequential = time.perf_counter() - start
+
+    client = FakeCablecast()
+    scheduler = CablecastScheduler(None, channel_id=1, storage_server_id=3, pooled_client=client, max_concurrency=8)
+    start = time.perf_counter()
+    result = await scheduler.schedule_meetings(meetings)
+    bulk = time.perf_counter() - start
+
+    print(f"\n20 meetings: one at a time {sequential * 1000:.0f} ms, bulk {bulk * 1000:.0f} ms "
+          f"({len(client.calls)} API calls, peak {client.peak} in flight)")
+    assert len(result.created) == 20
+    assert bulk < sequential / 4
+
+@pytest.mark.asyncio
+async def test_failed_creations_are_reported_per_meeting():
+    client = FakeCablecast()
+    request = client.request
+
+    async def flaky(endpoint, method="GET", params=None, data=None):
+        if endpoint is CablecastEndpoints.SHOWS and method == "POST" and data["event_date"].startswith("2025-01-14"):
+            raise RuntimeError("Request failed: 500")
+        return await request(endpoint, method, params, data)
+
+    client.request = flaky
+    scheduler = CablecastScheduler(None, channel_id=1, storage_server_id=3, pooled_client=client)
+    result = await scheduler.schedule_meetings(season(3))
+
+    assert len(result.created) == 2
+    assert list(result.failed) == [("City Council Meeting", datetime(2025, 1, 14).date())]
+
+@pytest.mark.asyncio
+async def test_shows_a_batch_failed_on_are_scheduled_by_the_next_run():
+    client = FakeCablecast()
+    client.failures[(CablecastEndpoints.SCHEDULE_ITEMS_BATCH, "POST")] = 1
+    scheduler = CablecastScheduler(None, channel_id=1, storage_server_id=3, pooled_client=client)
+
+    first = await scheduler.schedule_meetings(season(3))
+    assert first.created == [] and len(first.failed) == 3
+
+    again = await scheduler.schedule_meetings(season(3))
+    assert len(again.created) == 3 and not again.failed and again.existing == []
+    calls = [endpoint for endpoint, _ in client.calls]
+    assert calls.count(CablecastEndpoints.MEDIA) == 3
+    assert calls.count(CablecastEndpoints.SCHEDULE_ITEMS_BATCH) == 2
+    assert [s.id for s, _ in again.created] == [s.id for s in scheduler._shows.values()]
+
+@pytest.mark.asyncio
+async def test_media_left_by_a_failed_show_is_reused():
+    client = FakeCablecast()
+    client.failures[(CablecastEndpoints.SHOWS, "POST")] = 1
+    scheduler = CablecastScheduler(None, channel_id=1, storage_server_id=3, pooled_client=client,
+                                   max_concurrency=1)
+
+    first = await scheduler.schedule_meetings(season(2))
+    assert len(first.created) == 1 and len(first.failed) == 1
+
+    again = await scheduler.schedule_meetings(season(2))
+    assert len(again.created) == 1 and len(again.existing) == 1
+    assert client.calls.count((CablecastEndpoints.MEDIA, "POST")) == 2
+    assert client.calls.count((CablecastEndpoints.SHOWS, "POST")) == 3
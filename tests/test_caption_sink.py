@@ -0,0 +1,31 @@
+from app.core.live_transcription.caption_sink import CaptionSink, format_time_srt, format_time_vtt
+
+def test_timestamps():
+    assert format_time_srt(3725.5) == "01:02:05,500"
+    assert format_time_vtt(0.9996) == "00:00:01.000"
+
+def test_cues_are_readable_before_close(tmp_path):
+    sink = CaptionSink(str(tmp_path), segment_duration=6.0, fsync_cues=100)
+    sink.add_cue(1.0, 2.5, "Call to order.")
+    sink.add_cue(3.0, 4.0, "  ")
+
+    assert (tmp_path / "captions.srt").read_text() == "1\n00:00:01,000 --> 00:00:02,500\nCall to order.\n\n"
+    assert "00:00:01.000 --> 00:00:02.500\nCall to order." in (tmp_path / "captions_00000.vtt").read_text()
+    # The open segment is not in the playlist yet
+    assert ".vtt" not in (tmp_path / "captions.m3u8").read_text()
+    sink.close()
+
+def test_segments_rotate_and_playlist_completes(tmp_path):
+    with CaptionSink(str(tmp_path), segment_duration=6.0) as sink:
+        sink.add_cue(1.0, 2.0, "First")
+        sink.add_cue(20.0, 21.0, "After a silent gap")
+
+    playlist = (tmp_path / "captions.m3u8").read_text().splitlines()
+    segments = [line for line in playlist if line.endswith(".vtt")]
+    assert segments == [f"captions_{i:05d}.vtt" for i in range(4)]
+    assert playlist[-1] == "#EXT-X-ENDLIST"
+
+    assert "First" in (tmp_path / "captions_00000.vtt").read_text()
+    assert (tmp_path / "captions_00001.vtt").read_text().startswith("WEBVTT")
+    assert "After a silent gap" in (tmp_path / "captions_00003.vtt").read_text()
+    assert "2\n00:00:20,000 --> 00:00:21,000" in (tmp_path / "captions.srt").read_text()
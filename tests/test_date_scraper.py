@@ -3,27 +3,99 @@ from unittest.mock import patch, MagicMock
 
 import sys
 import os
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from app.core.cablecast.scheduling.date_scraper import DateScraper, MeetingSource
-print("Current Working Directory:", os.getcwd())
-print("Python Path:", sys.path)
+from app.core.cablecast.scheduling.date_scraper import DateScraper, FeedSource, MeetingInfo, MeetingSource
+
+# Simulated per-feed response time of a city website
+FEED_DELAY = 0.1
+
+class DictCache:
+    """In-memory stand-in for the flask-caching backend"""
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, timeout=None):
+        self.data[key] = value
+        return True
 
 @pytest.fixture
 def mock_cache():
     """Mock cache for testing."""
-    return MagicMock()
+    return DictCache()
 
 @pytest.fixture
 def date_scraper(mock_cache):
     """Fixture for DateScraper instance."""
-    return DateScraper(mock_cache)
+    return DateScraper(mock_cache, sinks=[])
+
+class FeedServer:
+    """Serves ``title|ISO date`` lines per path with an ETag, except for paths in ``no_etag``"""
+    def __init__(self):
+        self.feeds = {}
+        self.no_etag = set()
+        self.requests = []
+        self.in_flight = self.peak = 0
+        lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with lock:
+                    server.in_flight += 1
+                    server.peak = max(server.peak, server.in_flight)
+                time.sleep(FEED_DELAY)
+                with lock:
+                    server.in_flight -= 1
+                body = server.feeds[self.path].encode()
+                etag = f'"{hash(body)}"'
+                server.requests.append((self.path, self.headers.get('If-None-Match')))
+                use_etag = self.path not in server.no_etag
+                if use_etag and self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                if use_etag:
+                    self.send_header('ETag', etag)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+@pytest.fixture
+def feed_server():
+    server = FeedServer()
+    yield server
+    server.httpd.shutdown()
+
+def line_parser(calls):
+    def parse(content, url):
+        calls.append(url)
+        meetings = []
+        for line in content.decode().splitlines():
+            title, date = line.split('|')
+            meetings.append(MeetingInfo(title=title, date=datetime.fromisoformat(date), location=None,
+                                        meeting_type=None, description=None, source_url=url,
+                                        source_type=MeetingSource.CALENDAR))
+        return meetings
+    return parse
 
-@patch('app.core.cablecast_IN_DEVELOPMENT.scheduling.date_scraper.requests.get')
-def test_scrape_calendar(mock_get, date_scraper):
+def test_scrape_calendar(date_scraper):
     """Test scraping calendar events."""
-    # Mock the response from the calendar URL
-    mock_response = MagicMock()
-    mock_response.content = b"""
+    content = b"""
     <html>
         <body>
             <div class="event">
@@ -35,9 +107,8 @@ def test_scrape_calendar(mock_get, date_scraper):
         </body>
     </html>
     """
-    mock_get.return_value = mock_response
 
-    meetings = date_scraper._scrape_calendar("http://fakeurl.com/calendar")
+    meetings = date_scraper._scrape_calendar(content, "http://fakeurl.com/calendar")
 
     assert len(meetings) == 1
     assert meetings[0].title == "City Council Meeting"
@@ -46,15 +117,194 @@ def test_scrape_calendar(mock_get, date_scraper):
     assert meetings[0].description == "Monthly council meeting"
     assert meetings[0].source_type == MeetingSource.CALENDAR
 
-@patch('app.core.cablecast_IN_DEVELOPMENT.scheduling.date_scraper.create_google_calendar_event')
-@patch('app.core.cablecast_IN_DEVELOPMENT.scheduling.date_scraper.requests.get')
-def test_fetch_meetings(mock_get, mock_create_event, date_scraper):
+def test_fetch_meetings(mock_cache, feed_server):
     """Test fetching meetings from a source."""
-    mock_get.return_value = MagicMock(content=b"<html>...</html>")  # Mock response content
+    sink = MagicMock()
+    date_scraper = DateScraper(mock_cache, sinks=[sink])
+    date_scraper._parsers['icalendar'] = line_parser([])
+    feed_server.feeds['/oakdale.ics'] = "Council|2025-03-04T19:00:00"
+    sources = {'icalendar': (FeedSource('Oakdale', f"{feed_server.url}/oakdale.ics", 'icalendar'),)}
+
+    with patch.dict('app.core.cablecast.scheduling.date_scraper.FEED_SOURCES', sources):
+        meetings = date_scraper.fetch_meetings("icalendar")
+
+    assert [m.title for m in meetings] == ["Council"]
+    sink.assert_called_once_with(meetings[0])
+
+def test_feeds_are_fetched_concurrently(date_scraper, feed_server):
+    sources = []
+    for i in range(8):
+        feed_server.feeds[f'/city{i}.ics'] = f"Council {i}|2025-03-0{i + 1}T19:00:00"
+        sources.append(FeedSource(f'City {i}', f"{feed_server.url}/city{i}.ics", 'icalendar'))
+    date_scraper._parsers['icalendar'] = line_parser([])
+
+    meetings = date_scraper.fetch_feeds(sources)
+
+    assert len(meetings) == 8
+    assert feed_server.peak == date_scraper.max_workers
+
+def test_unchanged_feeds_are_not_reparsed(date_scraper, feed_server):
+    parsed = []
+    date_scraper._parsers['icalendar'] = line_parser(parsed)
+    feed_server.feeds['/etag.ics'] = "Council|2025-03-04T19:00:00"
+    feed_server.feeds['/plain.ics'] = "Board|2025-03-05T18:00:00"
+    sources = [FeedSource('A', f"{feed_server.url}/etag.ics", 'icalendar'),
+               FeedSource('B', f"{feed_server.url}/plain.ics", 'icalendar')]
+
+    feed_server.no_etag.add('/plain.ics')
+    first = date_scraper.fetch_feeds(sources)
+    assert len(parsed) == 2
+
+    # The first feed answers 304 to the conditional GET; the second has no validators but the same bytes
+    again = date_scraper.fetch_feeds(sources)
+    assert len(parsed) == 2
+    assert [etag for path, etag in feed_server.requests if path == '/etag.ics'][1] is not None
+    assert [m.title for m in again] == [m.title for m in first]
+
+    feed_server.feeds['/plain.ics'] = "Board|2025-03-06T18:00:00"
+    date_scraper.fetch_feeds(sources[1:])
+    assert len(parsed) == 3
+
+def test_only_new_or_changed_meetings_are_emitted(mock_cache, feed_server):
+    sink = MagicMock()
+    date_scraper = DateScraper(mock_cache, sinks=[sink])
+    date_scraper._parsers['icalendar'] = line_parser([])
+    feed_server.feeds['/a.ics'] = "Council|2025-03-04T19:00:00\nBoard|2025-03-05T18:00:00"
+    # The same meeting listed by a second feed is emitted once
+    feed_server.feeds['/b.ics'] = "council|2025-03-04T19:00:00"
+    sources = {'icalendar': (FeedSource('A', f"{feed_server.url}/a.ics", 'icalendar'),
+                             FeedSource('B', f"{feed_server.url}/b.ics", 'icalendar'))}
+
+    with patch.dict('app.core.cablecast.scheduling.date_scraper.FEED_SOURCES', sources):
+        assert len(date_scraper.fetch_meetings("icalendar")) == 2
+        assert date_scraper.fetch_meetings("icalendar") == []
+        assert len(date_scraper.fetch_meetings("icalendar", changed_only=False)) == 2
+
+        feed_server.feeds['/a.ics'] += "\nCommission|2025-03-06T18:00:00"
+        assert [m.title for m in date_scraper.fetch_meetings("icalendar")] == ["Commission"]
+
+    assert sink.call_count == 3
+
+def test_meetings_a_sink_failed_on_are_retried(mock_cache, feed_server):
+    calendar = MagicMock(side_effect=[ConnectionError('calendar API down'), None])
+    date_scraper = DateScraper(mock_cache, sinks=[calendar])
+    date_scraper._parsers['icalendar'] = line_parser([])
+    feed_server.feeds['/a.ics'] = "Council|2025-03-04T19:00:00"
+    sources = {'icalendar': (FeedSource('A', f"{feed_server.url}/a.ics", 'icalendar'),)}
+
+    with patch.dict('app.core.cablecast.scheduling.date_scraper.FEED_SOURCES', sources):
+        assert date_scraper.fetch_meetings("icalendar") == []
+        assert [m.title for m in date_scraper.fetch_meetings("icalendar")] == ["Council"]
+        assert date_scraper.fetch_meetings("icalendar") == []
+
+    assert calendar.call_count == 2
+
+def test_only_the_sink_that_failed_is_retried(mock_cache, feed_server):
+    calendar = MagicMock(side_effect=[ConnectionError('calendar API down'), None, None])
+    cablecast = MagicMock()
+    date_scraper = DateScraper(mock_cache, sinks=[cablecast, calendar])
+    date_scraper._parsers['icalendar'] = line_parser([])
+    feed_server.feeds['/a.ics'] = "Council|2025-03-04T19:00:00"
+    sources = {'icalendar': (FeedSource('A', f"{feed_server.url}/a.ics", 'icalendar'),)}
+
+    with patch.dict('app.core.cablecast.scheduling.date_scraper.FEED_SOURCES', sources):
+        assert date_scraper.fetch_meetings("icalendar") == []
+        assert [m.title for m in date_scraper.fetch_meetings("icalendar")] == ["Council"]
+        assert date_scraper.fetch_meetings("icalendar") == []
+
+        # A changed meeting goes to every sink again
+        feed_server.feeds['/a.ics'] = "Council|2025-03-04T19:00:00\nBoard|2025-03-05T18:00:00"
+        assert [m.title for m in date_scraper.fetch_meetings("icalendar")] == ["Board"]
+
+    assert cablecast.call_count == 2
+    assert calendar.call_count == 3
+
+def test_failed_feed_serves_last_parse(date_scraper, feed_server):
+    date_scraper._parsers['icalendar'] = line_parser([])
+    feed_server.feeds['/a.ics'] = "Council|2025-03-04T19:00:00"
+    source = FeedSource('A', f"{feed_server.url}/a.ics", 'icalendar')
+    assert len(date_scraper.fetch_feeds([source])) == 1
+
+    feed_server.httpd.shutdown()
+    feed_server.httpd.server_close()
+    date_scraper.timeout = 0.5
+    assert [m.title for m in date_scraper.fetch_feeds([source])] == ["Council"]
+
+def make_pdf(pages):
+    """Minimal text PDF with one line of text per entry of each page"""
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % i for i in page_ids) + b"] /Count %d >>" % len(pages),
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for page_id, lines in zip(page_ids, pages):
+        stream = b"BT /F1 10 Tf 14 TL 50 750 Td " + b" ".join(b"(%s) '" % line.encode() for line in lines) + b" ET"
+        objects[page_id] = (b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (page_id + 1))
+        objects[page_id + 1] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = len(out)
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, objects[number])
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offsets[n] for n in sorted(objects))
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+def agenda_packet(page_count):
+    """One page per week starting today, each listing that week's meeting"""
+    start = datetime.now().replace(hour=18, minute=45, second=0, microsecond=0) + timedelta(days=1)
+    pages = []
+    for week in range(page_count):
+        date = start + timedelta(weeks=week)
+        pages.append([f"Agenda item {week}", f"Council Meeting {date:%B} {date.day}, {date:%Y} {date:%I:%M %p}",
+                      "Approval of minutes"])
+    return make_pdf(pages), start
+
+def extracted_pages(date_scraper):
+    return date_scraper.metrics.pdf_pages.labels('extracted')._value.get()
+
+def test_pdf_parse_stops_after_the_range_of_interest(date_scraper):
+    content, start = agenda_packet(60)
+    before = extracted_pages(date_scraper)
+
+    meetings = date_scraper._scrape_pdf(content, "http://birchwood/agenda.pdf", until=start + timedelta(weeks=4))
+
+    assert [m.date for m in meetings] == [start + timedelta(weeks=w) for w in range(5)]
+    # Five pages in range plus the first one past it
+    assert extracted_pages(date_scraper) - before == 6
+
+def test_pdf_page_text_is_cached_by_content_hash(date_scraper):
+    content, start = agenda_packet(10)
+    first = date_scraper._scrape_pdf(content, "http://birchwood/agenda.pdf")
+    before = extracted_pages(date_scraper)
+
+    with patch('app.core.cablecast.scheduling.date_scraper.pdfplumber.open') as pdf_open:
+        again = date_scraper._scrape_pdf(content, "http://birchwood/agenda.pdf")
+
+    pdf_open.assert_not_called()
+    assert extracted_pages(date_scraper) == before
+    assert again == first and len(first) == 10
+
+def test_pdf_feed_is_spooled_to_disk_and_parsed_from_the_file(date_scraper, feed_server):
+    content, start = agenda_packet(20)
+    feed_server.feeds['/agenda.pdf'] = content.decode()
+    date_scraper.spool_memory_limit = 1024
+    spooled = []
+    spool = date_scraper._spool
 
-    meetings = date_scraper.fetch_meetings("calendar")
+    def record_spool(response):
+        result = spool(response)
+        spooled.append(result[0]._rolled)
+        return result
 
-    assert meetings  # Ensure meetings are returned
-    mock_create_event.assert_called()  # Ensure Google Calendar event creation is called
+    date_scraper._spool = record_spool
+    meetings = date_scraper.fetch_feeds([FeedSource('Birchwood', f"{feed_server.url}/agenda.pdf", 'pdf')])
 
-# Additional tests can be added for other methods and scenarios 
\ No newline at end of file
+    assert spooled == [True]
+    assert len(meetings) == 20
+    assert meetings[0].date == start
@@ -0,0 +1,73 @@
+import asyncio
+import time
+from datetime import datetime
+import pytest
+from app.core.device_discovery import EncoderStatus, HeloDiscovery, StreamingState, parse_scan_networks
+
+def make_discovery(live_hosts, **kwargs):
+    discovery = HeloDiscovery(endpoint_registry=None, **kwargs)
+    stats = {'in_flight': 0, 'peak': 0, 'probed': []}
+
+    async def port_open(ip):
+        stats['in_flight'] += 1
+        stats['peak'] = max(stats['peak'], stats['in_flight'])
+        await asyncio.sleep(0.001)
+        stats['in_flight'] -= 1
+        return ip in live_hosts
+
+    async def probe_device(ip):
+        stats['probed'].append(ip)
+        return {'ip': ip, 'serial': ip, 'name': f'Helo-{ip}', 'firmware': '1.0', 'last_seen': datetime.now()}
+
+    discovery._port_open = port_open
+    discovery.probe_device = probe_device
+    return discovery, stats
+
+@pytest.mark.asyncio
+async def test_scan_is_bounded_and_only_probes_open_ports():
+    live = {'10.0.0.5', '10.0.1.9'}
+    discovery, stats = make_discovery(live, max_concurrency=8, probes_per_second=0)
+
+    devices = [device async for device in discovery.iter_scan(['10.0.0.0/24', '10.0.1.0/24', '10.0.0.0/25'])]
+
+    assert {device['ip'] for device in devices} == live
+    assert sorted(stats['probed']) == sorted(live)
+    assert stats['peak'] <= 8
+    assert set(discovery.known_devices) == live
+
+@pytest.mark.asyncio
+async def test_results_stream_before_scan_finishes():
+    discovery, _ = make_discovery({'10.0.0.1'}, max_concurrency=4, probes_per_second=0)
+    scan = discovery.iter_scan('10.0.0.0/22')
+
+    first = await scan.__anext__()
+    assert first['ip'] == '10.0.0.1'
+    await scan.aclose()
+
+@pytest.mark.asyncio
+async def test_failures_are_scheduled_with_exponential_backoff():
+    discovery = HeloDiscovery(endpoint_registry=None)
+    discovery.encoder_states['10.0.0.7'] = EncoderStatus(
+        streaming=False, recording=False, state=StreamingState.IDLE,
+        last_error=None, retry_count=0, config_version='1'
+    )
+
+    delays = []
+    for _ in range(3):
+        start = time.monotonic()
+        await discovery._handle_connection_error('10.0.0.7', 'timeout')
+        delays.append(round(discovery._retry_at['10.0.0.7'] - start))
+    assert delays == [5, 10, 20]
+    assert discovery.encoder_states['10.0.0.7'].state == StreamingState.RECONNECTING
+
+    await discovery._handle_connection_error('10.0.0.7', 'timeout')
+    assert '10.0.0.7' not in discovery._retry_at
+    assert discovery.encoder_states['10.0.0.7'].state == StreamingState.ERROR
+
+def test_scan_networks_are_validated():
+    assert parse_scan_networks('10.0.0.5/24') == ['10.0.0.0/24']
+    assert parse_scan_networks(['10.0.0.0/22', '192.168.1.7']) == ['10.0.0.0/22', '192.168.1.7/32']
+    for bad in ('10.0.0.0/8', ['10.0.0.0/24', '10.0.0.0/21'], 'not-a-network', [], [42], {'cidr': '10.0.0.0/24'}):
+        with pytest.raises(ValueError):
+            parse_scan_networks(bad)
+    assert parse_scan_networks('10.0.0.0/20', max_addresses=4096) == ['10.0.0.0/20']
@@ -0,0 +1,75 @@
+import asyncio
+import time
+import pytest
+from app.core.device_liveness import DeviceStateStore, LivenessScheduler
+
+def test_store_indexes_devices_by_when_they_went_stale():
+    store = DeviceStateStore()
+    for ip in ('10.0.0.1', '10.0.0.2', '10.0.0.3'):
+        store.add(ip)
+
+    now = time.time()
+    assert store.mark_offline('10.0.0.1', when=now - 600)
+    assert store.mark_offline('10.0.0.2', when=now - 30)
+    assert not store.mark_offline('10.0.0.2')
+
+    assert store.stale_since(60) == ['10.0.0.2']
+    assert store.stale_since(3600) == ['10.0.0.1', '10.0.0.2']
+    assert store.online() == {'10.0.0.3'}
+
+    assert store.mark_online('10.0.0.2')
+    assert store.stale_since(3600) == ['10.0.0.1']
+    assert '10.0.0.2' in store.last_seen
+
+@pytest.mark.asyncio
+async def test_scheduler_backs_off_stable_devices_and_reports_transitions():
+    store = DeviceStateStore()
+    probes = {'stable': 0, 'flaky': 0}
+    transitions = []
+
+    async def probe(ip):
+        probes[ip] += 1
+        # The flaky device alternates on every probe
+        return ip == 'stable' or probes[ip] % 2 == 0
+
+    async def on_transition(ip, online):
+        transitions.append((ip, online))
+
+    scheduler = LivenessScheduler(store, probe, on_transition, min_interval=0.01, max_interval=1.0)
+    scheduler.track('stable')
+    scheduler.track('flaky')
+
+    runner = asyncio.create_task(scheduler.run())
+    await asyncio.sleep(0.3)
+    runner.cancel()
+    await asyncio.gather(runner, return_exceptions=True)
+
+    assert probes['flaky'] > 2 * probes['stable']
+    assert store.records['stable'].interval > store.records['flaky'].interval
+    assert transitions[:2] == [('flaky', False), ('flaky', True)]
+    assert all(ip == 'flaky' for ip, _ in transitions)
+
+@pytest.mark.asyncio
+async def test_probes_respect_the_concurrency_budget():
+    store = DeviceStateStore()
+    in_flight = peak = 0
+
+    async def probe(ip):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return True
+
+    scheduler = LivenessScheduler(store, probe, min_interval=10, max_concurrency=4)
+    for i in range(20):
+        scheduler.track(f'10.0.0.{i}')
+
+    runner = asyncio.create_task(scheduler.run())
+    await asyncio.sleep(0.1)
+    runner.cancel()
+    await asyncio.gather(runner, return_exceptions=True)
+
+    assert peak == 4
+    assert all(record.interval == 20 for record in store.records.values())
@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+from app.core.aja.device_state_cache import DeviceStateCache
+
+@pytest.fixture
+def cache():
+    return DeviceStateCache(ttls={'/status/streaming': 60})
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_fetch(cache):
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {'streaming': True}
+
+    results = await asyncio.gather(*[
+        cache.get('enc1', '/status/streaming', fetch) for _ in range(10)
+    ])
+
+    assert calls == 1
+    assert all(r == {'streaming': True} for r in results)
+
+    # Still fresh: served from cache
+    await cache.get('enc1', '/status/streaming', fetch)
+    assert calls == 1
+
+@pytest.mark.asyncio
+async def test_expired_and_invalidated_entries_refetch(cache):
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await cache.get('enc1', '/status/system', fetch, max_age=0) == 1
+    assert await cache.get('enc1', '/status/system', fetch, max_age=0) == 2
+
+    await cache.get('enc1', '/status/streaming', fetch)
+    cache.invalidate('enc1')
+    assert cache.peek('enc1', '/status/streaming') is None
+
+@pytest.mark.asyncio
+async def test_fetch_errors_reach_every_waiter(cache):
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ConnectionError('encoder offline')
+
+    results = await asyncio.gather(
+        cache.get('enc1', '/status/system', fetch),
+        cache.get('enc1', '/status/system', fetch),
+        return_exceptions=True
+    )
+
+    assert all(isinstance(r, ConnectionError) for r in results)
+    assert cache.peek('enc1', '/status/system') is None
+
+@pytest.mark.asyncio
+async def test_invalidate_detaches_a_fetch_in_flight(cache):
+    states = iter([{'streaming': False}, {'streaming': True}])
+
+    async def fetch():
+        state = next(states)
+        await asyncio.sleep(0.05)
+        return state
+
+    stale = asyncio.ensure_future(cache.get('enc1', '/status/streaming', fetch))
+    await asyncio.sleep(0.01)
+    # A start_stream command lands while the pre-command read is in flight
+    cache.invalidate('enc1', '/status/streaming')
+
+    assert await cache.get('enc1', '/status/streaming', fetch) == {'streaming': True}
+    assert await stale == {'streaming': False}
+    assert cache.peek('enc1', '/status/streaming') == {'streaming': True}
+
+@pytest.mark.asyncio
+async def test_joiners_refetch_when_the_owner_is_cancelled(cache):
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return calls
+
+    owner = asyncio.ensure_future(cache.get('enc1', '/status/system', fetch))
+    await asyncio.sleep(0.01)
+    joiner = asyncio.ensure_future(cache.get('enc1', '/status/system', fetch))
+    await asyncio.sleep(0.01)
+    owner.cancel()
+
+    assert await joiner == 2
+    assert owner.cancelled()
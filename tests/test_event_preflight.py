@@ -0,0 +1,123 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from app.core.aja.aja_helo_parameter_service import AJAParameterManager
+from app.core.aja.device_state_cache import DeviceStateCache
+from app.core.aja.parameter_schema import AJAParameterType, CompiledParameter, ParameterSchema
+from app.core.aja.session_registry import HeloSessionRegistry
+from app.core.cablecast.event_preflight import EventPreflight
+from app.core.cablecast.scheduling.scheduling_assistant import ScheduledAction, ScheduledEvent
+
+# Time the simulated encoder takes to report it is live after a start command
+GO_LIVE_DELAY = 0.15
+
+class FakeHelo:
+    def __init__(self):
+        self.params = {
+            'eParamID_ReplicatorRecordState': 1,
+            'eParamID_ReplicatorStreamState': 1,
+            'eParamID_VideoInSelect': 0,
+        }
+        self.sets = []
+
+    async def go_live(self, param):
+        await asyncio.sleep(GO_LIVE_DELAY)
+        self.params[param] = 2
+
+    async def config(self, request):
+        paramid = request.query['paramid']
+        if request.query['action'] == 'set':
+            value = request.query['value']
+            self.sets.append((paramid, value))
+            if paramid == 'eParamID_ReplicatorCommand' and value == '1':
+                asyncio.ensure_future(self.go_live('eParamID_ReplicatorRecordState'))
+            elif paramid == 'eParamID_ReplicatorCommand' and value == '3':
+                asyncio.ensure_future(self.go_live('eParamID_ReplicatorStreamState'))
+            return web.json_response({'paramid': paramid, 'value': value})
+        return web.json_response({'paramid': paramid, 'value': self.params.get(paramid, 0)})
+
+@pytest_asyncio.fixture
+async def helo(aiohttp_server):
+    device = FakeHelo()
+    app = web.Application()
+    app.router.add_get('/config', device.config)
+    server = await aiohttp_server(app)
+    device.encoder_id = f"{server.host}:{server.port}"
+    return device
+
+@pytest_asyncio.fixture
+async def preflight():
+    registry = HeloSessionRegistry()
+    schema = ParameterSchema({'eParamID_RecordingProfileSel': CompiledParameter(
+        'eParamID_RecordingProfileSel', 'Recording profile', AJAParameterType.INTEGER, '1', value_range=(1, 10))}, {})
+    yield EventPreflight(lead_time=600, registry=registry, state_cache=DeviceStateCache(),
+                         param_manager=AJAParameterManager(schema), poll_interval=0.01)
+    await registry.close_all()
+
+def make_event(action=ScheduledAction.RECORD, starts_in=timedelta(minutes=5)):
+    start = datetime.now() + starts_in
+    return ScheduledEvent(id=f"Springfield_{start:%Y%m%d_%H%M}", start_time=start,
+                          end_time=start + timedelta(hours=2), action=action, title='City Council: Regular')
+
+@pytest.mark.asyncio
+async def test_prepare_warms_prefetches_and_pushes_one_batch(helo, preflight):
+    event = make_event()
+    result = await preflight.prepare(helo.encoder_id, event)
+
+    assert result.ready, result.errors
+    assert preflight.registry.idle_sockets(helo.encoder_id) >= 1
+    assert preflight.state_cache.peek(helo.encoder_id, '/status/system')['online']
+    assert helo.sets == [('eParamID_RegisterRecall', '1'),
+                         ('eParamID_FilenamePrefix', f"City_Council_Regular_{event.start_time:%Y%m%d}")]
+
+@pytest.mark.asyncio
+async def test_invalid_profile_is_rejected_before_anything_is_sent(helo, preflight):
+    event = make_event()
+    result = await preflight.prepare(helo.encoder_id, event, profile={'eParamID_RecordingProfileSel': 42})
+
+    assert not result.ready
+    assert 'eParamID_RecordingProfileSel' in result.errors
+    assert helo.sets == []
+
+@pytest.mark.asyncio
+async def test_live_encoder_is_not_reconfigured(helo, preflight):
+    helo.params['eParamID_ReplicatorStreamState'] = 2
+    result = await preflight.prepare(helo.encoder_id, make_event())
+
+    assert not result.ready
+    assert helo.sets == []
+
+@pytest.mark.asyncio
+async def test_prepare_due_only_runs_inside_the_lead_time(helo, preflight):
+    soon, later = make_event(), make_event(starts_in=timedelta(hours=1))
+    results = await preflight.prepare_due([soon, later], lambda e: helo.encoder_id)
+    assert [r.event_id for r in results] == [soon.id]
+
+    # Already prepared events are not prepared again
+    assert await preflight.prepare_due([soon, later], lambda e: helo.encoder_id) == []
+
+@pytest.mark.asyncio
+async def test_prepared_start_is_one_command_and_records_first_frame_latency(helo, preflight):
+    event = make_event(ScheduledAction.RECORD_AND_STREAM)
+    await preflight.prepare(helo.encoder_id, event)
+    helo.sets.clear()
+    created = preflight.registry.stats()['connections_created']
+
+    elapsed = await preflight.start(helo.encoder_id, event)
+
+    assert GO_LIVE_DELAY <= elapsed < 1
+    assert helo.sets == [('eParamID_ReplicatorCommand', '1'), ('eParamID_ReplicatorCommand', '3')]
+    assert preflight.registry.stats()['connections_created'] == created
+    histogram = preflight.metrics.start_to_first_frame.labels('record_and_stream')
+    assert histogram._sum.get() >= elapsed
+
+@pytest.mark.asyncio
+async def test_start_gives_up_when_encoder_never_goes_live(helo, preflight):
+    preflight.first_frame_timeout = 0.05
+    event = make_event(ScheduledAction.STREAM)
+    await preflight.prepare(helo.encoder_id, event)
+    helo.go_live = lambda param: asyncio.sleep(0)
+
+    assert await preflight.start(helo.encoder_id, event) is None
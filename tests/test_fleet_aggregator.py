@@ -0,0 +1,160 @@
+import random
+import sys
+import threading
+import time
+import pytest
+from app.core.metrics.fleet_aggregator import FLEET, FleetAggregator
+
+def recompute(values, rooms, room):
+    """What broadcast_metrics used to do: aggregate every encoder from scratch"""
+    result = {}
+    for encoder_id, metrics in values.items():
+        if room != FLEET and room not in rooms[encoder_id]:
+            continue
+        for metric, value in metrics.items():
+            result.setdefault(metric, []).append(value)
+    return {
+        metric: {'count': len(v), 'sum': sum(v), 'min': min(v), 'max': max(v), 'mean': sum(v) / len(v)}
+        for metric, v in result.items()
+    }
+
+def assert_aggregates_equal(actual, expected):
+    assert actual.keys() == expected.keys()
+    for metric, summary in expected.items():
+        for key, value in summary.items():
+            assert actual[metric][key] == pytest.approx(value, rel=1e-9, abs=1e-6)
+
+def test_random_events_match_full_recompute():
+    rng = random.Random(11)
+    aggregator = FleetAggregator()
+    values, rooms = {}, {}
+    sites = ['site:north', 'site:south', 'site:east']
+
+    for _ in range(5000):
+        encoder_id = rng.randrange(60)
+        choice = rng.random()
+        if choice < 0.05:
+            aggregator.remove(encoder_id)
+            values.pop(encoder_id, None)
+            rooms.pop(encoder_id, None)
+            continue
+        update = {'bandwidth': rng.choice([rng.uniform(0, 20), None]) if choice < 0.1 else rng.uniform(0, 20),
+                  'streaming': rng.randrange(2)}
+        new_rooms = None
+        if choice > 0.9 or encoder_id not in rooms:
+            new_rooms = [rng.choice(sites), f"group:{rng.randrange(2)}"]
+            rooms[encoder_id] = set(new_rooms)
+        aggregator.update(encoder_id, update, rooms=new_rooms)
+        current = values.setdefault(encoder_id, {})
+        for metric, value in update.items():
+            if value is None:
+                current.pop(metric, None)
+            else:
+                current[metric] = float(value)
+
+    for room in [FLEET, *sites, 'group:0', 'group:1']:
+        assert_aggregates_equal(aggregator.aggregates(room), recompute(values, rooms, room))
+
+def test_publish_only_significant_changes():
+    aggregator = FleetAggregator(thresholds={'bandwidth': 5.0})
+    aggregator.update('enc1', {'bandwidth': 10, 'streaming': 1}, rooms=['site:north'])
+    aggregator.update('enc2', {'bandwidth': 20, 'streaming': 1}, rooms=['site:south'])
+    assert set(aggregator.publish()) == {FLEET, 'site:north', 'site:south'}
+    assert aggregator.publish() == {}
+
+    # Below the bandwidth threshold, and held back
+    aggregator.update('enc1', {'bandwidth': 13})
+    assert aggregator.publish() == {}
+    # Small changes add up against the last published value
+    aggregator.update('enc1', {'bandwidth': 16})
+    published = aggregator.publish()
+    assert set(published) == {FLEET, 'site:north'}
+    assert published[FLEET]['bandwidth']['sum'] == 36
+
+    assert aggregator.encoder_values()['enc1'] == {'bandwidth': 16.0, 'streaming': 1.0}
+
+    # Metrics without a threshold publish on any change
+    aggregator.update('enc2', {'streaming': 0})
+    assert set(aggregator.publish()) == {FLEET, 'site:south'}
+
+def test_moving_and_removing_encoders_updates_rooms():
+    aggregator = FleetAggregator()
+    aggregator.update('enc1', {'bandwidth': 10}, rooms=['site:north'])
+    aggregator.update('enc2', {'bandwidth': 30}, rooms=['site:north'])
+    aggregator.publish()
+
+    aggregator.update('enc2', {}, rooms=['site:south'])
+    published = aggregator.publish()
+    assert published['site:north']['bandwidth']['max'] == 10
+    assert published['site:south']['bandwidth']['sum'] == 30
+    assert FLEET not in published
+
+    aggregator.remove('enc2')
+    published = aggregator.publish()
+    assert published['site:south'] == {}
+    assert published[FLEET]['bandwidth']['count'] == 1
+    assert 'site:south' not in aggregator.rooms()
+
+def test_updates_and_publishes_from_different_threads():
+    aggregator = FleetAggregator()
+    errors = []
+
+    def poller():
+        rng = random.Random(3)
+        try:
+            for i in range(20_000):
+                aggregator.update(i % 500, {'bandwidth': rng.uniform(0, 20)}, rooms=[f"site:{i}"])
+        except Exception as e:
+            errors.append(e)
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Switch threads often enough to interleave inside publish
+    try:
+        worker = threading.Thread(target=poller)
+        worker.start()
+        while worker.is_alive():
+            try:
+                aggregator.publish()
+                aggregator.encoder_values()
+            except Exception as e:
+                errors.append(e)
+                break
+        worker.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert errors == []
+    assert aggregator.aggregates()['bandwidth']['count'] == 500
+
+@pytest.mark.benchmark
+def test_event_cost_is_independent_of_fleet_size():
+    rng = random.Random(2)
+    timings = {}
+    for fleet in (100, 5000):
+        aggregator = FleetAggregator(thresholds={'bandwidth': 1.0})
+        values, rooms = {}, {}
+        for encoder_id in range(fleet):
+            rooms[encoder_id] = {f"site:{encoder_id % 10}"}
+            values[encoder_id] = {'bandwidth': rng.uniform(0, 20), 'streaming': 1.0}
+            aggregator.update(encoder_id, values[encoder_id], rooms=rooms[encoder_id])
+        aggregator.publish()
+
+        events = [(rng.randrange(fleet), rng.uniform(0, 20)) for _ in range(2000)]
+        start = time.perf_counter()
+        for encoder_id, bandwidth in events:
+            aggregator.update(encoder_id, {'bandwidth': bandwidth})
+        aggregator.publish()
+        incremental = (time.perf_counter() - start) / len(events)
+
+        start = time.perf_counter()
+        for encoder_id, bandwidth in events[:20]:
+            values[encoder_id]['bandwidth'] = bandwidth
+            for room in [FLEET] + [f"site:{i}" for i in range(10)]:
+                recompute(values, rooms, room)
+        full = (time.perf_counter() - start) / 20
+        timings[fleet] = (incremental, full)
+
+    print("\n" + ", ".join(f"{fleet:,} encoders: recompute {full * 1e6:,.0f} us, incremental {incremental * 1e6:.1f} us"
+                           for fleet, (incremental, full) in timings.items()))
+    assert timings[5000][1] > 10 * timings[100][1]
+    assert timings[5000][0] < 5 * timings[100][0] + 5e-6
+    assert timings[5000][0] < timings[5000][1] / 100
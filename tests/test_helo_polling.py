@@ -0,0 +1,141 @@
+import asyncio
+import json
+import time
+from contextlib import contextmanager
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from app.core.database import helo_polling
+from app.core.database.helo_polling import EncoderPoller
+
+DEVICE_DEADLINE = 0.2
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query):
+        pass
+
+    def fetchall(self):
+        return self.db.encoders
+
+class FakeDBPool:
+    """Stands in for DBConnectionPool: serves the encoder list and counts transactions"""
+    def __init__(self, encoders):
+        self.encoders = encoders
+        self.transactions = 0
+
+    @contextmanager
+    def connection(self):
+        self.transactions += 1
+        yield self
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self)
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def written(monkeypatch):
+    """Rows save_cycle hands to execute_values, keyed by table"""
+    rows = {}
+
+    def execute_values(cur, query, values):
+        table = 'encoder_logs' if 'encoder_logs' in query else 'encoders'
+        rows.setdefault(table, []).extend(values)
+
+    monkeypatch.setattr(helo_polling, 'execute_values', execute_values)
+    return rows
+
+@pytest_asyncio.fixture
+async def devices(aiohttp_server):
+    """One HELO that answers, one slower than the deadline, one returning an error page"""
+    async def ok(request):
+        return web.json_response({'streaming': True, 'status': 'Streaming'})
+
+    async def slow(request):
+        await asyncio.sleep(DEVICE_DEADLINE * 5)
+        return web.json_response({'streaming': True, 'status': 'Streaming'})
+
+    async def broken(request):
+        return web.Response(status=500, text='<html>Internal Server Error</html>')
+
+    servers = {}
+    for name, handler in (('ok', ok), ('slow', slow), ('broken', broken)):
+        app = web.Application()
+        app.router.add_get('/api/v1/status/streaming', handler)
+        app.router.add_get('/api/v1/status/system', handler)
+        servers[name] = await aiohttp_server(app)
+    return servers
+
+def make_poller(devices, **kwargs):
+    encoders = [
+        {'id': i, 'name': name, 'ip_address': server.host, 'port': server.port}
+        for i, (name, server) in enumerate(devices.items(), start=1)
+    ]
+    poller = EncoderPoller({}, device_deadline=DEVICE_DEADLINE, **kwargs)
+    poller._db_pool = FakeDBPool(encoders)
+    return poller
+
+def logged(written):
+    """Encoder id to the (level, raw_json) save_cycle logged for it"""
+    return {row[0]: (row[1], json.loads(row[3])) for row in written['encoder_logs']}
+
+@pytest.mark.asyncio
+async def test_slow_and_failing_devices_do_not_block_the_sweep(devices, written):
+    poller = make_poller(devices)
+    db = poller._db_pool
+
+    start = time.perf_counter()
+    report = await poller.poll()
+    elapsed = time.perf_counter() - start
+    await poller.close()
+
+    assert report['encoders'] == 3
+    assert set(report['device_latency']) == {'1', '2', '3'}
+    # The sweep waits for the slow device's deadline, not its response
+    assert elapsed < DEVICE_DEADLINE * 3
+    assert report['device_latency']['2'] >= DEVICE_DEADLINE
+
+    # Every result is written in one transaction after the sweep
+    assert db.transactions == 2  # Encoder list, then the cycle
+    assert sorted(written['encoders']) == [(1, 'online'), (2, 'error'), (3, 'error')]
+    statuses = logged(written)
+    assert sorted(statuses) == [1, 2, 3]
+    assert statuses[1][0] == 'INFO'
+    assert statuses[2] == ('ERROR', {'error': 'deadline exceeded'})
+    assert statuses[3][0] == 'ERROR'
+
+@pytest.mark.asyncio
+async def test_deadline_covers_both_status_requests(devices, written):
+    poller = make_poller({'slow': devices['slow']}, max_concurrency=1)
+
+    report = await poller.poll()
+    await poller.close()
+
+    assert logged(written)[1] == ('ERROR', {'error': 'deadline exceeded'})
+    assert poller.metrics.device_timeouts.labels('1')._value.get() >= 1
+    assert report['fits_interval']
+    assert written['encoders'] == [(1, 'error')]
+
+@pytest.mark.asyncio
+async def test_a_failing_status_callback_does_not_lose_results(devices, written):
+    poller = make_poller({'ok': devices['ok']})
+
+    def on_status(encoder, status):
+        raise RuntimeError('aggregator down')
+
+    poller.on_status = on_status
+    report = await poller.poll()
+    await poller.close()
+
+    assert report['encoders'] == 1
+    assert written['encoders'] == [(1, 'online')]
@@ -0,0 +1,64 @@
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Optional dependencies that only specific features need
+HEAVY_MODULES = [
+    'plotly', 'networkx', 'pandas', 'cv2', 'matplotlib',
+    'googleapiclient', 'pdfplumber', 'bs4',
+    'whisper', 'torch', 'whisper_online'
+]
+
+IMPORT_TIME_BUDGET_SECONDS = 1.5
+
+def _run(*args):
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+def test_import_app_core_skips_heavy_dependencies():
+    result = _run('-c', (
+        'import json, sys, app.core\n'
+        f'heavy = {HEAVY_MODULES!r}\n'
+        'print(json.dumps(sorted(m for m in heavy if m in sys.modules)))'
+    ))
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+def test_exported_names_resolve_on_first_access():
+    result = _run('-c', (
+        'import sys, app.core\n'
+        'assert "app.core.aja.aja_helo_parameter_service" not in sys.modules\n'
+        'from app.core import AJAParameterManager\n'
+        'assert "app.core.aja.aja_helo_parameter_service" in sys.modules\n'
+        'assert app.core.AJAParameterManager is AJAParameterManager\n'
+        'print("ok")'
+    ))
+    assert result.stdout.strip().endswith('ok')
+
+@pytest.mark.benchmark
+def test_import_time_report():
+    """Benchmark report from ``python -X importtime -c 'import app.core'``"""
+    result = _run('-X', 'importtime', '-c', 'import app.core')
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = re.match(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(.*)$', line)
+        if match:
+            entries.append((int(match.group(2)), int(match.group(1)), match.group(3).strip()))
+
+    total_us = next(cumulative for cumulative, _, name in entries if name == 'app.core')
+    print(f"\nimport app.core: {total_us / 1e6:.3f}s cumulative, {len(entries)} modules")
+    print(f"{'cumulative [us]':>16} {'self [us]':>10}  module")
+    for cumulative, self_us, name in sorted(entries, reverse=True)[:15]:
+        print(f"{cumulative:>16} {self_us:>10}  {name}")
+
+    assert total_us / 1e6 < IMPORT_TIME_BUDGET_SECONDS
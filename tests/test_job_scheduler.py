@@ -0,0 +1,75 @@
+import asyncio
+import time
+import pytest
+from app.core.connection.job_scheduler import PeriodicJobScheduler
+
+@pytest.mark.asyncio
+async def test_jobs_run_periodically_on_one_wheel():
+    scheduler = PeriodicJobScheduler(tick=0.01)
+    runs = {}
+
+    async def job(encoder_id):
+        runs[encoder_id] = runs.get(encoder_id, 0) + 1
+
+    for i in range(20):
+        scheduler.add_job('health', f'encoder_{i}', 0.05, job)
+    await asyncio.sleep(0.3)
+    await scheduler.stop()
+
+    assert len(runs) == 20
+    assert all(4 <= count <= 7 for count in runs.values())
+
+@pytest.mark.asyncio
+async def test_first_runs_are_spread_across_the_interval():
+    scheduler = PeriodicJobScheduler(tick=0.01)
+    started = time.monotonic()
+    first_run = {}
+
+    async def job(encoder_id):
+        first_run.setdefault(encoder_id, time.monotonic() - started)
+
+    for i in range(50):
+        scheduler.add_job('warmup', f'encoder_{i}', 0.5, job)
+    await asyncio.sleep(0.6)
+    await scheduler.stop()
+
+    offsets = sorted(first_run.values())
+    assert len(offsets) == 50
+    # No more than a fifth of the fleet fires in any tenth of the interval
+    assert max(sum(1 for o in offsets if b * 0.05 <= o < (b + 1) * 0.05) for b in range(10)) <= 10
+
+@pytest.mark.asyncio
+async def test_run_still_in_flight_is_skipped():
+    scheduler = PeriodicJobScheduler(tick=0.01)
+    concurrent = peak = runs = 0
+
+    async def slow(encoder_id):
+        nonlocal concurrent, peak, runs
+        runs += 1
+        concurrent += 1
+        peak = max(peak, concurrent)
+        await asyncio.sleep(0.1)
+        concurrent -= 1
+
+    scheduler.add_job('thermal', 'encoder_1', 0.02, slow)
+    await asyncio.sleep(0.35)
+    await scheduler.stop()
+
+    assert peak == 1
+    assert runs <= 4
+
+@pytest.mark.asyncio
+async def test_removed_jobs_stop_running():
+    scheduler = PeriodicJobScheduler(tick=0.01)
+    runs = []
+
+    async def job(encoder_id):
+        runs.append(encoder_id)
+
+    scheduler.add_job('health', 'a', 0.02, job)
+    scheduler.add_job('warmup', 'a', 0.02, job)
+    scheduler.remove_encoder('a')
+    assert len(scheduler) == 0
+    await asyncio.sleep(0.1)
+    await scheduler.stop()
+    assert runs == []
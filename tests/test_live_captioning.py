@@ -0,0 +1,149 @@
+import asyncio
+import numpy as np
+import pytest
+from app.core.live_transcription import handler_whisper_online
+from app.core.live_transcription.handler_whisper_online import LiveCaptioningService, StreamConfig
+
+SAMPLE_RATE = 100
+SIGNAL = np.arange(1000, dtype=np.int16)
+
+class FakeStdout:
+    """ffmpeg's stdout pipe: hands out the PCM bytes, then EOF or an error"""
+    def __init__(self, data, error=None):
+        self.data = data
+        self.error = error
+
+    async def read(self, n):
+        await asyncio.sleep(0)
+        if self.data:
+            chunk, self.data = self.data[:n], self.data[n:]
+            return chunk
+        if self.error is not None:
+            raise self.error
+        return b''
+
+class FakeProcess:
+    def __init__(self, stdout, exit_status=0):
+        self.stdout = stdout
+        self.exit_status = exit_status
+        self.returncode = None
+
+    def kill(self):
+        self.returncode = -9
+
+    async def wait(self):
+        if self.returncode is None:
+            self.returncode = self.exit_status
+        return self.returncode
+
+class FakePool:
+    """Shared pool stand-in that records every window handed to ASR"""
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.windows = []
+        self.registered = set()
+
+    async def register_stream(self, stream_id, model):
+        self.registered.add(stream_id)
+        return type('Stream', (), {'model': model})()
+
+    async def transcribe(self, stream_id, chunk):
+        self.windows.append(chunk.copy())
+        await asyncio.sleep(self.delay)
+        return (0.0, len(chunk) / SAMPLE_RATE, 'caption')
+
+    async def finish(self, stream_id):
+        return (None, None, '')
+
+    def unregister_stream(self, stream_id):
+        self.registered.discard(stream_id)
+
+class FakeAJAClient:
+    def __init__(self, ip_address):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def start_stream(self):
+        pass
+
+    async def stop_stream(self):
+        pass
+
+@pytest.fixture
+def ffmpeg_output(monkeypatch):
+    """Replace the ffmpeg subprocess with a FakeProcess built from the returned dict"""
+    output = {'data': SIGNAL.tobytes(), 'error': None, 'exit_status': 0}
+
+    async def create_subprocess_exec(*args, **kwargs):
+        stdout = FakeStdout(output['data'], output['error'])
+        return FakeProcess(stdout, output['exit_status'])
+
+    monkeypatch.setattr(handler_whisper_online, 'AJAHELOClient', FakeAJAClient)
+    monkeypatch.setattr(handler_whisper_online.asyncio, 'create_subprocess_exec', create_subprocess_exec)
+    return output
+
+def make_service(ip_address, pool, **kwargs):
+    config = StreamConfig(
+        ip_address=ip_address,
+        stream_url='http://encoder/stream.m3u8',
+        chunk_size=51,  # odd, so int16 samples straddle reads
+        sample_rate=SAMPLE_RATE,
+        asr_window=1.0,
+        max_merge_window=3.0,
+        **kwargs
+    )
+    return LiveCaptioningService(config, pool=pool)
+
+def transcribed(pool):
+    return np.concatenate(pool.windows) if pool.windows else np.array([], dtype=np.float32)
+
+@pytest.mark.asyncio
+async def test_backlog_is_merged_into_larger_windows(ffmpeg_output):
+    pool = FakePool(delay=0.02)
+    service = make_service('10.0.7.1', pool)
+
+    await service.process_stream()
+
+    assert not service._transcription_failed
+    # Every sample reaches ASR once and in order, across odd read boundaries
+    assert np.array_equal(transcribed(pool), SIGNAL.astype(np.float32) / 32768.0)
+    sizes = [len(window) for window in pool.windows]
+    assert max(sizes) == 3 * SAMPLE_RATE
+    assert all(size >= SAMPLE_RATE for size in sizes[:-1])
+    assert service.real_time_factor > 0
+    assert pool.registered == set()
+
+@pytest.mark.asyncio
+async def test_audio_beyond_the_buffer_is_dropped_oldest_first(ffmpeg_output):
+    pool = FakePool(delay=0.05)
+    service = make_service('10.0.7.2', pool, buffer_seconds=2.0)
+
+    await service.process_stream()
+
+    dropped = service.audio_buffer.dropped_samples
+    assert dropped > 0
+    assert len(transcribed(pool)) + dropped == len(SIGNAL)
+    assert transcribed(pool)[-1] == SIGNAL[-1] / 32768.0
+    assert service.metrics.dropped_audio.labels('10.0.7.2')._value.get() == pytest.approx(dropped / SAMPLE_RATE)
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('error, exit_status', [
+    (BrokenPipeError('pipe closed'), 0),
+    (None, 1),
+])
+async def test_ffmpeg_failure_falls_back_to_passthrough(ffmpeg_output, error, exit_status):
+    ffmpeg_output.update(data=SIGNAL[:300].tobytes(), error=error, exit_status=exit_status)
+    pool = FakePool()
+    service = make_service('10.0.7.3', pool)
+
+    await service.process_stream()
+
+    # Audio read before ffmpeg died is still transcribed, then captioning is bypassed
+    assert len(transcribed(pool)) == 300
+    assert service._transcription_failed
+    assert pool.registered == set()
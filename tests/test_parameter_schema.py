@@ -0,0 +1,71 @@
+import time
+import pytest
+from app.core.aja.aja_constants import AJAStreamParams
+from app.core.aja.aja_helo_parameter_service import AJAParameterManager
+from app.core.aja.parameter_schema import load_parameter_schema
+
+PROFILE = {
+    'Video Source': 'HDMI',
+    'Audio Source': 'SDI',
+    'Audio Delay': '40',
+    'Media State': 0,
+    'Stream URL': 'rtmp://example.com/live',
+    'Auto-recover Streaming': 'On',
+    AJAStreamParams.VIDEO_BITRATE: 6_000_000,
+    AJAStreamParams.FRAME_RATE: '29.97',
+    'Not A Table Parameter': object()
+}
+
+def test_managers_share_one_compiled_schema():
+    first = AJAParameterManager()
+    second = AJAParameterManager()
+
+    assert first.schema is second.schema
+    assert first.get_parameter('Video Source').enum_values == ('HDMI', 'SDI', 'Test Pattern')
+    with pytest.raises(TypeError):
+        first.parameters['Video Source'] = None
+
+def test_validate_many_reports_each_invalid_value():
+    manager = AJAParameterManager()
+    assert manager.validate_many(PROFILE) == {}
+
+    errors = manager.validate_many({
+        **PROFILE,
+        'Video Source': 'Composite',
+        'Audio Delay': '4.5ms',
+        AJAStreamParams.VIDEO_BITRATE: 50_000_000
+    })
+    assert set(errors) == {'Video Source', 'Audio Delay', AJAStreamParams.VIDEO_BITRATE}
+    assert not manager.validate_value('Video Source', 'Composite')
+    assert manager.validate_value('Video Source', 'hdmi')
+
+def test_enum_codes_are_limited_to_declared_ones():
+    manager = AJAParameterManager()
+
+    # Label positions and the table's default code are accepted
+    assert manager.validate_value('Video Source', 2)
+    assert manager.validate_value('Encode Type', '18')
+    assert manager.validate_value('Encode Type', 0)
+    for name, value in (('Video Source', 3), ('Video Source', -1), ('Encode Type', 17)):
+        assert not manager.validate_value(name, value)
+    assert 'HDMI, SDI, Test Pattern' in manager.validate_many({'Video Source': 7})['Video Source']
+
+@pytest.mark.benchmark
+def test_construction_and_validation_throughput():
+    load_parameter_schema()  # Compile once, as the first import in a process would
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        AJAParameterManager()
+    construct_rate = 1000 / (time.perf_counter() - start)
+
+    manager = AJAParameterManager()
+    start = time.perf_counter()
+    for _ in range(10_000):
+        manager.validate_many(PROFILE)
+    validate_rate = 10_000 / (time.perf_counter() - start)
+
+    print(f"\nAJAParameterManager(): {construct_rate:,.0f}/s, "
+          f"validate_many({len(PROFILE)} params): {validate_rate:,.0f} profiles/s")
+    assert construct_rate > 10_000
+    assert validate_rate > 5_000
@@ -0,0 +1,127 @@
+import asyncio
+import time
+import pytest
+from app.core.connection.pool_manager import AdaptiveConcurrencyLimiter, PoolManager, TokenBucket
+from app.core.error_handling import APIError
+
+REQUEST_LATENCY = 0.01
+
+def make_pool(**kwargs):
+    pool = PoolManager(**kwargs)
+
+    async def create_session():
+        return object()
+
+    pool._create_session = create_session
+    return pool
+
+async def run_requests(pool, concurrency, total):
+    async def client(count):
+        for _ in range(count):
+            async with pool.connection('cablecast', '/shows'):
+                await asyncio.sleep(REQUEST_LATENCY)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(total // concurrency) for _ in range(concurrency)))
+    return total / (time.perf_counter() - start)
+
+@pytest.mark.asyncio
+async def test_requests_to_one_service_run_concurrently():
+    pool = make_pool(rate_limit=100_000, initial_concurrency=32)
+    active = peak = 0
+
+    async def request():
+        nonlocal active, peak
+        async with pool.connection('cablecast', '/shows'):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(REQUEST_LATENCY)
+            active -= 1
+
+    await asyncio.gather(*(request() for _ in range(16)))
+    assert peak == 16
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_throughput_scales_with_concurrency():
+    """Contention benchmark: requests to one service no longer serialise"""
+    rates = {}
+    for concurrency in (1, 4, 16):
+        pool = make_pool(rate_limit=100_000, initial_concurrency=32)
+        rates[concurrency] = await run_requests(pool, concurrency, total=160)
+
+    print("\n" + ", ".join(f"{c} clients: {r:,.0f} req/s" for c, r in rates.items()))
+    assert rates[4] > 3 * rates[1]
+    assert rates[16] > 10 * rates[1]
+
+@pytest.mark.asyncio
+async def test_session_created_once_under_concurrent_first_use():
+    pool = make_pool()
+    created = 0
+
+    async def create_session():
+        nonlocal created
+        created += 1
+        await asyncio.sleep(0.01)
+        return object()
+
+    pool._create_session = create_session
+
+    async def use():
+        async with pool.connection('helo', 'status') as session:
+            return session
+
+    sessions = await asyncio.gather(*(use() for _ in range(10)))
+    assert created == 1
+    assert len(set(map(id, sessions))) == 1
+
+@pytest.mark.asyncio
+async def test_rate_limit_is_per_endpoint_and_refills():
+    pool = make_pool(rate_limit=50, burst=2)
+    for _ in range(2):
+        async with pool.connection('cablecast', '/shows'):
+            pass
+    with pytest.raises(APIError) as exc:
+        async with pool.connection('cablecast', '/shows'):
+            pass
+    assert exc.value.code == 429
+
+    async with pool.connection('cablecast', '/schedule'):
+        pass
+
+    await asyncio.sleep(0.05)
+    async with pool.connection('cablecast', '/shows'):
+        pass
+
+def test_token_bucket_retry_after():
+    bucket = TokenBucket(rate=10, capacity=1)
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert 0 < bucket.retry_after() <= 0.1
+
+@pytest.mark.asyncio
+async def test_limiter_shrinks_when_latency_rises_and_grows_when_saturated():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10, max_limit=50)
+    for _ in range(10):
+        await limiter.acquire()
+    for _ in range(10):
+        limiter.release(0.01)
+    assert limiter.limit > 10
+
+    grown = limiter.limit
+    for _ in range(5):
+        await limiter.acquire()
+        limiter.release(0.1)
+    assert limiter.limit < grown
+
+@pytest.mark.asyncio
+async def test_limiter_queues_callers_over_the_limit():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    limiter.release()
+    await asyncio.wait_for(waiter, 1)
+    assert limiter.in_flight == 1
@@ -0,0 +1,140 @@
+import random
+import time
+from datetime import datetime, timedelta
+import pytest
+from app.core.cablecast.scheduling.scheduling_assistant import (
+    EventIndex, ScheduledAction, ScheduledEvent, SchedulingAssistant)
+
+BASE = datetime(2025, 1, 6, 18, 0)
+ENCODERS = [f"encoder_{i}" for i in range(5)]
+
+def make_event(event_id, start, hours=2, encoder_id=None):
+    return ScheduledEvent(id=event_id, start_time=start, end_time=start + timedelta(hours=hours),
+                          action=ScheduledAction.RECORD_AND_STREAM, title=event_id, encoder_id=encoder_id)
+
+def year_of_meetings(count):
+    """``count`` two-hour meetings spread over a year across the encoders, about 1% of them clashing"""
+    events = []
+    for i in range(count):
+        encoder_id = ENCODERS[i % len(ENCODERS)]
+        slot = i // len(ENCODERS)
+        start = BASE + timedelta(hours=slot * 4)
+        if i % 100 == 99:
+            start -= timedelta(hours=3)  # Overlaps the previous meeting on this encoder
+        events.append(make_event(f"meeting_{i}", start, encoder_id=encoder_id))
+    return events
+
+class LinearSchedule:
+    """The original list scan and re-sort, kept as the benchmark baseline"""
+    def __init__(self):
+        self.events = []
+
+    def add_event(self, event):
+        for existing in self.events:
+            if (existing.encoder_id == event.encoder_id and
+                    event.start_time < existing.end_time and event.end_time > existing.start_time):
+                return False
+        self.events.append(event)
+        self.events.sort(key=lambda x: x.start_time)
+        return True
+
+@pytest.fixture
+def assistant():
+    return SchedulingAssistant(helo_params=None)
+
+def test_conflicts_are_per_encoder(assistant):
+    assert assistant.add_event(make_event('a', BASE, encoder_id='encoder_1'))
+    assert not assistant.add_event(make_event('b', BASE + timedelta(hours=1), encoder_id='encoder_1'))
+    assert assistant.add_event(make_event('c', BASE + timedelta(hours=1), encoder_id='encoder_2'))
+    # Back to back is not a conflict
+    assert assistant.add_event(make_event('d', BASE + timedelta(hours=2), encoder_id='encoder_1'))
+    assert not assistant.add_event(make_event('a', BASE + timedelta(days=1), encoder_id='encoder_3'))
+    assert [e.id for e in assistant.events] == ['a', 'c', 'd']
+
+def test_remove_frees_the_slot(assistant):
+    assistant.add_event(make_event('a', BASE, encoder_id='encoder_1'))
+    assert assistant.remove_event('a')
+    assert not assistant.remove_event('a')
+    assert assistant.add_event(make_event('b', BASE + timedelta(hours=1), encoder_id='encoder_1'))
+    assert assistant.index.for_encoder('encoder_1')[0].id == 'b'
+
+def test_window_queries(assistant):
+    for i, hours in enumerate((0, 3, 6, 30)):
+        assistant.add_event(make_event(f"e{i}", BASE + timedelta(hours=hours), encoder_id='encoder_1'))
+
+    assert [e.id for e in assistant.index.starting_between(BASE + timedelta(hours=3), BASE + timedelta(hours=6))] == ['e1', 'e2']
+    # e1 (3h-5h) is still running at 4h
+    assert [e.id for e in assistant.get_active_events(BASE + timedelta(hours=4), BASE + timedelta(hours=7))] == ['e1', 'e2']
+    assert assistant.get_active_events(BASE + timedelta(hours=9), BASE + timedelta(hours=10)) == []
+
+def test_index_matches_linear_scan_on_random_schedule():
+    rng = random.Random(7)
+    index, linear = EventIndex(), LinearSchedule()
+    for i in range(2000):
+        event = make_event(f"e{i}", BASE + timedelta(minutes=rng.randrange(0, 60 * 24 * 30, 15)),
+                           hours=rng.choice((0.5, 1, 2, 3)), encoder_id=rng.choice(ENCODERS))
+        assert index.add(event) == linear.add_event(event)
+        if i % 7 == 0 and len(index):
+            victim = rng.choice(list(index)).id
+            index.remove(victim)
+            linear.events = [e for e in linear.events if e.id != victim]
+
+    assert [e.id for e in index] == [e.id for e in linear.events]
+    window = (BASE + timedelta(days=10), BASE + timedelta(days=11))
+    assert [e.id for e in index.overlapping(*window)] == [
+        e.id for e in linear.events if e.start_time < window[1] and e.end_time > window[0]]
+
+def test_window_queries_with_long_events_match_linear_scan():
+    rng = random.Random(3)
+    index, linear = EventIndex(), LinearSchedule()
+    # A week-long event on one encoder, then short ones on every encoder
+    long_event = make_event('long', BASE, hours=24 * 7, encoder_id=ENCODERS[0])
+    index.add(long_event)
+    linear.add_event(long_event)
+    for i in range(500):
+        event = make_event(f"e{i}", BASE + timedelta(minutes=rng.randrange(0, 60 * 24 * 14, 15)),
+                           hours=rng.choice((0.5, 1, 2)), encoder_id=rng.choice(ENCODERS))
+        assert index.add(event) == linear.add_event(event)
+
+    for removed in (False, True):
+        if removed:
+            index.remove('long')
+            linear.events = [e for e in linear.events if e.id != 'long']
+        for day in range(14):
+            window = (BASE + timedelta(days=day, hours=12), BASE + timedelta(days=day, hours=13))
+            assert [e.id for e in index.overlapping(*window)] == [
+                e.id for e in linear.events if e.start_time < window[1] and e.end_time > window[0]]
+
+def shuffled_year(count):
+    events = year_of_meetings(count)
+    rng = random.Random(1)
+    rng.shuffle(events)  # Calendar feeds are not guaranteed to be in order
+    return events
+
+def test_import_10k_events(assistant):
+    accepted = assistant.add_events(shuffled_year(10_000))
+    assert len(accepted) == len(assistant.index) == 9_900
+
+@pytest.mark.benchmark
+def test_import_benchmark_10k_events(assistant):
+    events = shuffled_year(10_000)
+
+    start = time.perf_counter()
+    assistant.add_events(events)
+    indexed = time.perf_counter() - start
+
+    baseline_events = events[:2_000]
+    linear = LinearSchedule()
+    start = time.perf_counter()
+    for event in baseline_events:
+        linear.add_event(event)
+    baseline = time.perf_counter() - start
+
+    print(f"\nImport: index 10,000 events in {indexed * 1000:.0f} ms, "
+          f"linear scan 2,000 events in {baseline * 1000:.0f} ms")
+    assert indexed < baseline
+
+    start = time.perf_counter()
+    for day in range(365):
+        assistant.get_active_events(BASE + timedelta(days=day), BASE + timedelta(days=day, hours=1))
+    print(f"365 window queries over 10,000 events in {(time.perf_counter() - start) * 1000:.1f} ms")
@@ -0,0 +1,84 @@
+import asyncio
+import time
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from app.core.aja.client import AJAHELOClient
+from app.core.aja.device_state_cache import DeviceStateCache
+from app.core.aja.session_registry import HeloSessionRegistry
+
+@pytest_asyncio.fixture
+async def helo_server(aiohttp_server):
+    async def status(request):
+        return web.json_response({'status': 'ok'})
+
+    async def slow(request):
+        await asyncio.sleep(0.2)
+        return web.json_response({'status': 'ok'})
+
+    app = web.Application()
+    app.router.add_get('/api/v1/status/system', status)
+    app.router.add_get('/api/v1/status/streaming', status)
+    app.router.add_get('/api/v1/status/slow', slow)
+    return await aiohttp_server(app)
+
+@pytest.mark.asyncio
+async def test_clients_share_one_session(helo_server):
+    registry = HeloSessionRegistry()
+    # Zero TTLs so every status read goes over the wire
+    uncached = DeviceStateCache(ttls={'/status/system': 0, '/status/streaming': 0})
+    first = AJAHELOClient(helo_server.host, helo_server.port, registry=registry, state_cache=uncached)
+    second = AJAHELOClient(helo_server.host, helo_server.port, registry=registry, state_cache=uncached)
+
+    async with first as client:
+        await client.get_system_status()
+    async with second as client:
+        await client.get_stream_status()
+        await client.get_system_status()
+
+    stats = registry.stats()
+    assert stats['sessions'] == 1
+    assert stats['connections_created'] == 1
+    assert stats['connections_reused'] == 2
+    assert stats['reuse_ratio'] == pytest.approx(2 / 3)
+    assert stats['open_sockets'] == 1
+    await registry.close_all()
+
+@pytest.mark.asyncio
+async def test_idle_sessions_are_evicted(helo_server):
+    registry = HeloSessionRegistry(idle_timeout=0)
+    client = AJAHELOClient(helo_server.host, helo_server.port, registry=registry)
+    await client.get_system_status()
+
+    assert await registry.evict_idle() == 1
+    assert registry.stats()['sessions'] == 0
+    assert registry.open_sockets() == 0
+    await registry.close_all()
+
+@pytest.mark.asyncio
+async def test_requests_on_a_kept_session_count_as_use(helo_server):
+    registry = HeloSessionRegistry(idle_timeout=60)
+    host = f"{helo_server.host}:{helo_server.port}"
+    client = AJAHELOClient(helo_server.host, helo_server.port, registry=registry,
+                           state_cache=DeviceStateCache(ttls={'/status/system': 0}))
+    await client.get_system_status()
+    # Eviction was started by the first get_session
+    assert registry._eviction_task is not None and not registry._eviction_task.done()
+
+    # The client reuses its own session without going back to the registry
+    registry._last_used[host] = time.monotonic() - 120
+    await client.get_system_status()
+    assert await registry.evict_idle() == 0
+
+    # A session with a request in progress is not closed, however old its last use
+    session = await registry.get_session(host)
+    request = asyncio.create_task(session.get(f"http://{host}/api/v1/status/slow"))
+    await asyncio.sleep(0.05)
+    registry._last_used[host] = time.monotonic() - 120
+    assert await registry.evict_idle() == 0
+    response = await request
+    assert response.status == 200
+    response.release()
+
+    await registry.close_all()
+    assert registry._eviction_task is None
@@ -0,0 +1,110 @@
+import json
+import random
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from app.core.metrics.metrics_analyzer import MetricsAnalyzer
+from app.core.metrics.stability_tracker import StreamingStabilityTracker
+
+def make_samples(count, seed=5):
+    rng = random.Random(seed)
+    return [{'bitrate': rng.gauss(8_000_000, 250_000), 'fps': rng.choice((29.97, 29.97, 29.5, 30.0)),
+             'dropped_frames': rng.choice((0, 0, 0, 2)), 'total_frames': 60} for _ in range(count)]
+
+def as_metrics(samples):
+    return [SimpleNamespace(streaming_data=sample) for sample in samples]
+
+def test_rolling_result_matches_full_analysis():
+    tracker = StreamingStabilityTracker(window=50)
+    samples = make_samples(180)
+    analyzer = MetricsAnalyzer()
+
+    for count, sample in enumerate(samples, start=1):
+        tracker.submit('enc1', sample)
+        if count in (1, 49, 50, 51, 180):
+            tracker.process_pending()
+            result = tracker.latest('enc1')
+            expected = analyzer.analyze_streaming_stability(as_metrics(samples[max(0, count - 50):count]))
+            assert result['samples'] == min(count, 50)
+            for key, value in expected.items():
+                assert result[key] == pytest.approx(value, rel=1e-9)
+
+def test_malformed_samples_are_skipped():
+    tracker = StreamingStabilityTracker()
+    tracker.submit('enc1', {'bitrate': 8e6, 'fps': 30})
+    tracker.submit('enc1', {'fps': 30})
+    tracker.submit('enc1', {'bitrate': 'n/a', 'fps': 30})
+    assert tracker.process_pending() == 1
+    assert tracker.latest('enc1')['samples'] == 1
+    assert tracker.latest('enc2') is None
+
+def test_malformed_frame_counts_leave_the_window_untouched():
+    tracker = StreamingStabilityTracker()
+    tracker.submit('enc1', {'bitrate': 8e6, 'fps': 30, 'dropped_frames': 1, 'total_frames': 60})
+    tracker.submit('enc1', {'bitrate': 1e6, 'fps': 10, 'dropped_frames': 'n/a', 'total_frames': 60})
+    assert tracker.process_pending() == 1
+    result = tracker.latest('enc1')
+    assert result['samples'] == 1 and result['dropped_frames_total'] == 1
+    assert result['bitrate_stability'] == 1.0
+
+def test_idle_encoder_results_are_valid_json():
+    tracker = StreamingStabilityTracker()
+    for _ in range(5):
+        tracker.submit('enc1', {'bitrate': 0, 'fps': 0, 'dropped_frames': 0, 'total_frames': 0})
+    tracker.process_pending()
+    result = tracker.latest('enc1')
+    assert result['bitrate_stability'] == result['fps_stability'] == 1.0
+    json.dumps(result, allow_nan=False)
+
+def test_pending_samples_are_bounded():
+    tracker = StreamingStabilityTracker(max_pending=100)
+    before = tracker.metrics.dropped._value.get()
+    for sample in make_samples(150):
+        tracker.submit('enc1', sample)
+    assert tracker.metrics.dropped._value.get() - before == 50
+    assert tracker.process_pending() == 100
+
+def test_background_task_publishes_results():
+    tracker = StreamingStabilityTracker(interval=0.01)
+    worker = threading.Thread(target=tracker.run, daemon=True)
+    worker.start()
+    for sample in make_samples(20):
+        tracker.submit('enc1', sample)
+
+    deadline = time.monotonic() + 2
+    while (tracker.latest('enc1') or {}).get('samples') != 20 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    tracker.stop()
+    worker.join(1)
+    assert tracker.latest('enc1')['samples'] == 20
+
+@pytest.mark.benchmark
+def test_broadcast_cost_is_independent_of_history():
+    analyzer = MetricsAnalyzer()
+    timings = {}
+    for history in (100, 10_000):
+        metrics = as_metrics(make_samples(history))
+        start = time.perf_counter()
+        for _ in range(20):
+            analyzer.analyze_streaming_stability(metrics)
+        inline = (time.perf_counter() - start) / 20
+
+        tracker = StreamingStabilityTracker(window=history)
+        for sample in make_samples(history):
+            tracker.submit('enc1', sample)
+        tracker.process_pending()
+        start = time.perf_counter()
+        for sample in make_samples(200, seed=9):
+            # What broadcast_encoder_update now does per update
+            tracker.submit('enc1', sample)
+            tracker.latest('enc1')
+        hot_path = (time.perf_counter() - start) / 200
+        timings[history] = (inline, hot_path)
+
+    print("\n" + ", ".join(f"{history:,} samples: inline analysis {inline * 1e6:,.0f} us, "
+                           f"submit + latest {hot_path * 1e6:.1f} us"
+                           for history, (inline, hot_path) in timings.items()))
+    assert timings[10_000][0] > 20 * timings[100][0]
+    assert timings[10_000][1] < 5 * timings[100][1] + 5e-6
+    assert timings[10_000][1] < timings[10_000][0] / 100
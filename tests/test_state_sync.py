@@ -0,0 +1,147 @@
+import copy
+import json
+import random
+from collections import defaultdict
+import pytest
+from app.services.websocket.state_sync import EncoderStateSync, apply_delta
+from app.services.websocket.subscription_fanout import encoder_room
+
+class FakeSocketIOServer:
+    def __init__(self):
+        self.rooms = defaultdict(set)
+
+    def enter_room(self, sid, room, namespace=None):
+        self.rooms[room].add(sid)
+
+class FakeSocketIO:
+    """Delivers emits to per-client inboxes, following room membership"""
+    def __init__(self):
+        self.server = FakeSocketIOServer()
+        self.inbox = defaultdict(list)
+
+    def emit(self, event, data, room=None, namespace=None):
+        # Round trip through JSON, as the client would receive it
+        message = json.loads(json.dumps(data))
+        for sid in self.server.rooms.get(room, {room}):
+            self.inbox[sid].append((event, message))
+
+class Dashboard:
+    """Client side of the protocol: apply snapshots and deltas, resync on a sequence gap"""
+    def __init__(self, sync, socketio, sid):
+        self.sync, self.socketio, self.sid = sync, socketio, sid
+        self.states, self.seqs = {}, {}
+        self.resyncs = 0
+
+    def receive(self, drop=()):
+        inbox, self.socketio.inbox[self.sid] = self.socketio.inbox[self.sid], []
+        for event, message in inbox:
+            if (event, message['seq']) in drop:
+                continue
+            encoder_id = message['encoder_id']
+            if event == 'encoder_snapshot':
+                self.states[encoder_id] = copy.deepcopy(message['state'])
+                self.seqs[encoder_id] = message['seq']
+            elif message['seq'] != self.seqs.get(encoder_id, 0) + 1:
+                self.resyncs += 1
+                self.sync.handle_resync(self.sid, {'encoder_id': encoder_id, 'seq': self.seqs.get(encoder_id)})
+                self.receive()
+                return
+            else:
+                apply_delta(self.states[encoder_id], message)
+                self.seqs[encoder_id] = message['seq']
+
+def encoder_status(encoder_id, bitrate=8000):
+    return {
+        'id': encoder_id, 'name': f"Chamber {encoder_id}", 'bitrate': bitrate, 'recording': True,
+        'streaming': {'state': 'live', 'url': f"rtmp://cdn.example/live/{encoder_id}", 'dropped_frames': 0},
+        'inputs': {'video': '1080i59.94', 'audio': {'ch1': -18.0, 'ch2': -18.5}},
+        'storage': {'media': 'SD', 'free_gb': 112.4}, 'firmware': '4.2.0.11', 'serial': f"1T00{encoder_id:04d}",
+        'presets': [f"preset_{i}" for i in range(20)],
+    }
+
+@pytest.fixture
+def socketio():
+    return FakeSocketIO()
+
+def test_subscribe_snapshot_then_deltas_of_changed_fields(socketio):
+    sync = EncoderStateSync(socketio)
+    sync.update(1, encoder_status(1))
+    sync.subscribe('a', 1)
+    dashboard = Dashboard(sync, socketio, 'a')
+    dashboard.receive()
+    assert dashboard.states[1] == encoder_status(1) and dashboard.seqs[1] == 1
+
+    delta = sync.update(1, encoder_status(1, bitrate=7900))
+    assert delta == {'encoder_id': 1, 'seq': 2, 'set': [[['bitrate'], 7900]], 'unset': []}
+    assert sync.update(1, encoder_status(1, bitrate=7900)) is None
+    assert socketio.inbox['a'][-1][0] == 'encoder_delta'
+
+    dashboard.receive()
+    assert dashboard.states[1] == encoder_status(1, bitrate=7900)
+
+def test_random_changes_keep_clients_in_sync(socketio):
+    rng = random.Random(3)
+    sync = EncoderStateSync(socketio)
+    state = encoder_status(1)
+    sync.subscribe('a', 1)
+    dashboard = Dashboard(sync, socketio, 'a')
+
+    for _ in range(300):
+        state = copy.deepcopy(state)
+        choice = rng.randrange(5)
+        if choice == 0:
+            state['bitrate'] = rng.randrange(6000, 9000)
+        elif choice == 1:
+            state['inputs']['audio'][f"ch{rng.randrange(1, 5)}"] = rng.random()
+        elif choice == 2:
+            state['inputs']['audio'].pop(rng.choice(sorted(state['inputs']['audio']) or ['ch1']), None)
+        elif choice == 3:
+            state['streaming'] = rng.choice([{}, 'offline', {'state': 'live', 'dropped_frames': rng.randrange(9)}])
+        else:
+            state['error'] = rng.choice([None, 'SD full'])
+        sync.update(1, state)
+        dashboard.receive()
+        assert dashboard.states[1] == state
+
+def test_gap_triggers_resync_snapshot(socketio):
+    sync = EncoderStateSync(socketio)
+    sync.subscribe('a', 1)
+    dashboard = Dashboard(sync, socketio, 'a')
+    for bitrate in (8000, 8100, 8200, 8300):
+        sync.update(1, encoder_status(1, bitrate))
+
+    # The delta with seq 3 is lost on the way
+    dashboard.receive(drop={('encoder_delta', 3)})
+
+    assert dashboard.resyncs == 1
+    assert dashboard.states[1] == encoder_status(1, 8300) and dashboard.seqs[1] == 4
+    assert sync.metrics.messages.labels('resync')._value.get() >= 1
+
+    # Resyncs for encoders the client is not subscribed to are ignored
+    sync.handle_resync('a', {'encoder_id': 2})
+    assert socketio.inbox['a'] == []
+
+def test_bytes_per_client_per_minute(socketio):
+    now = [0.0]
+    sync = EncoderStateSync(socketio, clock=lambda: now[0])
+    tiles = 24
+    for encoder_id in range(tiles):
+        sync.subscribe('dashboard', encoder_id)
+        socketio.server.enter_room('full_push', encoder_room(encoder_id))
+    full_push_bytes = 0
+
+    # One minute of bitrate changes reported every two seconds
+    for tick in range(30):
+        now[0] = tick * 2.0
+        for encoder_id in range(tiles):
+            status = encoder_status(encoder_id, bitrate=8000 + tick)
+            sync.update(encoder_id, status)
+            full_push_bytes += len(json.dumps(status, separators=(',', ':')))
+    now[0] = 60.0
+    sync.rollover()
+
+    sent = sync.last_bytes_per_client['dashboard']
+    print(f"\n{tiles} encoder tiles for one minute: full state {full_push_bytes:,} bytes, "
+          f"snapshot + deltas {sent:,.0f} bytes")
+    assert sync.metrics.mean_client_bytes_per_minute._value.get() == pytest.approx(sent)
+    assert sent < full_push_bytes / 5
@@ -0,0 +1,95 @@
+import asyncio
+import time
+import numpy as np
+import pytest
+from app.core.error_handling.errors.exceptions import EncoderError
+from app.core.live_transcription.transcription_pool import DEFAULT_RTF, EXPECTED_RTF, TranscriptionWorkerPool
+
+class FakeProcessor:
+    def __init__(self, asr, order, cost):
+        self.asr = asr
+        self.order = order
+        self.cost = cost
+        self.audio = None
+
+    def insert_audio_chunk(self, audio):
+        self.audio = audio
+
+    def process_iter(self):
+        time.sleep(self.cost)
+        self.order.append(self.audio[0])
+        return (0.0, 1.0, f"{self.asr}:{self.audio[0]}")
+
+def make_pool(order, cost=0.001, **kwargs):
+    loaded = []
+
+    def load(model, language, min_chunk_size):
+        loaded.append(model)
+        return model
+
+    pool = TranscriptionWorkerPool(
+        asr_loader=load,
+        processor_factory=lambda asr: FakeProcessor(asr, order, cost),
+        **kwargs
+    )
+    return pool, loaded
+
+@pytest.mark.asyncio
+async def test_streams_share_one_loaded_model():
+    pool, loaded = make_pool([], workers_per_model=2)
+    first = await pool.register_stream('10.0.0.1', 'large-v2')
+    second = await pool.register_stream('10.0.0.2', 'large-v2')
+
+    assert loaded == ['large-v2']
+    assert first.processor is not second.processor
+    assert await pool.transcribe('10.0.0.1', np.full(160, 1, np.float32)) == (0.0, 1.0, 'large-v2:1.0')
+    await pool.shutdown()
+
+@pytest.mark.asyncio
+async def test_backlogged_stream_does_not_starve_others():
+    order = []
+    pool, _ = make_pool(order, max_load=1.0)
+    await pool.register_stream('busy')
+    await pool.register_stream('quiet')
+
+    busy = [asyncio.create_task(pool.transcribe('busy', np.full(160, i, np.float32))) for i in range(5)]
+    await asyncio.sleep(0)
+    quiet = asyncio.create_task(pool.transcribe('quiet', np.full(160, 100, np.float32)))
+    await asyncio.gather(*busy, quiet)
+
+    # The quiet stream is served after at most one more busy window
+    assert order.index(100) <= 2
+    await pool.shutdown()
+
+@pytest.mark.asyncio
+async def test_admission_downgrades_then_rejects():
+    # Each window takes longer than its audio, so one stream saturates a model
+    pool, loaded = make_pool([], cost=0.02, allow_downgrade=True)
+    for name, model in (('a', 'small'), ('b', 'base')):
+        await pool.register_stream(name, model)
+        await pool.transcribe(name, np.zeros(160, np.float32))
+
+    downgraded = await pool.register_stream('c', 'small')
+    assert downgraded.model == 'tiny'
+    await pool.transcribe('c', np.zeros(160, np.float32))
+
+    with pytest.raises(EncoderError) as exc:
+        await pool.register_stream('d', 'small')
+    assert exc.value.error_type == 'transcription_capacity'
+    assert loaded == ['small', 'base', 'tiny']
+    await pool.shutdown()
+
+@pytest.mark.asyncio
+async def test_streams_not_yet_timed_count_at_the_expected_load():
+    pool, loaded = make_pool([])
+    first = await pool.register_stream('a', 'large-v2')
+    assert first.real_time_factor == EXPECTED_RTF['large-v2']
+
+    # Two untimed large streams would already exceed the 0.8 budget
+    second = await pool.register_stream('b', 'large-v2')
+    assert second.model == 'large'
+    assert pool.stats()['large-v2']['load'] == EXPECTED_RTF['large-v2']
+
+    unknown = await pool.register_stream('c', 'distil-large')
+    assert unknown.real_time_factor == DEFAULT_RTF
+    await pool.shutdown()
@@ -0,0 +1,103 @@
+import asyncio
+import statistics
+import time
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from app.core.aja.client import AJAHELOClient
+from app.core.aja.session_registry import HeloSessionRegistry
+
+# Simulated TCP connection setup cost to a HELO on another subnet
+CONNECT_DELAY = 0.02
+ROUNDS = 10
+
+@pytest_asyncio.fixture
+async def helo_server(aiohttp_server):
+    async def ok(request):
+        return web.json_response({'status': 'ok'})
+
+    app = web.Application()
+    app.router.add_get('/api/v1/status/system', ok)
+    app.router.add_post('/api/v1/control/stream/start', ok)
+    app.router.add_post('/api/v1/control/record/start', ok)
+    return await aiohttp_server(app)
+
+@pytest_asyncio.fixture
+async def slow_connect_proxy(helo_server):
+    """TCP proxy that delays every new connection by CONNECT_DELAY"""
+    async def pipe(reader, writer):
+        try:
+            while data := await reader.read(65536):
+                writer.write(data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle(client_reader, client_writer):
+        await asyncio.sleep(CONNECT_DELAY)
+        upstream_reader, upstream_writer = await asyncio.open_connection(helo_server.host, helo_server.port)
+        await asyncio.gather(pipe(client_reader, upstream_writer), pipe(upstream_reader, client_writer))
+
+    server = await asyncio.start_server(handle, '127.0.0.1', 0)
+    yield server.sockets[0].getsockname()[1]
+    server.close()
+
+async def first_command_latency(port, command, warm):
+    registry = HeloSessionRegistry()
+    if warm:
+        assert await registry.prewarm(f"127.0.0.1:{port}", 2) == 2
+    client = AJAHELOClient('127.0.0.1', port, registry=registry, encoder_id=f'bench-{port}')
+
+    start = time.perf_counter()
+    await getattr(client, command)()
+    elapsed = time.perf_counter() - start
+
+    stats = registry.stats()
+    await registry.close_all()
+    return elapsed, stats
+
+@pytest.mark.asyncio
+async def test_prewarm_holds_reusable_keepalive_sockets(helo_server):
+    registry = HeloSessionRegistry(limit_per_host=4)
+    host = f"{helo_server.host}:{helo_server.port}"
+
+    assert await registry.prewarm(host, 3) == 3
+    assert await registry.prewarm(host, 3) == 3  # Refresh reuses the same sockets
+    assert registry.stats()['connections_created'] == 3
+
+    client = AJAHELOClient(helo_server.host, helo_server.port, registry=registry)
+    await client.start_stream()
+    assert registry.stats()['connections_created'] == 3
+
+    await registry.reset_host(host)
+    assert registry.idle_sockets(host) == 0
+    await registry.close_all()
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('command', ['start_stream', 'start_recording'])
+async def test_first_command_reuses_a_prewarmed_socket(slow_connect_proxy, command):
+    _, stats = await first_command_latency(slow_connect_proxy, command, warm=False)
+    assert stats['connections_created'] == 1
+
+    _, stats = await first_command_latency(slow_connect_proxy, command, warm=True)
+    assert stats['connections_created'] == 2
+    assert stats['connections_reused'] >= 1
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+@pytest.mark.parametrize('command', ['start_stream', 'start_recording'])
+async def test_cold_vs_warm_first_command_latency(slow_connect_proxy, command):
+    cold, warm = [], []
+    for _ in range(ROUNDS):
+        elapsed, _ = await first_command_latency(slow_connect_proxy, command, warm=False)
+        cold.append(elapsed)
+
+        elapsed, _ = await first_command_latency(slow_connect_proxy, command, warm=True)
+        warm.append(elapsed)
+
+    cold_ms, warm_ms = statistics.median(cold) * 1000, statistics.median(warm) * 1000
+    print(f"\n{command} first-command latency: cold {cold_ms:.1f} ms, warm {warm_ms:.1f} ms")
+    assert cold_ms >= CONNECT_DELAY * 1000
+    assert warm_ms < cold_ms / 2
@@ -1,10 +1,13 @@
 import pytest
 import asyncio
+import json
 import socketio
 import time
+from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor
 from statistics import mean, stdev
-from ..app.core.metrics.metrics_analyzer import MetricsAnalyzer
+from app.core.metrics.metrics_analyzer import MetricsAnalyzer
+from app.services.websocket.subscription_fanout import BatchFanout, encoder_room
 
 class WebSocketLoadTest:
     def __init__(self, base_url, num_clients=100):
@@ -96,4 +99,120 @@ async def test_websocket_performance():
     # Assert performance requirements
     assert results['summary']['avg_latency'] < 0.1  # 100ms max average latency
     assert results['summary']['error_rate'] < 0.01  # Less than 1% error rate
-    assert results['summary']['messages_per_second'] > 50  # Minimum message rate 
\ No newline at end of file
+    assert results['summary']['messages_per_second'] > 50  # Minimum message rate
+
+class FakeSocketIOServer:
+    """Room bookkeeping and packet writes of python-socketio, without transports"""
+    def __init__(self):
+        self.rooms = defaultdict(set)
+        self.sent = defaultdict(list)
+
+    def enter_room(self, sid, room, namespace=None):
+        self.rooms[room].add(sid)
+
+    def leave_room(self, sid, room, namespace=None):
+        self.rooms[room].discard(sid)
+
+class FakeSocketIO:
+    """Encodes each emit once and writes the packet to every participant, as Socket.IO does"""
+    def __init__(self):
+        self.server = FakeSocketIOServer()
+        self.encodes = 0
+
+    def emit(self, event, data, room=None, namespace=None):
+        packet = json.dumps([event, data])
+        self.encodes += 1
+        participants = self.server.rooms[room] if room in self.server.rooms else (room,)
+        for sid in participants:
+            self.server.sent[sid].append(packet)
+
+def per_client_flush(socketio, batch_queue, connected_clients):
+    """The previous _process_batch_queue body: every update checked against every client"""
+    for encoder_id, updates in batch_queue.items():
+        if updates:
+            batch = updates.copy()
+            batch_queue[encoder_id] = []
+            for client_id, client in connected_clients.items():
+                if encoder_id in client['subscriptions']:
+                    socketio.emit('encoder_batch_update', {'encoder_id': encoder_id, 'updates': batch},
+                                  room=client_id)
+
+def queue_updates(fanout, encoders, updates_per_encoder=3):
+    for encoder_id in range(encoders):
+        for i in range(updates_per_encoder):
+            fanout.enqueue(encoder_id, 'status', {'bitrate': 8000 + i, 'recording': True})
+
+def test_flush_delivers_once_per_subscriber_room():
+    socketio = FakeSocketIO()
+    fanout = BatchFanout(socketio)
+    fanout.subscribe('a', 1)
+    fanout.subscribe('b', 1)
+    fanout.subscribe('b', 2)
+    assert not fanout.subscribe('b', 2)
+
+    queue_updates(fanout, encoders=4)
+    assert fanout.flush() == 3
+    assert socketio.encodes == 2
+    assert len(socketio.server.sent['a']) == 1 and len(socketio.server.sent['b']) == 2
+    assert json.loads(socketio.server.sent['a'][0])[1]['encoder_id'] == 1
+    assert fanout.flush() == 0
+
+    fanout.unsubscribe('b', 1)
+    fanout.remove_client('a')
+    assert fanout.index.subscriber_count(1) == 0 and fanout.index.subscriptions('b') == {2}
+    assert socketio.server.rooms[encoder_room(1)] == {'a'}
+
+def per_client_state(clients, encoders):
+    """Connected clients and a batch queue with every encoder updated, as the previous flush kept them"""
+    connected = {f"sid{i}": {'subscriptions': {i % encoders}} for i in range(clients)}
+    queue = defaultdict(list)
+    for encoder_id in range(encoders):
+        queue[encoder_id] = [{'type': 'status', 'data': {'bitrate': 8000 + i}, 'timestamp': ''} for i in range(3)]
+    return connected, queue
+
+def indexed_fanout(clients, encoders):
+    socketio = FakeSocketIO()
+    fanout = BatchFanout(socketio)
+    for i in range(clients):
+        fanout.subscribe(f"sid{i}", i % encoders)
+    queue_updates(fanout, encoders)
+    return socketio, fanout
+
+def test_flush_encodes_once_per_encoder_1000_clients():
+    """1000 clients spread over 50 encoders, every encoder updated"""
+    clients, encoders = 1000, 50
+    baseline_io = FakeSocketIO()
+    connected, queue = per_client_state(clients, encoders)
+    per_client_flush(baseline_io, queue, connected)
+
+    socketio, fanout = indexed_fanout(clients, encoders)
+    assert fanout.flush() == clients
+    assert socketio.encodes == encoders and baseline_io.encodes == clients
+    assert sum(len(p) for p in socketio.server.sent.values()) == clients
+
+@pytest.mark.benchmark
+def test_flush_latency_1000_clients():
+    """Flush latency with 1000 clients spread over 50 encoders, every encoder updated"""
+    clients, encoders = 1000, 50
+
+    baseline_io = FakeSocketIO()
+    connected, queue = per_client_state(clients, encoders)
+    start = time.perf_counter()
+    per_client_flush(baseline_io, queue, connected)
+    baseline = time.perf_counter() - start
+
+    socketio, fanout = indexed_fanout(clients, encoders)
+    start = time.perf_counter()
+    fanout.flush()
+    indexed = time.perf_counter() - start
+
+    # Only a few encoders changed since the last flush
+    queue_updates(fanout, encoders=2)
+    start = time.perf_counter()
+    fanout.flush()
+    sparse = time.perf_counter() - start
+
+    print(f"\nFlush to {clients} clients: per-client scan {baseline * 1000:.2f} ms "
+          f"({baseline_io.encodes} encodes), room fan-out {indexed * 1000:.2f} ms ({socketio.encodes} encodes), "
+          f"2 encoders changed {sparse * 1000:.3f} ms")
+    assert indexed < baseline / 2
@@ -0,0 +1,137 @@
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+import pytest
+from app.services.websocket.websocket_rate_limiter import GCRALimiter, RedisGCRALimiter, WebSocketRateLimiter
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class ListRateLimiter:
+    """The previous limiter: a list of timestamps per client, filtered on every check"""
+    def __init__(self, rate_limit=100, time_window=60):
+        self.rate_limit = rate_limit
+        self.time_window = time_window
+        self.client_messages = defaultdict(list)
+
+    def check_rate_limit(self, client_id):
+        now = datetime.now()
+        window_start = now - timedelta(seconds=self.time_window)
+        self.client_messages[client_id] = [t for t in self.client_messages[client_id] if t > window_start]
+        if len(self.client_messages[client_id]) >= self.rate_limit:
+            return False
+        self.client_messages[client_id].append(now)
+        return True
+
+def test_burst_then_steady_rate():
+    clock = Clock()
+    limiter = GCRALimiter(rate=100, period=60, clock=clock)
+
+    assert all(limiter.allow('a') for _ in range(100))
+    allowed, retry_after = limiter.check('a')
+    assert not allowed and retry_after == pytest.approx(0.6)
+    # Other keys are unaffected
+    assert limiter.allow('b')
+
+    # One request per emission interval from then on
+    clock.now += 0.6
+    assert limiter.allow('a')
+    assert not limiter.allow('a')
+
+    # A full burst again once the key has been idle for the period
+    clock.now += 60
+    assert sum(limiter.allow('a') for _ in range(150)) == 100
+
+def test_memory_is_one_entry_per_key():
+    clock = Clock()
+    limiter = GCRALimiter(rate=10, period=1, burst=5, clock=clock)
+    for _ in range(10_000):
+        limiter.allow('spammer')
+    assert len(limiter) == 1
+    assert sum(limiter.allow('spammer') for _ in range(10)) == 0
+
+    for client in range(3000):
+        limiter.allow(client)
+    clock.now += 2
+    for client in range(3000, 6000):
+        limiter.allow(client)
+    # Keys idle long enough to have recovered were dropped by the automatic prune
+    assert len(limiter) < 4000
+    clock.now += 2
+    assert limiter.prune() > 0 and len(limiter) == 0
+
+def test_websocket_limiter_counts_and_forgets_clients():
+    limiter = WebSocketRateLimiter(rate_limit=3, time_window=60)
+    assert [limiter.check_rate_limit('sid') for _ in range(4)] == [True, True, True, False]
+    assert limiter.metrics.checks.labels('limited')._value.get() >= 1
+    limiter.remove_client('sid')
+    assert limiter.check_rate_limit('sid')
+
+class FailingRedis:
+    def register_script(self, script):
+        def run(keys, args):
+            raise ConnectionError('redis down')
+        return run
+
+def test_redis_limiter_fails_open():
+    limiter = WebSocketRateLimiter(redis_client=FailingRedis())
+    assert isinstance(limiter.limiter, RedisGCRALimiter)
+    assert limiter.check_rate_limit('sid')
+    assert limiter.metrics.errors._value.get() >= 1
+
+def test_redis_limiter_shared_between_workers():
+    redis = pytest.importorskip('redis')
+    client = redis.Redis()
+    try:
+        client.ping()
+    except redis.ConnectionError:
+        pytest.skip('Redis server not available')
+
+    # Two limiters stand in for two Socket.IO worker processes
+    workers = [RedisGCRALimiter(redis.Redis(), rate=10, period=60, prefix='test_gcra:') for _ in range(2)]
+    workers[0].reset('sid')
+    results = [workers[i % 2].allow('sid') for i in range(12)]
+    assert results == [True] * 10 + [False] * 2
+    allowed, retry_after = workers[1].check('sid')
+    assert not allowed and 0 < retry_after <= 6
+    workers[0].reset('sid')
+
+def mixed_traffic():
+    rng = random.Random(4)
+    clients = [f"sid-{i}" for i in range(10_000)]
+    # Mostly ordinary clients, plus one spamming far past its limit
+    traffic = [rng.choice(clients) for _ in range(150_000)] + ['sid-0'] * 50_000
+    rng.shuffle(traffic)
+    return traffic
+
+def test_only_the_spammer_is_limited_at_10k_clients():
+    traffic = mixed_traffic()
+    limiter = GCRALimiter(rate=100, period=60, clock=Clock())
+    limited = defaultdict(int)
+    for client_id in traffic:
+        if not limiter.allow(client_id):
+            limited[client_id] += 1
+    assert limited == {'sid-0': traffic.count('sid-0') - 100}
+    assert len(limiter) == len(set(traffic))
+
+@pytest.mark.benchmark
+def test_checks_per_second_at_10k_clients():
+    traffic = mixed_traffic()
+    rates = {}
+    for name, factory in (('list', ListRateLimiter), ('gcra', WebSocketRateLimiter)):
+        best = float('inf')
+        for _ in range(3):
+            limiter = factory()
+            start = time.perf_counter()
+            for client_id in traffic:
+                limiter.check_rate_limit(client_id)
+            best = min(best, time.perf_counter() - start)
+        rates[name] = len(traffic) / best
+
+    print(f"\n10,000 clients: list limiter {rates['list']:,.0f} checks/s, GCRA {rates['gcra']:,.0f} checks/s")
+    assert rates['gcra'] > 2 * rates['list']